@@ -41,6 +41,94 @@ ON detainee_location_history (detainee_id);
 CREATE INDEX IF NOT EXISTS idx_detainee_location_facility_id 
 ON detainee_location_history (facility_id);
 
+-- Partial indexes on open intervals (current locations)
+CREATE INDEX IF NOT EXISTS idx_detainee_location_open_facility 
+ON detainee_location_history (facility_id) WHERE end_date IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_detainee_location_open_detainee 
+ON detainee_location_history (detainee_id) WHERE end_date IS NULL;
+
+-- Create FacilityCurrentOccupancy table: open location history records per
+-- facility, kept exact by the trigger below so current counts are read
+-- without scanning the history
+CREATE TABLE IF NOT EXISTS facility_current_occupancy (
+    facility_id INTEGER PRIMARY KEY REFERENCES facilities (id),
+    detainee_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION update_facility_current_occupancy() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        IF OLD.end_date IS NULL THEN
+            UPDATE facility_current_occupancy
+            SET detainee_count = detainee_count - 1, updated_at = CURRENT_TIMESTAMP
+            WHERE facility_id = OLD.facility_id;
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NEW.end_date IS NULL THEN
+            INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+            VALUES (NEW.facility_id, 1)
+            ON CONFLICT (facility_id) DO UPDATE SET
+                detainee_count = facility_current_occupancy.detainee_count + 1,
+                updated_at = CURRENT_TIMESTAMP;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_detainee_location_occupancy ON detainee_location_history;
+
+CREATE TRIGGER trg_detainee_location_occupancy
+AFTER INSERT OR DELETE OR UPDATE OF facility_id, end_date ON detainee_location_history
+FOR EACH ROW EXECUTE FUNCTION update_facility_current_occupancy();
+
+-- Create FacilityDailyOccupancy table: each facility's detainee count at the
+-- end of every day on which it changed, for point-in-time ("as of") queries.
+-- Built by a sweep over interval start/end events; the trigger below records
+-- the earliest invalidated day so refreshes only re-sweep from there
+CREATE TABLE IF NOT EXISTS facility_daily_occupancy (
+    facility_id INTEGER NOT NULL,
+    snapshot_date DATE NOT NULL,
+    detainee_count INTEGER NOT NULL,
+    PRIMARY KEY (facility_id, snapshot_date)
+);
+
+CREATE TABLE IF NOT EXISTS occupancy_snapshot_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    dirty_from DATE,
+    built_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_detainee_location_start_date
+ON detainee_location_history (start_date);
+
+CREATE INDEX IF NOT EXISTS idx_detainee_location_end_date
+ON detainee_location_history (end_date) WHERE end_date IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION mark_occupancy_snapshots_dirty() RETURNS TRIGGER AS $$
+DECLARE
+    day DATE;
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        day := OLD.start_date::date;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        day := LEAST(day, NEW.start_date::date);
+    END IF;
+    UPDATE occupancy_snapshot_state SET dirty_from = LEAST(dirty_from, day);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_detainee_location_snapshots ON detainee_location_history;
+
+CREATE TRIGGER trg_detainee_location_snapshots
+AFTER INSERT OR DELETE OR UPDATE OF facility_id, start_date, end_date ON detainee_location_history
+FOR EACH ROW EXECUTE FUNCTION mark_occupancy_snapshots_dirty();
+
 -- Grant permissions
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO ice_user;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO ice_user;
@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel build of the static SEO site.
+
+Replaces the separate facility page, facilities index, statistics page and
+sitemap generators with one pipeline:
+
+- facilities data is loaded once and normalized (both the
+  ``data/facilities/*.json`` list format and the web app's
+  ``src/data/facilities.json`` format are accepted)
+- every page gets a build key hashed from its inputs and its template
+  (layout file plus renderer source), so only pages whose data or template
+  changed are re-rendered; unchanged outputs are never rewritten
+- changed pages are rendered across a process pool
+- ``sitemap.xml`` is generated from the build manifest, so each URL keeps
+  the lastmod of its last real change
+- data payloads (``web-app/src/data/facilities*.json``) are published under
+  content-hashed names listed in ``asset-manifest.json``, so they can be
+  cached immutably
+- every written HTML, XML and JSON output gets precompressed ``.gz`` and
+  (with the optional ``brotli`` package) ``.br`` siblings, so the server
+  never compresses at request time
+
+Usage:
+    python scripts/build_static_site.py [--data PATH] [--output DIR] [--force]
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import inspect
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from string import Template
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DATA = PROJECT_ROOT / "data" / "facilities" / "comprehensive_ice_facilities.json"
+DEFAULT_OUTPUT = PROJECT_ROOT / "web-app" / "static-pages"
+DEFAULT_LAYOUT = DEFAULT_OUTPUT / "templates" / "page.html"
+DEFAULT_ASSETS_DIR = PROJECT_ROOT / "web-app" / "src" / "data"
+DEFAULT_BASE_URL = "https://ice-locator-mcp.vercel.app"
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 2
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+
+# Data payloads published with content-hashed names, and the pages linking them
+DATA_ASSET_PATTERN = "facilities*.json"
+DATA_ASSET_DIR = "data"
+PAGE_DATA_ASSETS = {
+    "facilities_index": ["facilities.json"],
+    "statistics": ["facilities.json", "facilities_monthly_optimized.json"],
+}
+
+# Precompressed siblings written next to every output
+COMPRESSED_SUFFIXES = (".gz", ".br") if BROTLI_AVAILABLE else (".gz",)
+
+# Below this many changed pages a pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+# Pages not produced by this build but listed in the sitemap
+EXTRA_SITEMAP_PAGES = [
+    ("", "daily", "1.0"),
+    ("about/", "monthly", "0.5"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Data loading
+# ---------------------------------------------------------------------------
+
+def slugify(name: str) -> str:
+    """Create a URL-friendly filename from a facility name."""
+    slug = name.lower().replace(' ', '-').replace('/', '-').replace('\'', '')
+    slug = ''.join(c for c in slug if c.isalnum() or c == '-')
+    while '--' in slug:
+        slug = slug.replace('--', '-')
+    return slug.strip('-') or "facility"
+
+
+def _normalize_facility(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Map either facilities JSON format to one record shape."""
+    city, state, zip_code = raw.get('city'), raw.get('state'), raw.get('zip')
+    if not city and raw.get('address'):
+        # Web app format: "City, ST, 12345" (optionally prefixed by the name)
+        parts = [p.strip() for p in raw['address'].split(',')]
+        if len(parts) >= 3:
+            city, state, zip_code = parts[-3], parts[-2], parts[-1]
+
+    population = raw.get('population', raw.get('population_count', 0)) or 0
+    return {
+        "name": raw.get('name') or 'Unknown Facility',
+        "city": city or 'Unknown',
+        "state": state or 'Unknown',
+        "zip": zip_code or 'Unknown',
+        "population": int(population),
+        "latitude": raw.get('latitude'),
+        "longitude": raw.get('longitude'),
+    }
+
+
+def load_facilities(data_path: Path) -> List[Dict[str, Any]]:
+    """Load and normalize facilities, sorted by population, with unique slugs."""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = data['facilities'] if isinstance(data, dict) else data
+
+    facilities = sorted(
+        (_normalize_facility(r) for r in records),
+        key=lambda f: (-f['population'], f['name'])
+    )
+
+    # Disambiguate duplicate names deterministically
+    seen: Counter = Counter()
+    for facility in facilities:
+        slug = slugify(facility['name'])
+        seen[slug] += 1
+        facility['slug'] = slug if seen[slug] == 1 else f"{slug}-{seen[slug]}"
+    return facilities
+
+
+# ---------------------------------------------------------------------------
+# Rendering (module-level so worker processes can import them)
+# ---------------------------------------------------------------------------
+
+def _json_ld(data: Dict[str, Any]) -> str:
+    return json.dumps(data, indent=2).replace("</", "<\\/")
+
+
+def render_facility(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Render a single facility page."""
+    f = inputs['facility']
+    esc = {k: html.escape(str(v)) for k, v in f.items()}
+    population = f['population']
+
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "GovernmentBuilding",
+        "name": f['name'],
+        "description": f"ICE detention facility located in {f['city']}, {f['state']} with capacity for {population:,} detainees",
+        "address": {
+            "@type": "PostalAddress",
+            "addressLocality": f['city'],
+            "addressRegion": f['state'],
+            "postalCode": f['zip']
+        },
+        "additionalProperty": {
+            "@type": "PropertyValue",
+            "name": "Detainee Capacity",
+            "value": population
+        }
+    }
+    coordinates = ""
+    if f.get('latitude') is not None and f.get('longitude') is not None:
+        structured_data["geo"] = {
+            "@type": "GeoCoordinates",
+            "latitude": f['latitude'],
+            "longitude": f['longitude']
+        }
+        coordinates = f"""
+                <div class="detail-item">
+                    <div class="detail-label">Coordinates</div>
+                    <div class="detail-value">{f['latitude']}, {f['longitude']}</div>
+                </div>"""
+
+    content = f"""
+        <div class="facility-card">
+            <div class="facility-header">
+                <div>
+                    <h2 class="facility-name">{esc['name']}</h2>
+                    <div class="facility-location">{esc['city']}, {esc['state']} {esc['zip']}</div>
+                </div>
+                <div class="population-badge">{population:,} detainees</div>
+            </div>
+
+            <div class="facility-details">
+                <div class="detail-item">
+                    <div class="detail-label">Location</div>
+                    <div class="detail-value">{esc['city']}, {esc['state']}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">ZIP Code</div>
+                    <div class="detail-value">{esc['zip']}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Detainee Capacity</div>
+                    <div class="detail-value">{population:,}</div>
+                </div>
+                <div class="detail-item">
+                    <div class="detail-label">Facility Type</div>
+                    <div class="detail-value">ICE Detention Center</div>
+                </div>{coordinates}
+            </div>
+
+            <div class="related-links">
+                <h3>Related Information</h3>
+                <div class="related-grid">
+                    <a href="/facilities/" class="related-link">All Facilities</a>
+                    <a href="/statistics/" class="related-link">Statistics</a>
+                    <a href="/about/" class="related-link">About ICE Detention</a>
+                </div>
+            </div>
+        </div>
+        """
+
+    return {
+        "title": f"{f['name']} - ICE Detention Facility Information",
+        "description": f"Comprehensive information about {f['name']} in {f['city']}, {f['state']}. Current detainee population: {population:,}. Find location, capacity, and related information.",
+        "keywords": f"{f['name']}, ICE, detention, {f['city']}, {f['state']}, immigration, facility, detainees",
+        "breadcrumb": f'<a href="/facilities/">Facilities</a> > {esc["name"]}',
+        "image": "facility-default.jpg",
+        "structured_data": structured_data,
+        "content": content,
+    }
+
+
+def render_facilities_index(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Render the facilities directory."""
+    rows = inputs['rows']
+    total_population = sum(r[3] for r in rows)
+    states = {r[2] for r in rows}
+
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "name": "ICE Detention Facilities Directory",
+        "description": "Complete directory of ICE detention facilities across the United States",
+        "numberOfItems": len(rows),
+        "itemListElement": [
+            {
+                "@type": "ListItem",
+                "position": i + 1,
+                "url": f"/facilities/{row[0]}.html",
+                "name": row[1]
+            }
+            for i, row in enumerate(rows[:10])
+        ]
+    }
+
+    table_rows = "".join(
+        f"""
+                    <tr>
+                        <td style="padding: 1rem; border-bottom: 1px solid #e5e7eb;">
+                            <a href="/facilities/{slug}.html" style="color: #2563eb; text-decoration: none;">{html.escape(name)}</a>
+                        </td>
+                        <td style="padding: 1rem; border-bottom: 1px solid #e5e7eb;">{html.escape(location)}</td>
+                        <td style="padding: 1rem; text-align: right; border-bottom: 1px solid #e5e7eb;">{population:,}</td>
+                    </tr>"""
+        for slug, name, location, population in (
+            (r[0], r[1], f"{r[4]}, {r[2]}", r[3]) for r in rows
+        )
+    )
+
+    content = f"""
+    <div class="facility-card">
+        <p style="margin-bottom: 1.5rem; font-size: 1.1rem;">
+            This comprehensive directory contains information about all ICE detention facilities
+            across the United States. Facilities are sorted by current detainee population.
+        </p>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-number">{len(rows)}</div>
+                <div class="stat-label">Total Facilities</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{total_population:,}</div>
+                <div class="stat-label">Total Capacity</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{len(states)}</div>
+                <div class="stat-label">States</div>
+            </div>
+        </div>
+    </div>
+
+    <div class="facility-card">
+        <h2 style="margin-bottom: 1.5rem; color: #1f2937;">All Facilities</h2>
+        <div style="overflow-x: auto;">
+            <table style="width: 100%; border-collapse: collapse;">
+                <thead>
+                    <tr style="background: #f8f9fa;">
+                        <th style="padding: 1rem; text-align: left; border-bottom: 2px solid #e5e7eb;">Facility Name</th>
+                        <th style="padding: 1rem; text-align: left; border-bottom: 2px solid #e5e7eb;">Location</th>
+                        <th style="padding: 1rem; text-align: right; border-bottom: 2px solid #e5e7eb;">Population</th>
+                    </tr>
+                </thead>
+                <tbody>{table_rows}
+                </tbody>
+            </table>
+        </div>
+    </div>
+    """
+
+    return {
+        "title": "ICE Detention Facilities Directory - Complete List",
+        "description": f"Complete directory of {len(rows)} ICE detention facilities across the United States. Find information about locations, populations, and capacity for all facilities.",
+        "keywords": "ICE facilities, detention centers, immigration, directory, list, locations",
+        "breadcrumb": "Facilities",
+        "image": "facilities-directory.jpg",
+        "structured_data": structured_data,
+        "content": content,
+    }
+
+
+def render_statistics(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Render the statistics page."""
+    total_facilities = inputs['total_facilities']
+    total_population = inputs['total_population']
+    avg_population = total_population / total_facilities if total_facilities else 0
+
+    structured_data = {
+        "@context": "https://schema.org",
+        "@type": "Dataset",
+        "name": "ICE Detention Facilities Statistics",
+        "description": "Statistical analysis of ICE detention facilities across the United States",
+        "variableMeasured": [
+            {"@type": "PropertyValue", "name": "Total Facilities", "value": total_facilities},
+            {"@type": "PropertyValue", "name": "Total Capacity", "value": total_population}
+        ]
+    }
+
+    def table(headers: List[str], rows: List[List[str]]) -> str:
+        head = "".join(
+            f'<th style="padding: 1rem; text-align: {"left" if i == 0 else "right"}; border-bottom: 2px solid #e5e7eb;">{h}</th>'
+            for i, h in enumerate(headers)
+        )
+        body = "".join(
+            "<tr>" + "".join(
+                f'<td style="padding: 1rem; {"" if i == 0 else "text-align: right; "}border-bottom: 1px solid #e5e7eb;">{html.escape(cell)}</td>'
+                for i, cell in enumerate(row)
+            ) + "</tr>"
+            for row in rows
+        )
+        return f"""
+        <div style="overflow-x: auto;">
+            <table style="width: 100%; border-collapse: collapse;">
+                <thead><tr style="background: #f8f9fa;">{head}</tr></thead>
+                <tbody>{body}</tbody>
+            </table>
+        </div>"""
+
+    ranges = table(
+        ["Population Range", "Number of Facilities", "Percentage"],
+        [
+            [name, str(count), f"{(count / total_facilities * 100) if total_facilities else 0:.1f}%"]
+            for name, count in inputs['population_ranges']
+        ]
+    )
+    states = table(
+        ["State", "Facilities", "Total Population"],
+        [[state, str(count), f"{population:,}"] for state, count, population in inputs['top_states']]
+    )
+
+    content = f"""
+    <div class="facility-card">
+        <p style="margin-bottom: 2rem; font-size: 1.1rem;">
+            Comprehensive statistics and analysis of ICE detention facilities across the United States.
+            Data includes facility counts, population capacity, and geographic distribution.
+        </p>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-number">{total_facilities}</div>
+                <div class="stat-label">Total Facilities</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{total_population:,}</div>
+                <div class="stat-label">Total Capacity</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{avg_population:.1f}</div>
+                <div class="stat-label">Average per Facility</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{inputs['state_count']}</div>
+                <div class="stat-label">States with Facilities</div>
+            </div>
+        </div>
+    </div>
+
+    <div class="facility-card">
+        <h2 style="margin-bottom: 1.5rem; color: #1f2937;">Population Distribution</h2>{ranges}
+    </div>
+
+    <div class="facility-card">
+        <h2 style="margin-bottom: 1.5rem; color: #1f2937;">Top States by Facility Count</h2>{states}
+    </div>
+    """
+
+    return {
+        "title": "ICE Detention Facilities Statistics - Data & Analysis",
+        "description": f"Statistical analysis of {total_facilities} ICE detention facilities with {total_population:,} total capacity. View population distribution, state breakdown, and facility statistics.",
+        "keywords": "ICE statistics, detention data, facility analysis, population statistics, immigration data",
+        "breadcrumb": "Statistics",
+        "image": "statistics.jpg",
+        "structured_data": structured_data,
+        "content": content,
+    }
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, str]]] = {
+    "facility": render_facility,
+    "facilities_index": render_facilities_index,
+    "statistics": render_statistics,
+}
+
+
+def render_page(task: Tuple[str, str, Dict[str, Any], str, str]) -> Tuple[str, str]:
+    """Render one page into the layout (runs in worker processes)."""
+    path, kind, inputs, layout, base_url = task
+    page = RENDERERS[kind](inputs)
+    url_path = path[:-len("index.html")] if path.endswith("index.html") else path
+    html_content = Template(layout).substitute(
+        title=html.escape(page["title"]),
+        description=html.escape(page["description"]),
+        keywords=html.escape(page["keywords"]),
+        canonical_url=f"{base_url}/{url_path}",
+        image_url=f"{base_url}/assets/{page['image']}",
+        structured_data=_json_ld(page["structured_data"]),
+        breadcrumb=page["breadcrumb"],
+        content=page["content"],
+        data_links="".join(
+            f'\n    <link rel="alternate" type="application/json" title="{html.escape(name)}" href="/{url}">'
+            for name, url in sorted(inputs.get("data_assets", {}).items())
+        ),
+    )
+    return path, html_content
+
+
+# ---------------------------------------------------------------------------
+# Build planning
+# ---------------------------------------------------------------------------
+
+def plan_pages(facilities: List[Dict[str, Any]],
+               assets: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Describe every page the site consists of and the inputs it depends on.
+
+    Hashed data asset names are part of a page's inputs, so a page is
+    rebuilt exactly when a payload it links to changes.
+    """
+    assets = assets or {}
+    pages = [
+        {
+            "path": f"facilities/{f['slug']}.html",
+            "kind": "facility",
+            "inputs": {"facility": f},
+            "changefreq": "weekly",
+            "priority": "0.6",
+        }
+        for f in facilities
+    ]
+
+    pages.append({
+        "path": "facilities/index.html",
+        "kind": "facilities_index",
+        "inputs": {"rows": [[f['slug'], f['name'], f['state'], f['population'], f['city']] for f in facilities]},
+        "changefreq": "weekly",
+        "priority": "0.8",
+    })
+
+    state_counts = Counter(f['state'] for f in facilities)
+    state_population = Counter()
+    for f in facilities:
+        state_population[f['state']] += f['population']
+    bounds = [("0-100", 100), ("101-500", 500), ("501-1000", 1000), ("1001-2000", 2000), ("2000+", None)]
+    ranges = Counter()
+    for f in facilities:
+        ranges[next(name for name, upper in bounds if upper is None or f['population'] <= upper)] += 1
+
+    pages.append({
+        "path": "statistics/index.html",
+        "kind": "statistics",
+        "inputs": {
+            "total_facilities": len(facilities),
+            "total_population": sum(f['population'] for f in facilities),
+            "state_count": len(state_counts),
+            "population_ranges": [[name, ranges[name]] for name, _ in bounds],
+            "top_states": [[s, c, state_population[s]] for s, c in state_counts.most_common(10)],
+        },
+        "changefreq": "weekly",
+        "priority": "0.8",
+    })
+
+    for page in pages:
+        linked = {name: assets[name]["path"] for name in PAGE_DATA_ASSETS.get(page["kind"], []) if name in assets}
+        if linked:
+            page["inputs"]["data_assets"] = linked
+    return pages
+
+
+def template_hashes(layout: str) -> Dict[str, str]:
+    """Hash each page kind's template: the layout plus its renderer's source."""
+    shared = inspect.getsource(render_page) + inspect.getsource(_json_ld) + layout
+    return {
+        kind: hashlib.sha256((shared + inspect.getsource(renderer)).encode()).hexdigest()
+        for kind, renderer in RENDERERS.items()
+    }
+
+
+def build_key(page: Dict[str, Any], template_hash: str, base_url: str) -> str:
+    """Stable hash of everything a page's output depends on."""
+    payload = json.dumps([page["inputs"], template_hash, base_url], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Load the previous build manifest (empty if missing or outdated)."""
+    try:
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "pages": {}, "assets": {}}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def compress(data: bytes, suffix: str) -> bytes:
+    """Deterministic maximum-ratio encoding (identical input, identical bytes)."""
+    if suffix == ".br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_if_changed(path: Path, content: Any, precompress: bool = True) -> bool:
+    """Atomically write ``content`` unless the file already holds it.
+
+    Precompressed siblings are (re)written with the file, or when missing.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        changed = path.read_bytes() != data
+    except OSError:
+        changed = True
+    if changed:
+        _atomic_write(path, data)
+
+    if precompress:
+        for suffix in COMPRESSED_SUFFIXES:
+            sibling = path.with_name(path.name + suffix)
+            if changed or not sibling.exists():
+                _atomic_write(sibling, compress(data, suffix))
+    return changed
+
+
+def remove_output(path: Path) -> None:
+    """Delete an output file and its precompressed siblings."""
+    for candidate in (path, *(path.with_name(path.name + s) for s in (".gz", ".br"))):
+        candidate.unlink(missing_ok=True)
+
+
+def publish_data_assets(assets_dir: Path, output_dir: Path,
+                        previous: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Copy data payloads to content-hashed names (``name.<hash>.json``).
+
+    Hashed files are immutable: an unchanged payload keeps its name and is
+    not rewritten, a changed one gets a new name and the old one is removed.
+    """
+    assets: Dict[str, Dict[str, Any]] = {}
+    if not assets_dir.is_dir():
+        return assets
+
+    for source in sorted(assets_dir.glob(DATA_ASSET_PATTERN)):
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        path = f"{DATA_ASSET_DIR}/{source.stem}.{digest[:12]}{source.suffix}"
+        write_if_changed(output_dir / path, data)
+        assets[source.name] = {"path": path, "sha256": digest, "bytes": len(data)}
+
+    for name, asset in previous.items():
+        if assets.get(name, {}).get("path") != asset["path"]:
+            remove_output(output_dir / asset["path"])
+    return assets
+
+
+def generate_asset_manifest(manifest: Dict[str, Any]) -> str:
+    """Public manifest mapping logical data names to hashed URLs."""
+    return json.dumps({
+        "version": MANIFEST_VERSION,
+        "sitemap": "/sitemap.xml",
+        "data": {name: f"/{asset['path']}" for name, asset in sorted(manifest["assets"].items())},
+        "encodings": ["identity", *(s.lstrip('.').replace('gz', 'gzip') for s in COMPRESSED_SUFFIXES)],
+    }, indent=2, sort_keys=True)
+
+
+def generate_sitemap(manifest: Dict[str, Any], base_url: str, today: str) -> str:
+    """Build sitemap.xml from the manifest instead of walking the output tree."""
+    entries = [(f"{base_url}/{path}" if path else base_url, today, freq, priority)
+               for path, freq, priority in EXTRA_SITEMAP_PAGES]
+    for path, page in sorted(manifest["pages"].items()):
+        url_path = path[:-len("index.html")] if path.endswith("index.html") else path
+        entries.append((f"{base_url}/{url_path}", page["lastmod"], page["changefreq"], page["priority"]))
+
+    urls = "".join(
+        f"""  <url>
+    <loc>{html.escape(loc)}</loc>
+    <lastmod>{lastmod}</lastmod>
+    <changefreq>{freq}</changefreq>
+    <priority>{priority}</priority>
+  </url>
+"""
+        for loc, lastmod, freq, priority in entries
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{urls}</urlset>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def build_site(data_path: Path = DEFAULT_DATA,
+               output_dir: Path = DEFAULT_OUTPUT,
+               layout_path: Path = DEFAULT_LAYOUT,
+               assets_dir: Optional[Path] = DEFAULT_ASSETS_DIR,
+               base_url: str = DEFAULT_BASE_URL,
+               workers: Optional[int] = None,
+               force: bool = False,
+               today: Optional[str] = None) -> Dict[str, Any]:
+    """Build the site incrementally and return a summary of what changed."""
+    started = time.perf_counter()
+    today = today or date.today().isoformat()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    facilities = load_facilities(data_path)
+    layout = layout_path.read_text(encoding='utf-8')
+    hashes = template_hashes(layout)
+    previous = load_manifest(output_dir)
+    manifest: Dict[str, Any] = {"version": MANIFEST_VERSION, "pages": {}}
+
+    # Publish hashed data payloads first so pages can link to them
+    manifest["assets"] = publish_data_assets(assets_dir, output_dir, previous["assets"]) if assets_dir else {}
+
+    # Decide which pages need rendering
+    tasks = []
+    for page in plan_pages(facilities, manifest["assets"]):
+        key = build_key(page, hashes[page["kind"]], base_url)
+        old = previous["pages"].get(page["path"])
+        entry = {
+            "kind": page["kind"],
+            "key": key,
+            "changefreq": page["changefreq"],
+            "priority": page["priority"],
+            "lastmod": old["lastmod"] if old else today,
+        }
+        manifest["pages"][page["path"]] = entry
+        if force or not old or old["key"] != key or not (output_dir / page["path"]).exists():
+            tasks.append((page["path"], page["kind"], page["inputs"], layout, base_url))
+
+    # Render changed pages, in parallel when it pays off
+    written = 0
+    if len(tasks) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(render_page, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1))))
+            for path, content in results:
+                written += _store_page(output_dir, manifest, path, content, today)
+    else:
+        for task in tasks:
+            path, content = render_page(task)
+            written += _store_page(output_dir, manifest, path, content, today)
+
+    # Remove pages that no longer exist in the data
+    removed = []
+    for path in set(previous["pages"]) - set(manifest["pages"]):
+        remove_output(output_dir / path)
+        removed.append(path)
+
+    write_if_changed(output_dir / "sitemap.xml", generate_sitemap(manifest, base_url, today))
+    write_if_changed(output_dir / ASSET_MANIFEST_NAME, generate_asset_manifest(manifest))
+    write_if_changed(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True),
+                     precompress=False)
+
+    return {
+        "pages": len(manifest["pages"]),
+        "rendered": len(tasks),
+        "written": written,
+        "skipped": len(manifest["pages"]) - len(tasks),
+        "removed": sorted(removed),
+        "assets": {name: asset["path"] for name, asset in manifest["assets"].items()},
+        "encodings": list(COMPRESSED_SUFFIXES),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _store_page(output_dir: Path, manifest: Dict[str, Any], path: str,
+                content: str, today: str) -> int:
+    """Write a rendered page; lastmod only moves when the bytes change."""
+    changed = write_if_changed(output_dir / path, content)
+    entry = manifest["pages"][path]
+    entry["sha256"] = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    if changed:
+        entry["lastmod"] = today
+    return int(changed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the static facility pages incrementally")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA, help="Facilities JSON file")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output directory")
+    parser.add_argument("--layout", type=Path, default=DEFAULT_LAYOUT, help="Page layout template")
+    parser.add_argument("--assets", type=Path, default=DEFAULT_ASSETS_DIR,
+                        help="Directory of facilities*.json data payloads to publish with hashed names")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Public site URL")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render every page")
+    args = parser.parse_args(argv)
+
+    if not args.data.exists():
+        print(f"Error: {args.data} not found")
+        return 1
+
+    if not BROTLI_AVAILABLE:
+        print("Note: brotli not installed, writing .gz siblings only (pip install brotli)")
+
+    summary = build_site(args.data, args.output, args.layout, args.assets, args.base_url.rstrip('/'),
+                         workers=args.workers, force=args.force)
+    print(f"Built {summary['pages']} pages in {summary['duration_seconds']}s: "
+          f"{summary['rendered']} rendered, {summary['written']} written, "
+          f"{summary['skipped']} unchanged, {len(summary['removed'])} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
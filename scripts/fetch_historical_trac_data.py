@@ -13,7 +13,18 @@ from typing import Dict, List, Optional, Tuple
 import time
 import logging
 from dataclasses import dataclass
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ice_locator_mcp.database.facility_matcher import (  # noqa: E402
+    FacilityMatcher,
+    extract_location_from_address,
+    normalize_facility_name,
+    normalize_facility_name_advanced
+)
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager  # noqa: E402
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -41,6 +52,8 @@ class HistoricalTRACDataFetcher:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.base_url = "https://tracreports.org/immigration/detentionstats/facilities.json"
+        self._matcher: Optional[FacilityMatcher] = None
+        self._matcher_source: Optional[List[Dict]] = None
         
     def fetch_trac_data(self) -> List[Dict]:
         """Fetch all TRAC facility data."""
@@ -136,109 +149,26 @@ class HistoricalTRACDataFetcher:
     
     def normalize_facility_name(self, name: str) -> str:
         """Normalize facility names for better matching."""
-        # Remove common suffixes and normalize
-        name = name.upper().strip()
-        name = re.sub(r'\s+(ICE|DETENTION|CENTER|FACILITY|JAIL|CORRECTIONAL|CORRECTIONS)\s*$', '', name)
-        name = re.sub(r'\s+', ' ', name)  # Normalize whitespace
-        return name.strip()
+        return normalize_facility_name(name)
     
     def normalize_facility_name_advanced(self, name: str) -> str:
         """Advanced normalization with abbreviation handling."""
-        name = name.upper().strip()
-        
-        # Handle common abbreviations and variations
-        abbreviations = {
-            'DET': 'DETENTION',
-            'DETENTION': 'DETENTION',
-            'CORRECTIONAL': 'DETENTION',  # Map correctional to detention for matching
-            'CORRECTIONS': 'DETENTION',   # Map corrections to detention for matching
-            'CENTER': 'CENTER',
-            'CENTRE': 'CENTER',
-            'FACILITY': 'FACILITY',
-            'JAIL': 'DETENTION',          # Map jail to detention for matching
-            'PRISON': 'DETENTION',        # Map prison to detention for matching
-            'PROCESSING': 'PROCESSING',
-            'SERVICE': 'SERVICE',
-            'ICE': 'ICE'
-        }
-        
-        # Replace abbreviations with standardized terms
-        for abbrev, standard in abbreviations.items():
-            name = re.sub(r'\b' + abbrev + r'\b', standard, name)
-        
-        # Remove common suffixes
-        name = re.sub(r'\s+(ICE|DETENTION|CENTER|FACILITY|PROCESSING|SERVICE)\s*$', '', name)
-        name = re.sub(r'\s+', ' ', name)  # Normalize whitespace
-        return name.strip()
+        return normalize_facility_name_advanced(name)
     
     def extract_location_from_address(self, address: str) -> tuple:
         """Extract city and state from address string."""
-        if not address:
-            return None, None
-        
-        # Common patterns: "City, State, ZIP" or "City, State ZIP"
-        parts = [part.strip() for part in address.split(',')]
-        if len(parts) >= 2:
-            city = parts[0].strip()
-            state_zip = parts[1].strip()
-            # Extract state (first 2 characters)
-            state = state_zip[:2] if len(state_zip) >= 2 else None
-            return city, state
-        
-        return None, None
+        return extract_location_from_address(address)
     
     def match_facility_to_database(self, trac_facility: TRACFacility, db_facilities: List[Dict]) -> Optional[Dict]:
-        """Match TRAC facility to database facility using improved strategies."""
-        trac_name_normalized = self.normalize_facility_name(trac_facility.name)
-        trac_name_advanced = self.normalize_facility_name_advanced(trac_facility.name)
-        
-        # Strategy 1: Exact name match (original)
-        for db_facility in db_facilities:
-            db_name_normalized = self.normalize_facility_name(db_facility['name'])
-            if trac_name_normalized == db_name_normalized:
-                return db_facility
-        
-        # Strategy 2: Advanced normalization match
-        for db_facility in db_facilities:
-            db_name_advanced = self.normalize_facility_name_advanced(db_facility['name'])
-            if trac_name_advanced == db_name_advanced:
-                return db_facility
-        
-        # Strategy 3: Partial name match with advanced normalization
-        for db_facility in db_facilities:
-            db_name_advanced = self.normalize_facility_name_advanced(db_facility['name'])
-            if (trac_name_advanced in db_name_advanced or 
-                db_name_advanced in trac_name_advanced):
-                return db_facility
-        
-        # Strategy 4: Location-based matching with address parsing
-        for db_facility in db_facilities:
-            # Try direct state/city match first
-            if (trac_facility.state == db_facility.get('state', '') and
-                trac_facility.city.upper() == db_facility.get('city', '').upper()):
-                return db_facility
-            
-            # Try address parsing for database facility
-            db_city, db_state = self.extract_location_from_address(db_facility.get('address', ''))
-            if (db_city and db_state and
-                trac_facility.state == db_state and
-                trac_facility.city.upper() == db_city.upper()):
-                return db_facility
-        
-        # Strategy 5: Fuzzy matching for similar names
-        for db_facility in db_facilities:
-            db_name_advanced = self.normalize_facility_name_advanced(db_facility['name'])
-            # Check if the core parts match (excluding common words)
-            trac_core = re.sub(r'\b(COUNTY|CITY|TOWN|VILLAGE)\b', '', trac_name_advanced).strip()
-            db_core = re.sub(r'\b(COUNTY|CITY|TOWN|VILLAGE)\b', '', db_name_advanced).strip()
-            
-            if trac_core and db_core and (
-                trac_core in db_core or db_core in trac_core or
-                len(set(trac_core.split()) & set(db_core.split())) >= 2
-            ):
-                return db_facility
+        """Match TRAC facility to database facility using improved strategies.
         
-        return None
+        The matcher indexing ``db_facilities`` is built once and reused for
+        every TRAC record matched against the same list.
+        """
+        if self._matcher is None or self._matcher_source is not db_facilities:
+            self._matcher = FacilityMatcher(db_facilities)
+            self._matcher_source = db_facilities
+        return self._matcher.match_with_location(trac_facility.name, trac_facility.city, trac_facility.state)
     
     def get_database_facilities(self) -> List[Dict]:
         """Get all facilities from the database."""
@@ -292,37 +222,12 @@ class HistoricalTRACDataFetcher:
 
     def update_database_with_monthly_data(self, monthly_data: Dict[str, List[TRACFacility]]):
         """Update database with monthly population data using entity discernment algorithm."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Get existing facilities
         db_facilities = self.get_database_facilities()
         
-        # Create monthly_population table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS monthly_population (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                facility_id INTEGER,
-                month_year TEXT,
-                population_count INTEGER,
-                download_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (facility_id) REFERENCES facilities (id)
-            )
-        """)
-        
-        # Create unique index to prevent duplicates
-        try:
-            cursor.execute("""
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_monthly_population_unique 
-                ON monthly_population(facility_id, month_year)
-            """)
-        except sqlite3.OperationalError:
-            # Index might already exist, continue
-            pass
-        
-        # Clear existing monthly data
-        cursor.execute("DELETE FROM monthly_population")
+        db_manager = SQLiteDatabaseManager(self.db_path)
+        db_manager.connect()
+        db_manager.create_monthly_population_table()
         
         total_records = 0
         matched_facilities = 0
@@ -341,6 +246,7 @@ class HistoricalTRACDataFetcher:
                 facility_groups[normalized_name].append(trac_facility)
             
             # Apply entity discernment and process each group
+            month_rows = {}
             for normalized_name, facility_group in facility_groups.items():
                 # Apply entity discernment algorithm
                 resolved_facility = self.apply_entity_discernment_algorithm(facility_group)
@@ -353,26 +259,23 @@ class HistoricalTRACDataFetcher:
                 db_facility = self.match_facility_to_database(resolved_facility, db_facilities)
                 
                 if db_facility:
-                    # Use INSERT OR REPLACE to handle potential duplicates
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO monthly_population 
-                        (facility_id, month_year, population_count, download_date)
-                        VALUES (?, ?, ?, ?)
-                    """, (
+                    # Later groups matching the same facility replace earlier ones
+                    month_rows[db_facility['id']] = (
                         db_facility['id'],
-                        month_year,
                         resolved_facility.population_count,
                         resolved_facility.download_date
-                    ))
+                    )
                     matched_facilities += 1
                 else:
                     # This is expected behavior - many TRAC facilities are not in our ICE-focused database
                     logger.debug(f"TRAC facility not in ICE database: {resolved_facility.name}")
                 
                 total_records += 1
+            
+            # One transaction per month: replace the month's rows with this batch
+            db_manager.upsert_monthly_population(month_year, list(month_rows.values()), replace_month=True)
         
-        conn.commit()
-        conn.close()
+        db_manager.disconnect()
         
         unmatched_facilities = total_records - matched_facilities
         logger.info(f"Updated database with {total_records} records, matched {matched_facilities} facilities")
@@ -8,8 +8,7 @@ and Customs Enforcement (ICE) Online Detainee Locator System (ODLS) with
 advanced anti-detection capabilities, bilingual support, and privacy-first design.
 """
 
-from .server import ICELocatorServer
-from .core.config import ServerConfig
+from .utils.lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 __author__ = "trose"
@@ -18,4 +17,10 @@ __license__ = "MIT"
 __description__ = "Advanced MCP server for ICE detainee location services"
 __url__ = "https://github.com/trose/ice-locator-mcp"
 
-__all__ = ["ICELocatorServer", "Config"]
\ No newline at end of file
+__all__ = ["ICELocatorServer", "ServerConfig"]
+
+# The server (and the MCP SDK) load on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "ICELocatorServer": ".server",
+    "ServerConfig": ".core.config",
+})
\ No newline at end of file
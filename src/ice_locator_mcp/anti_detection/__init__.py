@@ -10,11 +10,7 @@ This module provides comprehensive anti-detection capabilities including:
 - Adaptive timing based on success/failure rates
 """
 
-from .proxy_manager import ProxyManager, ProxyConfig, ProxyMetrics, ProxyStatus
-from .request_obfuscator import RequestObfuscator, BrowserProfile, RequestContext
-from .behavioral_simulator import BehavioralSimulator, BehaviorType, SessionPhase, BrowsingSession
-from .traffic_distributor import TrafficDistributor, TrafficPattern, RequestPriority, TrafficMetrics
-from .coordinator import AntiDetectionCoordinator
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     "ProxyManager",
@@ -33,4 +29,24 @@ __all__ = [
     "RequestPriority",
     "TrafficMetrics",
     "AntiDetectionCoordinator"
-]
\ No newline at end of file
+]
+
+# Submodules load on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "ProxyManager": ".proxy_manager",
+    "ProxyConfig": ".proxy_manager",
+    "ProxyMetrics": ".proxy_manager",
+    "ProxyStatus": ".proxy_manager",
+    "RequestObfuscator": ".request_obfuscator",
+    "BrowserProfile": ".request_obfuscator",
+    "RequestContext": ".request_obfuscator",
+    "BehavioralSimulator": ".behavioral_simulator",
+    "BehaviorType": ".behavioral_simulator",
+    "SessionPhase": ".behavioral_simulator",
+    "BrowsingSession": ".behavioral_simulator",
+    "TrafficDistributor": ".traffic_distributor",
+    "TrafficPattern": ".traffic_distributor",
+    "RequestPriority": ".traffic_distributor",
+    "TrafficMetrics": ".traffic_distributor",
+    "AntiDetectionCoordinator": ".coordinator"
+})
@@ -3,14 +3,17 @@ Heatmap API for ICE Locator MCP.
 
 This module provides API endpoints for retrieving heatmap data for the web and mobile apps.
 """
+import itertools
+import json
 import sys
 import os
 
 # Add the src directory to the path so we can import the database package
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Optional
 
 # Import database modules using the correct package structure
@@ -18,6 +21,25 @@ from ice_locator_mcp.database.manager import DatabaseManager
 from ice_locator_mcp.database.mock_manager import MockDatabaseManager
 from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
 from ice_locator_mcp.database.models import Facility
+from ice_locator_mcp.database.occupancy_snapshots import parse_as_of
+from ice_locator_mcp.utils.prometheus_metrics import (
+    DB_QUERY_DURATION,
+    EventLoopLagProbe,
+    metrics_payload,
+    observe_duration,
+)
+
+
+def facility_json(facility: Facility) -> bytes:
+    """Encode the public fields of a facility as compact JSON."""
+    return json.dumps({
+        "id": facility.id,
+        "name": facility.name,
+        "latitude": facility.latitude,
+        "longitude": facility.longitude,
+        "address": facility.address,
+        "population_count": facility.population_count
+    }, ensure_ascii=False, separators=(",", ":")).encode()
 
 
 class HeatmapAPI:
@@ -66,36 +88,52 @@ class HeatmapAPI:
         if not self.use_mock and self.db_manager:
             self.db_manager.disconnect()
     
-    def get_facilities(self) -> List[Dict]:
+    def get_facilities(self, batch_size: int = 500) -> StreamingResponse:
         """
         Get all facilities with their GPS coordinates and population counts.
         
+        Facilities are read from the database in batches and written out as
+        a JSON array while they are read, so the full list is never held in
+        memory as rows, objects and dictionaries at once.
+        
+        Args:
+            batch_size: Facilities read and encoded per chunk
+            
         Returns:
-            List of facilities with id, name, latitude, longitude, address, and population_count
+            Streaming JSON array of facilities with id, name, latitude, longitude,
+            address, and population_count
         """
         try:
             self.connect_database()
-            facilities = self.db_manager.get_all_facilities()
-            
-            result = []
-            for facility in facilities:
-                result.append({
-                    "id": facility.id,
-                    "name": facility.name,
-                    "latitude": facility.latitude,
-                    "longitude": facility.longitude,
-                    "address": facility.address,
-                    "population_count": facility.population_count
-                })
-            
-            return result
+            db_manager, use_mock = self.db_manager, self.use_mock
+            with observe_duration(DB_QUERY_DURATION, endpoint="facilities"):
+                facilities = db_manager.iter_facilities(batch_size=batch_size)
+                first = next(facilities, None)
         except Exception as e:
+            self.disconnect_database()
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to retrieve facilities: {str(e)}"
             )
-        finally:
-            self.disconnect_database()
+        
+        def chunks():
+            rows = itertools.chain([first], facilities) if first is not None else iter(())
+            prefix = b"["
+            try:
+                while batch := list(itertools.islice(rows, batch_size)):
+                    yield prefix + b",".join(facility_json(f) for f in batch)
+                    prefix = b","
+                yield b"[]" if prefix == b"[" else b"]"
+            finally:
+                if not use_mock:
+                    db_manager.disconnect()
+        
+        # Iterated on the event loop thread, which owns the SQLite connection
+        async def body():
+            for chunk in chunks():
+                yield chunk
+        
+        return StreamingResponse(body(), media_type="application/json")
     
     def get_facility_current_detainees(self, facility_id: int) -> Dict:
         """
@@ -110,22 +148,19 @@ class HeatmapAPI:
         try:
             self.connect_database()
             
-            # Get facility details
-            facilities = self.db_manager.get_all_facilities()
-            facility = next((f for f in facilities if f.id == facility_id), None)
-            
-            if not facility:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Facility with ID {facility_id} not found"
-                )
-            
-            # Get current detainee count
-            detainee_counts = self.db_manager.get_current_detainee_count_by_facility()
-            detainee_count = next(
-                (item['detainee_count'] for item in detainee_counts 
-                 if item['facility_id'] == facility_id), 0
-            )
+            # Both queries are timed as one observation per request
+            with observe_duration(DB_QUERY_DURATION, endpoint="facility_current_detainees"):
+                # Get facility details
+                facility = self.db_manager.get_facility_by_id(facility_id)
+                
+                if not facility:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"Facility with ID {facility_id} not found"
+                    )
+                
+                # Get current detainee count
+                detainee_count = self.db_manager.get_current_detainee_count(facility_id)
             
             return {
                 "id": facility.id,
@@ -145,22 +180,36 @@ class HeatmapAPI:
         finally:
             self.disconnect_database()
     
-    def get_heatmap_data(self) -> List[Dict]:
+    def get_heatmap_data(self, as_of: Optional[str] = None) -> List[Dict]:
         """
         Get aggregated data for heatmap visualization.
         
+        Args:
+            as_of: Optional date (YYYY-MM-DD); counts are then those at the end of that day
+            
         Returns:
             List of facilities with coordinates and detainee counts
         """
+        if as_of is not None:
+            try:
+                as_of = parse_as_of(as_of)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+        
         try:
             self.connect_database()
-            heatmap_data = self.db_manager.get_heatmap_data()
+            if as_of is not None:
+                with observe_duration(DB_QUERY_DURATION, endpoint="heatmap_data_as_of"):
+                    heatmap_data = self.db_manager.get_heatmap_data_as_of(as_of)
+            else:
+                with observe_duration(DB_QUERY_DURATION, endpoint="heatmap_data"):
+                    heatmap_data = self.db_manager.get_heatmap_data()
             return heatmap_data
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to retrieve heatmap data: {str(e)}"
-            )
+            ) from e
         finally:
             self.disconnect_database()
     
@@ -174,10 +223,12 @@ class HeatmapAPI:
         try:
             self.connect_database()
             if hasattr(self.db_manager, 'get_facilities_with_population'):
-                facilities = self.db_manager.get_facilities_with_population()
+                with observe_duration(DB_QUERY_DURATION, endpoint="facilities_with_population"):
+                    facilities = self.db_manager.get_facilities_with_population()
             else:
                 # Fallback to regular facilities if method doesn't exist
-                facilities = self.db_manager.get_all_facilities()
+                with observe_duration(DB_QUERY_DURATION, endpoint="facilities_with_population"):
+                    facilities = self.db_manager.get_all_facilities()
                 facilities = [
                     {
                         "id": f.id,
@@ -211,10 +262,12 @@ class HeatmapAPI:
         try:
             self.connect_database()
             if hasattr(self.db_manager, 'get_facility_statistics'):
-                stats = self.db_manager.get_facility_statistics()
+                with observe_duration(DB_QUERY_DURATION, endpoint="facility_statistics"):
+                    stats = self.db_manager.get_facility_statistics()
             else:
                 # Fallback statistics
-                facilities = self.db_manager.get_all_facilities()
+                with observe_duration(DB_QUERY_DURATION, endpoint="facility_statistics"):
+                    facilities = self.db_manager.get_all_facilities()
                 total_facilities = len(facilities)
                 total_population = sum(f.population_count or 0 for f in facilities)
                 avg_population = total_population / total_facilities if total_facilities > 0 else 0
@@ -254,6 +307,9 @@ app.add_middleware(
 # Global heatmap API instance
 heatmap_api: Optional[HeatmapAPI] = None
 
+# Event-loop lag sampler feeding the /metrics endpoint
+loop_lag_probe = EventLoopLagProbe()
+
 
 def get_heatmap_api():
     """Dependency to get the heatmap API instance."""
@@ -268,6 +324,13 @@ async def startup_event():
     """Initialize the heatmap API on startup."""
     global heatmap_api
     heatmap_api = HeatmapAPI()
+    loop_lag_probe.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background probes on shutdown."""
+    await loop_lag_probe.stop()
 
 
 @app.get("/")
@@ -281,18 +344,31 @@ async def root():
             "/api/facility/{id}/current-detainees",
             "/api/heatmap-data",
             "/api/facilities-with-population",
-            "/api/facility-statistics"
+            "/api/facility-statistics",
+            "/metrics"
         ]
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics exposition.
+    
+    Returns:
+        Metrics in the Prometheus text format
+    """
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.get("/api/facilities")
 async def get_facilities(api: HeatmapAPI = Depends(get_heatmap_api)):
     """
     Get all facilities with their GPS coordinates.
     
     Returns:
-        List of facilities with id, name, latitude, longitude, and address
+        Streaming JSON list of facilities with id, name, latitude, longitude, and address
     """
     return api.get_facilities()
 
@@ -315,14 +391,17 @@ async def get_facility_current_detainees(
 
 
 @app.get("/api/heatmap-data")
-async def get_heatmap_data(api: HeatmapAPI = Depends(get_heatmap_api)):
+async def get_heatmap_data(as_of: Optional[str] = None, api: HeatmapAPI = Depends(get_heatmap_api)):
     """
     Get aggregated data for heatmap visualization.
     
+    Args:
+        as_of: Optional date (YYYY-MM-DD) for point-in-time detainee counts
+        
     Returns:
         List of facilities with coordinates and detainee counts
     """
-    return api.get_heatmap_data()
+    return api.get_heatmap_data(as_of=as_of)
 
 
 @app.get("/api/facilities-with-population")
@@ -2,8 +2,8 @@
 Core modules for ICE Locator MCP Server.
 """
 
-from .config import ServerConfig, ProxyConfig, SearchConfig, CacheConfig, SecurityConfig, LoggingConfig
-from .search_engine import SearchEngine, SearchRequest, SearchResult, DetaineeRecord
+from .config import ServerConfig, ProxyConfig, SearchConfig, CacheConfig, SecurityConfig, LoggingConfig, ProfilingConfig
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     "ServerConfig",
@@ -12,8 +12,17 @@ __all__ = [
     "CacheConfig",
     "SecurityConfig",
     "LoggingConfig",
+    "ProfilingConfig",
     "SearchEngine",
     "SearchRequest",
     "SearchResult", 
     "DetaineeRecord"
-]
\ No newline at end of file
+]
+
+# The search engine (httpx, BeautifulSoup, anti-detection) loads on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "SearchEngine": ".search_engine",
+    "SearchRequest": ".search_engine",
+    "SearchResult": ".search_engine",
+    "DetaineeRecord": ".search_engine"
+})
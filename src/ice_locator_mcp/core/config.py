@@ -124,6 +124,14 @@ class MonitoringConfig:
     identify_users: bool = False  # Disabled by default for privacy
     local_only: bool = False  # If True, no data sent to external servers
     
+    # Prometheus exposition on a side port (stdio transport has no HTTP server)
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    
+    # Event loop lag probe and slow-callback detector (always on with metrics_port)
+    loop_monitor_enabled: bool = False
+    slow_callback_ms: float = 100.0
+    
     @classmethod
     def from_env(cls) -> "MonitoringConfig":
         """Create monitoring configuration from environment variables."""
@@ -132,10 +140,28 @@ class MonitoringConfig:
             mcpcat_project_id=os.getenv("ICE_LOCATOR_MCPCAT_PROJECT_ID"),
             redaction_level=os.getenv("ICE_LOCATOR_REDACTION_LEVEL", "strict"),
             identify_users=os.getenv("ICE_LOCATOR_IDENTIFY_USERS", "false").lower() == "true",
-            local_only=os.getenv("ICE_LOCATOR_ANALYTICS_LOCAL_ONLY", "false").lower() == "true"
+            local_only=os.getenv("ICE_LOCATOR_ANALYTICS_LOCAL_ONLY", "false").lower() == "true",
+            metrics_port=int(os.getenv("ICE_LOCATOR_METRICS_PORT")) if os.getenv("ICE_LOCATOR_METRICS_PORT") else None,
+            metrics_host=os.getenv("ICE_LOCATOR_METRICS_HOST", "127.0.0.1"),
+            loop_monitor_enabled=os.getenv("ICE_LOCATOR_LOOP_MONITOR_ENABLED", "false").lower() == "true",
+            slow_callback_ms=float(os.getenv("ICE_LOCATOR_SLOW_CALLBACK_MS", "100"))
         )
 
 
+@dataclass
+class ProfilingConfig:
+    """Configuration for sampled tool-call profiling."""
+    
+    enabled: bool = False
+    sample_rate: float = 0.01  # Fraction of tool calls profiled
+    interval: float = 0.005  # Stack sampling interval in seconds
+    output_dir: Path = field(default_factory=lambda: Path.home() / ".cache" / "ice-locator-mcp" / "profiles")
+    
+    # Retention
+    max_files: int = 50
+    max_age_hours: int = 72
+
+
 @dataclass
 class ServerConfig:
     """Main server configuration."""
@@ -147,6 +173,7 @@ class ServerConfig:
     security_config: SecurityConfig = field(default_factory=SecurityConfig)
     logging_config: LoggingConfig = field(default_factory=LoggingConfig)
     monitoring_config: MonitoringConfig = field(default_factory=MonitoringConfig)
+    profiling_config: ProfilingConfig = field(default_factory=ProfilingConfig)
     
     # Server settings
     server_name: str = "ice-locator-mcp"
@@ -154,6 +181,12 @@ class ServerConfig:
     max_concurrent_requests: int = 10
     request_timeout: int = 60
     
+    # Tool responses without indentation
+    compact_json: bool = False
+    
+    # SQLite facilities database behind the ice:// resources
+    facilities_database_path: Path = field(default_factory=lambda: Path("ice_locator_facilities.db"))
+    
     # Feature flags
     enhanced_search_enabled: bool = True
     bulk_search_enabled: bool = True
@@ -217,6 +250,22 @@ class ServerConfig:
                 if "behavioral_simulation" in security_data:
                     config.security_config.behavioral_simulation = security_data["behavioral_simulation"]
             
+            # Load profiling configuration
+            if "profiling" in config_data:
+                profiling_data = config_data["profiling"]
+                if "enabled" in profiling_data:
+                    config.profiling_config.enabled = profiling_data["enabled"]
+                if "sample_rate" in profiling_data:
+                    config.profiling_config.sample_rate = profiling_data["sample_rate"]
+                if "interval" in profiling_data:
+                    config.profiling_config.interval = profiling_data["interval"]
+                if "output_dir" in profiling_data:
+                    config.profiling_config.output_dir = Path(profiling_data["output_dir"])
+                if "max_files" in profiling_data:
+                    config.profiling_config.max_files = profiling_data["max_files"]
+                if "max_age_hours" in profiling_data:
+                    config.profiling_config.max_age_hours = profiling_data["max_age_hours"]
+            
             return config
             
         except Exception as e:
@@ -252,6 +301,14 @@ class ServerConfig:
         if os.getenv("ICE_LOCATOR_CACHE_DIR"):
             config.cache_config.cache_dir = Path(os.getenv("ICE_LOCATOR_CACHE_DIR"))
         
+        # Facilities database
+        if os.getenv("SQLITE_DATABASE_PATH"):
+            config.facilities_database_path = Path(os.getenv("SQLITE_DATABASE_PATH"))
+        
+        # Response format
+        if os.getenv("ICE_LOCATOR_COMPACT_JSON"):
+            config.compact_json = os.getenv("ICE_LOCATOR_COMPACT_JSON").lower() == "true"
+        
         # Logging configuration
         if os.getenv("ICE_LOCATOR_LOG_LEVEL"):
             config.logging_config.level = os.getenv("ICE_LOCATOR_LOG_LEVEL")
@@ -263,6 +320,38 @@ class ServerConfig:
         if os.getenv("ICE_LOCATOR_LOG_SENSITIVE_DATA"):
             config.security_config.log_sensitive_data = os.getenv("ICE_LOCATOR_LOG_SENSITIVE_DATA").lower() == "true"
         
+        # Monitoring configuration
+        if os.getenv("ICE_LOCATOR_METRICS_PORT"):
+            config.monitoring_config.metrics_port = int(os.getenv("ICE_LOCATOR_METRICS_PORT"))
+            
+        if os.getenv("ICE_LOCATOR_METRICS_HOST"):
+            config.monitoring_config.metrics_host = os.getenv("ICE_LOCATOR_METRICS_HOST")
+        
+        if os.getenv("ICE_LOCATOR_LOOP_MONITOR_ENABLED"):
+            config.monitoring_config.loop_monitor_enabled = os.getenv("ICE_LOCATOR_LOOP_MONITOR_ENABLED").lower() == "true"
+        
+        if os.getenv("ICE_LOCATOR_SLOW_CALLBACK_MS"):
+            config.monitoring_config.slow_callback_ms = float(os.getenv("ICE_LOCATOR_SLOW_CALLBACK_MS"))
+        
+        # Profiling settings
+        if os.getenv("ICE_LOCATOR_PROFILING_ENABLED"):
+            config.profiling_config.enabled = os.getenv("ICE_LOCATOR_PROFILING_ENABLED").lower() == "true"
+        
+        if os.getenv("ICE_LOCATOR_PROFILING_SAMPLE_RATE"):
+            config.profiling_config.sample_rate = float(os.getenv("ICE_LOCATOR_PROFILING_SAMPLE_RATE"))
+        
+        if os.getenv("ICE_LOCATOR_PROFILING_INTERVAL"):
+            config.profiling_config.interval = float(os.getenv("ICE_LOCATOR_PROFILING_INTERVAL"))
+        
+        if os.getenv("ICE_LOCATOR_PROFILING_DIR"):
+            config.profiling_config.output_dir = Path(os.getenv("ICE_LOCATOR_PROFILING_DIR"))
+        
+        if os.getenv("ICE_LOCATOR_PROFILING_MAX_FILES"):
+            config.profiling_config.max_files = int(os.getenv("ICE_LOCATOR_PROFILING_MAX_FILES"))
+        
+        if os.getenv("ICE_LOCATOR_PROFILING_MAX_AGE_HOURS"):
+            config.profiling_config.max_age_hours = int(os.getenv("ICE_LOCATOR_PROFILING_MAX_AGE_HOURS"))
+        
         return config
     
     def validate(self) -> None:
@@ -300,6 +389,10 @@ class ServerConfig:
             
         if self.search_config.burst_allowance < self.search_config.requests_per_minute:
             raise ValueError("Burst allowance must be >= requests per minute")
+        
+        # Validate profiling configuration
+        if not (0.0 <= self.profiling_config.sample_rate <= 1.0):
+            raise ValueError("Profiling sample rate must be between 0.0 and 1.0")
     
     def create_directories(self) -> None:
         """Create necessary directories."""
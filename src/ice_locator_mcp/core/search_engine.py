@@ -7,8 +7,11 @@ and coordinates with anti-detection systems.
 
 import asyncio
 import hashlib
+import re
 import time
+import unicodedata
 from dataclasses import dataclass, asdict
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 import httpx
 import structlog
@@ -18,6 +21,96 @@ from .config import SearchConfig
 from ..anti_detection import ProxyManager, RequestObfuscator
 from ..utils.cache import CacheManager
 from ..utils.rate_limiter import RateLimiter
+from ..utils.prometheus_metrics import PARSE_DURATION, RATE_LIMITER_WAIT, observe_duration
+from ..utils.profiling import phase
+from ..utils.serialization import pre_encode
+from ..utils.dates import DateParser
+
+
+# Country name mappings shared by SearchTools and cache key canonicalization
+COUNTRY_MAPPINGS = {
+    'mexico': 'Mexico',
+    'méxico': 'Mexico',
+    'guatemala': 'Guatemala',
+    'el salvador': 'El Salvador',
+    'salvador': 'El Salvador',
+    'honduras': 'Honduras',
+    'nicaragua': 'Nicaragua',
+    'costa rica': 'Costa Rica',
+    'panama': 'Panama',
+    'panamá': 'Panama',
+    'colombia': 'Colombia',
+    'venezuela': 'Venezuela',
+    'ecuador': 'Ecuador',
+    'peru': 'Peru',
+    'perú': 'Peru',
+    'bolivia': 'Bolivia',
+    'brazil': 'Brazil',
+    'brasil': 'Brazil',
+    'argentina': 'Argentina',
+    'chile': 'Chile',
+    'uruguay': 'Uruguay',
+    'paraguay': 'Paraguay'
+}
+
+# Static guidance shared by every search result, encoded once
+LEGAL_RESOURCES = pre_encode([
+    {
+        "name": "American Immigration Lawyers Association",
+        "phone": "1-202-507-7600",
+        "website": "https://www.aila.org"
+    },
+    {
+        "name": "National Immigration Legal Services Directory",
+        "website": "https://www.immigrationadvocates.org/nonprofit/legaldirectory/"
+    }
+])
+
+FAMILY_RESOURCES = pre_encode([
+    {
+        "name": "ICE Detainee Locator Helpline",
+        "phone": "1-888-351-4024",
+        "hours": "Monday-Friday 8am-8pm EST"
+    },
+    {
+        "name": "Detention Watch Network",
+        "website": "https://www.detentionwatchnetwork.org"
+    }
+])
+
+NON_DIGITS = re.compile(r'\D')
+
+_date_parser = DateParser()
+
+
+def fold_text(value: str) -> str:
+    """Casefold, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+# Folded spellings, so "MÉXICO" and "mexico" find the same entry
+_FOLDED_COUNTRIES = {fold_text(name): country for name, country in COUNTRY_MAPPINGS.items()}
+
+
+def canonical_date(value: str) -> str:
+    """Date as YYYY-MM-DD when DateParser understands it, else folded text."""
+    return _date_parser.parse_date(value) or fold_text(value)
+
+
+def canonical_country(value: str) -> str:
+    """Folded canonical country name."""
+    folded = fold_text(value)
+    return fold_text(_FOLDED_COUNTRIES.get(folded, folded))
+
+
+def canonical_alien_number(value: str) -> str:
+    """A-number as "a" plus nine digits; 8-digit numbers take a leading zero."""
+    digits = NON_DIGITS.sub('', value)
+    if 8 <= len(digits) <= 9:
+        return 'a' + digits.zfill(9)
+    return fold_text(value)
 
 
 @dataclass
@@ -39,21 +132,36 @@ class SearchRequest:
     fuzzy_search: bool = True
     language: str = "en"
     
+    def canonical_fields(self) -> Dict[str, str]:
+        """
+        Search parameters in canonical form.
+        
+        Spellings of the same lookup map to the same values: accents and
+        case are folded, whitespace is collapsed, dates are parsed to
+        YYYY-MM-DD, countries go through COUNTRY_MAPPINGS and A-numbers
+        lose their separators.
+        """
+        canonicalizers = {
+            'first_name': fold_text,
+            'last_name': fold_text,
+            'middle_name': fold_text,
+            'date_of_birth': canonical_date,
+            'country_of_birth': canonical_country,
+            'alien_number': canonical_alien_number,
+            'language': fold_text
+        }
+        fields = {}
+        for name, canonicalize in canonicalizers.items():
+            value = getattr(self, name)
+            if value is not None:
+                value = canonicalize(str(value))
+                if value:
+                    fields[name] = value
+        return fields
+    
     def to_cache_key(self) -> str:
         """Generate cache key for this search request."""
-        # Create deterministic key from search parameters
-        key_data = {
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'middle_name': self.middle_name,
-            'date_of_birth': self.date_of_birth,
-            'country_of_birth': self.country_of_birth,
-            'alien_number': self.alien_number,
-            'language': self.language
-        }
-        
-        # Remove None values and normalize
-        normalized = {k: str(v).lower().strip() for k, v in key_data.items() if v is not None}
+        normalized = self.canonical_fields()
         
         # Create hash
         key_string = "|".join(f"{k}={v}" for k, v in sorted(normalized.items()))
@@ -109,8 +217,8 @@ class SearchResult:
             },
             user_guidance={
                 "next_steps": cls._generate_next_steps(records),
-                "legal_resources": cls._get_legal_resources(),
-                "family_resources": cls._get_family_resources()
+                "legal_resources": LEGAL_RESOURCES,
+                "family_resources": FAMILY_RESOURCES
             }
         )
     
@@ -128,8 +236,8 @@ class SearchResult:
             },
             user_guidance={
                 "next_steps": ["Check your search parameters", "Try again later"],
-                "legal_resources": cls._get_legal_resources(),
-                "family_resources": cls._get_family_resources()
+                "legal_resources": LEGAL_RESOURCES,
+                "family_resources": FAMILY_RESOURCES
             }
         )
     
@@ -154,36 +262,6 @@ class SearchResult:
             steps.append("Review visiting procedures and schedules")
         
         return steps
-    
-    @staticmethod
-    def _get_legal_resources() -> List[Dict[str, str]]:
-        """Get legal resource information."""
-        return [
-            {
-                "name": "American Immigration Lawyers Association",
-                "phone": "1-202-507-7600",
-                "website": "https://www.aila.org"
-            },
-            {
-                "name": "National Immigration Legal Services Directory",
-                "website": "https://www.immigrationadvocates.org/nonprofit/legaldirectory/"
-            }
-        ]
-    
-    @staticmethod
-    def _get_family_resources() -> List[Dict[str, str]]:
-        """Get family support resource information."""
-        return [
-            {
-                "name": "ICE Detainee Locator Helpline",
-                "phone": "1-888-351-4024",
-                "hours": "Monday-Friday 8am-8pm EST"
-            },
-            {
-                "name": "Detention Watch Network",
-                "website": "https://www.detentionwatchnetwork.org"
-            }
-        ]
 
 
 class SearchEngine:
@@ -191,9 +269,12 @@ class SearchEngine:
     
     def __init__(self, 
                  proxy_manager: ProxyManager,
-                 config: SearchConfig):
+                 config: SearchConfig,
+                 cache_dir: Optional[Path] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
         self.config = config
         self.proxy_manager = proxy_manager
+        self.transport = transport
         self.logger = structlog.get_logger(__name__)
         
         # Initialize components
@@ -202,7 +283,7 @@ class SearchEngine:
             requests_per_minute=config.requests_per_minute,
             burst_allowance=config.burst_allowance
         )
-        self.cache_manager = CacheManager()
+        self.cache_manager = CacheManager(cache_dir=cache_dir)
         
         # HTTP client
         self.client: Optional[httpx.AsyncClient] = None
@@ -246,25 +327,30 @@ class SearchEngine:
             
             # Check cache first
             cache_key = request.to_cache_key()
-            cached_result = await self.cache_manager.get(cache_key)
+            with phase("cache"):
+                cached_result = await self.cache_manager.get(cache_key)
             if cached_result:
                 self.logger.info("Cache hit", cache_key=cache_key)
-                return SearchResult(**cached_result)
+                records = [DetaineeRecord(**record) for record in cached_result["results"]]
+                return SearchResult(**dict(cached_result, results=records))
             
             # Rate limiting
-            await self.rate_limiter.acquire()
+            with phase("rate_limit"), observe_duration(RATE_LIMITER_WAIT):
+                await self.rate_limiter.acquire()
             
-            # Ensure we have fresh form data
-            await self._ensure_form_data()
-            
-            # Perform the search
-            if request.alien_number:
-                result = await self._search_by_alien_number(request)
-            else:
-                result = await self._search_by_name(request)
+            with phase("fetch"):
+                # Ensure we have fresh form data
+                await self._ensure_form_data()
+                
+                # Perform the search
+                if request.alien_number:
+                    result = await self._search_by_alien_number(request)
+                else:
+                    result = await self._search_by_name(request)
             
             # Cache the result
-            await self.cache_manager.set(cache_key, asdict(result))
+            with phase("cache"):
+                await self.cache_manager.set(cache_key, asdict(result))
             
             search_time = time.time() - start_time
             result.search_metadata["processing_time_ms"] = int(search_time * 1000)
@@ -298,6 +384,10 @@ class SearchEngine:
         if proxy:
             client_kwargs["proxy"] = proxy.url
         
+        # A custom transport (e.g. an in-process ASGI app) replaces the network
+        if self.transport:
+            client_kwargs["transport"] = self.transport
+        
         self.client = httpx.AsyncClient(**client_kwargs)
         
         self.logger.debug("HTTP client configured", proxy=proxy.endpoint if proxy else None)
@@ -317,9 +407,10 @@ class SearchEngine:
         """Fetch the search form and extract CSRF token."""
         try:
             # Simulate human behavior
-            await self.request_obfuscator.simulate_human_behavior(
-                self.session_id, "navigation", nav_type="page_load"
-            )
+            if self.config.human_delays:
+                await self.request_obfuscator.simulate_human_behavior(
+                    self.session_id, "navigation", nav_type="page_load"
+                )
             
             # Get obfuscated headers
             headers = await self.request_obfuscator.obfuscate_request(
@@ -426,16 +517,17 @@ class SearchEngine:
     async def _submit_search(self, search_data: Dict[str, str], search_type: str) -> SearchResult:
         """Submit search request and parse results."""
         try:
-            # Simulate form filling
-            await self.request_obfuscator.simulate_human_behavior(
-                self.session_id, "form_filling", form_data=search_data
-            )
-            
-            # Calculate delay
-            delay = await self.request_obfuscator.calculate_delay(
-                self.session_id, "form_submit"
-            )
-            await asyncio.sleep(delay)
+            if self.config.human_delays:
+                # Simulate form filling
+                await self.request_obfuscator.simulate_human_behavior(
+                    self.session_id, "form_filling", form_data=search_data
+                )
+                
+                # Calculate delay
+                delay = await self.request_obfuscator.calculate_delay(
+                    self.session_id, "form_submit"
+                )
+                await asyncio.sleep(delay)
             
             # Get obfuscated headers
             headers = await self.request_obfuscator.obfuscate_request(
@@ -462,7 +554,8 @@ class SearchEngine:
             response.raise_for_status()
             
             # Parse results
-            return await self._parse_search_results(response.text, search_type)
+            with phase("parse"), observe_duration(PARSE_DURATION, search_type=search_type):
+                return await self._parse_search_results(response.text, search_type)
             
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 403 and not self.retry_with_browser:
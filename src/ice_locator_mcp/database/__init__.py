@@ -1,12 +1,19 @@
 """
 Database package for the heatmap feature.
 """
-from .models import Detainee, Facility, DetaineeLocationHistory
-from .manager import DatabaseManager
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     'Detainee',
     'Facility', 
     'DetaineeLocationHistory',
     'DatabaseManager'
-]
\ No newline at end of file
+]
+
+# psycopg2 loads with the PostgreSQL manager on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    'Detainee': '.models',
+    'Facility': '.models',
+    'DetaineeLocationHistory': '.models',
+    'DatabaseManager': '.manager'
+})
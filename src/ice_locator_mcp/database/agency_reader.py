@@ -0,0 +1,199 @@
+"""
+Streaming reader for the ICE 287(g) participating agencies file.
+Yields normalized agency rows from the XLSX source (openpyxl read-only
+mode) or a CSV export one row at a time, deduplicating on the fly, so
+memory stays flat regardless of file size.
+"""
+import csv
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+DEFAULT_AGENCIES_FILE = Path(__file__).resolve().parents[3] / "data" / "participatingAgencies09042025pm.xlsx"
+
+# Source column headers
+STATE_COLUMN = "STATE"
+AGENCY_COLUMN = "LAW ENFORCEMENT AGENCY"
+COUNTY_COLUMN = "COUNTY"
+TYPE_COLUMN = "TYPE"
+SUPPORT_TYPE_COLUMN = "SUPPORT TYPE"
+
+
+def _clean(value: Any) -> str:
+    """Cell value as a single-spaced string."""
+    if value is None:
+        return ""
+    return " ".join(str(value).split())
+
+
+@dataclass(frozen=True)
+class AgencyRow:
+    """A normalized participating agency row."""
+    agency: str
+    state: str
+    county: str = ""
+    agency_type: str = ""
+    support_type: str = ""
+
+    @property
+    def key(self) -> str:
+        """Deduplication key: case-insensitive agency and state."""
+        return f"{self.agency.casefold()}|{self.state.casefold()}"
+
+    @property
+    def facility_name(self) -> str:
+        """Facility name used in the database."""
+        return f"{self.agency}, {self.state}"
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert row to the agency info dictionary used by the ingest scripts."""
+        return {
+            'agency': self.agency,
+            'state': self.state,
+            'county': self.county,
+            'type': self.agency_type
+        }
+
+
+@dataclass
+class ReadProgress:
+    """Running counts for a streaming read."""
+    rows: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert progress to dictionary."""
+        return {
+            "rows": self.rows,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped
+        }
+
+
+def _iter_csv_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for record in csv.DictReader(f):
+            yield {_clean(k): v for k, v in record.items() if k is not None}
+
+
+def _iter_xlsx_records(path: Path) -> Iterator[Dict[str, Any]]:
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("Reading XLSX files requires openpyxl: pip install ice-locator-mcp[ingest]")
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        header: Optional[Sequence[str]] = None
+        for values in workbook.active.iter_rows(values_only=True):
+            if header is None:
+                # The header is the first non-empty row
+                if any(value is not None for value in values):
+                    header = [_clean(value) for value in values]
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_agency_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over raw records of an agencies file, keyed by column header.
+
+    Args:
+        path: XLSX or CSV file
+
+    Returns:
+        Iterator of {header: value} dictionaries
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Agencies file not found: {path}")
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        return _iter_xlsx_records(path)
+    return _iter_csv_records(path)
+
+
+def iter_agency_rows(path: Path, progress: Optional[ReadProgress] = None) -> Iterator[AgencyRow]:
+    """
+    Iterate over normalized agency rows, skipping rows without agency or state.
+
+    Args:
+        path: XLSX or CSV file
+        progress: Counters to update while reading
+
+    Returns:
+        Iterator of AgencyRow objects
+    """
+    progress = progress if progress is not None else ReadProgress()
+    for record in iter_agency_records(path):
+        progress.rows += 1
+        row = AgencyRow(
+            agency=_clean(record.get(AGENCY_COLUMN)),
+            state=_clean(record.get(STATE_COLUMN)),
+            county=_clean(record.get(COUNTY_COLUMN)),
+            agency_type=_clean(record.get(TYPE_COLUMN)),
+            support_type=_clean(record.get(SUPPORT_TYPE_COLUMN))
+        )
+        if not (row.agency and row.state):
+            progress.skipped += 1
+            continue
+        yield row
+
+
+def iter_unique_agencies(path: Path, progress: Optional[ReadProgress] = None,
+                         on_progress: Optional[Callable[[ReadProgress], None]] = None,
+                         progress_every: int = 500) -> Iterator[AgencyRow]:
+    """
+    Iterate over agencies, yielding the first row seen for each agency and state.
+
+    Only the normalized keys of agencies already yielded are kept in memory.
+
+    Args:
+        path: XLSX or CSV file
+        progress: Counters to update while reading
+        on_progress: Called with the counters every ``progress_every`` rows
+        progress_every: Rows between progress callbacks
+
+    Returns:
+        Iterator of unique AgencyRow objects
+    """
+    progress = progress if progress is not None else ReadProgress()
+    seen = set()
+    for row in iter_agency_rows(path, progress):
+        if row.key in seen:
+            progress.duplicates += 1
+        else:
+            seen.add(row.key)
+            progress.unique += 1
+            yield row
+        if on_progress and progress.rows % progress_every == 0:
+            on_progress(progress)
+    if on_progress:
+        on_progress(progress)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def print_progress(progress: ReadProgress):
+    """Progress callback for the command-line ingest scripts."""
+    print(f"Read {progress.rows} rows: {progress.unique} unique agencies, "
+          f"{progress.duplicates} duplicates, {progress.skipped} skipped")
+
@@ -5,15 +5,12 @@ This script uses web search to find official websites and then extracts addresse
 import os
 import sys
 import csv
-import time
-import requests
-from urllib.parse import quote_plus
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from ice_locator_mcp.database.geocoding import NOT_FOUND, BatchGeocoder
+
 def search_for_official_website(agency_name: str, state: str) -> str:
     """
     Search for the official website of a law enforcement agency.
@@ -84,48 +81,15 @@ def construct_address_from_known_patterns(agency_name: str, state: str, county:
     
     return ""
 
-def geocode_address_with_retry(geolocator, address: str, max_retries: int = 3) -> tuple:
-    """
-    Geocode an address with retry logic.
-    
-    Args:
-        geolocator: Geopy geolocator instance
-        address: Address to geocode
-        max_retries: Maximum number of retry attempts
-        
-    Returns:
-        Tuple of (latitude, longitude) or (0.0, 0.0) if not found
-    """
-    for attempt in range(max_retries):
-        try:
-            location = geolocator.geocode(address)
-            if location:
-                return (location.latitude, location.longitude)
-            else:
-                return (0.0, 0.0)
-        except GeocoderTimedOut:
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            else:
-                print(f"Geocoding timed out for address: {address}")
-                return (0.0, 0.0)
-        except GeocoderServiceError as e:
-            print(f"Geocoding service error for address {address}: {e}")
-            return (0.0, 0.0)
-        except Exception as e:
-            print(f"Unexpected error geocoding address {address}: {e}")
-            return (0.0, 0.0)
-    
-    return (0.0, 0.0)
-
-def enhance_missing_addresses(csv_file_path: str, output_file_path: str = None):
+def enhance_missing_addresses(csv_file_path: str, output_file_path: str = None,
+                              geocoder: BatchGeocoder = None):
     """
     Enhance agencies without coordinates by finding addresses and geocoding them.
     
     Args:
         csv_file_path: Path to the geocoded CSV file
         output_file_path: Path to output CSV with enhanced addresses
+        geocoder: Cache-first batch geocoder (defaults to the configured backend)
     """
     if not os.path.exists(csv_file_path):
         raise FileNotFoundError(f"CSV file not found: {csv_file_path}")
@@ -153,15 +117,13 @@ def enhance_missing_addresses(csv_file_path: str, output_file_path: str = None):
         if col not in fieldnames:
             fieldnames = list(fieldnames) + [col]
     
-    # Initialize geolocator
-    geolocator = Nominatim(user_agent="ICE Locator MCP/1.0 (trose@example.com)")
-    
-    # Process agencies without coordinates
+    # Construct addresses from known patterns
     processed_count = 0
     enhanced_count = 0
     error_count = 0
     
-    for i, row in enumerate(no_coords):
+    constructed = []
+    for row in no_coords:
         state = row.get('STATE', '').strip()
         agency = row.get('LAW ENFORCEMENT AGENCY', '').strip()
         county = row.get('COUNTY', '').strip()
@@ -170,18 +132,21 @@ def enhance_missing_addresses(csv_file_path: str, output_file_path: str = None):
             error_count += 1
             continue
         
-        print(f"Processing {i+1}/{len(no_coords)}: {agency}, {state}")
-        
-        # Construct address from known patterns
-        constructed_address = construct_address_from_known_patterns(agency, state, county)
+        constructed.append((row, construct_address_from_known_patterns(agency, state, county)))
+    
+    # Cache-first pass; only misses are sent to the geocoder
+    geocoder = geocoder or BatchGeocoder()
+    coordinates = geocoder.geocode_many_sync(address for _, address in constructed if address)
+    print(f"Geocoding: {geocoder.stats}")
+    
+    for i, (row, constructed_address) in enumerate(constructed):
+        print(f"Processing {i+1}/{len(constructed)}: {row['LAW ENFORCEMENT AGENCY'].strip()}, {row['STATE'].strip()}")
         
         if constructed_address:
             print(f"  Constructed address: {constructed_address}")
+            lat, lon = coordinates[constructed_address]
             
-            # Geocode the constructed address
-            lat, lon = geocode_address_with_retry(geolocator, constructed_address)
-            
-            if lat != 0.0 or lon != 0.0:
+            if (lat, lon) != NOT_FOUND:
                 row['ENHANCED_ADDRESS'] = constructed_address
                 row['ENHANCED_LATITUDE'] = str(lat)
                 row['ENHANCED_LONGITUDE'] = str(lon)
@@ -199,10 +164,6 @@ def enhance_missing_addresses(csv_file_path: str, output_file_path: str = None):
             print(f"  Could not construct address")
         
         processed_count += 1
-        
-        # Add a delay to respect rate limits
-        if (i + 1) % 10 == 0:
-            time.sleep(1)
     
     # Write the updated CSV
     with open(output_file_path, 'w', newline='', encoding='utf-8') as outfile:
@@ -0,0 +1,486 @@
+"""
+Facility matcher for TRAC ingest.
+Matches TRAC facility records to database facilities using keys that are
+normalized once per database facility and looked up through hash maps and
+inverted indexes, instead of re-normalizing every database name for every
+TRAC record.
+"""
+import re
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+_SUFFIX_PATTERN = re.compile(r'\s+(ICE|DETENTION|CENTER|FACILITY|JAIL|CORRECTIONAL|CORRECTIONS)\s*$')
+_ADVANCED_SUFFIX_PATTERN = re.compile(r'\s+(ICE|DETENTION|CENTER|FACILITY|PROCESSING|SERVICE)\s*$')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_CORE_STOPWORDS_PATTERN = re.compile(r'\b(COUNTY|CITY|TOWN|VILLAGE)\b')
+
+# Common abbreviations and variations mapped to standardized terms
+_ABBREVIATIONS = {
+    'DET': 'DETENTION',
+    'DETENTION': 'DETENTION',
+    'CORRECTIONAL': 'DETENTION',  # Map correctional to detention for matching
+    'CORRECTIONS': 'DETENTION',   # Map corrections to detention for matching
+    'CENTER': 'CENTER',
+    'CENTRE': 'CENTER',
+    'FACILITY': 'FACILITY',
+    'JAIL': 'DETENTION',          # Map jail to detention for matching
+    'PRISON': 'DETENTION',        # Map prison to detention for matching
+    'PROCESSING': 'PROCESSING',
+    'SERVICE': 'SERVICE',
+    'ICE': 'ICE'
+}
+_ABBREVIATION_PATTERNS = [
+    (re.compile(r'\b' + abbrev + r'\b'), standard) for abbrev, standard in _ABBREVIATIONS.items()
+]
+
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+_DESIGNATION_PATTERN = re.compile(r'\s*(DETENTION\s+)?(FACILITY|CENTER|COMPLEX|JAIL|CORRECTIONAL|DET\.?\s+CENTER|CORRECTIONS?|DEPT\.?|DEPARTMENT|OFFICE|SHERIFF\'?S?|POLICE|LAW ENFORCEMENT|COURT|COUNTY JAIL|COUNTY DETENTION|DET\.?\s+CTR|PROCESSING\s+CENTER|HOLD\s+ROOM|SERVICE\s+PROCESSING|CONTRACT\s+FACILITY|FEDERAL\s+DETENTION|REGIONAL\s+DETENTION|ICE\s+PROCESSING|CORRECTIONAL\s+CENTER|PUBLIC\s+SAFETY|JUSTICE\s+CENTER|DETENTION\s+FACILITY|CORRECTIONAL\s+FACILITY|DETENTION\s+CTR|DETENTION|PROCESSING\s+CTR|SERVICE\s+PROCESSING\s+CENTER|CONTRACT\s+DETENTION|FEDERAL\s+CONTRACT|REGIONAL\s+JAIL|CORRECTIONAL\s+INST|FEDERAL\s+CORR|PUBLIC\s+SAFETY\s+COMPLEX|DET\.?\s+PROCESSING|DET\.?\s+SERV\s+PROC|DET\.?\s+SERV\s+PROCESSING).*$', re.IGNORECASE)
+_LEADING_THE_PATTERN = re.compile(r'^THE\s+', re.IGNORECASE)
+_COUNTY_PATTERN = re.compile(r'([A-Z]+(?:\s+[A-Z]+)*?)\s+COUNTY')
+_TRAILING_STATE_PATTERN = re.compile(r',\s*([A-Z]+)$')
+_PAREN_STATE_PATTERN = re.compile(r'\(([A-Z]+)\)')
+
+
+def normalize_facility_name(name: str) -> str:
+    """Normalize a facility name by stripping a trailing facility-type suffix."""
+    name = name.upper().strip()
+    name = _SUFFIX_PATTERN.sub('', name)
+    name = _WHITESPACE_PATTERN.sub(' ', name)
+    return name.strip()
+
+
+def normalize_facility_name_advanced(name: str) -> str:
+    """Normalize a facility name with abbreviation handling."""
+    name = name.upper().strip()
+    for pattern, standard in _ABBREVIATION_PATTERNS:
+        name = pattern.sub(standard, name)
+    name = _ADVANCED_SUFFIX_PATTERN.sub('', name)
+    name = _WHITESPACE_PATTERN.sub(' ', name)
+    return name.strip()
+
+
+def facility_name_stem(name: str) -> str:
+    """
+    Reduce a facility name to its distinguishing stem.
+
+    Punctuation is removed and everything from the first facility-type
+    designation (JAIL, SHERIFF'S OFFICE, PROCESSING CENTER, ...) onward is
+    dropped.
+
+    Args:
+        name: Facility name
+
+    Returns:
+        Normalized facility name
+    """
+    name = name.upper()
+    name = _PUNCTUATION_PATTERN.sub(' ', name)
+    name = name.replace('_', ' ')
+    name = _DESIGNATION_PATTERN.sub('', name)
+    name = _LEADING_THE_PATTERN.sub('', name)
+    return _WHITESPACE_PATTERN.sub(' ', name).strip()
+
+
+def extract_location_from_address(address: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Extract city and state from a "City, State ZIP" address string."""
+    if not address:
+        return None, None
+
+    parts = [part.strip() for part in address.split(',')]
+    if len(parts) >= 2:
+        city = parts[0]
+        state_zip = parts[1]
+        state = state_zip[:2] if len(state_zip) >= 2 else None
+        return city, state
+
+    return None, None
+
+
+def extract_county_and_state(name: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract county name and state from a facility name.
+
+    Args:
+        name: Facility name
+
+    Returns:
+        Tuple of (county_name, state) or (None, None)
+    """
+    county_match = _COUNTY_PATTERN.search(name.upper())
+    county_name = county_match.group(1) if county_match else None
+
+    # State from the end of the name (after comma) or from parentheses
+    state_match = _TRAILING_STATE_PATTERN.search(name) or _PAREN_STATE_PATTERN.search(name)
+    state = state_match.group(1) if state_match else None
+
+    return county_name, state
+
+
+def _field(record: Any, key: str, default: Any = None) -> Any:
+    """Read a field from a dict record or a model object."""
+    if isinstance(record, dict):
+        return record.get(key, default)
+    return getattr(record, key, default)
+
+
+def _state_tokens(tokens: Set[str]) -> Set[str]:
+    """Two-letter alphabetic tokens, treated as state abbreviations."""
+    return {token for token in tokens if len(token) == 2 and token.isalpha()}
+
+
+class _SubstringIndex:
+    """Ordered keys searchable by substring in either direction.
+
+    ``containing`` scans one joined string with ``str.find`` rather than
+    looping over keys in Python; ``first_within`` hashes the query's
+    substrings of every indexed key length.
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, match_empty: bool = True):
+        self.keys: List[str] = []
+        self.first_index: Dict[str, int] = {}
+        self.lengths: Set[int] = set()
+        self.match_empty = match_empty
+        self._haystack: Optional[str] = None
+        self._starts: List[int] = []
+
+    def add(self, key: str):
+        """Append the key for the next facility index."""
+        index = len(self.keys)
+        self.keys.append(key)
+        if key or self.match_empty:
+            self.first_index.setdefault(key, index)
+            self.lengths.add(len(key))
+        self._haystack = None
+
+    def _build(self):
+        starts = []
+        position = 0
+        for key in self.keys:
+            starts.append(position)
+            position += len(key) + 1
+        self._starts = starts
+        self._haystack = self.SEPARATOR.join(self.keys)
+
+    def containing(self, needle: str) -> Iterator[int]:
+        """Indices, in order, of keys that contain ``needle``."""
+        if not needle:
+            yield from range(len(self.keys))
+            return
+        if self.SEPARATOR in needle:
+            yield from (i for i, key in enumerate(self.keys) if needle in key)
+            return
+
+        if self._haystack is None:
+            self._build()
+        position = self._haystack.find(needle)
+        while position != -1:
+            index = bisect_right(self._starts, position) - 1
+            yield index
+            if index + 1 >= len(self._starts):
+                return
+            position = self._haystack.find(needle, self._starts[index + 1])
+
+    def first_containing(self, needle: str) -> Optional[int]:
+        """Smallest index of a key that contains ``needle``."""
+        return next(self.containing(needle), None)
+
+    def first_within(self, needle: str) -> Optional[int]:
+        """Smallest index of a key that is a substring of ``needle``."""
+        best = None
+        size = len(needle)
+        for length in self.lengths:
+            for start in range(size - length + 1):
+                index = self.first_index.get(needle[start:start + length])
+                if index is not None and (best is None or index < best):
+                    best = index
+        return best
+
+
+@dataclass
+class FacilityKeys:
+    """Matching keys computed once for a database facility."""
+    normalized: str
+    advanced: str
+    core: str
+    core_tokens: Set[str]
+    locations: List[Tuple[str, str]]
+    name_upper: str
+    exact: str
+    stem: str
+    stem_tokens: Set[str]
+    stem_states: Set[str]
+    county: Optional[str]
+    name_state: Optional[str]
+
+
+def _first(*indexes: Optional[int]) -> Optional[int]:
+    found = [index for index in indexes if index is not None]
+    return min(found) if found else None
+
+
+class FacilityMatcher:
+    """
+    Matches TRAC facility records against a fixed list of database facilities.
+
+    Facilities may be dicts (``name``/``city``/``state``/``address`` keys) or
+    model objects such as :class:`Facility`. Every strategy returns the first
+    facility, in list order, that the equivalent linear scan would return.
+    Facilities can be added incrementally; location matches are memoized
+    because the historical ingest sees the same TRAC facility every month.
+    """
+
+    def __init__(self, facilities: Iterable[Any] = ()):
+        """
+        Initialize the matcher.
+
+        Args:
+            facilities: Database facilities, in match-preference order
+        """
+        self.facilities: List[Any] = []
+        self.keys: List[FacilityKeys] = []
+        self._by_normalized: Dict[str, int] = {}
+        self._by_advanced: Dict[str, int] = {}
+        self._advanced_substrings = _SubstringIndex(match_empty=True)
+        self._by_location: Dict[Tuple[str, str], int] = {}
+        self._core_substrings = _SubstringIndex(match_empty=False)
+        self._core_token_index: Dict[str, List[int]] = {}
+        self._by_exact: Dict[str, int] = {}
+        self._by_stem: Dict[str, List[int]] = {}
+        self._by_county: Dict[str, List[int]] = {}
+        self._name_substrings = _SubstringIndex(match_empty=True)
+        self._stem_token_index: Dict[str, List[int]] = {}
+        self._names_containing_cache: Dict[str, Tuple[int, ...]] = {}
+        self._location_cache: Dict[Tuple[str, Optional[str], Optional[str]], Optional[int]] = {}
+        self.extend(facilities)
+
+    def __len__(self) -> int:
+        return len(self.facilities)
+
+    def extend(self, facilities: Iterable[Any]):
+        """Index additional database facilities."""
+        for facility in facilities:
+            self.add(facility)
+
+    def add(self, facility: Any):
+        """Index one database facility."""
+        index = len(self.facilities)
+        name = _field(facility, 'name') or ''
+        keys = self._compute_keys(facility, name)
+        self.facilities.append(facility)
+        self.keys.append(keys)
+
+        self._by_normalized.setdefault(keys.normalized, index)
+        self._by_advanced.setdefault(keys.advanced, index)
+        self._advanced_substrings.add(keys.advanced)
+        for location in keys.locations:
+            self._by_location.setdefault(location, index)
+        self._core_substrings.add(keys.core)
+        for token in keys.core_tokens:
+            self._core_token_index.setdefault(token, []).append(index)
+
+        self._by_exact.setdefault(keys.exact, index)
+        self._by_stem.setdefault(keys.stem, []).append(index)
+        if keys.county:
+            self._by_county.setdefault(keys.county, []).append(index)
+        self._name_substrings.add(keys.name_upper)
+        for token in keys.stem_tokens:
+            self._stem_token_index.setdefault(token, []).append(index)
+
+        # A new facility can become the answer for cached queries
+        self._names_containing_cache.clear()
+        self._location_cache.clear()
+
+    @staticmethod
+    def _compute_keys(facility: Any, name: str) -> FacilityKeys:
+        advanced = normalize_facility_name_advanced(name)
+        core = _CORE_STOPWORDS_PATTERN.sub('', advanced).strip()
+
+        locations = []
+        city, state = _field(facility, 'city', ''), _field(facility, 'state', '')
+        if city is not None and state is not None:
+            locations.append((state, city.upper()))
+        address_city, address_state = extract_location_from_address(_field(facility, 'address'))
+        if address_city and address_state:
+            locations.append((address_state, address_city.upper()))
+
+        stem = facility_name_stem(name.upper().strip())
+        stem_tokens = set(stem.split())
+        county, name_state = extract_county_and_state(name)
+
+        return FacilityKeys(
+            normalized=normalize_facility_name(name),
+            advanced=advanced,
+            core=core,
+            core_tokens=set(core.split()),
+            locations=locations,
+            name_upper=name.upper(),
+            exact=name.upper().strip(),
+            stem=stem,
+            stem_tokens=stem_tokens,
+            stem_states=_state_tokens(stem_tokens),
+            county=county,
+            name_state=name_state
+        )
+
+    # Name and location strategies (historical ingest)
+
+    def match_with_location(self, name: str, city: Optional[str] = None,
+                            state: Optional[str] = None) -> Optional[Any]:
+        """
+        Match a TRAC record by name, falling back to its city and state.
+
+        Strategies, in order: normalized name, advanced normalization,
+        partial advanced name, city/state, core-name fuzzy match.
+
+        Args:
+            name: TRAC facility name
+            city: TRAC facility city
+            state: TRAC facility state
+
+        Returns:
+            Matching facility or None
+        """
+        cache_key = (name, city, state)
+        if cache_key not in self._location_cache:
+            self._location_cache[cache_key] = self._match_with_location(name, city, state)
+        index = self._location_cache[cache_key]
+        return self.facilities[index] if index is not None else None
+
+    def _match_with_location(self, name: str, city: Optional[str],
+                             state: Optional[str]) -> Optional[int]:
+        if not self.facilities:
+            return None
+
+        # Strategy 1: exact normalized name
+        index = self._by_normalized.get(normalize_facility_name(name))
+        if index is not None:
+            return index
+
+        # Strategy 2: advanced normalization
+        advanced = normalize_facility_name_advanced(name)
+        index = self._by_advanced.get(advanced)
+        if index is not None:
+            return index
+
+        # Strategy 3: partial advanced name in either direction
+        index = _first(self._advanced_substrings.first_containing(advanced),
+                       self._advanced_substrings.first_within(advanced))
+        if index is not None:
+            return index
+
+        # Strategy 4: city and state, direct or parsed from the address
+        index = self._by_location.get((state, (city or '').upper()))
+        if index is not None:
+            return index
+
+        # Strategy 5: core names overlap, or share at least two tokens
+        core = _CORE_STOPWORDS_PATTERN.sub('', advanced).strip()
+        if not core:
+            return None
+        shared = Counter()
+        for token in set(core.split()):
+            shared.update(self._core_token_index.get(token, ()))
+        return _first(self._core_substrings.first_containing(core),
+                      self._core_substrings.first_within(core),
+                      min((i for i, count in shared.items() if count >= 2), default=None))
+
+    # Name-only strategies (population updates and mapping candidates)
+
+    def find_match(self, name: str, threshold: float = 0.4) -> Optional[Any]:
+        """
+        Find the best matching facility for a TRAC facility name.
+
+        Args:
+            name: TRAC facility name
+            threshold: Minimum token similarity for the fuzzy strategy
+
+        Returns:
+            Matching facility or None
+        """
+        index = next(self._name_matches(name, threshold), None)
+        return self.facilities[index] if index is not None else None
+
+    def find_candidates(self, name: str, max_candidates: int = 5,
+                        threshold: float = 0.3) -> List[Any]:
+        """
+        Find candidate facilities for a name, strongest strategies first.
+
+        Args:
+            name: Facility name to match
+            max_candidates: Maximum number of candidates to return
+            threshold: Minimum token similarity for the fuzzy strategy
+
+        Returns:
+            List of candidate facilities
+        """
+        return [self.facilities[i] for i in islice(self._name_matches(name, threshold), max_candidates)]
+
+    def _names_containing(self, token: str) -> Tuple[int, ...]:
+        if token not in self._names_containing_cache:
+            self._names_containing_cache[token] = tuple(self._name_substrings.containing(token))
+        return self._names_containing_cache[token]
+
+    def _name_matches(self, name: str, threshold: float) -> Iterator[int]:
+        """Facility indexes in the order the name strategies find them."""
+        trac_name = name.upper().strip()
+
+        # Exact match wins outright
+        index = self._by_exact.get(trac_name)
+        if index is not None:
+            yield index
+            return
+
+        # Normalized name match
+        stem = facility_name_stem(trac_name)
+        yield from self._by_stem.get(stem, ())
+
+        # County-based matching, checking state where either side has one
+        trac_county, trac_state = extract_county_and_state(trac_name)
+        if trac_county:
+            for index in self._by_county.get(trac_county, ()):
+                keys = self.keys[index]
+                if trac_state and keys.name_state:
+                    if trac_state == keys.name_state:
+                        yield index
+                elif trac_state or keys.name_state:
+                    if trac_state and trac_state in keys.name_upper:
+                        yield index
+                    elif keys.name_state and keys.name_state in trac_name:
+                        yield index
+                else:
+                    yield index
+
+        # Partial token matching: at least 2 tokens and half of the TRAC
+        # tokens appear in the facility name
+        trac_tokens = set(stem.split())
+        if not trac_tokens:
+            return
+        contained = Counter()
+        for token in trac_tokens:
+            contained.update(self._names_containing(token))
+        yield from sorted(
+            i for i, count in contained.items()
+            if count >= 2 and count / len(trac_tokens) >= 0.5
+        )
+
+        # Fuzzy token similarity over facilities sharing at least one token
+        candidates = set()
+        for token in trac_tokens:
+            candidates.update(self._stem_token_index.get(token, ()))
+        trac_states = _state_tokens(trac_tokens)
+        for index in sorted(candidates):
+            keys = self.keys[index]
+            similarity_score = len(trac_tokens & keys.stem_tokens) / len(trac_tokens | keys.stem_tokens)
+            if 'COUNTY' in trac_tokens and 'COUNTY' in keys.stem_tokens:
+                similarity_score *= 1.5
+            if trac_states and keys.stem_states and trac_states & keys.stem_states:
+                similarity_score *= 1.2
+            if similarity_score > threshold:
+                yield index
@@ -0,0 +1,499 @@
+"""
+Shared geocoding for facility ingest.
+Addresses are normalized and looked up in a persistent SQLite cache first;
+only misses are sent to a geocoding backend, through one throttled async
+worker. Backends are pluggable, including an offline gazetteer so tests and
+air-gapped rebuilds run without network access.
+"""
+import asyncio
+import csv
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from ..utils.rate_limiter import RateLimiter
+
+
+Coordinates = Tuple[float, float]
+
+# Ingest scripts store unknown locations as (0.0, 0.0)
+NOT_FOUND: Coordinates = (0.0, 0.0)
+
+USER_AGENT = "ICE Locator MCP/1.0 (trose@example.com)"  # Required by Nominatim ToS
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+BUNDLED_GAZETTEER = PROJECT_ROOT / "web-app" / "src" / "data" / "facilities.json"
+
+_NON_ADDRESS_CHARS = re.compile(r"[^a-z0-9,#]+")
+_COUNTRY_NAMES = {"usa", "us", "united states", "united states of america"}
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address into a cache key.
+
+    Accents, case, punctuation, repeated whitespace and a trailing country
+    are folded so trivially different spellings share one entry.
+
+    Args:
+        address: Free-form address or place name
+
+    Returns:
+        Normalized address key
+    """
+    text = unicodedata.normalize("NFKD", address).encode("ascii", "ignore").decode("ascii").lower()
+    text = _NON_ADDRESS_CHARS.sub(" ", text)
+    parts = [" ".join(part.split()) for part in text.split(",")]
+    parts = [part for part in parts if part]
+    while parts and parts[-1] in _COUNTRY_NAMES:
+        parts.pop()
+    return ", ".join(parts)
+
+
+def default_cache_path() -> Path:
+    """Location of the shared geocoding cache database."""
+    cache_dir = os.getenv("ICE_LOCATOR_CACHE_DIR")
+    base = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "ice-locator-mcp"
+    return base / "geocode.sqlite"
+
+
+class GeocodingCache:
+    """Persistent normalized-address to coordinates cache.
+
+    Addresses a backend could not find are cached as well, so they are not
+    re-queried on every ingest. Transient failures are never cached.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: SQLite file path, ``:memory:``, or None for the default
+        """
+        path = str(path or default_cache_path())
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    address_key TEXT PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    latitude REAL,
+                    longitude REAL,
+                    provider TEXT,
+                    geocoded_at REAL NOT NULL
+                )
+            """)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+
+    def get_many(self, keys: Iterable[str], chunk_size: int = 500) -> Dict[str, Coordinates]:
+        """
+        Look up normalized address keys.
+
+        Args:
+            keys: Keys from :func:`normalize_address`
+            chunk_size: Keys per SELECT statement
+
+        Returns:
+            Mapping of each cached key to its coordinates (NOT_FOUND for
+            addresses known to have no result)
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            rows = self.connection.execute(
+                f"SELECT address_key, latitude, longitude FROM geocode_cache "
+                f"WHERE address_key IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            for key, latitude, longitude in rows:
+                found[key] = (latitude, longitude) if latitude is not None else NOT_FOUND
+        return found
+
+    def get(self, address: str) -> Optional[Coordinates]:
+        """Cached coordinates for an address, or None on a cache miss."""
+        key = normalize_address(address)
+        return self.get_many([key]).get(key)
+
+    def put_many(self, results: Iterable[Tuple[str, Optional[Coordinates], str]]):
+        """
+        Store geocoding results in one transaction.
+
+        Args:
+            results: (address, coordinates or None if not found, provider) tuples
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.executemany("""
+                INSERT INTO geocode_cache (address_key, address, latitude, longitude, provider, geocoded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(address_key) DO UPDATE SET
+                    address = excluded.address,
+                    latitude = excluded.latitude,
+                    longitude = excluded.longitude,
+                    provider = excluded.provider,
+                    geocoded_at = excluded.geocoded_at
+            """, [
+                (normalize_address(address), address,
+                 coordinates[0] if coordinates else None,
+                 coordinates[1] if coordinates else None,
+                 provider, now)
+                for address, coordinates, provider in results
+            ])
+
+    def put(self, address: str, coordinates: Optional[Coordinates], provider: str):
+        """Store one geocoding result."""
+        self.put_many([(address, coordinates, provider)])
+
+    def close(self):
+        """Close the cache database."""
+        self.connection.close()
+
+
+class GeocoderUnavailable(Exception):
+    """Transient geocoding failure (timeout, network or service error)."""
+
+
+class GeocoderBackend:
+    """Base class for geocoding services.
+
+    ``requests_per_minute`` is the service's rate limit; None means the
+    backend is local and needs no throttling.
+    """
+
+    name = "base"
+    requests_per_minute: Optional[int] = None
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        """
+        Geocode an address (blocking).
+
+        Args:
+            address: Address to geocode
+
+        Returns:
+            (latitude, longitude) or None if not found
+
+        Raises:
+            GeocoderUnavailable: On transient failures worth retrying
+        """
+        raise NotImplementedError
+
+
+class NominatimBackend(GeocoderBackend):
+    """OpenStreetMap Nominatim (no API key, at most one request per second)."""
+
+    name = "nominatim"
+    requests_per_minute = 60
+
+    def __init__(self, user_agent: str = USER_AGENT, timeout: float = 10.0):
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent})
+        self.timeout = timeout
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        try:
+            response = self.session.get(
+                "https://nominatim.openstreetmap.org/search",
+                params={'q': address, 'format': 'json', 'limit': 1},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            results = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise GeocoderUnavailable(str(e)) from e
+
+        if results:
+            return (float(results[0]['lat']), float(results[0]['lon']))
+        return None
+
+
+class GoogleBackend(GeocoderBackend):
+    """Google Maps Geocoding API."""
+
+    name = "google"
+    requests_per_minute = 600
+
+    def __init__(self, api_key: str, timeout: float = 10.0):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        try:
+            response = requests.get(
+                "https://maps.googleapis.com/maps/api/geocode/json",
+                params={'address': address, 'key': self.api_key},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise GeocoderUnavailable(str(e)) from e
+
+        if result.get('status') == 'OK' and result.get('results'):
+            location = result['results'][0]['geometry']['location']
+            return (location['lat'], location['lng'])
+        if result.get('status') in ('OVER_QUERY_LIMIT', 'UNKNOWN_ERROR'):
+            raise GeocoderUnavailable(result['status'])
+        return None
+
+
+class FallbackBackend(GeocoderBackend):
+    """Tries backends in order until one finds the address."""
+
+    def __init__(self, backends: List[GeocoderBackend]):
+        self.backends = backends
+        self.name = "+".join(backend.name for backend in backends)
+        limits = [b.requests_per_minute for b in backends if b.requests_per_minute]
+        self.requests_per_minute = min(limits) if limits else None
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        unavailable = None
+        for backend in self.backends:
+            try:
+                coordinates = backend.geocode(address)
+            except GeocoderUnavailable as e:
+                unavailable = e
+                continue
+            if coordinates:
+                return coordinates
+        if unavailable:
+            raise unavailable
+        return None
+
+
+class GazetteerBackend(GeocoderBackend):
+    """Offline lookup in a local table of known places.
+
+    An address that is not listed is retried without its leading
+    components ("Agency, Dade County, FL" -> "dade county, fl" -> "fl").
+    """
+
+    name = "gazetteer"
+
+    def __init__(self, entries: Optional[Dict[str, Coordinates]] = None):
+        self.entries: Dict[str, Coordinates] = {}
+        for address, coordinates in (entries or {}).items():
+            self.add(address, coordinates)
+
+    def add(self, address: str, coordinates: Coordinates):
+        """Add a place to the gazetteer."""
+        key = normalize_address(address)
+        if key and coordinates and coordinates != NOT_FOUND:
+            self.entries.setdefault(key, (float(coordinates[0]), float(coordinates[1])))
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        parts = normalize_address(address).split(", ")
+        for start in range(len(parts)):
+            coordinates = self.entries.get(", ".join(parts[start:]))
+            if coordinates:
+                return coordinates
+        return None
+
+    @classmethod
+    def from_facilities_json(cls, path: Path = BUNDLED_GAZETTEER) -> "GazetteerBackend":
+        """Build a gazetteer from a facilities JSON file (names and addresses)."""
+        gazetteer = cls()
+        if not Path(path).exists():
+            return gazetteer
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for facility in data.get('facilities', []) if isinstance(data, dict) else data:
+            coordinates = (facility.get('latitude'), facility.get('longitude'))
+            if None in coordinates:
+                continue
+            for field in ('name', 'address'):
+                if facility.get(field):
+                    gazetteer.add(facility[field], coordinates)
+        return gazetteer
+
+    @classmethod
+    def from_csv(cls, path: Path, address_field: str = 'address',
+                 latitude_field: str = 'latitude', longitude_field: str = 'longitude') -> "GazetteerBackend":
+        """Build a gazetteer from a CSV file with address and coordinate columns."""
+        gazetteer = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    coordinates = (float(row[latitude_field]), float(row[longitude_field]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if row.get(address_field):
+                    gazetteer.add(row[address_field], coordinates)
+        return gazetteer
+
+
+def create_backend(name: Optional[str] = None, google_api_key: Optional[str] = None) -> GeocoderBackend:
+    """
+    Create the configured geocoding backend.
+
+    Args:
+        name: ``nominatim``, ``google`` or ``offline``; defaults to the
+            ``ICE_LOCATOR_GEOCODER`` environment variable, then ``nominatim``
+        google_api_key: Google Maps API key; defaults to ``GOOGLE_API_KEY``
+
+    Returns:
+        Geocoding backend
+    """
+    name = (name or os.getenv("ICE_LOCATOR_GEOCODER") or "nominatim").lower()
+    google_api_key = google_api_key or os.getenv("GOOGLE_API_KEY")
+
+    if name in ("offline", "gazetteer"):
+        path = Path(os.getenv("ICE_LOCATOR_GAZETTEER") or BUNDLED_GAZETTEER)
+        if path.suffix == ".csv":
+            return GazetteerBackend.from_csv(path)
+        return GazetteerBackend.from_facilities_json(path)
+    if name == "google":
+        if not google_api_key:
+            raise ValueError("Google geocoder requires GOOGLE_API_KEY")
+        return GoogleBackend(google_api_key)
+    if name == "nominatim":
+        if google_api_key:
+            return FallbackBackend([NominatimBackend(), GoogleBackend(google_api_key)])
+        return NominatimBackend()
+    raise ValueError(f"Unknown geocoder: {name}")
+
+
+class BatchGeocoder:
+    """Cache-first batch geocoding through one throttled worker.
+
+    Every batch is resolved from the cache first. Misses are deduplicated
+    by normalized address and queued to a single worker that paces calls
+    with the backend's rate limit, so concurrent batches share one polite
+    request stream. Results are cached as they arrive, which lets an
+    interrupted ingest resume where it stopped.
+    """
+
+    def __init__(self, backend: Optional[GeocoderBackend] = None,
+                 cache: Optional[GeocodingCache] = None, max_retries: int = 3):
+        """
+        Initialize the geocoder.
+
+        Args:
+            backend: Geocoding backend; defaults to :func:`create_backend`
+            cache: Geocoding cache; defaults to the shared cache file
+            max_retries: Attempts per address on transient failures
+        """
+        self.backend = backend or create_backend()
+        self.cache = cache if cache is not None else GeocodingCache()
+        self.max_retries = max_retries
+        rpm = self.backend.requests_per_minute
+        self.rate_limiter = RateLimiter(requests_per_minute=rpm, burst_allowance=1) if rpm else None
+        self.stats = {"cached": 0, "geocoded": 0, "not_found": 0, "failed": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def geocode_many(self, addresses: Iterable[str]) -> Dict[str, Coordinates]:
+        """
+        Geocode addresses, hitting the backend only for cache misses.
+
+        Args:
+            addresses: Addresses to geocode
+
+        Returns:
+            Mapping of each address to (latitude, longitude), NOT_FOUND if unknown
+        """
+        addresses = list(addresses)
+        keys = {address: normalize_address(address) for address in addresses}
+        results = self.cache.get_many(keys.values())
+        self.stats["cached"] += sum(1 for address in addresses if keys[address] in results)
+
+        misses = {}
+        for address in addresses:
+            key = keys[address]
+            if key not in results and key not in misses:
+                misses[key] = self._submit(key, address)
+
+        for key, future in misses.items():
+            results[key] = await future
+
+        return {address: results[keys[address]] for address in addresses}
+
+    async def geocode(self, address: str) -> Coordinates:
+        """Geocode one address (cache first)."""
+        return (await self.geocode_many([address]))[address]
+
+    def geocode_many_sync(self, addresses: Iterable[str]) -> Dict[str, Coordinates]:
+        """Blocking :meth:`geocode_many` for ingest scripts."""
+        async def run():
+            try:
+                return await self.geocode_many(addresses)
+            finally:
+                await self.aclose()
+        return asyncio.run(run())
+
+    def _submit(self, key: str, address: str) -> asyncio.Future:
+        """Queue a miss, sharing the future with identical in-flight requests."""
+        if key in self._pending:
+            return self._pending[key]
+
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run_worker())
+
+        future = loop.create_future()
+        self._pending[key] = future
+        self._queue.put_nowait((key, address, future))
+        return future
+
+    async def _run_worker(self):
+        while True:
+            key, address, future = await self._queue.get()
+            try:
+                coordinates = await self._geocode_remote(address)
+                if not future.done():
+                    future.set_result(coordinates)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._pending.pop(key, None)
+                self._queue.task_done()
+
+    async def _geocode_remote(self, address: str) -> Coordinates:
+        for attempt in range(self.max_retries):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            try:
+                coordinates = await asyncio.to_thread(self.backend.geocode, address)
+            except GeocoderUnavailable as e:
+                if self.rate_limiter:
+                    await self.rate_limiter.mark_error("geocoder_unavailable")
+                print(f"Geocoding attempt {attempt + 1} failed for {address}: {e}")
+                continue
+
+            self.cache.put(address, coordinates, self.backend.name)
+            self.stats["geocoded" if coordinates else "not_found"] += 1
+            return coordinates or NOT_FOUND
+
+        # Not cached, so the next ingest retries it
+        self.stats["failed"] += 1
+        return NOT_FOUND
+
+    async def aclose(self):
+        """Stop the worker task."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
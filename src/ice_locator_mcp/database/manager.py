@@ -2,11 +2,13 @@
 Database manager for the heatmap feature.
 Handles PostgreSQL database operations for detainees, facilities, and location history.
 """
+import itertools
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import List, Optional
+from psycopg2.extras import RealDictCursor, execute_values
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 from .models import Detainee, Facility, DetaineeLocationHistory
+from .occupancy_snapshots import EPOCH, parse_as_of, sweep_daily_counts
 
 
 class DatabaseManager:
@@ -21,11 +23,14 @@ class DatabaseManager:
         """
         self.database_url = database_url
         self.connection = None
+        self._occupancy_ready = False
+        self._cursor_ids = itertools.count()
     
     def connect(self):
         """Establish a connection to the database."""
         try:
             self.connection = psycopg2.connect(self.database_url, cursor_factory=RealDictCursor)
+            self._occupancy_ready = False
         except Exception as e:
             print(f"Error connecting to database: {e}")
             raise
@@ -100,6 +105,283 @@ class DatabaseManager:
         
         self.connection.commit()
         cursor.close()
+        self.create_occupancy_table()
+        self.create_snapshot_tables()
+    
+    def create_occupancy_table(self):
+        """
+        Create the facility_current_occupancy table and the trigger that keeps it exact.
+        
+        The table holds the number of open location history records
+        (end_date IS NULL) per facility. A row-level trigger on
+        detainee_location_history adjusts it on every insert, delete and
+        change of facility or end date, so current counts are read without
+        scanning the history. Partial indexes cover the open records.
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS facility_current_occupancy (
+                    facility_id INTEGER PRIMARY KEY REFERENCES facilities (id),
+                    detainee_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Partial indexes on open intervals
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_open_facility 
+                ON detainee_location_history (facility_id) WHERE end_date IS NULL
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_open_detainee 
+                ON detainee_location_history (detainee_id) WHERE end_date IS NULL
+            """)
+            
+            cursor.execute("""
+                CREATE OR REPLACE FUNCTION update_facility_current_occupancy() RETURNS TRIGGER AS $$
+                BEGIN
+                    IF TG_OP <> 'INSERT' THEN
+                        IF OLD.end_date IS NULL THEN
+                            UPDATE facility_current_occupancy
+                            SET detainee_count = detainee_count - 1, updated_at = CURRENT_TIMESTAMP
+                            WHERE facility_id = OLD.facility_id;
+                        END IF;
+                    END IF;
+                    IF TG_OP <> 'DELETE' THEN
+                        IF NEW.end_date IS NULL THEN
+                            INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+                            VALUES (NEW.facility_id, 1)
+                            ON CONFLICT (facility_id) DO UPDATE SET
+                                detainee_count = facility_current_occupancy.detainee_count + 1,
+                                updated_at = CURRENT_TIMESTAMP;
+                        END IF;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute("""
+                DROP TRIGGER IF EXISTS trg_detainee_location_occupancy ON detainee_location_history
+            """)
+            cursor.execute("""
+                CREATE TRIGGER trg_detainee_location_occupancy
+                AFTER INSERT OR DELETE OR UPDATE OF facility_id, end_date ON detainee_location_history
+                FOR EACH ROW EXECUTE FUNCTION update_facility_current_occupancy()
+            """)
+            
+            # History written before the trigger existed is counted once here
+            self._rebuild_occupancy(cursor)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def rebuild_occupancy(self) -> int:
+        """
+        Recount facility_current_occupancy from the open location history records.
+        
+        Returns:
+            Number of facilities with current detainees
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        cursor = self.connection.cursor()
+        try:
+            count = self._rebuild_occupancy(cursor)
+            self.connection.commit()
+            return count
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def create_snapshot_tables(self):
+        """
+        Create the facility_daily_occupancy snapshot table and its bookkeeping.
+        
+        facility_daily_occupancy holds each facility's detainee count at the
+        end of every day on which it changed. occupancy_snapshot_state records
+        the earliest day that writes to detainee_location_history have
+        invalidated; a trigger moves it back and refresh_daily_snapshots()
+        re-sweeps from there.
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS facility_daily_occupancy (
+                    facility_id INTEGER NOT NULL,
+                    snapshot_date DATE NOT NULL,
+                    detainee_count INTEGER NOT NULL,
+                    PRIMARY KEY (facility_id, snapshot_date)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS occupancy_snapshot_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    dirty_from DATE,
+                    built_at TIMESTAMP
+                )
+            """)
+            
+            # Event scans from the first invalidated day
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_start_date 
+                ON detainee_location_history (start_date)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_end_date 
+                ON detainee_location_history (end_date) WHERE end_date IS NOT NULL
+            """)
+            
+            # A record only affects counts from its start day on
+            cursor.execute("""
+                CREATE OR REPLACE FUNCTION mark_occupancy_snapshots_dirty() RETURNS TRIGGER AS $$
+                DECLARE
+                    day DATE;
+                BEGIN
+                    IF TG_OP <> 'INSERT' THEN
+                        day := OLD.start_date::date;
+                    END IF;
+                    IF TG_OP <> 'DELETE' THEN
+                        day := LEAST(day, NEW.start_date::date);
+                    END IF;
+                    UPDATE occupancy_snapshot_state SET dirty_from = LEAST(dirty_from, day);
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute("""
+                DROP TRIGGER IF EXISTS trg_detainee_location_snapshots ON detainee_location_history
+            """)
+            cursor.execute("""
+                CREATE TRIGGER trg_detainee_location_snapshots
+                AFTER INSERT OR DELETE OR UPDATE OF facility_id, start_date, end_date ON detainee_location_history
+                FOR EACH ROW EXECUTE FUNCTION mark_occupancy_snapshots_dirty()
+            """)
+            self.connection.commit()
+            self._occupancy_ready = True
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def refresh_daily_snapshots(self) -> int:
+        """
+        Bring facility_daily_occupancy up to date with the location history.
+        
+        Snapshots before the first invalidated day are kept as the starting
+        counts; the interval start and end events from that day on are swept
+        in date order and the changed days written back. Without a state row
+        the snapshots are built from the whole history.
+        
+        Returns:
+            Number of snapshot rows written
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        self._ensure_occupancy()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT dirty_from FROM occupancy_snapshot_state WHERE id = 1")
+            state = cursor.fetchone()
+            if state and state['dirty_from'] is None:
+                self.connection.rollback()
+                return 0
+            
+            # Lock out concurrent history writes so no invalidation is lost
+            cursor.execute("LOCK TABLE detainee_location_history IN SHARE MODE")
+            cursor.execute("SELECT dirty_from FROM occupancy_snapshot_state WHERE id = 1 FOR UPDATE")
+            state = cursor.fetchone()
+            start = state['dirty_from'] if state else EPOCH
+            
+            cursor.execute("""
+                SELECT DISTINCT ON (facility_id) facility_id, detainee_count
+                FROM facility_daily_occupancy
+                WHERE snapshot_date < %s
+                ORDER BY facility_id, snapshot_date DESC
+            """, (start,))
+            base = {row['facility_id']: row['detainee_count'] for row in cursor.fetchall()}
+            cursor.execute("DELETE FROM facility_daily_occupancy WHERE snapshot_date >= %s", (start,))
+            
+            # +1 on the start day, -1 on the end day; an end before the start counts as the start day
+            cursor.execute("""
+                SELECT day, facility_id, SUM(delta)::integer AS delta
+                FROM (
+                    SELECT start_date::date AS day, facility_id, 1 AS delta
+                    FROM detainee_location_history
+                    WHERE start_date >= %(start)s
+                    UNION ALL
+                    SELECT GREATEST(start_date::date, end_date::date), facility_id, -1
+                    FROM detainee_location_history
+                    WHERE end_date IS NOT NULL AND (end_date >= %(start)s OR start_date >= %(start)s)
+                ) events
+                WHERE day >= %(start)s
+                GROUP BY day, facility_id
+                ORDER BY day
+            """, {"start": start})
+            events = [(row['day'], row['facility_id'], row['delta']) for row in cursor.fetchall()]
+            rows = [(facility_id, day, count) for day, facility_id, count in sweep_daily_counts(base, events)]
+            execute_values(cursor, """
+                INSERT INTO facility_daily_occupancy (facility_id, snapshot_date, detainee_count)
+                VALUES %s
+            """, rows, page_size=1000)
+            
+            cursor.execute("""
+                INSERT INTO occupancy_snapshot_state (id, dirty_from, built_at)
+                VALUES (1, NULL, CURRENT_TIMESTAMP)
+                ON CONFLICT (id) DO UPDATE SET dirty_from = NULL, built_at = CURRENT_TIMESTAMP
+            """)
+            self.connection.commit()
+            return len(rows)
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def _ensure_occupancy(self):
+        """Create the occupancy tables on databases built before they existed."""
+        if self._occupancy_ready:
+            return
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT to_regclass('facility_current_occupancy') IS NOT NULL AS current,
+                   to_regclass('facility_daily_occupancy') IS NOT NULL AS daily
+        """)
+        present = cursor.fetchone()
+        cursor.close()
+        if not present['current']:
+            self.create_occupancy_table()
+        if present['daily']:
+            self._occupancy_ready = True
+        else:
+            self.create_snapshot_tables()
+    
+    def _rebuild_occupancy(self, cursor) -> int:
+        # Lock out concurrent history writes so no trigger update is lost
+        cursor.execute("LOCK TABLE detainee_location_history IN SHARE MODE")
+        cursor.execute("DELETE FROM facility_current_occupancy")
+        cursor.execute("""
+            INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+            SELECT facility_id, COUNT(*)
+            FROM detainee_location_history
+            WHERE end_date IS NULL
+            GROUP BY facility_id
+        """)
+        return cursor.rowcount
     
     def insert_detainee(self, detainee: Detainee) -> int:
         """
@@ -197,41 +479,164 @@ class DatabaseManager:
         self.connection.commit()
         cursor.close()
         
+        # The trigger marked the snapshots dirty from this record's start day
+        self.refresh_daily_snapshots()
         return history_id
     
-    def get_all_facilities(self) -> List[Facility]:
+    def insert_facilities(self, facilities: List[Facility], page_size: int = 500) -> List[int]:
         """
-        Retrieve all facilities from the database.
+        Insert many facilities in one transaction.
         
+        Args:
+            facilities: Facility objects to insert
+            page_size: Rows per multi-row INSERT statement
+            
         Returns:
-            List of Facility objects
+            IDs of the inserted facilities, in input order
         """
         if not self.connection:
             raise Exception("Database not connected")
         
+        now = datetime.now()
         cursor = self.connection.cursor()
-        cursor.execute("""
+        try:
+            rows = execute_values(cursor, """
+                INSERT INTO facilities (name, latitude, longitude, address, population_count, created_at, updated_at)
+                VALUES %s
+                RETURNING id
+            """, [
+                (
+                    facility.name,
+                    facility.latitude,
+                    facility.longitude,
+                    facility.address,
+                    facility.population_count,
+                    facility.created_at or now,
+                    facility.updated_at or now
+                )
+                for facility in facilities
+            ], page_size=page_size, fetch=True)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        return [row['id'] for row in rows]
+    
+    def insert_location_histories(self, location_histories: List[DetaineeLocationHistory],
+                                  page_size: int = 500) -> List[int]:
+        """
+        Insert many location history records in one transaction.
+        
+        Args:
+            location_histories: DetaineeLocationHistory objects to insert
+            page_size: Rows per multi-row INSERT statement
+            
+        Returns:
+            IDs of the inserted records, in input order
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        now = datetime.now()
+        cursor = self.connection.cursor()
+        try:
+            rows = execute_values(cursor, """
+                INSERT INTO detainee_location_history 
+                (detainee_id, facility_id, start_date, end_date, created_at)
+                VALUES %s
+                RETURNING id
+            """, [
+                (
+                    history.detainee_id,
+                    history.facility_id,
+                    history.start_date,
+                    history.end_date,
+                    history.created_at or now
+                )
+                for history in location_histories
+            ], page_size=page_size, fetch=True)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        self.refresh_daily_snapshots()
+        return [row['id'] for row in rows]
+    
+    def _iter_rows(self, query: str, params: tuple = (), batch_size: int = 500) -> Iterator[dict]:
+        """
+        Yield the rows of a query through a server-side (named) cursor.
+        
+        The server keeps the result set; each fetchmany pulls the next batch,
+        so only one batch is held in memory at a time.
+        
+        Args:
+            query: SQL query
+            params: Query parameters
+            batch_size: Rows per fetchmany call
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        cursor = self.connection.cursor(name=f"ice_locator_rows_{next(self._cursor_ids)}")
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def iter_facilities(self, batch_size: int = 500) -> Iterator[Facility]:
+        """
+        Iterate over all facilities without loading them all at once.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Facility objects ordered by name
+        """
+        for row in self._iter_rows("""
             SELECT id, name, latitude, longitude, address, population_count, created_at, updated_at
             FROM facilities
             ORDER BY name
-        """)
+        """, batch_size=batch_size):
+            yield Facility(**row)
+    
+    def get_all_facilities(self) -> List[Facility]:
+        """
+        Retrieve all facilities from the database.
         
-        facilities = []
-        for row in cursor.fetchall():
-            facility = Facility(
-                id=row['id'],
-                name=row['name'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                address=row['address'],
-                population_count=row['population_count'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            )
-            facilities.append(facility)
+        Returns:
+            List of Facility objects
+        """
+        return list(self.iter_facilities())
+    
+    def iter_detainees(self, batch_size: int = 500) -> Iterator[Detainee]:
+        """
+        Iterate over all detainees without loading them all at once.
         
-        cursor.close()
-        return facilities
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Detainee objects ordered by name
+        """
+        for row in self._iter_rows("""
+            SELECT id, first_name, last_name, created_at, updated_at
+            FROM detainees
+            ORDER BY last_name, first_name
+        """, batch_size=batch_size):
+            yield Detainee(**row)
     
     def get_all_detainees(self) -> List[Detainee]:
         """
@@ -240,62 +645,83 @@ class DatabaseManager:
         Returns:
             List of Detainee objects
         """
+        return list(self.iter_detainees())
+    
+    def iter_detainees_without_facility(self, batch_size: int = 500) -> Iterator[Detainee]:
+        """
+        Iterate over detainees that are not linked to any facility.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Detainee objects without facility links
+        """
+        for row in self._iter_rows("""
+            SELECT d.id, d.first_name, d.last_name, d.created_at, d.updated_at
+            FROM detainees d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM detainee_location_history dlh WHERE dlh.detainee_id = d.id
+            )
+            ORDER BY d.last_name, d.first_name
+        """, batch_size=batch_size):
+            yield Detainee(**row)
+    
+    def get_detainees_without_facility(self) -> List[Detainee]:
+        """
+        Retrieve detainees that are not linked to any facility.
+        
+        Returns:
+            List of Detainee objects without facility links
+        """
+        return list(self.iter_detainees_without_facility())
+    
+    def get_facility_by_id(self, facility_id: int) -> Optional[Facility]:
+        """
+        Retrieve one facility by ID.
+        
+        Args:
+            facility_id: ID of the facility
+            
+        Returns:
+            Facility object, or None if there is no such facility
+        """
         if not self.connection:
             raise Exception("Database not connected")
         
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT id, first_name, last_name, created_at, updated_at
-            FROM detainees
-            ORDER BY last_name, first_name
-        """)
-        
-        detainees = []
-        for row in cursor.fetchall():
-            detainee = Detainee(
-                id=row['id'],
-                first_name=row['first_name'],
-                last_name=row['last_name'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            )
-            detainees.append(detainee)
+            SELECT id, name, latitude, longitude, address, population_count, created_at, updated_at
+            FROM facilities
+            WHERE id = %s
+        """, (facility_id,))
         
+        row = cursor.fetchone()
         cursor.close()
-        return detainees
+        return Facility(**row) if row else None
     
-    def get_detainees_without_facility(self) -> List[Detainee]:
+    def get_current_detainee_count(self, facility_id: int) -> int:
         """
-        Retrieve detainees that are not linked to any facility.
+        Get the current detainee count of one facility.
         
+        Args:
+            facility_id: ID of the facility
+            
         Returns:
-            List of Detainee objects without facility links
+            Number of detainees currently at the facility
         """
         if not self.connection:
             raise Exception("Database not connected")
         
+        self._ensure_occupancy()
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT d.id, d.first_name, d.last_name, d.created_at, d.updated_at
-            FROM detainees d
-            LEFT JOIN detainee_location_history dlh ON d.id = dlh.detainee_id
-            WHERE dlh.detainee_id IS NULL
-            ORDER BY d.last_name, d.first_name
-        """)
-        
-        detainees = []
-        for row in cursor.fetchall():
-            detainee = Detainee(
-                id=row['id'],
-                first_name=row['first_name'],
-                last_name=row['last_name'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            )
-            detainees.append(detainee)
+            SELECT detainee_count FROM facility_current_occupancy WHERE facility_id = %s
+        """, (facility_id,))
         
+        row = cursor.fetchone()
         cursor.close()
-        return detainees
+        return row['detainee_count'] if row else 0
     
     def get_current_detainee_count_by_facility(self) -> List[dict]:
         """
@@ -307,13 +733,13 @@ class DatabaseManager:
         if not self.connection:
             raise Exception("Database not connected")
         
+        self._ensure_occupancy()
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT f.id as facility_id, f.name as facility_name, COUNT(dlh.id) as detainee_count
+            SELECT f.id as facility_id, f.name as facility_name,
+                   COALESCE(o.detainee_count, 0) as detainee_count
             FROM facilities f
-            LEFT JOIN detainee_location_history dlh ON f.id = dlh.facility_id 
-            AND dlh.end_date IS NULL
-            GROUP BY f.id, f.name
+            LEFT JOIN facility_current_occupancy o ON o.facility_id = f.id
             ORDER BY f.name
         """)
         
@@ -360,6 +786,90 @@ class DatabaseManager:
         cursor.close()
         return results
     
+    def get_detainee_count_by_facility_as_of(self, as_of: str) -> List[dict]:
+        """
+        Get the detainee count for each facility at the end of a given day.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of dictionaries with facility_id and detainee_count
+        """
+        return [
+            {
+                'facility_id': row['id'],
+                'facility_name': row['name'],
+                'detainee_count': row['detainee_count']
+            }
+            for row in self.get_heatmap_data_as_of(as_of)
+        ]
+    
+    def get_heatmap_data_as_of(self, as_of: str) -> List[dict]:
+        """
+        Get heatmap data with detainee counts at the end of a given day.
+        
+        Counts come from the latest daily snapshot on or before the date,
+        one index seek per facility. Reads never refresh the snapshots; when
+        writes since the last refresh_daily_snapshots() reach back to the date,
+        the counts are taken from the location history instead.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of dictionaries with facility coordinates, detainee_count and as_of
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        as_of = parse_as_of(as_of)
+        self._ensure_occupancy()
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT 1 FROM occupancy_snapshot_state WHERE id = 1 AND (dirty_from IS NULL OR dirty_from > %s)",
+            (as_of,)
+        )
+        if cursor.fetchone():
+            count = """
+                SELECT detainee_count
+                FROM facility_daily_occupancy
+                WHERE facility_id = f.id AND snapshot_date <= %(as_of)s
+                ORDER BY snapshot_date DESC
+                LIMIT 1
+            """
+        else:
+            # Same rule as the sweep: counted from the start day until the end day
+            count = """
+                SELECT COUNT(*) AS detainee_count
+                FROM detainee_location_history
+                WHERE facility_id = f.id AND start_date::date <= %(as_of)s
+                  AND (end_date IS NULL OR end_date::date > %(as_of)s)
+            """
+        cursor.execute(f"""
+            SELECT f.id, f.name, f.latitude, f.longitude, f.address, f.population_count,
+                   COALESCE(s.detainee_count, 0) AS detainee_count
+            FROM facilities f
+            LEFT JOIN LATERAL ({count}) s ON TRUE
+            ORDER BY f.name
+        """, {"as_of": as_of})
+        
+        results = []
+        for row in cursor.fetchall():
+            results.append({
+                'id': row['id'],
+                'name': row['name'],
+                'latitude': row['latitude'],
+                'longitude': row['longitude'],
+                'address': row['address'],
+                'population_count': row['population_count'],
+                'detainee_count': row['detainee_count'],
+                'as_of': as_of
+            })
+        
+        cursor.close()
+        return results
+    
     def get_facilities_without_coordinates(self) -> List[Facility]:
         """
         Retrieve facilities that have missing or invalid coordinates (0.0, 0.0).
@@ -425,3 +935,37 @@ class DatabaseManager:
             self.connection.rollback()
             cursor.close()
             return False
+    
+    def update_facility_populations(self, populations: Dict[int, int], page_size: int = 500) -> int:
+        """
+        Update population counts for many facilities in one transaction.
+        
+        Args:
+            populations: Mapping of facility ID to population count
+            page_size: Rows per multi-row UPDATE statement
+            
+        Returns:
+            Number of facilities updated, or 0 if the transaction failed
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        cursor = self.connection.cursor()
+        try:
+            updated = execute_values(cursor, """
+                UPDATE facilities AS f
+                SET population_count = v.population_count, updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(id, population_count)
+                WHERE f.id = v.id
+                RETURNING f.id
+            """, list(populations.items()), template="(%s::integer, %s::integer)",
+                page_size=page_size, fetch=True)
+            
+            self.connection.commit()
+            cursor.close()
+            return len(updated)
+        except Exception as e:
+            print(f"Error updating facility populations: {e}")
+            self.connection.rollback()
+            cursor.close()
+            return 0
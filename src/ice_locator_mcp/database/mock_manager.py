@@ -2,9 +2,10 @@
 Mock database manager for testing the heatmap feature without a real database.
 """
 
-from typing import List
+from typing import Iterator, List, Optional
 from datetime import datetime
 from .models import Detainee, Facility, DetaineeLocationHistory
+from .occupancy_snapshots import parse_as_of
 
 
 class MockDatabaseManager:
@@ -137,6 +138,36 @@ class MockDatabaseManager:
         """
         return self.facilities
     
+    def iter_facilities(self, batch_size: int = 500) -> Iterator[Facility]:
+        """
+        Iterate over the mock facilities.
+        
+        Returns:
+            Iterator of Facility objects
+        """
+        return iter(self.facilities)
+    
+    def get_facility_by_id(self, facility_id: int) -> Optional[Facility]:
+        """
+        Retrieve one mock facility by ID.
+        
+        Returns:
+            Facility object, or None if there is no such facility
+        """
+        return next((f for f in self.facilities if f.id == facility_id), None)
+    
+    def get_current_detainee_count(self, facility_id: int) -> int:
+        """
+        Get the current detainee count of one facility.
+        
+        Returns:
+            Number of open location history entries at the facility
+        """
+        return sum(
+            1 for history in self.location_history
+            if history.facility_id == facility_id and history.end_date is None
+        )
+    
     def get_current_detainee_count_by_facility(self) -> List[dict]:
         """
         Get current detainee count for each facility.
@@ -193,4 +224,56 @@ class MockDatabaseManager:
                 'current_detainee_count': detainee_count
             })
         
-        return results
\ No newline at end of file
+        return results
+    
+    def get_detainee_count_by_facility_as_of(self, as_of: str) -> List[dict]:
+        """
+        Get the detainee count for each facility at the end of a given day.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of dictionaries with facility_id and detainee_count
+        """
+        return [
+            {
+                'facility_id': row['id'],
+                'facility_name': row['name'],
+                'detainee_count': row['detainee_count']
+            }
+            for row in self.get_heatmap_data_as_of(as_of)
+        ]
+    
+    def get_heatmap_data_as_of(self, as_of: str) -> List[dict]:
+        """
+        Get heatmap data with detainee counts at the end of a given day.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of dictionaries with facility coordinates, detainee_count and as_of
+        """
+        as_of = parse_as_of(as_of)
+        counts = {facility.id: 0 for facility in self.facilities}
+        
+        # A record counts from its start day up to, not including, its end day
+        for history in self.location_history:
+            start = history.start_date.date().isoformat()
+            end = history.end_date.date().isoformat() if history.end_date else None
+            if start <= as_of and (end is None or as_of < end):
+                counts[history.facility_id] = counts.get(history.facility_id, 0) + 1
+        
+        return [
+            {
+                'id': facility.id,
+                'name': facility.name,
+                'latitude': facility.latitude,
+                'longitude': facility.longitude,
+                'address': facility.address,
+                'detainee_count': counts.get(facility.id, 0),
+                'as_of': as_of
+            }
+            for facility in self.facilities
+        ]
@@ -7,7 +7,32 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+def lazy_timestamps(*names: str):
+    """
+    Parse ISO timestamp strings in the given fields on first access.
+    
+    SQLite returns timestamps as text. Rows keep the text until a field is
+    read, so callers that only need ids and coordinates never parse dates.
+    An empty string reads as ``None``. Applied after ``@dataclass(slots=True)``; the slot itself stores the value.
+    """
+    def decorate(cls):
+        for name in names:
+            slot = getattr(cls, name)
+            
+            def get(self, slot=slot):
+                value = slot.__get__(self)
+                if isinstance(value, str):
+                    value = datetime.fromisoformat(value) if value else None
+                    slot.__set__(self, value)
+                return value
+            
+            setattr(cls, name, property(get, slot.__set__))
+        return cls
+    return decorate
+
+
+@lazy_timestamps("created_at", "updated_at")
+@dataclass(slots=True)
 class Detainee:
     """Represents a detainee in the system."""
     id: Optional[int]
@@ -17,7 +42,8 @@ class Detainee:
     updated_at: Optional[datetime]
 
 
-@dataclass
+@lazy_timestamps("created_at", "updated_at")
+@dataclass(slots=True)
 class Facility:
     """Represents a facility where detainees are held."""
     id: Optional[int]
@@ -30,7 +56,8 @@ class Facility:
     updated_at: Optional[datetime] = None
 
 
-@dataclass
+@lazy_timestamps("start_date", "end_date", "created_at")
+@dataclass(slots=True)
 class DetaineeLocationHistory:
     """Tracks detainee location changes over time."""
     id: Optional[int]
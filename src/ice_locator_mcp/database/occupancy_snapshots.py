@@ -0,0 +1,62 @@
+"""
+Daily facility occupancy snapshots for point-in-time ("as of") queries.
+
+A location history record counts toward a facility on day D when
+date(start_date) <= D < date(end_date), or when it has no end date. Each
+record therefore contributes +1 on its start day and -1 on its end day.
+Sweeping those events in date order gives every facility's count at the
+end of each day. Only days on which a facility's count changes are stored,
+so the count as of any date is the facility's latest snapshot on or before
+that date.
+
+Triggers on detainee_location_history record the earliest start date
+touched by a write. A refresh keeps the snapshots before that date and
+sweeps only the events from that date on. Refreshes run on the write side
+(after history inserts, or by calling refresh_daily_snapshots()); as-of
+reads never write, and count from the history for dates the snapshots do
+not yet cover.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+# Sweep start for a full build
+EPOCH = "0001-01-01"
+
+
+def parse_as_of(value: Any) -> str:
+    """
+    Validate an as-of date.
+
+    Args:
+        value: Date string (YYYY-MM-DD) or date
+
+    Returns:
+        The date as YYYY-MM-DD
+    """
+    if isinstance(value, date):
+        return value.isoformat()[:10]
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError as e:
+        raise ValueError(f"Invalid as_of date {value!r}, expected YYYY-MM-DD") from e
+
+
+def sweep_daily_counts(base: Dict[int, int],
+                       deltas: Iterable[Tuple[Any, int, int]]) -> Iterator[Tuple[Any, int, int]]:
+    """
+    Turn per-day count changes into per-day counts.
+
+    Args:
+        base: Count per facility before the first delta
+        deltas: (day, facility_id, delta) tuples ordered by day, at most one
+            per day and facility
+
+    Returns:
+        Iterator of (day, facility_id, count) for every non-zero delta
+    """
+    counts = dict(base)
+    for day, facility_id, delta in deltas:
+        if not delta:
+            continue
+        counts[facility_id] = counts.get(facility_id, 0) + delta
+        yield day, facility_id, counts[facility_id]
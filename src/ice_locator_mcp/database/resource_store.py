@@ -0,0 +1,304 @@
+"""
+Read-only, cached queries behind the ice:// MCP resources.
+Serves facility and monthly population data from the SQLite facilities
+database. Query results are cached until the database changes, and every
+result carries the data version it was built from.
+"""
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.prometheus_metrics import DB_QUERY_DURATION, observe_duration, record_cache_lookup
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+FACILITY_FIELDS = ["id", "name", "latitude", "longitude", "address", "population_count"]
+
+
+def page_bounds(page: Any = 1, page_size: Any = DEFAULT_PAGE_SIZE) -> Tuple[int, int]:
+    """
+    Validate pagination parameters.
+
+    Args:
+        page: 1-based page number
+        page_size: Items per page, capped at MAX_PAGE_SIZE
+
+    Returns:
+        (page, page_size) as integers
+    """
+    try:
+        page, page_size = int(page), int(page_size)
+    except (TypeError, ValueError):
+        raise ValueError("page and page_size must be integers")
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be positive")
+    return page, min(page_size, MAX_PAGE_SIZE)
+
+
+class ResourceStore:
+    """Cached read-only view of the facilities database.
+
+    The connection is opened in SQLite read-only mode. Before each query the
+    store checks ``PRAGMA data_version``, which changes whenever another
+    connection commits, and drops its cache when it does, so ingests show up
+    on the next read without a restart.
+    """
+
+    def __init__(self, database_path: str = "ice_locator_facilities.db", cache_size: int = 256):
+        """
+        Initialize the store.
+
+        Args:
+            database_path: Path to the SQLite database file
+            cache_size: Maximum number of cached query results
+        """
+        self.database_path = str(database_path)
+        self.cache_size = cache_size
+        self.connection: Optional[sqlite3.Connection] = None
+        self._cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pragma_version: Optional[int] = None
+        self._data_version: Optional[str] = None
+        self._has_monthly = False
+
+    def connect(self):
+        """Open a read-only connection to the database."""
+        path = Path(self.database_path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Facilities database not found: {path}")
+        self.connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+
+    def disconnect(self):
+        """Close the database connection and clear the cache."""
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+            self._cache.clear()
+            self._pragma_version = None
+
+    @property
+    def data_version(self) -> str:
+        """Content version of the database the cached results came from."""
+        with self._lock:
+            self._refresh()
+            return self._data_version
+
+    def _refresh(self):
+        """Drop cached results if the database changed since the last query."""
+        if self.connection is None:
+            self.connect()
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._pragma_version:
+            return
+        self._cache.clear()
+        self._has_monthly = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_population'"
+        ).fetchone() is not None
+        self._data_version = self._compute_data_version()
+        self._pragma_version = version
+
+    def _compute_data_version(self) -> str:
+        with observe_duration(DB_QUERY_DURATION, endpoint="resource_version"):
+            state = [tuple(self.connection.execute(
+                "SELECT COUNT(*), MAX(id), MAX(updated_at), SUM(population_count) FROM facilities"
+            ).fetchone())]
+            if self._has_monthly:
+                state.append(tuple(self.connection.execute(
+                    "SELECT COUNT(*), MAX(id), MAX(month_year), SUM(population_count) FROM monthly_population"
+                ).fetchone()))
+        return hashlib.sha1(repr(state).encode()).hexdigest()[:12]
+
+    def _cached(self, key: Tuple, query) -> Dict[str, Any]:
+        """Return the cached result for ``key``, running ``query`` on a miss."""
+        with self._lock:
+            self._refresh()
+            result = self._cache.get(key)
+            record_cache_lookup("resource", hit=result is not None)
+            if result is not None:
+                self._cache.move_to_end(key)
+                return dict(result)
+
+            with observe_duration(DB_QUERY_DURATION, endpoint=f"resource_{key[0]}"):
+                result = query()
+            result["data_version"] = self._data_version
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return dict(result)
+
+    @staticmethod
+    def _page(items, total: int, page: int, page_size: int) -> Dict[str, Any]:
+        return {
+            "items": items,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "pages": (total + page_size - 1) // page_size
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Facility and population totals.
+
+        Returns:
+            Dictionary with facility counts, current population and the
+            range of months with population data
+        """
+        def query():
+            row = self.connection.execute("""
+                SELECT COUNT(*) AS total_facilities,
+                       SUM(CASE WHEN latitude != 0 OR longitude != 0 THEN 1 ELSE 0 END) AS with_coordinates,
+                       COUNT(population_count) AS with_population,
+                       COALESCE(SUM(population_count), 0) AS current_population
+                FROM facilities
+            """).fetchone()
+            summary = dict(row)
+            summary["with_coordinates"] = summary["with_coordinates"] or 0
+            if self._has_monthly:
+                months = self.connection.execute("""
+                    SELECT MIN(month_year), MAX(month_year), COUNT(DISTINCT month_year)
+                    FROM monthly_population
+                """).fetchone()
+                summary["months"] = {"first": months[0], "last": months[1], "count": months[2]}
+            else:
+                summary["months"] = {"first": None, "last": None, "count": 0}
+            return summary
+
+        return self._cached(("summary",), query)
+
+    def list_facilities(self, page: Any = 1, page_size: Any = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        One page of facilities ordered by name.
+
+        Args:
+            page: 1-based page number
+            page_size: Facilities per page
+
+        Returns:
+            Page dictionary with items, page, page_size, total and pages
+        """
+        page, page_size = page_bounds(page, page_size)
+
+        def query():
+            total = self.connection.execute("SELECT COUNT(*) FROM facilities").fetchone()[0]
+            rows = self.connection.execute(f"""
+                SELECT {', '.join(FACILITY_FIELDS)}
+                FROM facilities
+                ORDER BY name, id
+                LIMIT ? OFFSET ?
+            """, (page_size, (page - 1) * page_size)).fetchall()
+            return self._page([dict(row) for row in rows], total, page, page_size)
+
+        return self._cached(("facilities", page, page_size), query)
+
+    def get_facility(self, facility_id: int, page: Any = 1,
+                     page_size: Any = DEFAULT_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+        """
+        A facility with one page of its monthly population history.
+
+        Args:
+            facility_id: ID of the facility
+            page: 1-based page of history, newest month first
+            page_size: Months per page
+
+        Returns:
+            Facility dictionary with a ``population_history`` page, or None
+            if the facility does not exist
+        """
+        page, page_size = page_bounds(page, page_size)
+
+        def query():
+            row = self.connection.execute(f"""
+                SELECT {', '.join(FACILITY_FIELDS)}, created_at, updated_at
+                FROM facilities
+                WHERE id = ?
+            """, (facility_id,)).fetchone()
+            if row is None:
+                return {"facility": None}
+
+            facility = dict(row)
+            history, total = [], 0
+            if self._has_monthly:
+                total = self.connection.execute(
+                    "SELECT COUNT(*) FROM monthly_population WHERE facility_id = ?", (facility_id,)
+                ).fetchone()[0]
+                history = [dict(r) for r in self.connection.execute("""
+                    SELECT month_year, population_count
+                    FROM monthly_population
+                    WHERE facility_id = ?
+                    ORDER BY month_year DESC
+                    LIMIT ? OFFSET ?
+                """, (facility_id, page_size, (page - 1) * page_size))]
+            facility["population_history"] = self._page(history, total, page, page_size)
+            return {"facility": facility}
+
+        result = self._cached(("facility", int(facility_id), page, page_size), query)
+        if result["facility"] is None:
+            return None
+        return dict(result["facility"], data_version=result["data_version"])
+
+    def trends(self, start: Optional[str] = None, end: Optional[str] = None,
+               page: Any = 1, page_size: Any = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Monthly population totals across all facilities.
+
+        Args:
+            start: First month (YYYY-MM), inclusive
+            end: Last month (YYYY-MM), inclusive
+            page: 1-based page number, oldest month first
+            page_size: Months per page
+
+        Returns:
+            Page dictionary of {month, total_population, facilities_reporting,
+            average_population} items
+        """
+        page, page_size = page_bounds(page, page_size)
+        for month in (start, end):
+            if month is not None and not _is_month(month):
+                raise ValueError(f"Invalid month {month!r}, expected YYYY-MM")
+
+        def query():
+            if not self._has_monthly:
+                return self._page([], 0, page, page_size)
+            where, params = _month_range(start, end)
+            total = self.connection.execute(
+                f"SELECT COUNT(DISTINCT month_year) FROM monthly_population {where}", params
+            ).fetchone()[0]
+            rows = self.connection.execute(f"""
+                SELECT month_year AS month,
+                       SUM(population_count) AS total_population,
+                       COUNT(*) AS facilities_reporting,
+                       ROUND(AVG(population_count), 1) AS average_population
+                FROM monthly_population
+                {where}
+                GROUP BY month_year
+                ORDER BY month_year
+                LIMIT ? OFFSET ?
+            """, params + [page_size, (page - 1) * page_size]).fetchall()
+            return self._page([dict(row) for row in rows], total, page, page_size)
+
+        result = self._cached(("trends", start, end, page, page_size), query)
+        return dict(result, start=start, end=end)
+
+
+def _is_month(value: str) -> bool:
+    year, _, month = value.partition("-")
+    return len(year) == 4 and year.isdigit() and len(month) == 2 and month.isdigit() and 1 <= int(month) <= 12
+
+
+def _month_range(start: Optional[str], end: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    if start:
+        clauses.append("month_year >= ?")
+        params.append(start)
+    if end:
+        clauses.append("month_year <= ?")
+        params.append(end)
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
@@ -3,9 +3,9 @@ SQLite database manager for the heatmap feature.
 Handles SQLite database operations for detainees, facilities, and location history.
 """
 import sqlite3
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import Iterator, List, Optional, Dict, Tuple
 from .models import Detainee, Facility, DetaineeLocationHistory
+from .occupancy_snapshots import EPOCH, parse_as_of, sweep_daily_counts
 
 
 class SQLiteDatabaseManager:
@@ -20,12 +20,14 @@ class SQLiteDatabaseManager:
         """
         self.database_path = database_path
         self.connection = None
+        self._occupancy_ready = False
     
     def connect(self):
         """Establish a connection to the SQLite database."""
         try:
             self.connection = sqlite3.connect(self.database_path)
             self.connection.row_factory = sqlite3.Row  # Enable column access by name
+            self._occupancy_ready = False
         except Exception as e:
             print(f"Error connecting to SQLite database: {e}")
             raise
@@ -94,34 +96,302 @@ class SQLiteDatabaseManager:
         """)
         
         self.connection.commit()
+        self.create_occupancy_table()
+        self.create_snapshot_tables()
     
-    def get_all_facilities(self) -> List[Facility]:
-        """Get all facilities from the database."""
+    def create_occupancy_table(self):
+        """
+        Create the facility_current_occupancy table and the triggers that keep it exact.
+        
+        The table holds the number of open location history records
+        (end_date IS NULL) per facility. Triggers on detainee_location_history
+        adjust it on every insert, delete and change of facility or end date,
+        so current counts are read without scanning the history. Partial
+        indexes cover the open records for rebuilds and per-detainee lookups.
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS facility_current_occupancy (
+                    facility_id INTEGER PRIMARY KEY,
+                    detainee_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (facility_id) REFERENCES facilities (id)
+                )
+            """)
+            
+            # Partial indexes on open intervals
+            self.connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_open_facility 
+                ON detainee_location_history (facility_id) WHERE end_date IS NULL
+            """)
+            self.connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_open_detainee 
+                ON detainee_location_history (detainee_id) WHERE end_date IS NULL
+            """)
+            
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_occupancy_insert
+                AFTER INSERT ON detainee_location_history
+                WHEN NEW.end_date IS NULL
+                BEGIN
+                    INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+                    VALUES (NEW.facility_id, 1)
+                    ON CONFLICT(facility_id) DO UPDATE SET
+                        detainee_count = detainee_count + 1,
+                        updated_at = CURRENT_TIMESTAMP;
+                END
+            """)
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_occupancy_delete
+                AFTER DELETE ON detainee_location_history
+                WHEN OLD.end_date IS NULL
+                BEGIN
+                    UPDATE facility_current_occupancy
+                    SET detainee_count = detainee_count - 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE facility_id = OLD.facility_id;
+                END
+            """)
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_occupancy_update
+                AFTER UPDATE OF facility_id, end_date ON detainee_location_history
+                BEGIN
+                    UPDATE facility_current_occupancy
+                    SET detainee_count = detainee_count - 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE facility_id = OLD.facility_id AND OLD.end_date IS NULL;
+                    
+                    INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+                    SELECT NEW.facility_id, 1 WHERE NEW.end_date IS NULL
+                    ON CONFLICT(facility_id) DO UPDATE SET
+                        detainee_count = detainee_count + 1,
+                        updated_at = CURRENT_TIMESTAMP;
+                END
+            """)
+        
+        # History written before the triggers existed is counted once here
+        self.rebuild_occupancy()
+    
+    def rebuild_occupancy(self) -> int:
+        """
+        Recount facility_current_occupancy from the open location history records.
+        
+        Returns:
+            Number of facilities with current detainees
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            self.connection.execute("DELETE FROM facility_current_occupancy")
+            cursor = self.connection.execute("""
+                INSERT INTO facility_current_occupancy (facility_id, detainee_count)
+                SELECT facility_id, COUNT(*)
+                FROM detainee_location_history
+                WHERE end_date IS NULL
+                GROUP BY facility_id
+            """)
+        
+        return cursor.rowcount
+    
+    def create_snapshot_tables(self):
+        """
+        Create the facility_daily_occupancy snapshot table and its bookkeeping.
+        
+        facility_daily_occupancy holds each facility's detainee count at the
+        end of every day on which it changed. occupancy_snapshot_state records
+        the earliest day that writes to detainee_location_history have
+        invalidated; triggers move it back and refresh_daily_snapshots()
+        re-sweeps from there.
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS facility_daily_occupancy (
+                    facility_id INTEGER NOT NULL,
+                    snapshot_date TEXT NOT NULL,
+                    detainee_count INTEGER NOT NULL,
+                    PRIMARY KEY (facility_id, snapshot_date)
+                ) WITHOUT ROWID
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS occupancy_snapshot_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    dirty_from TEXT,
+                    built_at TIMESTAMP
+                )
+            """)
+            
+            # Event scans from the first invalidated day
+            self.connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_start_date 
+                ON detainee_location_history (start_date)
+            """)
+            self.connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_detainee_location_end_date 
+                ON detainee_location_history (end_date) WHERE end_date IS NOT NULL
+            """)
+            
+            # A record only affects counts from its start day on
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_snapshot_dirty_insert
+                AFTER INSERT ON detainee_location_history
+                BEGIN
+                    UPDATE occupancy_snapshot_state
+                    SET dirty_from = MIN(COALESCE(dirty_from, date(NEW.start_date)), date(NEW.start_date));
+                END
+            """)
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_snapshot_dirty_delete
+                AFTER DELETE ON detainee_location_history
+                BEGIN
+                    UPDATE occupancy_snapshot_state
+                    SET dirty_from = MIN(COALESCE(dirty_from, date(OLD.start_date)), date(OLD.start_date));
+                END
+            """)
+            self.connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_snapshot_dirty_update
+                AFTER UPDATE OF facility_id, start_date, end_date ON detainee_location_history
+                BEGIN
+                    UPDATE occupancy_snapshot_state
+                    SET dirty_from = MIN(COALESCE(dirty_from, date(OLD.start_date)),
+                                         date(OLD.start_date), date(NEW.start_date));
+                END
+            """)
+        
+        self._occupancy_ready = True
+    
+    def refresh_daily_snapshots(self) -> int:
+        """
+        Bring facility_daily_occupancy up to date with the location history.
+        
+        Snapshots before the first invalidated day are kept as the starting
+        counts; the interval start and end events from that day on are swept
+        in date order and the changed days written back. Without a state row
+        the snapshots are built from the whole history.
+        
+        Returns:
+            Number of snapshot rows written
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        self._ensure_occupancy()
+        state = self.connection.execute(
+            "SELECT dirty_from FROM occupancy_snapshot_state WHERE id = 1"
+        ).fetchone()
+        if state and state['dirty_from'] is None:
+            return 0
+        start = state['dirty_from'] if state else EPOCH
+        
+        with self.connection:
+            base = {
+                row['facility_id']: row['detainee_count']
+                for row in self.connection.execute("""
+                    SELECT facility_id, detainee_count, MAX(snapshot_date)
+                    FROM facility_daily_occupancy
+                    WHERE snapshot_date < ?
+                    GROUP BY facility_id
+                """, (start,))
+            }
+            self.connection.execute(
+                "DELETE FROM facility_daily_occupancy WHERE snapshot_date >= ?", (start,)
+            )
+            
+            # +1 on the start day, -1 on the end day; an end before the start counts as the start day
+            events = self.connection.execute("""
+                SELECT day, facility_id, SUM(delta)
+                FROM (
+                    SELECT date(start_date) AS day, facility_id, 1 AS delta
+                    FROM detainee_location_history
+                    WHERE start_date >= :start
+                    UNION ALL
+                    SELECT MAX(date(start_date), date(end_date)), facility_id, -1
+                    FROM detainee_location_history
+                    WHERE end_date IS NOT NULL AND (end_date >= :start OR start_date >= :start)
+                )
+                WHERE day >= :start
+                GROUP BY day, facility_id
+                ORDER BY day
+            """, {"start": start})
+            cursor = self.connection.executemany("""
+                INSERT INTO facility_daily_occupancy (facility_id, snapshot_date, detainee_count)
+                VALUES (?, ?, ?)
+            """, ((facility_id, day, count) for day, facility_id, count in sweep_daily_counts(base, events)))
+            written = cursor.rowcount
+            
+            self.connection.execute("""
+                INSERT OR REPLACE INTO occupancy_snapshot_state (id, dirty_from, built_at)
+                VALUES (1, NULL, CURRENT_TIMESTAMP)
+            """)
+        
+        return written
+    
+    def _snapshots_cover(self, as_of: str) -> bool:
+        """Whether the snapshots are current through the end of ``as_of``."""
+        return self.connection.execute(
+            "SELECT 1 FROM occupancy_snapshot_state WHERE id = 1 AND (dirty_from IS NULL OR dirty_from > ?)",
+            (as_of,)
+        ).fetchone() is not None
+    
+    def _ensure_occupancy(self):
+        """Create the occupancy tables on databases built before they existed."""
+        if self._occupancy_ready:
+            return
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_snapshot_dirty_update'"
+        ).fetchone()
+        if exists:
+            self._occupancy_ready = True
+        else:
+            self.create_tables()
+    
+    def _iter_rows(self, query: str, params: Tuple = (), batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """
+        Yield the rows of a query, fetched in batches.
+        
+        Args:
+            query: SQL query
+            params: Query parameters
+            batch_size: Rows per fetchmany call
+        """
         if not self.connection:
             raise Exception("Database not connected")
         
         cursor = self.connection.cursor()
-        cursor.execute("""
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def iter_facilities(self, batch_size: int = 500) -> Iterator[Facility]:
+        """
+        Iterate over all facilities without loading them all at once.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Facility objects ordered by name
+        """
+        for row in self._iter_rows("""
             SELECT id, name, latitude, longitude, address, population_count, created_at, updated_at
             FROM facilities
             ORDER BY name
-        """)
-        
-        facilities = []
-        for row in cursor.fetchall():
-            facility = Facility(
-                id=row['id'],
-                name=row['name'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                address=row['address'],
-                population_count=row['population_count'],
-                created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
-            )
-            facilities.append(facility)
-        
-        return facilities
+        """, batch_size=batch_size):
+            yield Facility(*row)
+    
+    def get_all_facilities(self) -> List[Facility]:
+        """Get all facilities from the database."""
+        return list(self.iter_facilities())
     
     def get_facility_by_id(self, facility_id: int) -> Optional[Facility]:
         """Get a specific facility by ID."""
@@ -137,40 +407,97 @@ class SQLiteDatabaseManager:
         
         row = cursor.fetchone()
         if row:
-            return Facility(
-                id=row['id'],
-                name=row['name'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                address=row['address'],
-                population_count=row['population_count'],
-                created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
-            )
+            return Facility(*row)
         return None
     
+    def iter_detainees(self, batch_size: int = 500) -> Iterator[Detainee]:
+        """
+        Iterate over all detainees without loading them all at once.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Detainee objects ordered by name
+        """
+        for row in self._iter_rows("""
+            SELECT id, first_name, last_name, created_at, updated_at
+            FROM detainees
+            ORDER BY last_name, first_name
+        """, batch_size=batch_size):
+            yield Detainee(*row)
+    
+    def get_all_detainees(self) -> List[Detainee]:
+        """Get all detainees from the database."""
+        return list(self.iter_detainees())
+    
+    def iter_detainees_without_facility(self, batch_size: int = 500) -> Iterator[Detainee]:
+        """
+        Iterate over detainees that are not linked to any facility.
+        
+        Args:
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterator of Detainee objects ordered by name
+        """
+        for row in self._iter_rows("""
+            SELECT d.id, d.first_name, d.last_name, d.created_at, d.updated_at
+            FROM detainees d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM detainee_location_history dlh WHERE dlh.detainee_id = d.id
+            )
+            ORDER BY d.last_name, d.first_name
+        """, batch_size=batch_size):
+            yield Detainee(*row)
+    
+    def get_detainees_without_facility(self) -> List[Detainee]:
+        """Get detainees that are not linked to any facility."""
+        return list(self.iter_detainees_without_facility())
+    
     def get_current_detainee_count_by_facility(self) -> List[Dict]:
         """Get current detainee count for each facility."""
         if not self.connection:
             raise Exception("Database not connected")
         
+        self._ensure_occupancy()
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT 
-                facility_id,
-                COUNT(*) as detainee_count
-            FROM detainee_location_history
-            WHERE end_date IS NULL
-            GROUP BY facility_id
+            SELECT facility_id, detainee_count
+            FROM facility_current_occupancy
+            WHERE detainee_count > 0
         """)
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_current_detainee_count(self, facility_id: int) -> int:
+        """
+        Get the current detainee count of one facility.
+        
+        Args:
+            facility_id: ID of the facility
+            
+        Returns:
+            Number of detainees currently at the facility
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        self._ensure_occupancy()
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT detainee_count FROM facility_current_occupancy WHERE facility_id = ?
+        """, (facility_id,))
+        
+        row = cursor.fetchone()
+        return row['detainee_count'] if row else 0
+    
     def get_heatmap_data(self) -> List[Dict]:
         """Get aggregated data for heatmap visualization."""
         if not self.connection:
             raise Exception("Database not connected")
         
+        self._ensure_occupancy()
         cursor = self.connection.cursor()
         cursor.execute("""
             SELECT 
@@ -180,10 +507,9 @@ class SQLiteDatabaseManager:
                 f.longitude,
                 f.address,
                 f.population_count,
-                COALESCE(COUNT(dlh.detainee_id), 0) as current_detainee_count
+                COALESCE(o.detainee_count, 0) as current_detainee_count
             FROM facilities f
-            LEFT JOIN detainee_location_history dlh ON f.id = dlh.facility_id AND dlh.end_date IS NULL
-            GROUP BY f.id, f.name, f.latitude, f.longitude, f.address, f.population_count
+            LEFT JOIN facility_current_occupancy o ON o.facility_id = f.id
             ORDER BY f.population_count DESC
         """)
         
@@ -201,6 +527,85 @@ class SQLiteDatabaseManager:
         
         return heatmap_data
     
+    def get_detainee_count_by_facility_as_of(self, as_of: str) -> List[Dict]:
+        """
+        Get the detainee count for each facility at the end of a given day.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of facility_id and detainee_count for facilities with detainees
+        """
+        return [
+            {"facility_id": row["id"], "detainee_count": row["detainee_count"]}
+            for row in self.get_heatmap_data_as_of(as_of) if row["detainee_count"] > 0
+        ]
+    
+    def get_heatmap_data_as_of(self, as_of: str) -> List[Dict]:
+        """
+        Get heatmap data with detainee counts at the end of a given day.
+        
+        Counts come from the latest daily snapshot on or before the date,
+        one index seek per facility. Reads never refresh the snapshots; when
+        writes since the last refresh_daily_snapshots() reach back to the date,
+        the counts are taken from the location history instead.
+        
+        Args:
+            as_of: Date as YYYY-MM-DD
+            
+        Returns:
+            List of facilities with detainee_count and as_of
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        as_of = parse_as_of(as_of)
+        self._ensure_occupancy()
+        if self._snapshots_cover(as_of):
+            count = """
+                SELECT s.detainee_count
+                FROM facility_daily_occupancy s
+                WHERE s.facility_id = f.id AND s.snapshot_date <= :as_of
+                ORDER BY s.snapshot_date DESC
+                LIMIT 1
+            """
+        else:
+            # Same rule as the sweep: counted from the start day until the end day
+            count = """
+                SELECT COUNT(*)
+                FROM detainee_location_history h
+                WHERE h.facility_id = f.id AND date(h.start_date) <= :as_of
+                  AND (h.end_date IS NULL OR date(h.end_date) > :as_of)
+            """
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT 
+                f.id,
+                f.name,
+                f.latitude,
+                f.longitude,
+                f.address,
+                f.population_count,
+                COALESCE(({count}), 0) as detainee_count
+            FROM facilities f
+            ORDER BY f.population_count DESC
+        """, {"as_of": as_of})
+        
+        return [
+            {
+                "id": row['id'],
+                "name": row['name'],
+                "latitude": row['latitude'],
+                "longitude": row['longitude'],
+                "address": row['address'],
+                "population_count": row['population_count'],
+                "detainee_count": row['detainee_count'],
+                "as_of": as_of
+            }
+            for row in cursor.fetchall()
+        ]
+    
     def get_facilities_with_population(self) -> List[Dict]:
         """Get all facilities with their population counts for heatmap visualization."""
         if not self.connection:
@@ -327,3 +732,91 @@ class SQLiteDatabaseManager:
             "facilities_by_state": facilities_by_state
         }
 
+    
+    def update_facility_populations(self, populations: Dict[int, int]) -> int:
+        """
+        Update population counts for many facilities in one transaction.
+        
+        Args:
+            populations: Mapping of facility ID to population count
+            
+        Returns:
+            Number of facilities updated
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            cursor = self.connection.executemany("""
+                UPDATE facilities 
+                SET population_count = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(population_count, facility_id) for facility_id, population_count in populations.items()])
+        
+        return cursor.rowcount
+    
+    def create_monthly_population_table(self):
+        """Create the monthly_population table and its (facility_id, month_year) unique key."""
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS monthly_population (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    facility_id INTEGER,
+                    month_year TEXT,
+                    population_count INTEGER,
+                    download_date TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (facility_id) REFERENCES facilities (id)
+                )
+            """)
+            
+            # Older databases may hold duplicates; keep the latest row so the
+            # unique key that upserts rely on can be created
+            self.connection.execute("""
+                DELETE FROM monthly_population
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM monthly_population GROUP BY facility_id, month_year
+                )
+            """)
+            self.connection.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_monthly_population_unique 
+                ON monthly_population(facility_id, month_year)
+            """)
+    
+    def upsert_monthly_population(self, month_year: str, rows: List[Tuple[int, int, str]],
+                                  replace_month: bool = False) -> int:
+        """
+        Write one month of facility populations in a single transaction.
+        
+        Args:
+            month_year: Month key (YYYY-MM)
+            rows: (facility_id, population_count, download_date) tuples
+            replace_month: Also delete rows of this month that are not in ``rows``
+            
+        Returns:
+            Number of rows written
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        with self.connection:
+            if replace_month:
+                self.connection.execute(
+                    "DELETE FROM monthly_population WHERE month_year = ?", (month_year,)
+                )
+            cursor = self.connection.executemany("""
+                INSERT INTO monthly_population 
+                (facility_id, month_year, population_count, download_date)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(facility_id, month_year) DO UPDATE SET
+                    population_count = excluded.population_count,
+                    download_date = excluded.download_date
+            """, [
+                (facility_id, month_year, population_count, download_date)
+                for facility_id, population_count, download_date in rows
+            ])
+        
+        return cursor.rowcount
@@ -1,7 +1,6 @@
 import requests
-import json
-import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .facility_matcher import FacilityMatcher, extract_county_and_state, facility_name_stem
 from .manager import DatabaseManager
 from .models import Facility
 
@@ -18,6 +17,8 @@ class FacilityPopulationUpdater:
         """
         self.database_url = database_url
         self.db_manager = DatabaseManager(database_url)
+        self._matcher: Optional[FacilityMatcher] = None
+        self._matcher_source: Optional[List[Facility]] = None
     
     def fetch_trac_data(self) -> List[Dict]:
         """
@@ -80,21 +81,7 @@ class FacilityPopulationUpdater:
         Returns:
             Normalized facility name
         """
-        # Convert to uppercase
-        name = name.upper()
-        
-        # Remove punctuation and replace underscores with spaces
-        name = re.sub(r'[^\w\s]', ' ', name)
-        name = re.sub(r'_', ' ', name)
-        
-        # Remove common suffixes and prefixes
-        name = re.sub(r'\s*(DETENTION\s+)?(FACILITY|CENTER|COMPLEX|JAIL|CORRECTIONAL|DET\.?\s+CENTER|CORRECTIONS?|DEPT\.?|DEPARTMENT|OFFICE|SHERIFF\'?S?|POLICE|LAW ENFORCEMENT|COURT|COUNTY JAIL|COUNTY DETENTION|DET\.?\s+CTR|PROCESSING\s+CENTER|HOLD\s+ROOM|SERVICE\s+PROCESSING|CONTRACT\s+FACILITY|FEDERAL\s+DETENTION|REGIONAL\s+DETENTION|ICE\s+PROCESSING|CORRECTIONAL\s+CENTER|PUBLIC\s+SAFETY|JUSTICE\s+CENTER|DETENTION\s+FACILITY|CORRECTIONAL\s+FACILITY|DETENTION\s+CTR|DETENTION|PROCESSING\s+CTR|SERVICE\s+PROCESSING\s+CENTER|CONTRACT\s+DETENTION|FEDERAL\s+CONTRACT|REGIONAL\s+JAIL|CORRECTIONAL\s+INST|FEDERAL\s+CORR|PUBLIC\s+SAFETY\s+COMPLEX|DET\.?\s+PROCESSING|DET\.?\s+SERV\s+PROC|DET\.?\s+SERV\s+PROCESSING).*$', '', name, flags=re.IGNORECASE)
-        name = re.sub(r'^THE\s+', '', name, flags=re.IGNORECASE)
-        
-        # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        return name
+        return facility_name_stem(name)
     
     def extract_county_and_state(self, name: str) -> tuple:
         """
@@ -106,17 +93,7 @@ class FacilityPopulationUpdater:
         Returns:
             Tuple of (county_name, state) or (None, None)
         """
-        # Extract county name
-        county_match = re.search(r'([A-Z]+(?:\s+[A-Z]+)*?)\s+COUNTY', name.upper())
-        county_name = county_match.group(1) if county_match else None
-        
-        # Extract state from the end of the name (after comma) or from parentheses
-        state_match = re.search(r',\s*([A-Z]+)$', name)
-        if not state_match:
-            state_match = re.search(r'\(([A-Z]+)\)', name)
-        state = state_match.group(1) if state_match else None
-        
-        return (county_name, state)
+        return extract_county_and_state(name)
     
     def find_matching_facility(self, trac_facility: Dict, db_facilities: List[Facility]) -> Facility:
         """
@@ -129,87 +106,10 @@ class FacilityPopulationUpdater:
         Returns:
             Matching Facility object or None
         """
-        trac_name = trac_facility['name'].upper().strip()
-        
-        # Try exact match first
-        for facility in db_facilities:
-            if facility.name.upper().strip() == trac_name:
-                return facility
-        
-        # Try normalized name match
-        normalized_trac_name = self.normalize_facility_name(trac_name)
-        for facility in db_facilities:
-            normalized_db_name = self.normalize_facility_name(facility.name.upper().strip())
-            if normalized_db_name == normalized_trac_name:
-                return facility
-                
-        # Try county-based matching
-        trac_county, trac_state = self.extract_county_and_state(trac_name)
-        if trac_county:
-            for facility in db_facilities:
-                db_county, db_state = self.extract_county_and_state(facility.name)
-                if db_county and db_county == trac_county:
-                    # Check if state matches if available
-                    if trac_state and db_state:
-                        if trac_state == db_state:
-                            return facility
-                    elif trac_state or db_state:
-                        # If only one has state info, check if names contain state
-                        facility_name_upper = facility.name.upper()
-                        if trac_state and trac_state in facility_name_upper:
-                            return facility
-                        elif db_state and db_state in trac_name:
-                            return facility
-                    else:
-                        return facility
-        
-        # Try partial token matching - check if TRAC tokens are contained in DB name
-        trac_tokens = set(normalized_trac_name.split())
-        if len(trac_tokens) > 0:
-            for facility in db_facilities:
-                facility_name_upper = facility.name.upper()
-                # Check if all TRAC tokens are in the facility name
-                match_count = 0
-                for token in trac_tokens:
-                    if token in facility_name_upper:
-                        match_count += 1
-                
-                # If we match at least 2 tokens and it's more than 50% of TRAC tokens
-                if match_count >= 2 and match_count / len(trac_tokens) >= 0.5:
-                    return facility
-        
-        # Try fuzzy matching with token-based approach
-        for facility in db_facilities:
-            normalized_db_name = self.normalize_facility_name(facility.name.upper().strip())
-            db_tokens = set(normalized_db_name.split())
-            
-            # Calculate similarity score based on common tokens
-            if len(trac_tokens) > 0 and len(db_tokens) > 0:
-                common_tokens = trac_tokens.intersection(db_tokens)
-                total_tokens = trac_tokens.union(db_tokens)
-                
-                similarity_score = len(common_tokens) / len(total_tokens)
-                
-                # Look for county matches specifically
-                trac_has_county = 'COUNTY' in trac_tokens
-                db_has_county = 'COUNTY' in db_tokens
-                
-                if trac_has_county and db_has_county:
-                    # Boost score for county matches
-                    similarity_score *= 1.5
-                
-                # Look for state matches
-                trac_states = {token for token in trac_tokens if len(token) == 2 and token.isalpha()}
-                db_states = {token for token in db_tokens if len(token) == 2 and token.isalpha()}
-                
-                if trac_states and db_states and trac_states.intersection(db_states):
-                    # Boost score for state matches
-                    similarity_score *= 1.2
-                
-                if similarity_score > 0.4:  # Threshold for matching
-                    return facility
-        
-        return None
+        if self._matcher is None or self._matcher_source is not db_facilities:
+            self._matcher = FacilityMatcher(db_facilities)
+            self._matcher_source = db_facilities
+        return self._matcher.find_match(trac_facility['name'])
     
     def update_population_counts(self) -> Dict:
         """
@@ -240,29 +140,24 @@ class FacilityPopulationUpdater:
             "unmatched_facilities": 0
         }
         
-        # Update population counts
+        # Match every TRAC facility, then write all updates in one transaction
+        populations = {}
         for trac_facility in trac_facilities:
             matching_facility = self.find_matching_facility(trac_facility, db_facilities)
             
             if matching_facility:
                 stats["matched_facilities"] += 1
-                population_count = trac_facility.get('population_count', 0)
-                
-                # Update the facility in the database
-                success = self.db_manager.update_facility_population(
-                    matching_facility.id, 
-                    population_count
-                )
-                
-                if success:
-                    stats["updated_facilities"] += 1
-                    print(f"Updated {matching_facility.name} with population count {population_count}")
-                else:
-                    print(f"Failed to update {matching_facility.name}")
+                populations[matching_facility.id] = trac_facility.get('population_count', 0)
             else:
                 stats["unmatched_facilities"] += 1
                 print(f"No match found for TRAC facility: {trac_facility['name']}")
         
+        stats["updated_facilities"] = self.db_manager.update_facility_populations(populations)
+        if populations and not stats["updated_facilities"]:
+            print(f"Failed to update {len(populations)} facilities")
+        else:
+            print(f"Updated {stats['updated_facilities']} facilities with population counts")
+        
         self.db_manager.disconnect()
         
         return stats
@@ -9,10 +9,148 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Tuple
 import structlog
 
-from ..core.config import Config
+from ..core.config import ServerConfig
+
+
+def _freeze_catalog(catalog: Dict[str, Dict[str, str]]) -> Mapping[str, Mapping[str, str]]:
+    """Read-only view of a language -> {english: translation} catalog."""
+    return MappingProxyType({lang: MappingProxyType(entries) for lang, entries in catalog.items()})
+
+
+# Interface translations
+INTERFACE_CATALOG = _freeze_catalog({
+    "es": {
+        # Search interface
+        "search": "buscar",
+        "find": "encontrar",
+        "results": "resultados",
+        "no results found": "no se encontraron resultados",
+        "search by name": "buscar por nombre",
+        "search by alien number": "buscar por número alien",
+        "first name": "nombre",
+        "last name": "apellido",
+        "alien number": "número alien",
+        "facility": "facilidad",
+        "detention center": "centro de detención",
+        
+        # Status messages
+        "found": "encontrado",
+        "not found": "no encontrado",
+        "in custody": "bajo custodia",
+        "released": "liberado",
+        "transferred": "transferido",
+        
+        # Error messages
+        "invalid input": "entrada inválida",
+        "rate limit exceeded": "límite de velocidad excedido",
+        "server error": "error del servidor",
+        "connection failed": "falló la conexión",
+        
+        # Interface elements
+        "loading": "cargando",
+        "please wait": "por favor espere",
+        "try again": "inténtelo de nuevo",
+        "help": "ayuda",
+        "contact": "contacto",
+        "resources": "recursos"
+    }
+})
+
+# Legal terminology translations
+LEGAL_CATALOG = _freeze_catalog({
+    "es": {
+        "detention": "detención",
+        "immigration court": "corte de inmigración",
+        "deportation": "deportación",
+        "removal proceedings": "procedimientos de deportación",
+        "bond hearing": "audiencia de fianza",
+        "legal representation": "representación legal",
+        "attorney": "abogado",
+        "interpreter": "intérprete",
+        "due process": "debido proceso",
+        "asylum": "asilo",
+        "refugee": "refugiado",
+        "temporary protected status": "estatus de protección temporal",
+        "withholding of removal": "suspensión de deportación"
+    }
+})
+
+# Lookup table per (language, context): interface terms first, then legal
+# terms for the legal context, matching translate_text's lookup order
+CONTEXT_CATALOGS = MappingProxyType({
+    (lang, context): MappingProxyType(
+        {**LEGAL_CATALOG.get(lang, {}), **INTERFACE_CATALOG[lang]} if context == "legal"
+        else dict(INTERFACE_CATALOG[lang])
+    )
+    for lang in INTERFACE_CATALOG
+    for context in ("", "legal")
+})
+
+# Resources and support contacts per language, built once and copied per response
+LOCALIZED_RESOURCES = MappingProxyType({
+    "es": tuple(MappingProxyType(resource) for resource in [
+        {
+            "name": "Línea Nacional de Inmigración",
+            "phone": "1-855-234-1317",
+            "description": "Asistencia legal gratuita en español",
+            "type": "legal_aid"
+        },
+        {
+            "name": "Unidos US (anteriormente UnidosUS)",
+            "url": "https://unidosus.org",
+            "description": "Recursos y apoyo para la comunidad latina",
+            "type": "advocacy"
+        },
+        {
+            "name": "Asociación Americana de Abogados de Inmigración (AILA)",
+            "url": "https://aila.org",
+            "description": "Encuentra abogados de inmigración calificados",
+            "type": "legal"
+        },
+        {
+            "name": "Directorio Nacional de Servicios Legales de Inmigración",
+            "url": "https://nipnlg.org/PILdirectory",
+            "description": "Servicios legales gratuitos y de bajo costo",
+            "type": "legal_aid"
+        },
+        {
+            "name": "Localizador de Detenidos de ICE",
+            "url": "https://locator.ice.gov",
+            "description": "Base de datos oficial de ICE para localizar detenidos",
+            "type": "official"
+        }
+    ]),
+    "en": tuple(MappingProxyType(resource) for resource in [
+        {
+            "name": "ICE Online Detainee Locator",
+            "url": "https://locator.ice.gov",
+            "description": "Official ICE database for locating detainees",
+            "type": "official"
+        },
+        {
+            "name": "American Immigration Lawyers Association",
+            "url": "https://aila.org",
+            "description": "Find qualified immigration attorneys",
+            "type": "legal"
+        },
+        {
+            "name": "National Immigration Legal Services Directory",
+            "url": "https://nipnlg.org/PILdirectory",
+            "description": "Free and low-cost legal services",
+            "type": "legal_aid"
+        },
+        {
+            "name": "National Immigration Hotline",
+            "phone": "1-855-234-1317",
+            "description": "Free legal assistance hotline",
+            "type": "legal_aid"
+        }
+    ])
+})
 
 
 @dataclass
@@ -28,7 +166,7 @@ class TranslationEntry:
 class LanguageProcessor:
     """Handles language detection, translation, and localization."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: ServerConfig):
         self.config = config
         self.logger = structlog.get_logger(__name__)
         
@@ -36,9 +174,9 @@ class LanguageProcessor:
         self.supported_languages = ["en", "es"]
         self.default_language = "en"
         
-        # Translation dictionaries
-        self.translations: Dict[str, Dict[str, str]] = {}
-        self.legal_translations: Dict[str, Dict[str, str]] = {}
+        # Translation catalogs (read-only, shared by all instances)
+        self.translations: Mapping[str, Mapping[str, str]] = INTERFACE_CATALOG
+        self.legal_translations: Mapping[str, Mapping[str, str]] = LEGAL_CATALOG
         
         # Language detection patterns
         self.language_patterns = {
@@ -54,6 +192,13 @@ class LanguageProcessor:
             ]
         }
         
+        # One alternation per language; the keywords never overlap, so the
+        # match count equals the sum of the individual pattern counts
+        self.language_regexes = {
+            lang: re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+            for lang, patterns in self.language_patterns.items()
+        }
+        
         # Name processing patterns for Spanish/Latino names
         self.hispanic_name_patterns = {
             "compound_first": r"^(Ana|José|Juan|María|Luis|Carmen)\s+(.*)",
@@ -77,12 +222,8 @@ class LanguageProcessor:
         
         # Count pattern matches for each language
         scores = {}
-        for lang, patterns in self.language_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
-                score += matches
-            scores[lang] = score
+        for lang, regex in self.language_regexes.items():
+            scores[lang] = sum(1 for _ in regex.finditer(text_lower))
         
         # Return language with highest score
         if scores:
@@ -92,46 +233,33 @@ class LanguageProcessor:
         
         return self.default_language
     
+    def translate(self, text: str, target_language: str, context: str = "") -> str:
+        """Translate text to target language, returning it unchanged if no translation exists."""
+        catalog = CONTEXT_CATALOGS.get((target_language, "legal" if context == "legal" else ""))
+        if catalog is None or not isinstance(text, str):
+            return text
+        return catalog.get(text.lower().strip(), text)
+    
     async def translate_text(self, text: str, target_language: str, context: str = "") -> str:
         """Translate text to target language."""
-        if target_language not in self.supported_languages:
-            return text
-        
-        # Check for direct translation
-        key = text.lower().strip()
-        if target_language in self.translations and key in self.translations[target_language]:
-            return self.translations[target_language][key]
-        
-        # Check legal translations for legal context
-        if context == "legal" and target_language in self.legal_translations:
-            if key in self.legal_translations[target_language]:
-                return self.legal_translations[target_language][key]
-        
-        # Return original text if no translation found
-        return text
+        return self.translate(text, target_language, context)
     
     async def translate_interface(self, interface_dict: Dict[str, Any], target_language: str) -> Dict[str, Any]:
         """Translate interface elements to target language."""
         if target_language == "en":
             return interface_dict
-        
-        translated = {}
-        for key, value in interface_dict.items():
-            if isinstance(value, str):
-                translated[key] = await self.translate_text(value, target_language, "interface")
-            elif isinstance(value, dict):
-                translated[key] = await self.translate_interface(value, target_language)
-            elif isinstance(value, list):
-                translated[key] = []
-                for item in value:
-                    if isinstance(item, str):
-                        translated[key].append(await self.translate_text(item, target_language, "interface"))
-                    else:
-                        translated[key].append(item)
-            else:
-                translated[key] = value
-        
-        return translated
+        return self._translate_value(interface_dict, target_language)
+    
+    def _translate_value(self, value: Any, language: str) -> Any:
+        """Translate the strings in a guidance block, one level of lists deep."""
+        if isinstance(value, str):
+            return self.translate(value, language, "interface")
+        if isinstance(value, dict):
+            return {key: self._translate_value(item, language) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.translate(item, language, "interface") if isinstance(item, str) else item
+                    for item in value]
+        return value
     
     async def process_spanish_name(self, name: str) -> Dict[str, List[str]]:
         """Process Spanish/Latino names for better matching."""
@@ -216,161 +344,69 @@ class LanguageProcessor:
     
     async def localize_response(self, response: Dict[str, Any], language: str) -> Dict[str, Any]:
         """Localize response data to specified language."""
+        return self.localize(response, language)
+    
+    def localize(self, response: Dict[str, Any], language: str) -> Dict[str, Any]:
+        """
+        Localize one response without modifying it.
+        
+        Args:
+            response: Response dictionary with optional status, error,
+                user_guidance and results
+            language: Target language code
+            
+        Returns:
+            Localized copy of the response (the response itself for English)
+        """
         if language == "en":
             return response
         
         localized = response.copy()
         
-        # Translate status messages
+        # Translate status and error messages
         if "status" in localized:
-            localized["status"] = await self.translate_text(
-                localized["status"], language, "status"
-            )
-        
-        # Translate error messages
+            localized["status"] = self.translate(localized["status"], language, "status")
         if "error" in localized:
-            localized["error"] = await self.translate_text(
-                localized["error"], language, "error"
-            )
+            localized["error"] = self.translate(localized["error"], language, "error")
         
         # Translate guidance and recommendations
         if "user_guidance" in localized:
-            localized["user_guidance"] = await self.translate_interface(
-                localized["user_guidance"], language
-            )
-        
-        # Translate facility information
-        if "results" in localized and isinstance(localized["results"], list):
-            for result in localized["results"]:
-                if "custody_status" in result:
-                    result["custody_status"] = await self.translate_text(
-                        result["custody_status"], language, "legal"
-                    )
+            localized["user_guidance"] = self._translate_value(localized["user_guidance"], language)
+        
+        # Translate custody status of each result
+        if isinstance(localized.get("results"), list):
+            localized["results"] = [
+                dict(result, custody_status=self.translate(result["custody_status"], language, "legal"))
+                if isinstance(result, dict) and "custody_status" in result else result
+                for result in localized["results"]
+            ]
         
         return localized
     
+    def localize_many(self, responses: Iterable[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+        """
+        Localize a batch of responses, e.g. the results of a bulk search.
+        
+        Runs synchronously with catalog lookups only, so a bulk response
+        costs one dictionary lookup per string rather than one coroutine.
+        
+        Args:
+            responses: Response dictionaries
+            language: Target language code
+            
+        Returns:
+            Localized copies in the same order
+        """
+        return [self.localize(response, language) for response in responses]
+    
     async def get_localized_resources(self, language: str) -> List[Dict[str, str]]:
         """Get localized resources and support contacts."""
-        if language == "es":
-            return [
-                {
-                    "name": "Línea Nacional de Inmigración",
-                    "phone": "1-855-234-1317",
-                    "description": "Asistencia legal gratuita en español",
-                    "type": "legal_aid"
-                },
-                {
-                    "name": "Unidos US (anteriormente UnidosUS)",
-                    "url": "https://unidosus.org",
-                    "description": "Recursos y apoyo para la comunidad latina",
-                    "type": "advocacy"
-                },
-                {
-                    "name": "Asociación Americana de Abogados de Inmigración (AILA)",
-                    "url": "https://aila.org",
-                    "description": "Encuentra abogados de inmigración calificados",
-                    "type": "legal"
-                },
-                {
-                    "name": "Directorio Nacional de Servicios Legales de Inmigración",
-                    "url": "https://nipnlg.org/PILdirectory",
-                    "description": "Servicios legales gratuitos y de bajo costo",
-                    "type": "legal_aid"
-                },
-                {
-                    "name": "Localizador de Detenidos de ICE",
-                    "url": "https://locator.ice.gov",
-                    "description": "Base de datos oficial de ICE para localizar detenidos",
-                    "type": "official"
-                }
-            ]
-        else:
-            return [
-                {
-                    "name": "ICE Online Detainee Locator",
-                    "url": "https://locator.ice.gov",
-                    "description": "Official ICE database for locating detainees",
-                    "type": "official"
-                },
-                {
-                    "name": "American Immigration Lawyers Association",
-                    "url": "https://aila.org",
-                    "description": "Find qualified immigration attorneys",
-                    "type": "legal"
-                },
-                {
-                    "name": "National Immigration Legal Services Directory",
-                    "url": "https://nipnlg.org/PILdirectory",
-                    "description": "Free and low-cost legal services",
-                    "type": "legal_aid"
-                },
-                {
-                    "name": "National Immigration Hotline",
-                    "phone": "1-855-234-1317",
-                    "description": "Free legal assistance hotline",
-                    "type": "legal_aid"
-                }
-            ]
+        return [dict(resource) for resource in LOCALIZED_RESOURCES.get(language, LOCALIZED_RESOURCES["en"])]
     
     async def _load_translations(self) -> None:
         """Load translation dictionaries."""
-        # Interface translations
-        self.translations = {
-            "es": {
-                # Search interface
-                "search": "buscar",
-                "find": "encontrar",
-                "results": "resultados",
-                "no results found": "no se encontraron resultados",
-                "search by name": "buscar por nombre",
-                "search by alien number": "buscar por número alien",
-                "first name": "nombre",
-                "last name": "apellido",
-                "alien number": "número alien",
-                "facility": "facilidad",
-                "detention center": "centro de detención",
-                
-                # Status messages
-                "found": "encontrado",
-                "not found": "no encontrado",
-                "in custody": "bajo custodia",
-                "released": "liberado",
-                "transferred": "transferido",
-                
-                # Error messages
-                "invalid input": "entrada inválida",
-                "rate limit exceeded": "límite de velocidad excedido",
-                "server error": "error del servidor",
-                "connection failed": "falló la conexión",
-                
-                # Interface elements
-                "loading": "cargando",
-                "please wait": "por favor espere",
-                "try again": "inténtelo de nuevo",
-                "help": "ayuda",
-                "contact": "contacto",
-                "resources": "recursos"
-            }
-        }
-        
-        # Legal terminology translations
-        self.legal_translations = {
-            "es": {
-                "detention": "detención",
-                "immigration court": "corte de inmigración",
-                "deportation": "deportación",
-                "removal proceedings": "procedimientos de deportación",
-                "bond hearing": "audiencia de fianza",
-                "legal representation": "representación legal",
-                "attorney": "abogado",
-                "interpreter": "intérprete",
-                "due process": "debido proceso",
-                "asylum": "asilo",
-                "refugee": "refugiado",
-                "temporary protected status": "estatus de protección temporal",
-                "withholding of removal": "suspensión de deportación"
-            }
-        }
+        self.translations = INTERFACE_CATALOG
+        self.legal_translations = LEGAL_CATALOG
     
     async def _extract_search_parameters(self, query: str, language: str) -> Dict[str, Any]:
         """Extract search parameters from natural language query."""
@@ -497,12 +533,11 @@ class MultiLanguageInterface:
             return response
         
         # Localize the response
-        localized_response = await self.processor.localize_response(response, target_language)
+        localized_response = self.processor.localize(response, target_language)
         
         # Add language-specific resources
         resources = await self.processor.get_localized_resources(target_language)
-        if "user_guidance" not in localized_response:
-            localized_response["user_guidance"] = {}
-        localized_response["user_guidance"]["resources"] = resources
+        localized_response["user_guidance"] = dict(localized_response.get("user_guidance") or {},
+                                                   resources=resources)
         
         return localized_response
\ No newline at end of file
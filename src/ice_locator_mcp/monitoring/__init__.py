@@ -10,16 +10,7 @@ This module provides privacy-first monitoring capabilities including:
 - Unified monitoring dashboard and alerting
 """
 
-from .mcpcat_integration import MCPcatMonitor
-from .privacy_redaction import DataRedactor
-from .telemetry_exporters import TelemetryExporter, TelemetryConfig
-from .monitoring_config import MonitoringConfig
-from .user_analytics import UserAnalytics, UserSession, BehaviorPattern
-from .session_replay import SessionRecorder, SessionReplay, ReplayEvent, EventType
-from .system_monitor import SystemMonitor, SystemMetrics, ProcessInfo
-from .comprehensive_monitor import ComprehensiveMonitor
-from .dashboard import MonitoringDashboard, AlertManager
-from .privacy_security import PrivacySecurityMonitor, AdvancedDataRedactor, ComplianceMonitor, ComplianceStandard
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     "MCPcatMonitor",
@@ -37,11 +28,45 @@ __all__ = [
     "SystemMonitor",
     "SystemMetrics",
     "ProcessInfo",
+    "MetricsRingStore",
+    "ArchiveSpec",
     "ComprehensiveMonitor",
     "MonitoringDashboard",
     "AlertManager",
+    "DashboardEventStream",
+    "create_dashboard_app",
     "PrivacySecurityMonitor",
     "AdvancedDataRedactor",
     "ComplianceMonitor",
     "ComplianceStandard"
-]
\ No newline at end of file
+]
+
+# Submodules (and OpenTelemetry, MCPcat, psutil) load on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "MCPcatMonitor": ".mcpcat_integration",
+    "DataRedactor": ".privacy_redaction",
+    "TelemetryExporter": ".telemetry_exporters",
+    "TelemetryConfig": ".telemetry_exporters",
+    "MonitoringConfig": ".monitoring_config",
+    "UserAnalytics": ".user_analytics",
+    "UserSession": ".user_analytics",
+    "BehaviorPattern": ".user_analytics",
+    "SessionRecorder": ".session_replay",
+    "SessionReplay": ".session_replay",
+    "ReplayEvent": ".session_replay",
+    "EventType": ".session_replay",
+    "SystemMonitor": ".system_monitor",
+    "SystemMetrics": ".system_monitor",
+    "ProcessInfo": ".system_monitor",
+    "MetricsRingStore": ".metrics_store",
+    "ArchiveSpec": ".metrics_store",
+    "ComprehensiveMonitor": ".comprehensive_monitor",
+    "MonitoringDashboard": ".dashboard",
+    "AlertManager": ".dashboard",
+    "DashboardEventStream": ".dashboard_stream",
+    "create_dashboard_app": ".dashboard_stream",
+    "PrivacySecurityMonitor": ".privacy_security",
+    "AdvancedDataRedactor": ".privacy_security",
+    "ComplianceMonitor": ".privacy_security",
+    "ComplianceStandard": ".privacy_security"
+})
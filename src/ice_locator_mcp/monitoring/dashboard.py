@@ -17,6 +17,7 @@ from enum import Enum
 import structlog
 
 from .comprehensive_monitor import ComprehensiveMonitor
+from .dashboard_stream import DashboardEventStream, create_dashboard_app, stream_script
 from ..core.config import ServerConfig
 
 
@@ -220,6 +221,9 @@ class AlertManager:
         # Cooldown tracking
         self.rule_cooldowns: Dict[str, datetime] = {}
         
+        # Listeners for alert state changes (e.g. the live dashboard stream)
+        self.listeners: List[Callable[[str, Alert], None]] = []
+        
         # Initialize default alert rules
         self._initialize_default_rules()
         
@@ -286,6 +290,28 @@ class AlertManager:
                 severity=AlertSeverity.WARNING,
                 cooldown_minutes=5,
                 notification_channels=["log"]
+            ),
+            AlertRule(
+                rule_id="event_loop_lag",
+                name="Event Loop Lag",
+                description="Event loop woke a task more than 250ms late",
+                metric_name="event_loop_lag_ms",
+                condition="gt",
+                threshold=250.0,
+                severity=AlertSeverity.WARNING,
+                cooldown_minutes=5,
+                notification_channels=["log", "webhook"]
+            ),
+            AlertRule(
+                rule_id="slow_callbacks",
+                name="Slow Event Loop Callbacks",
+                description="More than 3 callbacks blocked the event loop since the last check",
+                metric_name="slow_callback_count",
+                condition="gt",
+                threshold=3.0,
+                severity=AlertSeverity.WARNING,
+                cooldown_minutes=5,
+                notification_channels=["log", "webhook"]
             )
         ]
         
@@ -311,6 +337,18 @@ class AlertManager:
                 "email", {"recipients": email_recipients}
             )
     
+    def add_listener(self, listener: Callable[[str, Alert], None]):
+        """Register a callback for alert changes (triggered, resolved, acknowledged)."""
+        self.listeners.append(listener)
+    
+    def _notify_listeners(self, action: str, alert: Alert):
+        """Notify listeners of an alert change."""
+        for listener in self.listeners:
+            try:
+                listener(action, alert)
+            except Exception as e:
+                self.logger.error("Alert listener failed", action=action, error=str(e))
+    
     async def evaluate_metrics(self, metrics: Dict[str, float]):
         """Evaluate metrics against alert rules."""
         for rule_id, rule in self.alert_rules.items():
@@ -367,6 +405,7 @@ class AlertManager:
         
         # Set cooldown
         self.rule_cooldowns[rule.rule_id] = datetime.now()
+        self._notify_listeners("triggered", alert)
         
         # Send notifications
         await self._send_notifications(alert, rule.notification_channels)
@@ -388,6 +427,7 @@ class AlertManager:
         
         # Remove from active alerts
         del self.active_alerts[rule_id]
+        self._notify_listeners("resolved", alert)
         
         self.logger.info("Alert resolved",
                         alert_id=alert.alert_id,
@@ -421,6 +461,7 @@ class AlertManager:
             if alert.alert_id == alert_id:
                 alert.status = AlertStatus.ACKNOWLEDGED
                 alert.acknowledged_at = datetime.now()
+                self._notify_listeners("acknowledged", alert)
                 self.logger.info("Alert acknowledged", alert_id=alert_id)
                 return True
         return False
@@ -457,12 +498,18 @@ class MonitoringDashboard:
     
     def __init__(self, comprehensive_monitor: ComprehensiveMonitor,
                  alert_manager: AlertManager,
-                 config: ServerConfig):
-        """Initialize monitoring dashboard."""
+                 config: ServerConfig,
+                 loop_lag_probe: Optional[Any] = None):
+        """Initialize monitoring dashboard.
+        
+        ``loop_lag_probe`` (an ``EventLoopLagProbe``) adds event loop lag and
+        slow callbacks to the dashboard data and the alert evaluation.
+        """
         self.logger = structlog.get_logger(__name__)
         self.comprehensive_monitor = comprehensive_monitor
         self.alert_manager = alert_manager
         self.config = config
+        self.loop_lag_probe = loop_lag_probe
         
         # Dashboard state
         self.is_running = False
@@ -473,21 +520,48 @@ class MonitoringDashboard:
         self.cache_timestamp: Optional[datetime] = None
         self.cache_ttl_seconds = 30
         
+        # Live delta stream (alerts, metric snapshots, tool-call counters)
+        self.event_stream = DashboardEventStream()
+        self.stream_interval_seconds = 1.0
+        self.stream_task: Optional[asyncio.Task] = None
+        self.last_tool_counts: Dict[str, int] = {}
+        self.alert_manager.add_listener(self._publish_alert)
+        
+        # Web server
+        self.server: Optional[Any] = None
+        self.server_task: Optional[asyncio.Task] = None
+        
         self.logger.info("Monitoring dashboard initialized")
     
-    async def start_dashboard(self, port: int = 8080) -> bool:
-        """Start the monitoring dashboard web server."""
+    async def start_dashboard(self, port: int = 8080, host: str = "localhost",
+                              serve: bool = True) -> bool:
+        """Start the monitoring loops and the dashboard web server.
+        
+        Args:
+            port: Port for the dashboard web server
+            host: Interface to bind
+            serve: If False, only run the monitoring and stream loops
+                (e.g. when the app is mounted elsewhere)
+        """
         if self.is_running:
             self.logger.warning("Dashboard already running")
             return False
         
         try:
-            # For now, just start the monitoring loop
-            # In a full implementation, this would start a web server
             self.is_running = True
             self.dashboard_task = asyncio.create_task(self._monitoring_loop())
+            self.stream_task = asyncio.create_task(self._stream_loop())
+            
+            if serve:
+                import uvicorn
+                
+                server_config = uvicorn.Config(
+                    create_dashboard_app(self), host=host, port=port, log_level="warning"
+                )
+                self.server = uvicorn.Server(server_config)
+                self.server_task = asyncio.create_task(self.server.serve())
             
-            self.logger.info("Monitoring dashboard started", port=port)
+            self.logger.info("Monitoring dashboard started", host=host, port=port, serve=serve)
             return True
             
         except Exception as e:
@@ -501,12 +575,19 @@ class MonitoringDashboard:
         
         self.is_running = False
         
-        if self.dashboard_task:
-            self.dashboard_task.cancel()
-            try:
-                await self.dashboard_task
-            except asyncio.CancelledError:
-                pass
+        if self.server:
+            self.server.should_exit = True
+            if self.server_task:
+                await self.server_task
+            self.server = None
+        
+        for task in (self.dashboard_task, self.stream_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         self.logger.info("Monitoring dashboard stopped")
         return True
@@ -532,6 +613,10 @@ class MonitoringDashboard:
             # Add system status
             dashboard_data["system_status"] = await self.comprehensive_monitor.get_health_status()
             
+            # Add event loop health
+            if self.loop_lag_probe:
+                dashboard_data["event_loop"] = self.loop_lag_probe.summary()
+            
             # Cache the data
             self.cached_metrics = dashboard_data
             self.cache_timestamp = datetime.now()
@@ -554,29 +639,96 @@ class MonitoringDashboard:
             self.logger.error("Failed to get real-time metrics", error=str(e))
             return {"error": str(e)}
     
+    def _publish_alert(self, action: str, alert: Alert):
+        """Push an alert change to stream subscribers."""
+        data = alert.to_dict()
+        data["action"] = action
+        self.event_stream.publish("alert", data)
+    
+    def publish_tool_call_deltas(self) -> Optional[Dict[str, Any]]:
+        """Push tool-call counters that changed since the last publish."""
+        tool_counts = self.comprehensive_monitor.session_metrics.get("tool_calls", {})
+        changed = {
+            tool: count for tool, count in tool_counts.items()
+            if self.last_tool_counts.get(tool) != count
+        }
+        if not changed:
+            return None
+        
+        self.last_tool_counts = dict(tool_counts)
+        success_rate = self.comprehensive_monitor.session_metrics.get("success_rate", {})
+        data = {
+            "changed": changed,
+            "total": sum(tool_counts.values()),
+            "successful": success_rate.get("successful", 0),
+            "failed": success_rate.get("failed", 0)
+        }
+        self.event_stream.publish("tool_calls", data)
+        return data
+    
+    def publish_metrics_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Push a lightweight system metrics snapshot."""
+        system_monitor = self.comprehensive_monitor.system_monitor
+        if not system_monitor:
+            return None
+        
+        data = system_monitor.sample_live_metrics()
+        data["timestamp"] = datetime.now().isoformat()
+        self.event_stream.publish("metrics", data)
+        return data
+    
+    async def _stream_loop(self):
+        """Publish deltas for live dashboard clients."""
+        while self.is_running:
+            try:
+                # Skip the sampling work entirely when nobody is watching
+                if self.event_stream.subscribers:
+                    self.publish_metrics_snapshot()
+                    self.publish_tool_call_deltas()
+                
+                await asyncio.sleep(self.stream_interval_seconds)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error("Error in dashboard stream loop", error=str(e))
+                await asyncio.sleep(self.stream_interval_seconds)
+    
+    async def evaluate_alerts(self) -> Dict[str, float]:
+        """Collect current metrics and evaluate them against the alert rules."""
+        flat_metrics: Dict[str, float] = {}
+        
+        # Get current metrics
+        if self.comprehensive_monitor.system_monitor:
+            metrics = await self.comprehensive_monitor.system_monitor.collect_metrics()
+            
+            # Convert to flat metrics dict for alert evaluation
+            flat_metrics.update({
+                "cpu_percent": metrics.cpu_percent,
+                "memory_percent": metrics.memory_percent,
+                "disk_percent": metrics.disk_percent,
+                "process_cpu_percent": metrics.process_cpu_percent,
+                "process_memory_percent": metrics.process_memory_percent
+            })
+            
+            # Add derived metrics
+            # Note: Error rate would need to be calculated from session data
+            flat_metrics["error_rate_percent"] = 0.0  # Placeholder
+        
+        # Worst loop lag and slow callbacks since the previous evaluation
+        if self.loop_lag_probe:
+            flat_metrics.update(self.loop_lag_probe.alert_metrics())
+        
+        # Evaluate alerts
+        if flat_metrics:
+            await self.alert_manager.evaluate_metrics(flat_metrics)
+        return flat_metrics
+    
     async def _monitoring_loop(self):
         """Main monitoring loop for dashboard."""
         while self.is_running:
             try:
-                # Get current metrics
-                if self.comprehensive_monitor.system_monitor:
-                    metrics = await self.comprehensive_monitor.system_monitor.collect_metrics()
-                    
-                    # Convert to flat metrics dict for alert evaluation
-                    flat_metrics = {
-                        "cpu_percent": metrics.cpu_percent,
-                        "memory_percent": metrics.memory_percent,
-                        "disk_percent": metrics.disk_percent,
-                        "process_cpu_percent": metrics.process_cpu_percent,
-                        "process_memory_percent": metrics.process_memory_percent
-                    }
-                    
-                    # Add derived metrics
-                    # Note: Error rate would need to be calculated from session data
-                    flat_metrics["error_rate_percent"] = 0.0  # Placeholder
-                    
-                    # Evaluate alerts
-                    await self.alert_manager.evaluate_metrics(flat_metrics)
+                await self.evaluate_alerts()
                 
                 # Wait before next iteration
                 await asyncio.sleep(30)  # Check every 30 seconds
@@ -587,8 +739,13 @@ class MonitoringDashboard:
                 self.logger.error("Error in monitoring loop", error=str(e))
                 await asyncio.sleep(30)
     
-    def generate_dashboard_html(self, data: Dict[str, Any]) -> str:
-        """Generate basic HTML dashboard (for demonstration)."""
+    def generate_dashboard_html(self, data: Dict[str, Any],
+                                stream_url: Optional[str] = None) -> str:
+        """Generate basic HTML dashboard.
+        
+        If ``stream_url`` is given, the page subscribes to that SSE endpoint
+        and applies live deltas instead of being re-rendered.
+        """
         html = f"""
         <!DOCTYPE html>
         <html>
@@ -610,14 +767,14 @@ class MonitoringDashboard:
             
             <h2>System Health: <span class="{data.get('health_status', {}).get('overall_status', 'unknown')}">{data.get('health_status', {}).get('overall_status', 'Unknown').upper()}</span></h2>
             
-            <h3>Active Alerts ({len(data.get('alerts', {}).get('active_alerts', []))})</h3>
+            <h3>Active Alerts (<span id="active_alert_count">{len(data.get('alerts', {}).get('active_alerts', []))}</span>)</h3>
             <div id="alerts">
         """
         
         # Add active alerts
         for alert in data.get('alerts', {}).get('active_alerts', []):
             html += f"""
-                <div class="alert {alert['severity']}">
+                <div class="alert {alert['severity']}" id="alert-{alert['rule_id']}">
                     <strong>{alert['title']}</strong> - {alert['description']}<br>
                     <small>Triggered: {alert['triggered_at']} | Duration: {alert['duration_seconds']}s</small>
                 </div>
@@ -634,16 +791,22 @@ class MonitoringDashboard:
             </div>
             
             <h3>System Metrics</h3>
-            <div class="metric">CPU Usage: {system_component.get('cpu_percent', 'N/A')}%</div>
-            <div class="metric">Memory Usage: {system_component.get('memory_percent', 'N/A')}%</div>
-            <div class="metric">Disk Usage: {system_component.get('disk_percent', 'N/A')}%</div>
+            <div class="metric">CPU Usage: <span id="cpu_percent">{system_component.get('cpu_percent', 'N/A')}</span>%</div>
+            <div class="metric">Memory Usage: <span id="memory_percent">{system_component.get('memory_percent', 'N/A')}</span>%</div>
+            <div class="metric">Disk Usage: <span id="disk_percent">{system_component.get('disk_percent', 'N/A')}</span>%</div>
             
             <h3>Analytics Summary</h3>
             <div class="metric">Total Sessions: {data.get('analytics_summary', {}).get('total_sessions', 'N/A')}</div>
-            <div class="metric">Total Tool Calls: {data.get('analytics_summary', {}).get('total_tool_calls', 'N/A')}</div>
+            <div class="metric">Total Tool Calls: <span id="total_tool_calls">{data.get('analytics_summary', {}).get('total_tool_calls', 'N/A')}</span></div>
             <div class="metric">Average Session Duration: {data.get('analytics_summary', {}).get('average_session_duration_seconds', 'N/A')}s</div>
             
             <small>Generated at: {data.get('generated_at', 'Unknown')}</small>
+        """
+        
+        if stream_url:
+            html += stream_script(stream_url)
+        
+        html += """
         </body>
         </html>
         """
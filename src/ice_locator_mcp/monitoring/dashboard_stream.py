@@ -0,0 +1,208 @@
+"""
+Live event stream for the monitoring dashboard.
+
+Publishes small deltas (alert changes, metric snapshots, tool-call counters)
+to any number of subscribers over Server-Sent Events or WebSockets, so the
+dashboard page is rendered once and then kept current without re-pulling
+the multi-day aggregates.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+import structlog
+
+
+@dataclass
+class DashboardEvent:
+    """A single delta pushed to dashboard clients."""
+
+    event_id: int
+    event: str
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert event to dictionary (WebSocket frame)."""
+        return {
+            "id": self.event_id,
+            "event": self.event,
+            "data": self.data,
+            "timestamp": self.timestamp
+        }
+
+    def to_sse(self) -> str:
+        """Encode event as a Server-Sent Events message."""
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.event_id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+class DashboardEventStream:
+    """Fan-out of dashboard events with a bounded replay buffer.
+
+    Each subscriber owns a bounded queue. A subscriber that falls behind is
+    sent a ``resync`` event instead of blocking publishers; reconnecting
+    clients pass their last seen id and receive the missed events from the
+    replay buffer.
+    """
+
+    def __init__(self, history_size: int = 256, queue_size: int = 128):
+        self.logger = structlog.get_logger(__name__)
+        self.history: Deque[DashboardEvent] = deque(maxlen=history_size)
+        self.queue_size = queue_size
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.last_event_id = 0
+
+    def publish(self, event: str, data: Dict[str, Any]) -> DashboardEvent:
+        """Publish an event to all subscribers."""
+        self.last_event_id += 1
+        dashboard_event = DashboardEvent(self.last_event_id, event, data)
+        self.history.append(dashboard_event)
+
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(dashboard_event)
+            except asyncio.QueueFull:
+                # Slow client - drop its backlog and ask it to reload
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(DashboardEvent(self.last_event_id, "resync", {}))
+
+        return dashboard_event
+
+    def replay(self, last_event_id: int) -> Optional[List[DashboardEvent]]:
+        """Events after ``last_event_id``, or None if they have aged out."""
+        if last_event_id >= self.last_event_id:
+            return []
+        if not self.history or self.history[0].event_id > last_event_id + 1:
+            return None
+        return [e for e in self.history if e.event_id > last_event_id]
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[DashboardEvent]:
+        """Iterate over events, starting after ``last_event_id`` if given."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        if last_event_id is not None:
+            missed = self.replay(last_event_id)
+            if missed is None:
+                queue.put_nowait(DashboardEvent(self.last_event_id, "resync", {}))
+            else:
+                for dashboard_event in missed[-self.queue_size:]:
+                    queue.put_nowait(dashboard_event)
+
+        self.subscribers.add(queue)
+        self.logger.debug("Dashboard client subscribed", subscribers=len(self.subscribers))
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers.discard(queue)
+            self.logger.debug("Dashboard client unsubscribed", subscribers=len(self.subscribers))
+
+    async def sse(self, last_event_id: Optional[int] = None,
+                  heartbeat_seconds: float = 15.0) -> AsyncIterator[str]:
+        """Encode the subscription as SSE messages with keep-alive comments."""
+        events = self.subscribe(last_event_id).__aiter__()
+        next_event = asyncio.ensure_future(events.__anext__())
+        try:
+            while True:
+                done, _ = await asyncio.wait({next_event}, timeout=heartbeat_seconds)
+                if not done:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield next_event.result().to_sse()
+                next_event = asyncio.ensure_future(events.__anext__())
+        finally:
+            next_event.cancel()
+            await events.aclose()
+
+
+_STREAM_SCRIPT = """
+    <script>
+        const source = new EventSource("__STREAM_URL__");
+        const setText = (id, value) => {
+            const el = document.getElementById(id);
+            if (el) el.textContent = value;
+        };
+        source.addEventListener("metrics", (e) => {
+            const metrics = JSON.parse(e.data);
+            for (const [key, value] of Object.entries(metrics)) {
+                setText(key, typeof value === "number" ? value.toFixed(1) : value);
+            }
+        });
+        source.addEventListener("tool_calls", (e) => {
+            setText("total_tool_calls", JSON.parse(e.data).total);
+        });
+        source.addEventListener("alert", (e) => {
+            const alert = JSON.parse(e.data);
+            const container = document.getElementById("alerts");
+            const existing = document.getElementById("alert-" + alert.rule_id);
+            if (existing) existing.remove();
+            if (alert.status !== "resolved") {
+                const div = document.createElement("div");
+                div.id = "alert-" + alert.rule_id;
+                div.className = "alert " + alert.severity;
+                div.innerHTML = "<strong></strong> - <span></span>";
+                div.querySelector("strong").textContent = alert.title;
+                div.querySelector("span").textContent = alert.description;
+                container.prepend(div);
+            }
+            setText("active_alert_count", container.querySelectorAll(".alert").length);
+        });
+        source.addEventListener("resync", () => window.location.reload());
+    </script>
+"""
+
+
+def stream_script(stream_url: str) -> str:
+    """Client-side script that applies streamed deltas to the page."""
+    return _STREAM_SCRIPT.replace("__STREAM_URL__", stream_url)
+
+
+def create_dashboard_app(dashboard: Any) -> Any:
+    """Create the ASGI app serving the dashboard page and its event stream.
+
+    ``/`` renders ``generate_dashboard_html`` once per page load; ``/events``
+    (SSE) and ``/ws`` (WebSocket) then push deltas from the dashboard's
+    event stream.
+    """
+    from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+    from fastapi.responses import HTMLResponse, StreamingResponse
+
+    app = FastAPI(title="ICE Locator MCP Monitoring Dashboard", docs_url=None, redoc_url=None)
+
+    def _last_event_id(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value else None
+        except ValueError:
+            return None
+
+    @app.get("/", response_class=HTMLResponse)
+    async def index():
+        data = await dashboard.get_dashboard_data()
+        return HTMLResponse(dashboard.generate_dashboard_html(data, stream_url="events"))
+
+    @app.get("/events")
+    async def events(request: Request):
+        last_event_id = _last_event_id(request.headers.get("last-event-id"))
+        return StreamingResponse(
+            dashboard.event_stream.sse(last_event_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @app.websocket("/ws")
+    async def websocket_events(websocket: WebSocket):
+        await websocket.accept()
+        last_event_id = _last_event_id(websocket.query_params.get("last_event_id"))
+        try:
+            async for dashboard_event in dashboard.event_stream.subscribe(last_event_id):
+                await websocket.send_json(dashboard_event.to_dict())
+        except WebSocketDisconnect:
+            pass
+
+    return app
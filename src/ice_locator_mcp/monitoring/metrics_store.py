@@ -0,0 +1,206 @@
+"""
+Fixed-size ring-buffer time-series storage for system metrics.
+
+Implements an RRD-style store: each resolution (10s, 1m, 1h by default) is a
+fixed-size binary file mapped into memory as a NumPy structured array. Every
+recorded sample is consolidated into the matching bucket of every archive, so
+coarser resolutions are downsampled automatically and disk usage never grows.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import structlog
+
+
+STORE_VERSION = 1
+
+# Metrics averaged into every bucket
+STORE_FIELDS: Tuple[str, ...] = (
+    "cpu_percent",
+    "memory_percent",
+    "disk_percent",
+    "swap_percent",
+    "process_cpu_percent",
+    "process_memory_percent",
+    "process_memory_rss",
+    "process_num_threads",
+    "network_bytes_sent",
+    "network_bytes_recv",
+    "network_connections",
+)
+
+# Metrics whose per-bucket peak is also kept, so downsampled
+# archives still expose spikes for anomaly detection
+PEAK_FIELDS: Tuple[str, ...] = (
+    "cpu_percent",
+    "memory_percent",
+    "disk_percent",
+)
+
+METRICS_DTYPE = np.dtype(
+    [("timestamp", "f8"), ("samples", "u4")]
+    + [(name, "f8") for name in STORE_FIELDS]
+    + [(f"{name}_max", "f8") for name in PEAK_FIELDS]
+)
+
+
+@dataclass(frozen=True)
+class ArchiveSpec:
+    """Resolution and retention of a single ring archive."""
+
+    name: str
+    step_seconds: int
+    rows: int
+
+    @property
+    def retention_seconds(self) -> int:
+        """Time span covered by a full ring."""
+        return self.step_seconds * self.rows
+
+
+DEFAULT_ARCHIVES: Tuple[ArchiveSpec, ...] = (
+    ArchiveSpec("10s", 10, 8640),     # 24 hours
+    ArchiveSpec("1m", 60, 10080),     # 7 days
+    ArchiveSpec("1h", 3600, 8760),    # 365 days
+)
+
+
+class RingArchive:
+    """A single fixed-size, memory-mapped ring of consolidated buckets."""
+
+    def __init__(self, spec: ArchiveSpec, path: Path):
+        self.spec = spec
+        self.path = path
+
+        expected_size = spec.rows * METRICS_DTYPE.itemsize
+        mode = "r+" if path.exists() and path.stat().st_size == expected_size else "w+"
+        self.data = np.memmap(path, dtype=METRICS_DTYPE, mode=mode, shape=(spec.rows,))
+
+    def bucket_start(self, timestamp: float) -> float:
+        """Start of the bucket containing ``timestamp``."""
+        return math.floor(timestamp / self.spec.step_seconds) * self.spec.step_seconds
+
+    def record(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Consolidate one sample into its bucket (running mean and peak)."""
+        bucket_ts = self.bucket_start(timestamp)
+        index = int(bucket_ts // self.spec.step_seconds) % self.spec.rows
+        row = self.data[index]
+
+        if row["timestamp"] != bucket_ts or row["samples"] == 0:
+            # Slot holds an older lap of the ring (or nothing) - start fresh
+            samples = 1
+            averages = [float(values.get(name, 0.0)) for name in STORE_FIELDS]
+            peaks = [float(values.get(name, 0.0)) for name in PEAK_FIELDS]
+        else:
+            samples = int(row["samples"]) + 1
+            averages = [
+                row[name] + (float(values.get(name, 0.0)) - row[name]) / samples
+                for name in STORE_FIELDS
+            ]
+            peaks = [
+                max(row[f"{name}_max"], float(values.get(name, 0.0)))
+                for name in PEAK_FIELDS
+            ]
+
+        self.data[index] = (bucket_ts, samples, *averages, *peaks)
+
+    def fetch(self, start: float, end: float) -> np.ndarray:
+        """Return populated buckets in ``[start, end]`` ordered by time."""
+        data = self.data
+        start = self.bucket_start(start)
+        mask = (data["samples"] > 0) & (data["timestamp"] >= start) & (data["timestamp"] <= end)
+        rows = np.array(data[mask])
+        return rows[np.argsort(rows["timestamp"], kind="stable")]
+
+    def flush(self) -> None:
+        """Flush dirty pages to disk."""
+        self.data.flush()
+
+
+class MetricsRingStore:
+    """Multi-resolution, fixed-size time-series store for metric snapshots."""
+
+    def __init__(self, storage_path: Path,
+                 archives: Tuple[ArchiveSpec, ...] = DEFAULT_ARCHIVES):
+        self.logger = structlog.get_logger(__name__)
+        self.storage_path = storage_path
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+
+        # Finest resolution first so reads prefer detail
+        self.archives: List[RingArchive] = [
+            RingArchive(spec, self.storage_path / f"metrics_v{STORE_VERSION}_{spec.name}.ring")
+            for spec in sorted(archives, key=lambda s: s.step_seconds)
+        ]
+
+        self.logger.info("Metrics ring store opened",
+                        storage_path=str(self.storage_path),
+                        archives=[a.spec.name for a in self.archives],
+                        size_bytes=self.size_bytes)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total (fixed) on-disk size of all ring files."""
+        return sum(a.spec.rows * METRICS_DTYPE.itemsize for a in self.archives)
+
+    def record(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Record a sample into every archive."""
+        for archive in self.archives:
+            archive.record(timestamp, values)
+
+    def record_snapshot(self, metrics: Any) -> None:
+        """Record a ``SystemMetrics`` snapshot."""
+        timestamp = metrics.timestamp.timestamp()
+        values = {name: getattr(metrics, name, 0.0) or 0.0 for name in STORE_FIELDS}
+        self.record(timestamp, values)
+
+    def select_archive(self, start: float, end: Optional[float] = None,
+                       resolution: Optional[str] = None) -> RingArchive:
+        """Pick the archive to answer a range query.
+
+        Uses the named resolution if given, otherwise the finest archive
+        whose retention still reaches back to ``start``.
+        """
+        if resolution is not None:
+            for archive in self.archives:
+                if archive.spec.name == resolution:
+                    return archive
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        now = max(time.time(), end or 0.0)
+        for archive in self.archives:
+            if now - start <= archive.spec.retention_seconds:
+                return archive
+        return self.archives[-1]
+
+    def fetch(self, start: float, end: Optional[float] = None,
+              resolution: Optional[str] = None) -> np.ndarray:
+        """Read consolidated buckets for an arbitrary time range."""
+        end = time.time() if end is None else end
+        return self.select_archive(start, end, resolution).fetch(start, end)
+
+    def flush(self) -> None:
+        """Flush all archives to disk."""
+        for archive in self.archives:
+            archive.flush()
+
+    def get_info(self) -> Dict[str, Any]:
+        """Describe the store layout."""
+        return {
+            "storage_path": str(self.storage_path),
+            "size_bytes": self.size_bytes,
+            "archives": [
+                {
+                    "name": a.spec.name,
+                    "step_seconds": a.spec.step_seconds,
+                    "rows": a.spec.rows,
+                    "retention_seconds": a.spec.retention_seconds,
+                    "populated_rows": int(np.count_nonzero(a.data["samples"]))
+                }
+                for a in self.archives
+            ]
+        }
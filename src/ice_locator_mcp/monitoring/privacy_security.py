@@ -9,8 +9,10 @@ import asyncio
 import json
 import re
 import hashlib
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set, Pattern
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Any, Set, Pattern
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from enum import Enum
@@ -18,6 +20,11 @@ import logging
 
 import structlog
 
+from ..utils.sketches import SlidingWindowCounter
+
+HOUR = 3600
+DAY = 24 * HOUR
+
 
 class ComplianceStandard(Enum):
     """Supported compliance standards."""
@@ -199,18 +206,76 @@ class AdvancedDataRedactor:
         }
 
 
+class BoundedEventLog:
+    """Fixed-capacity log of event dicts in arrival order.
+    
+    Each entry gets a numeric ``timestamp`` (epoch seconds). Once full, the
+    oldest entry is dropped for each new one; ``on_evict`` sees every entry
+    that leaves the log, so callers can keep incremental aggregates exact.
+    """
+    
+    def __init__(self, maxlen: int, on_evict: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.entries: Deque[Dict[str, Any]] = deque()
+        self.maxlen = maxlen
+        self.on_evict = on_evict
+        self.total_appended = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.entries)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.entries[index]
+    
+    def _evict_oldest(self) -> None:
+        entry = self.entries.popleft()
+        if self.on_evict:
+            self.on_evict(entry)
+    
+    def append(self, entry: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+        """Add an entry, stamping it with the current time."""
+        entry["timestamp"] = time.time() if now is None else now
+        if len(self.entries) >= self.maxlen:
+            self._evict_oldest()
+        self.entries.append(entry)
+        self.total_appended += 1
+        return entry
+    
+    def expire(self, cutoff: float) -> int:
+        """Drop entries older than ``cutoff``; costs O(removed)."""
+        removed = 0
+        while self.entries and self.entries[0]["timestamp"] < cutoff:
+            self._evict_oldest()
+            removed += 1
+        return removed
+
+
 class ComplianceMonitor:
     """Monitors system compliance with privacy regulations."""
     
-    def __init__(self, standards: List[ComplianceStandard] = None):
+    def __init__(self, standards: List[ComplianceStandard] = None,
+                 max_log_entries: int = 10_000):
         """Initialize compliance monitor."""
         self.logger = structlog.get_logger(__name__)
         self.standards = standards or [ComplianceStandard.GDPR]
+        self._standard_values = [std.value for std in self.standards]
         
-        # Monitoring state
-        self.data_processing_log: List[Dict[str, Any]] = []
+        # Monitoring state (logs are bounded; the counters below cover all time)
+        self.data_processing_log = BoundedEventLog(max_log_entries)
         self.consent_records: Dict[str, Dict[str, Any]] = {}
-        self.audit_trail: List[Dict[str, Any]] = []
+        self.audit_trail = BoundedEventLog(max_log_entries)
+        
+        # Incremental aggregates for reports
+        self.recent_operations = SlidingWindowCounter(30 * DAY, slot_seconds=HOUR, max_keys=1_000)
+        self.consent_types: Counter = Counter()
+        self.granted_consents = 0
+        self.total_consents = 0
+        
+        # Open violations by id, kept until resolved even after the audit
+        # trail has evicted them
+        self.unresolved_violations: Dict[str, Dict[str, Any]] = {}
         
         self.logger.info("Compliance monitor initialized",
                         standards=[std.value for std in self.standards])
@@ -221,16 +286,16 @@ class ComplianceMonitor:
         """Log data processing activities for compliance audit."""
         
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
             "operation": operation,
             "data_types": [dt.value for dt in data_types],
             "purpose": purpose,
             "legal_basis": legal_basis,
             "user_consent": user_consent,
-            "compliance_standards": [std.value for std in self.standards]
+            "compliance_standards": self._standard_values
         }
         
         self.data_processing_log.append(log_entry)
+        self.recent_operations.add(operation, now=log_entry["timestamp"])
         
         self.logger.info("Data processing logged",
                         operation=operation,
@@ -242,7 +307,7 @@ class ComplianceMonitor:
         """Record user consent for data processing."""
         
         consent_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
             "consent_type": consent_type,
             "granted": granted,
             "purpose": purpose
@@ -251,6 +316,16 @@ class ComplianceMonitor:
         if user_id not in self.consent_records:
             self.consent_records[user_id] = {}
         
+        # A new decision replaces the user's previous one for this consent type
+        previous = self.consent_records[user_id].get(consent_type)
+        if previous is None:
+            self.total_consents += 1
+            self.consent_types[consent_type] += 1
+        elif previous["granted"]:
+            self.granted_consents -= 1
+        if granted:
+            self.granted_consents += 1
+        
         self.consent_records[user_id][consent_type] = consent_record
         
         self.logger.info("User consent recorded",
@@ -258,30 +333,51 @@ class ComplianceMonitor:
                         consent_type=consent_type,
                         granted=granted)
     
+    def record_violation(self, violation_type: str, description: str,
+                         severity: str = "medium") -> Dict[str, Any]:
+        """Add a compliance violation to the audit trail."""
+        
+        violation = self.audit_trail.append({
+            "violation_id": f"violation_{self.audit_trail.total_appended + 1}",
+            "violation_type": violation_type,
+            "description": description,
+            "severity": severity,
+            "resolved": False
+        })
+        self.unresolved_violations[violation["violation_id"]] = violation
+        
+        self.logger.warning("Compliance violation recorded",
+                           violation_type=violation_type,
+                           severity=severity)
+        return violation
+    
+    def resolve_violation(self, violation_id: str) -> bool:
+        """Mark a violation as resolved, whether or not it is still in the audit trail."""
+        
+        violation = self.unresolved_violations.pop(violation_id, None)
+        if violation is None:
+            return False
+        # The audit trail holds the same dict while it still has the entry
+        violation["resolved"] = True
+        return True
+    
     def generate_compliance_report(self) -> Dict[str, Any]:
         """Generate comprehensive compliance report."""
         
         return {
             "generated_at": datetime.now().isoformat(),
-            "compliance_standards": [std.value for std in self.standards],
+            "compliance_standards": self._standard_values,
             "data_processing_summary": {
-                "total_operations": len(self.data_processing_log),
-                "operations_last_30_days": len([
-                    entry for entry in self.data_processing_log
-                    if datetime.fromisoformat(entry["timestamp"]) > 
-                    datetime.now() - timedelta(days=30)
-                ])
+                "total_operations": self.data_processing_log.total_appended,
+                "operations_last_30_days": self.recent_operations.total()
             },
             "consent_summary": {
                 "total_users": len(self.consent_records),
-                "consent_types": list(set(
-                    consent_type for user_consents in self.consent_records.values()
-                    for consent_type in user_consents.keys()
-                ))
+                "consent_types": list(self.consent_types)
             },
             "compliance_violations": {
-                "total": len(self.audit_trail),
-                "unresolved": len([v for v in self.audit_trail if not v.get("resolved")])
+                "total": self.audit_trail.total_appended,
+                "unresolved": len(self.unresolved_violations)
             }
         }
 
@@ -289,8 +385,16 @@ class ComplianceMonitor:
 class PrivacySecurityMonitor:
     """Comprehensive privacy and security monitoring system."""
     
+    # Access logs are kept for at most this long (see cleanup_expired_data)
+    ACCESS_LOG_RETENTION_SECONDS = 90 * DAY
+    
+    # More requests than this from one user within an hour is suspicious
+    EXCESSIVE_REQUESTS_PER_HOUR = 50
+    
     def __init__(self, compliance_standards: List[ComplianceStandard] = None,
-                 storage_path: Optional[Path] = None):
+                 storage_path: Optional[Path] = None,
+                 max_access_logs: int = 10_000,
+                 max_security_events: int = 1_000):
         """Initialize privacy and security monitor."""
         self.logger = structlog.get_logger(__name__)
         self.compliance_standards = compliance_standards or [ComplianceStandard.GDPR]
@@ -299,9 +403,12 @@ class PrivacySecurityMonitor:
         self.data_redactor = AdvancedDataRedactor(self.compliance_standards)
         self.compliance_monitor = ComplianceMonitor(self.compliance_standards)
         
-        # Security monitoring
-        self.security_events: List[Dict[str, Any]] = []
-        self.access_logs: List[Dict[str, Any]] = []
+        # Security monitoring (bounded logs with incremental aggregates)
+        self.security_events = BoundedEventLog(max_security_events)
+        self.access_logs = BoundedEventLog(max_access_logs, on_evict=self._forget_access)
+        self.logged_users: Counter = Counter()  # user_id -> retained access log entries
+        self.hourly_requests = SlidingWindowCounter(HOUR, slot_seconds=60)
+        self.recent_security_events = SlidingWindowCounter(DAY, slot_seconds=HOUR, max_keys=1_000)
         
         # Privacy metrics
         self.privacy_metrics = {
@@ -374,7 +481,6 @@ class PrivacySecurityMonitor:
         """Log access attempt for security monitoring."""
         
         access_log = {
-            "timestamp": datetime.now().isoformat(),
             "operation": "search_access",
             "user_id": user_context.get("user_id") if user_context else "anonymous",
             "ip_address": user_context.get("ip_address") if user_context else None,
@@ -386,10 +492,21 @@ class PrivacySecurityMonitor:
         }
         
         self.access_logs.append(access_log)
+        user_id = access_log["user_id"]
+        if user_id and user_id != "anonymous":
+            self.logged_users[user_id] += 1
         
         # Check for suspicious patterns
         self._detect_suspicious_activity(access_log)
     
+    def _forget_access(self, access_log: Dict[str, Any]):
+        """Keep the per-user index in step with entries leaving the access log."""
+        user_id = access_log.get("user_id")
+        if user_id in self.logged_users:
+            self.logged_users[user_id] -= 1
+            if not self.logged_users[user_id]:
+                del self.logged_users[user_id]
+    
     def _detect_suspicious_activity(self, access_log: Dict[str, Any]):
         """Detect suspicious access patterns."""
         
@@ -398,24 +515,18 @@ class PrivacySecurityMonitor:
             return
         
         # Check for excessive requests
-        recent_logs = [
-            log for log in self.access_logs[-100:]  # Last 100 logs
-            if log.get("user_id") == user_id and
-            datetime.fromisoformat(log["timestamp"]) > 
-            datetime.now() - timedelta(hours=1)
-        ]
+        request_count = self.hourly_requests.add(user_id, now=access_log["timestamp"])
         
-        if len(recent_logs) > 50:  # More than 50 requests in 1 hour
-            security_event = {
-                "timestamp": datetime.now().isoformat(),
+        if request_count > self.EXCESSIVE_REQUESTS_PER_HOUR:
+            security_event = self.security_events.append({
                 "event_type": "excessive_requests",
                 "severity": "medium",
                 "user_id": user_id,
-                "description": f"User made {len(recent_logs)} requests in the last hour",
-                "metadata": {"request_count": len(recent_logs)}
-            }
+                "description": f"User made {request_count} requests in the last hour",
+                "metadata": {"request_count": request_count}
+            })
+            self.recent_security_events.add(security_event["event_type"], now=security_event["timestamp"])
             
-            self.security_events.append(security_event)
             self.logger.warning("Suspicious activity detected", **security_event)
     
     async def _update_privacy_metrics(self):
@@ -427,15 +538,9 @@ class PrivacySecurityMonitor:
         self.privacy_metrics["redaction_effectiveness"] = min(total_redactions / 100.0, 1.0)
         
         # Consent rate
-        consent_records = self.compliance_monitor.consent_records
-        if consent_records:
-            granted_consents = sum(
-                1 for user_consents in consent_records.values()
-                for consent in user_consents.values()
-                if consent.get("granted", False)
-            )
-            total_consents = sum(len(consents) for consents in consent_records.values())
-            self.privacy_metrics["consent_rate"] = granted_consents / total_consents if total_consents > 0 else 0.0
+        compliance = self.compliance_monitor
+        if compliance.total_consents:
+            self.privacy_metrics["consent_rate"] = compliance.granted_consents / compliance.total_consents
         
         # Overall compliance score
         self.privacy_metrics["compliance_score"] = (
@@ -455,33 +560,24 @@ class PrivacySecurityMonitor:
             "compliance_report": compliance_report,
             "redaction_statistics": redaction_stats,
             "security_events": {
-                "total": len(self.security_events),
-                "recent": len([
-                    event for event in self.security_events
-                    if datetime.fromisoformat(event["timestamp"]) > 
-                    datetime.now() - timedelta(hours=24)
-                ])
+                "total": self.security_events.total_appended,
+                "recent": self.recent_security_events.total()
             },
             "access_logs": {
                 "total": len(self.access_logs),
-                "unique_users": len(set(
-                    log.get("user_id") for log in self.access_logs
-                    if log.get("user_id") and log.get("user_id") != "anonymous"
-                ))
+                "unique_users": len(self.logged_users)
             }
         }
     
     async def cleanup_expired_data(self):
         """Clean up data that exceeds retention policies."""
         
-        # Clean up old access logs (keep only 90 days)
-        cutoff_date = datetime.now() - timedelta(days=90)
-        original_count = len(self.access_logs)
-        self.access_logs = [
-            log for log in self.access_logs
-            if datetime.fromisoformat(log["timestamp"]) > cutoff_date
-        ]
+        # Clean up old access logs (keep only 90 days); the log is in time
+        # order, so only the expired entries are touched
+        removed_count = self.access_logs.expire(time.time() - self.ACCESS_LOG_RETENTION_SECONDS)
+        
+        # Forget users with no requests in the last hour
+        self.hourly_requests.prune()
         
-        removed_count = original_count - len(self.access_logs)
         if removed_count > 0:
             self.logger.info("Old access logs cleaned up", removed_count=removed_count)
\ No newline at end of file
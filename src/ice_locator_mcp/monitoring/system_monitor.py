@@ -6,17 +6,17 @@ for comprehensive performance visibility and resource usage tracking.
 """
 
 import asyncio
-import json
 import subprocess
 import time
 import psutil
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 import logging
 import shutil
 
+import numpy as np
 import structlog
 try:
     import mcpcat
@@ -25,6 +25,8 @@ except ImportError:
     mcpcat = None
     MCPCAT_AVAILABLE = False
 
+from .metrics_store import MetricsRingStore
+
 
 @dataclass
 class SystemMetrics:
@@ -135,10 +137,12 @@ class SystemMonitor:
         self.is_monitoring = False
         self.monitoring_task: Optional[asyncio.Task] = None
         self.current_process = psutil.Process()
+        psutil.cpu_percent(interval=None)  # Start the CPU measurement window
         
-        # Metrics history
+        # Metrics history (recent snapshots in memory, long-term in ring files)
         self.metrics_history: List[SystemMetrics] = []
         self.max_history_size = 1000  # Keep last 1000 metric snapshots
+        self.history_store = MetricsRingStore(self.storage_path)
         
         # Tool availability
         self.available_tools = self._check_available_tools()
@@ -233,7 +237,8 @@ class SystemMonitor:
         
         try:
             # CPU metrics
-            metrics.cpu_percent = psutil.cpu_percent(interval=1)
+            # Measured since the previous call; interval=1 would block the loop for a second
+            metrics.cpu_percent = psutil.cpu_percent(interval=None)
             metrics.cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             metrics.cpu_freq = cpu_freq.current if cpu_freq else None
@@ -300,7 +305,26 @@ class SystemMonitor:
             self.logger.error("Failed to collect system metrics", error=str(e))
         
         return metrics
-    
+
+    def sample_live_metrics(self) -> Dict[str, float]:
+        """Take a cheap, non-blocking snapshot for live dashboards.
+
+        Unlike ``collect_metrics`` this never sleeps (CPU is measured since
+        the previous call) and skips connection and disk I/O scans, so it can
+        run every second on the event loop.
+        """
+        memory = psutil.virtual_memory()
+        process_memory = self.current_process.memory_info()
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": memory.percent,
+            "disk_percent": psutil.disk_usage('/').percent,
+            "process_cpu_percent": self.current_process.cpu_percent(),
+            "process_memory_percent": self.current_process.memory_percent(),
+            "process_memory_rss": process_memory.rss,
+            "process_num_threads": self.current_process.num_threads()
+        }
+
     async def get_top_processes(self, limit: int = 10) -> List[ProcessInfo]:
         """Get top processes by CPU usage."""
         processes = []
@@ -389,44 +413,41 @@ class SystemMonitor:
     
     async def analyze_performance_trends(self, lookback_minutes: int = 60) -> Dict[str, Any]:
         """Analyze performance trends over time."""
-        if len(self.metrics_history) < 2:
-            return {"error": "Insufficient data for trend analysis"}
-        
-        cutoff_time = datetime.now() - timedelta(minutes=lookback_minutes)
-        recent_metrics = [
-            m for m in self.metrics_history 
-            if m.timestamp >= cutoff_time
-        ]
+        recent = self.history_store.fetch(time.time() - lookback_minutes * 60)
         
-        if len(recent_metrics) < 2:
+        if len(recent) < 2:
             return {"error": "Insufficient recent data for trend analysis"}
         
         # Calculate trends
-        cpu_trend = self._calculate_trend([m.cpu_percent for m in recent_metrics])
-        memory_trend = self._calculate_trend([m.memory_percent for m in recent_metrics])
-        disk_trend = self._calculate_trend([m.disk_percent for m in recent_metrics])
+        cpu_trend = self._calculate_trend(recent["cpu_percent"])
+        memory_trend = self._calculate_trend(recent["memory_percent"])
+        disk_trend = self._calculate_trend(recent["disk_percent"])
         
         # Process-specific trends
-        process_cpu_trend = self._calculate_trend([m.process_cpu_percent for m in recent_metrics])
-        process_memory_trend = self._calculate_trend([m.process_memory_percent for m in recent_metrics])
+        process_cpu_trend = self._calculate_trend(recent["process_cpu_percent"])
+        process_memory_trend = self._calculate_trend(recent["process_memory_percent"])
         
-        # Calculate averages
-        avg_cpu = sum(m.cpu_percent for m in recent_metrics) / len(recent_metrics)
-        avg_memory = sum(m.memory_percent for m in recent_metrics) / len(recent_metrics)
-        avg_disk = sum(m.disk_percent for m in recent_metrics) / len(recent_metrics)
+        # Calculate sample-weighted averages
+        weights = recent["samples"]
+        avg_cpu = float(np.average(recent["cpu_percent"], weights=weights))
+        avg_memory = float(np.average(recent["memory_percent"], weights=weights))
+        avg_disk = float(np.average(recent["disk_percent"], weights=weights))
         
-        # Detect anomalies
+        # Detect anomalies from per-bucket peaks
         anomalies = []
-        if any(m.cpu_percent > 90 for m in recent_metrics):
+        if (recent["cpu_percent_max"] > 90).any():
             anomalies.append("High CPU usage detected")
-        if any(m.memory_percent > 90 for m in recent_metrics):
+        if (recent["memory_percent_max"] > 90).any():
             anomalies.append("High memory usage detected")
-        if any(m.disk_percent > 95 for m in recent_metrics):
+        if (recent["disk_percent_max"] > 95).any():
             anomalies.append("Low disk space detected")
         
+        current = self.metrics_history[-1] if self.metrics_history else None
+        
         return {
             "analysis_period_minutes": lookback_minutes,
-            "data_points": len(recent_metrics),
+            "data_points": len(recent),
+            "samples": int(weights.sum()),
             "trends": {
                 "cpu_percent": cpu_trend,
                 "memory_percent": memory_trend,
@@ -440,23 +461,19 @@ class SystemMonitor:
                 "disk_percent": round(avg_disk, 2)
             },
             "anomalies": anomalies,
-            "current_metrics": recent_metrics[-1].to_dict(),
-            "baseline_comparison": self._compare_to_baseline(recent_metrics[-1]) if self.baseline_metrics else None
+            "current_metrics": current.to_dict() if current else None,
+            "baseline_comparison": self._compare_to_baseline(current) if self.baseline_metrics and current else None
         }
     
-    def _calculate_trend(self, values: List[float]) -> str:
-        """Calculate trend direction from a list of values."""
-        if len(values) < 2:
+    def _calculate_trend(self, values: Union[np.ndarray, List[float]]) -> str:
+        """Calculate trend direction from a series of values."""
+        values = np.asarray(values, dtype=float)
+        if values.size < 2:
             return "insufficient_data"
         
         # Simple linear trend calculation
-        first_half = values[:len(values)//2]
-        second_half = values[len(values)//2:]
-        
-        first_avg = sum(first_half) / len(first_half)
-        second_avg = sum(second_half) / len(second_half)
-        
-        diff = second_avg - first_avg
+        half = values.size // 2
+        diff = values[half:].mean() - values[:half].mean()
         
         if abs(diff) < 1.0:  # Less than 1% change
             return "stable"
@@ -485,6 +502,7 @@ class SystemMonitor:
                 # Collect metrics
                 metrics = await self.collect_metrics()
                 self.metrics_history.append(metrics)
+                self.history_store.record_snapshot(metrics)
                 
                 # Limit history size
                 if len(self.metrics_history) > self.max_history_size:
@@ -562,24 +580,13 @@ class SystemMonitor:
             self.logger.warning("System alerts triggered", alerts=alerts)
     
     async def _save_metrics_to_disk(self):
-        """Save metrics history to disk."""
+        """Flush the fixed-size metrics ring files to disk."""
         try:
-            metrics_file = self.storage_path / f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            metrics_data = {
-                "collection_interval": self.collection_interval,
-                "start_time": self.metrics_history[0].timestamp.isoformat() if self.metrics_history else None,
-                "end_time": self.metrics_history[-1].timestamp.isoformat() if self.metrics_history else None,
-                "total_snapshots": len(self.metrics_history),
-                "metrics": [m.to_dict() for m in self.metrics_history]
-            }
-            
-            with open(metrics_file, 'w') as f:
-                json.dump(metrics_data, f, indent=2)
+            self.history_store.flush()
             
             self.logger.info("Metrics saved to disk", 
-                           file=str(metrics_file),
-                           snapshots=len(self.metrics_history))
+                           storage_path=str(self.storage_path),
+                           size_bytes=self.history_store.size_bytes)
         
         except Exception as e:
             self.logger.error("Failed to save metrics to disk", error=str(e))
@@ -610,6 +617,7 @@ class SystemMonitor:
                 "is_monitoring": self.is_monitoring,
                 "collection_interval": self.collection_interval,
                 "metrics_history_size": len(self.metrics_history),
+                "history_store": self.history_store.get_info(),
                 "baseline_available": self.baseline_metrics is not None
             }
         }
\ No newline at end of file
@@ -3,15 +3,15 @@ Reporting tools for generating comprehensive search reports and analytics.
 """
 
 import asyncio
-import json
 import time
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 import structlog
 
-from ..core.config import Config
+from ..core.config import ServerConfig
+from ..utils.serialization import dumps
 
 
 @dataclass
@@ -42,7 +42,7 @@ class ReportTemplate:
 class ReportGenerator:
     """Generates comprehensive reports for search results."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: ServerConfig):
         self.config = config
         self.logger = structlog.get_logger(__name__)
         
@@ -608,7 +608,7 @@ class ReportGenerator:
     
     async def _format_json(self, report: SearchReport, template: ReportTemplate) -> str:
         """Format report as JSON."""
-        return json.dumps(asdict(report), indent=2)
+        return dumps(report, compact=self.config.compact_json)
     
     async def save_report(
         self,
@@ -9,81 +9,226 @@ import asyncio
 import logging
 import json
 import os
+import re
+import sqlite3
+import time
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from typing import Any, Dict, List, Optional, Sequence
 
 import mcp.types as types
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 from mcp.server import Server
-from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 import structlog
 
 from .core.config import ServerConfig
-from .core.search_engine import SearchEngine
-from .anti_detection.proxy_manager import ProxyManager
-from .tools.search_tools import SearchTools
 from .utils.logging import setup_logging
-from .monitoring.comprehensive_monitor import ComprehensiveMonitor
+from .utils.serialization import dumps
+
+
+_FACILITY_PATH = re.compile(r"facilities/(\d+)")
+
+# Tools dispatched by handle_call_tool; profiles of other names are labelled unknown
+TOOL_NAMES = (
+    "search_detainee_by_name",
+    "search_detainee_by_alien_number",
+    "smart_detainee_search",
+    "bulk_search_detainees",
+    "generate_search_report",
+)
+
+
+def _next_page_uri(base: str, page: Dict[str, Any], query: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """URI of the page after ``page``, or None on the last page."""
+    if page["page"] >= page["pages"]:
+        return None
+    params = dict(query or {}, page=page["page"] + 1, page_size=page["page_size"])
+    return f"{base}?{urlencode(params)}"
 
 
 class ICELocatorServer:
     """Main MCP server for ICE detainee location services."""
     
     def __init__(self, config: Optional[ServerConfig] = None):
-        """Initialize the ICE Locator MCP Server."""
+        """Initialize the ICE Locator MCP Server.
+        
+        Only the MCP handlers are set up here. Monitoring, the proxy manager,
+        the search engine and the facilities database are imported and built
+        on first use, so a new stdio session answers ``list_tools`` without
+        loading OpenTelemetry, MCPcat, psutil or the HTTP scraping stack.
+        """
         self.config = config or ServerConfig()
         self.logger = structlog.get_logger(__name__)
         
-        # Initialize comprehensive monitoring system
+        # Comprehensive monitoring is started with the search components on the first tool call
         self.comprehensive_monitor = None
         
+        # Alert evaluation for the loop lag probe (runs with comprehensive monitoring)
+        self.monitoring_dashboard = None
+        
         # Check if monitoring is disabled via environment variable
         monitoring_enabled = os.getenv("ICE_LOCATOR_ANALYTICS_ENABLED", "true").lower() == "true"
         mcpcat_enabled = os.getenv("ICE_LOCATOR_MCPCAT_ENABLED", "true").lower() == "true"
-        
-        if self.config.monitoring_config.mcpcat_enabled and monitoring_enabled and mcpcat_enabled:
-            try:
-                # Initialize comprehensive monitoring system
-                self.comprehensive_monitor = ComprehensiveMonitor(
-                    self.config.monitoring_config,
-                    storage_path=None  # Use default storage path
-                )
-                
-                self.logger.info(
-                    "Comprehensive monitoring initialized with privacy-first design",
-                    mcpcat_enabled=True,
-                    redaction_level=self.config.monitoring_config.redaction_level,
-                    components=["mcpcat", "telemetry", "analytics", "session_replay", "system_monitor"]
-                )
-            except Exception as e:
-                self.logger.warning(
-                    "Failed to initialize comprehensive monitoring - continuing without analytics",
-                    error=str(e)
-                )
-        else:
+        self.monitoring_requested = (
+            self.config.monitoring_config.mcpcat_enabled and monitoring_enabled and mcpcat_enabled
+        )
+        if not self.monitoring_requested:
             self.logger.info(
                 "Monitoring disabled via configuration",
                 monitoring_enabled=monitoring_enabled,
                 mcpcat_enabled=mcpcat_enabled
             )
         
-        # Initialize core components
-        self.proxy_manager = ProxyManager(self.config.proxy_config)
-        self.search_engine = SearchEngine(
-            proxy_manager=self.proxy_manager,
-            config=self.config.search_config
-        )
-        self.search_tools = SearchTools(self.search_engine)
+        # Core components (created on first access)
+        self._proxy_manager = None
+        self._search_engine = None
+        self._search_tools = None
+        self._components_ready: Optional[asyncio.Future] = None
+        
+        # Read-only facilities database behind the ice:// data resources (opened on first read)
+        self.resource_store = None
+        
+        # Prometheus side-port exposition (optional)
+        self.metrics_server = None
+        self._loop_lag_probe = None
+        
+        # Sampled per-phase profiling of tool calls (disabled by default)
+        self._tool_profiler = None
         
         # Initialize MCP server
         self.server = Server("ice-locator")
         self._register_handlers()
+    
+    @property
+    def proxy_manager(self):
+        """Proxy manager, created on first access."""
+        if self._proxy_manager is None:
+            from .anti_detection.proxy_manager import ProxyManager
+            self._proxy_manager = ProxyManager(self.config.proxy_config)
+        return self._proxy_manager
+    
+    @proxy_manager.setter
+    def proxy_manager(self, value) -> None:
+        self._proxy_manager = value
+    
+    @property
+    def search_engine(self):
+        """Search engine, created on first access."""
+        if self._search_engine is None:
+            from .core.search_engine import SearchEngine
+            self._search_engine = SearchEngine(
+                proxy_manager=self.proxy_manager,
+                config=self.config.search_config,
+                cache_dir=self.config.cache_config.cache_dir
+            )
+        return self._search_engine
+    
+    @search_engine.setter
+    def search_engine(self, value) -> None:
+        self._search_engine = value
+    
+    @property
+    def search_tools(self):
+        """MCP search tools, created on first access."""
+        if self._search_tools is None:
+            from .tools.search_tools import SearchTools
+            self._search_tools = SearchTools(self.search_engine, compact_json=self.config.compact_json)
+        return self._search_tools
+    
+    @search_tools.setter
+    def search_tools(self, value) -> None:
+        self._search_tools = value
+    
+    @property
+    def loop_lag_probe(self):
+        """Event loop lag probe and slow-callback detector, created on first access."""
+        if self._loop_lag_probe is None:
+            from .utils.prometheus_metrics import EventLoopLagProbe
+            self._loop_lag_probe = EventLoopLagProbe(
+                slow_callback_threshold=self.config.monitoring_config.slow_callback_ms / 1000
+            )
+        return self._loop_lag_probe
+    
+    @property
+    def tool_profiler(self):
+        """Sampled tool-call profiler, created on first access."""
+        if self._tool_profiler is None:
+            from .utils.profiling import ToolCallProfiler
+            self._tool_profiler = ToolCallProfiler(self.config.profiling_config, tool_names=TOOL_NAMES)
+        return self._tool_profiler
+    
+    @tool_profiler.setter
+    def tool_profiler(self, value) -> None:
+        self._tool_profiler = value
+    
+    async def ensure_components(self) -> None:
+        """Start monitoring and initialize the search components once.
         
-        # Set up MCPcat tracking after tools are registered
-        if self.comprehensive_monitor and hasattr(self.comprehensive_monitor, 'mcpcat_monitor'):
-            if self.comprehensive_monitor.mcpcat_monitor:
-                self.comprehensive_monitor.mcpcat_monitor.setup_tracking(self.server)
+        Concurrent first tool calls share one initialization; a failed
+        initialization is retried by the next call.
+        """
+        if self._components_ready is None:
+            self._components_ready = asyncio.ensure_future(self._initialize_components())
+        task = self._components_ready
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            if self._components_ready is task:
+                self._components_ready = None
+            raise
+    
+    async def _initialize_components(self) -> None:
+        if self.monitoring_requested:
+            await self._start_monitoring()
+        
+        await self.proxy_manager.initialize()
+        await self.search_engine.initialize()
+        self.logger.info("Search components initialized")
+    
+    async def _start_monitoring(self) -> None:
+        """Create the comprehensive monitor and start tracking this server."""
+        try:
+            from .monitoring.comprehensive_monitor import ComprehensiveMonitor
+            
+            monitor = ComprehensiveMonitor(
+                self.config.monitoring_config,
+                storage_path=None  # Use default storage path
+            )
+            
+            # Handlers are looked up per request, so MCPcat can wrap them after the server started
+            if getattr(monitor, 'mcpcat_monitor', None):
+                monitor.mcpcat_monitor.setup_tracking(self.server)
+            
+            await monitor.initialize()
+            await monitor.start_monitoring({
+                "server_version": self.config.server_version,
+                "startup_time": datetime.now().isoformat()
+            })
+            self.comprehensive_monitor = monitor
+            
+            # Feed loop lag and slow callbacks into the alert rules; the
+            # dashboard app itself is not served from the stdio server
+            if self._loop_lag_probe is not None:
+                from .monitoring.dashboard import AlertManager, MonitoringDashboard
+                
+                self.monitoring_dashboard = MonitoringDashboard(
+                    monitor, AlertManager(), self.config, loop_lag_probe=self._loop_lag_probe
+                )
+                await self.monitoring_dashboard.start_dashboard(serve=False)
+            
+            self.logger.info(
+                "Comprehensive monitoring initialized with privacy-first design",
+                mcpcat_enabled=True,
+                redaction_level=self.config.monitoring_config.redaction_level,
+                components=["mcpcat", "telemetry", "analytics", "session_replay", "system_monitor"]
+            )
+        except Exception as e:
+            self.logger.warning(
+                "Failed to initialize comprehensive monitoring - continuing without analytics",
+                error=str(e)
+            )
         
     def _register_handlers(self) -> None:
         """Register all MCP handlers."""
@@ -249,70 +394,87 @@ class ICELocatorServer:
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
-            """Handle tool calls with telemetry instrumentation."""
+            """Handle tool calls with telemetry instrumentation.
             
-            # Track tool call with comprehensive monitoring (privacy-preserving)
-            if self.comprehensive_monitor:
-                await self.comprehensive_monitor.track_tool_call(
-                    session_id="default",  # Use default session or implement session management
-                    tool_name=name,
-                    arguments=arguments
-                )
+            A sampled fraction of calls is profiled (see ``tool_profiler``).
+            """
+            from .utils.prometheus_metrics import record_tool_call
+            from .utils.profiling import phase
             
-            try:
-                self.logger.info("Tool called", tool_name=name, arguments=arguments)
+            async with self.tool_profiler.profile(name):
+                call_start = time.perf_counter()
+            
+                try:
+                    await self.ensure_components()
                 
-                if name == "search_detainee_by_name":
-                    result = await self.search_tools.search_by_name(**arguments)
-                elif name == "search_detainee_by_alien_number":
-                    result = await self.search_tools.search_by_alien_number(**arguments)
-                elif name == "smart_detainee_search":
-                    result = await self.search_tools.smart_search(**arguments)
-                elif name == "bulk_search_detainees":
-                    result = await self.search_tools.bulk_search(**arguments)
-                elif name == "generate_search_report":
-                    result = await self.search_tools.generate_report(**arguments)
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+                    # Track tool call with comprehensive monitoring (privacy-preserving)
+                    if self.comprehensive_monitor:
+                        with phase("telemetry"):
+                            await self.comprehensive_monitor.track_tool_call(
+                                session_id="default",  # Use default session or implement session management
+                                tool_name=name,
+                                arguments=arguments
+                            )
                 
-                # Track successful tool completion
-                if self.comprehensive_monitor:
-                    await self.comprehensive_monitor.track_tool_call(
-                        session_id="default",
-                        tool_name=name,
-                        arguments=arguments,
-                        result={"status": "success", "response": result},
-                        error=None
-                    )
+                    self.logger.info("Tool called", tool_name=name, arguments=arguments)
                 
-                self.logger.info("Tool completed successfully", tool_name=name)
+                    if name == "search_detainee_by_name":
+                        result = await self.search_tools.search_by_name(**arguments)
+                    elif name == "search_detainee_by_alien_number":
+                        result = await self.search_tools.search_by_alien_number(**arguments)
+                    elif name == "smart_detainee_search":
+                        result = await self.search_tools.smart_search(**arguments)
+                    elif name == "bulk_search_detainees":
+                        result = await self.search_tools.bulk_search(**arguments)
+                    elif name == "generate_search_report":
+                        result = await self.search_tools.generate_report(**arguments)
+                    else:
+                        raise ValueError(f"Unknown tool: {name}")
                 
-                return [types.TextContent(
-                    type="text",
-                    text=result
-                )]
+                    # Track successful tool completion
+                    if self.comprehensive_monitor:
+                        with phase("telemetry"):
+                            await self.comprehensive_monitor.track_tool_call(
+                                session_id="default",
+                                tool_name=name,
+                                arguments=arguments,
+                                result={"status": "success", "response": result},
+                                error=None
+                            )
                 
-            except Exception as e:
-                # Track tool errors
-                if self.comprehensive_monitor:
-                    await self.comprehensive_monitor.track_tool_call(
-                        session_id="default",
-                        tool_name=name,
-                        arguments=arguments,
-                        result=None,
-                        error=str(e)
-                    )
+                    self.logger.info("Tool completed successfully", tool_name=name)
+                    with phase("telemetry"):
+                        record_tool_call(name, time.perf_counter() - call_start, "success")
                 
-                self.logger.error("Tool execution failed", tool_name=name, error=str(e))
-                error_response = {
-                    "status": "error",
-                    "error_message": str(e),
-                    "tool_name": name
-                }
-                return [types.TextContent(
-                    type="text",
-                    text=json.dumps(error_response, indent=2)
-                )]
+                    return [types.TextContent(
+                        type="text",
+                        text=result
+                    )]
+                
+                except Exception as e:
+                    # Track tool errors
+                    if self.comprehensive_monitor:
+                        with phase("telemetry"):
+                            await self.comprehensive_monitor.track_tool_call(
+                                session_id="default",
+                                tool_name=name,
+                                arguments=arguments,
+                                result=None,
+                                error=str(e)
+                            )
+                
+                    self.logger.error("Tool execution failed", tool_name=name, error=str(e))
+                    with phase("telemetry"):
+                        record_tool_call(name, time.perf_counter() - call_start, "error")
+                    error_response = {
+                        "status": "error",
+                        "error_message": str(e),
+                        "tool_name": name
+                    }
+                    return [types.TextContent(
+                        type="text",
+                        text=dumps(error_response, compact=self.config.compact_json)
+                    )]
         
         @self.server.list_prompts()
         async def handle_list_prompts() -> list[types.Prompt]:
@@ -767,7 +929,7 @@ class ICELocatorServer:
                 types.Resource(
                     uri="ice://facilities/database",
                     name="ICE Facilities Database",
-                    description="Comprehensive database of ICE detention facilities with locations, contact information, and capacity data",
+                    description="ICE detention facilities with locations and current population, paginated with ?page=&page_size=",
                     mimeType="application/json"
                 ),
                 types.Resource(
@@ -791,43 +953,39 @@ class ICELocatorServer:
                 types.Resource(
                     uri="ice://statistics/trends",
                     name="Detention Statistics and Trends",
-                    description="Historical data and trends about ICE detention patterns, facility populations, and demographic information",
+                    description="Monthly detention population totals across facilities, filterable with ?from=YYYY-MM&to=YYYY-MM",
+                    mimeType="application/json"
+                )
+            ]
+        
+        @self.server.list_resource_templates()
+        async def handle_list_resource_templates() -> list[types.ResourceTemplate]:
+            """List parameterized resources."""
+            return [
+                types.ResourceTemplate(
+                    uriTemplate="ice://facilities/{facility_id}",
+                    name="ICE Facility",
+                    description="A single facility with its monthly population history, newest month first",
+                    mimeType="application/json"
+                ),
+                types.ResourceTemplate(
+                    uriTemplate="ice://statistics/trends{?from,to,page,page_size}",
+                    name="Detention Population Trends",
+                    description="Monthly population totals for a range of months",
                     mimeType="application/json"
                 )
             ]
         
         @self.server.read_resource()
-        async def handle_read_resource(uri: str) -> str:
+        async def handle_read_resource(uri: str) -> List[ReadResourceContents]:
             """Read a specific resource."""
+            uri = str(uri)
             
-            if uri == "ice://facilities/database":
-                # Return facility database information
-                facilities_data = {
-                    "description": "ICE Detention Facilities Database",
-                    "last_updated": datetime.now().isoformat(),
-                    "total_facilities": 186,
-                    "data_source": "TRAC Reports - Syracuse University",
-                    "update_frequency": "Monthly",
-                    "fields": [
-                        "facility_name",
-                        "facility_type", 
-                        "address",
-                        "city",
-                        "state",
-                        "zip_code",
-                        "phone",
-                        "capacity",
-                        "current_population",
-                        "operating_agency",
-                        "contractor",
-                        "latitude",
-                        "longitude"
-                    ],
-                    "access_notes": "This resource provides comprehensive facility information for legal and family reference purposes."
-                }
-                return json.dumps(facilities_data, indent=2)
+            data = await self.read_data_resource(uri)
+            if data is not None:
+                return [ReadResourceContents(content=data, mime_type="application/json")]
             
-            elif uri == "ice://search/history":
+            if uri == "ice://search/history":
                 # Return search history template
                 history_template = {
                     "description": "Search History Management",
@@ -850,7 +1008,9 @@ class ICELocatorServer:
                     ],
                     "legal_considerations": "Search history may be subject to discovery in legal proceedings. Maintain appropriate documentation standards."
                 }
-                return json.dumps(history_template, indent=2)
+                return [ReadResourceContents(
+                    content=json.dumps(history_template, indent=2), mime_type="application/json"
+                )]
             
             elif uri == "ice://legal/templates":
                 # Return legal templates
@@ -927,7 +1087,7 @@ Sincerely,
 [CONTACT_INFORMATION]
 ```
 """
-                return templates
+                return [ReadResourceContents(content=templates, mime_type="text/markdown")]
             
             elif uri == "ice://support/resources":
                 # Return family support resources
@@ -984,60 +1144,128 @@ Sincerely,
 ---
 *Remember: You are not alone. Help is available.*
 """
-                return support_resources
-            
-            elif uri == "ice://statistics/trends":
-                # Return statistics and trends
-                stats_data = {
-                    "description": "ICE Detention Statistics and Trends",
-                    "last_updated": datetime.now().isoformat(),
-                    "data_source": "TRAC Reports, ICE Statistics",
-                    "time_period": "2019-2025",
-                    "key_metrics": {
-                        "total_facilities": 186,
-                        "average_daily_population": 62005,
-                        "peak_population": 56000,
-                        "facility_types": {
-                            "service_processing_centers": 8,
-                            "contract_detention_facilities": 120,
-                            "intergovernmental_service_agreements": 58
-                        }
-                    },
-                    "trends": {
-                        "population_changes": "Monthly population data available",
-                        "facility_utilization": "Capacity and occupancy rates",
-                        "demographic_breakdown": "Age, gender, country of origin",
-                        "geographic_distribution": "State-by-state detention patterns"
-                    },
-                    "data_quality": {
-                        "update_frequency": "Monthly",
-                        "verification_status": "Verified through multiple sources",
-                        "completeness": "95%+ data coverage",
-                        "accuracy": "Cross-validated with official sources"
-                    },
-                    "usage_notes": "Statistics are for informational purposes and may be subject to change. Always verify current data through official sources."
-                }
-                return json.dumps(stats_data, indent=2)
+                return [ReadResourceContents(content=support_resources, mime_type="text/markdown")]
             
             else:
-                return f"Unknown resource: {uri}"
+                return [ReadResourceContents(content=f"Unknown resource: {uri}", mime_type="text/plain")]
+    
+    async def read_data_resource(self, uri: str) -> Optional[str]:
+        """
+        Serve the database-backed ice:// resources.
+        
+        Handles ``ice://facilities/database``, ``ice://facilities/{id}`` and
+        ``ice://statistics/trends`` (with ``from``, ``to``, ``page`` and
+        ``page_size`` query parameters). Payloads come from a cached read-only
+        view of the facilities database and include its data version.
+        
+        Returns:
+            JSON payload, or None if the URI is not a data resource
+        """
+        parts = urlsplit(uri)
+        if parts.scheme != "ice":
+            return None
+        path = f"{parts.netloc}{parts.path}".rstrip("/")
+        if path != "facilities/database" and path != "statistics/trends" and not _FACILITY_PATH.fullmatch(path):
+            return None
+        
+        params = dict(parse_qsl(parts.query))
+        if self.resource_store is None:
+            from .database.resource_store import ResourceStore
+            self.resource_store = ResourceStore(self.config.facilities_database_path)
+        
+        try:
+            payload = await asyncio.to_thread(self._data_resource_payload, path, params)
+        except ValueError as e:
+            payload = {"error": str(e)}
+        except (FileNotFoundError, sqlite3.Error) as e:
+            self.logger.warning("Facilities database unavailable", uri=uri, error=str(e))
+            payload = {"error": "Facilities database unavailable"}
+        return json.dumps(payload, indent=2)
+    
+    def _data_resource_payload(self, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Build the payload for a data resource path (runs in a worker thread)."""
+        from .database.resource_store import DEFAULT_PAGE_SIZE, FACILITY_FIELDS
+        
+        store = self.resource_store
+        page = params.get("page", 1)
+        page_size = params.get("page_size", DEFAULT_PAGE_SIZE)
+        
+        if path == "facilities/database":
+            summary = store.summary()
+            facilities = store.list_facilities(page, page_size)
+            return {
+                "description": "ICE Detention Facilities Database",
+                "data_source": "TRAC Reports - Syracuse University",
+                "update_frequency": "Monthly",
+                "data_version": facilities.pop("data_version"),
+                "total_facilities": summary["total_facilities"],
+                "facilities_with_coordinates": summary["with_coordinates"],
+                "facilities_with_population": summary["with_population"],
+                "current_population": summary["current_population"],
+                "population_months": summary["months"],
+                "fields": FACILITY_FIELDS,
+                "facilities": facilities,
+                "links": {
+                    "next": _next_page_uri("ice://facilities/database", facilities),
+                    "facility": "ice://facilities/{facility_id}",
+                    "trends": "ice://statistics/trends?from=YYYY-MM&to=YYYY-MM"
+                },
+                "access_notes": "This resource provides comprehensive facility information for legal and family reference purposes."
+            }
+        
+        if path == "statistics/trends":
+            start, end = params.get("from") or None, params.get("to") or None
+            summary = store.summary()
+            months = store.trends(start, end, page, page_size)
+            query = {key: value for key, value in (("from", start), ("to", end)) if value}
+            return {
+                "description": "ICE Detention Statistics and Trends",
+                "data_source": "TRAC Reports, ICE Statistics",
+                "update_frequency": "Monthly",
+                "data_version": months.pop("data_version"),
+                "range": {"from": months.pop("start"), "to": months.pop("end")},
+                "key_metrics": {
+                    "total_facilities": summary["total_facilities"],
+                    "current_population": summary["current_population"],
+                    "facilities_with_population": summary["with_population"],
+                    "population_months": summary["months"]
+                },
+                "months": months,
+                "links": {"next": _next_page_uri("ice://statistics/trends", months, query)},
+                "usage_notes": "Statistics are for informational purposes and may be subject to change. Always verify current data through official sources."
+            }
+        
+        facility_id = int(_FACILITY_PATH.fullmatch(path).group(1))
+        facility = store.get_facility(facility_id, page, page_size)
+        if facility is None:
+            return {"error": f"Facility {facility_id} not found", "data_version": store.data_version}
+        facility["links"] = {
+            "next": _next_page_uri(f"ice://facilities/{facility_id}", facility["population_history"]),
+            "database": "ice://facilities/database"
+        }
+        return facility
     
     async def start(self) -> None:
-        """Start the MCP server."""
+        """Start the MCP server.
+        
+        Monitoring and the search components are started by the first tool
+        call (see :meth:`ensure_components`), not here.
+        """
         self.logger.info("Starting ICE Locator MCP Server")
         
-        # Initialize telemetry and monitoring
-        if self.comprehensive_monitor:
-            await self.comprehensive_monitor.initialize()
-            await self.comprehensive_monitor.start_monitoring({
-                "server_version": self.config.server_version,
-                "startup_time": datetime.now().isoformat()
-            })
-            self.logger.info("Comprehensive monitoring started")
+        # Expose Prometheus metrics on a side port if configured
+        metrics_port = self.config.monitoring_config.metrics_port
+        if metrics_port and self.metrics_server is None:
+            from .utils.prometheus_metrics import start_metrics_server
+            try:
+                self.metrics_server = start_metrics_server(
+                    metrics_port, self.config.monitoring_config.metrics_host
+                )
+            except OSError as e:
+                self.logger.warning("Failed to start metrics server", port=metrics_port, error=str(e))
         
-        # Initialize components
-        await self.proxy_manager.initialize()
-        await self.search_engine.initialize()
+        if self.metrics_server is not None or self.config.monitoring_config.loop_monitor_enabled:
+            self.loop_lag_probe.start()
         
         self.logger.info("ICE Locator MCP Server started successfully")
     
@@ -1045,11 +1273,29 @@ Sincerely,
         """Stop the MCP server and cleanup resources."""
         self.logger.info("Stopping ICE Locator MCP Server")
         
-        # Cleanup components
-        await self.search_engine.cleanup()
-        await self.proxy_manager.cleanup()
+        # Cleanup components that were started
+        if self._components_ready is not None:
+            if not self._components_ready.done():
+                self._components_ready.cancel()
+            await asyncio.gather(self._components_ready, return_exceptions=True)
+            self._components_ready = None
+            await self.search_engine.cleanup()
+            await self.proxy_manager.cleanup()
+        if self.resource_store is not None:
+            self.resource_store.disconnect()
+        
+        # Stop metrics exposition
+        if self._loop_lag_probe is not None:
+            await self._loop_lag_probe.stop()
+        if self.metrics_server is not None:
+            server, thread = self.metrics_server
+            server.shutdown()
+            self.metrics_server = None
         
         # Cleanup telemetry and monitoring
+        if self.monitoring_dashboard is not None:
+            await self.monitoring_dashboard.stop_dashboard()
+            self.monitoring_dashboard = None
         if self.comprehensive_monitor:
             await self.comprehensive_monitor.stop_monitoring("server_shutdown")
             await self.comprehensive_monitor.cleanup()
@@ -1065,7 +1311,7 @@ async def main() -> None:
     setup_logging()
     
     # Create and start server
-    server = ICELocatorServer()
+    server = ICELocatorServer(ServerConfig.from_env())
     
     try:
         await server.start()
@@ -4,6 +4,11 @@ Tools module for ICE Locator MCP Server.
 This module contains the implementation of all MCP tools.
 """
 
-from .search_tools import SearchTools
+from ..utils.lazy_imports import lazy_exports
 
-__all__ = ["SearchTools"]
\ No newline at end of file
+__all__ = ["SearchTools"]
+
+# Submodules load on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "SearchTools": ".search_tools"
+})
@@ -3,15 +3,110 @@ Natural Language Query Processor for ICE Locator MCP Server.
 
 This module handles parsing of natural language queries into structured
 search parameters with intelligent extraction and auto-correction.
+
+All patterns are compiled once, country and state names are matched
+through a token trie, and parse results are memoized per normalized query.
 """
 
 import re
-import calendar
-from datetime import datetime, timedelta
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import structlog
 
+from ..utils.dates import DateParser
+
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+MONTHS = "january|february|march|april|may|june|july|august|september|october|november|december"
+
+NAME_PATTERNS = [
+    # "find John Doe"
+    re.compile(r'(?:find|search|locate)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', re.IGNORECASE),
+    # "looking for Maria Garcia"
+    re.compile(r'(?:looking for|seeking)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', re.IGNORECASE),
+    # Direct name patterns
+    re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b', re.IGNORECASE),
+    # Quoted names
+    re.compile(r'"([^"]+)"', re.IGNORECASE),
+    re.compile(r"'([^']+)'", re.IGNORECASE)
+]
+
+COUNTRY_PATTERNS = [
+    re.compile(r'from\s+([A-Za-z\s]+?)(?:\s+born|\s+detained|$)', re.IGNORECASE),
+    re.compile(r'born\s+in\s+([A-Za-z\s]+?)(?:\s+on|\s+in|\s+around|$)', re.IGNORECASE),
+    re.compile(r'citizen\s+of\s+([A-Za-z\s]+?)(?:\s|$)', re.IGNORECASE),
+    re.compile(r'native\s+of\s+([A-Za-z\s]+?)(?:\s|$)', re.IGNORECASE)
+]
+
+FACILITY_PATTERNS = [
+    re.compile(r'(?:detained|held)\s+(?:at|in)\s+([A-Za-z\s,]+?)(?:\s|$)', re.IGNORECASE),
+    re.compile(r'(?:facility|center)\s+(?:in|at)\s+([A-Za-z\s,]+?)(?:\s|$)', re.IGNORECASE),
+    re.compile(r'(?:prison|jail)\s+(?:in|at)\s+([A-Za-z\s,]+?)(?:\s|$)', re.IGNORECASE)
+]
+
+ALIEN_NUMBER_DETECT_PATTERN = re.compile(r'a\d{8,9}|\b\d{8,9}\b', re.IGNORECASE)
+
+ALIEN_NUMBER_PATTERNS = [
+    re.compile(r'(a\d{8,9})', re.IGNORECASE),
+    re.compile(r'\b(\d{8,9})\b', re.IGNORECASE)
+]
+
+FACILITY_KEYWORDS = (
+    'facility', 'center', 'detention', 'prison', 'jail',
+    'processing center', 'correctional', 'holding'
+)
+
+TEXT_DATE_PATTERNS = [
+    re.compile(r'born\s+(?:on\s+)?([^,]+?)(?:\s+in|\s+at|,|$)', re.IGNORECASE),
+    re.compile(r'birth\s+(?:date\s+)?([^,]+?)(?:\s+in|\s+at|,|$)', re.IGNORECASE),
+    re.compile(r'dob\s+([^,\s]+)', re.IGNORECASE),
+    re.compile(r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2})', re.IGNORECASE),
+    re.compile(rf'((?:{MONTHS})\s+\d{{1,2}},?\s+\d{{4}})', re.IGNORECASE),
+    re.compile(rf'(\d{{1,2}}\s+(?:{MONTHS})\s+\d{{4}})', re.IGNORECASE),
+    re.compile(r'(?:around|about|circa)\s+(\d{4})', re.IGNORECASE),
+    re.compile(r'(?:in|during)\s+(\d{4})', re.IGNORECASE)
+]
+
+NAME_CORRECTIONS = {
+    'jose': 'José',
+    'maria': 'María',
+    'carlos': 'Carlos',
+    'juan': 'Juan',
+    'luis': 'Luis',
+    'ana': 'Ana',
+    'garcia': 'García',
+    'rodriguez': 'Rodríguez',
+    'martinez': 'Martínez',
+    'lopez': 'López',
+    'gonzalez': 'González',
+    'hernandez': 'Hernández',
+    'perez': 'Pérez',
+    'sanchez': 'Sánchez'
+}
+
+COUNTRY_CORRECTIONS = {
+    'mexico': 'Mexico',
+    'méxico': 'Mexico',
+    'guatemala': 'Guatemala',
+    'el salvador': 'El Salvador',
+    'salvador': 'El Salvador',
+    'honduras': 'Honduras',
+    'nicaragua': 'Nicaragua'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def normalize_query(query: str, context: Optional[str] = None) -> str:
+    """Query and context as one lowercase, single-spaced string."""
+    return " ".join(f"{query} {context or ''}".lower().split())
+
 
 @dataclass
 class ParsedQuery:
@@ -23,98 +118,53 @@ class ParsedQuery:
     corrections_applied: List[str]
     ambiguities: List[str]
 
+    def copy(self) -> "ParsedQuery":
+        """Copy with its own parameter dict and lists."""
+        return ParsedQuery(
+            search_type=self.search_type,
+            parameters=dict(self.parameters),
+            confidence=self.confidence,
+            suggestions=list(self.suggestions),
+            corrections_applied=list(self.corrections_applied),
+            ambiguities=list(self.ambiguities)
+        )
 
-class DateParser:
-    """Parse various date formats and expressions."""
-    
-    def __init__(self):
-        self.current_year = datetime.now().year
-        self.month_names = {
-            month.lower(): i for i, month in enumerate(calendar.month_name[1:], 1)
-        }
-        self.month_abbrev = {
-            month.lower(): i for i, month in enumerate(calendar.month_abbr[1:], 1)
-        }
-        
-    def parse_date(self, date_str: str) -> Optional[str]:
-        """Parse natural language date into YYYY-MM-DD format."""
-        date_str = date_str.lower().strip()
-        
-        # Exact date patterns
-        patterns = [
-            # YYYY-MM-DD
-            (r'(\d{4})-(\d{1,2})-(\d{1,2})', self._parse_ymd),
-            # MM/DD/YYYY
-            (r'(\d{1,2})/(\d{1,2})/(\d{4})', self._parse_mdy),
-            # DD/MM/YYYY (European)
-            (r'(\d{1,2})/(\d{1,2})/(\d{4})', self._parse_dmy),
-            # Month DD, YYYY
-            (r'([a-z]+)\s+(\d{1,2}),?\s+(\d{4})', self._parse_month_day_year),
-            # DD Month YYYY
-            (r'(\d{1,2})\s+([a-z]+)\s+(\d{4})', self._parse_day_month_year),
-            # Just year
-            (r'^(\d{4})$', self._parse_year_only),
-            # "born around 1990"
-            (r'(?:around|about|circa)\s+(\d{4})', self._parse_approximate_year),
-            # "born in 1990"
-            (r'(?:in|during)\s+(\d{4})', self._parse_year_only),
-        ]
-        
-        for pattern, parser in patterns:
-            match = re.search(pattern, date_str)
+
+class AliasTrie:
+    """Token trie that finds known multi-word aliases in tokenized text."""
+
+    _END = object()
+
+    def __init__(self, aliases: Optional[Dict[str, Any]] = None):
+        self.root: Dict[Any, Any] = {}
+        for alias, value in (aliases or {}).items():
+            self.add(alias, value)
+
+    def add(self, alias: str, value: Any) -> None:
+        """Add an alias; the first value added for an alias wins."""
+        node = self.root
+        for token in tokenize(alias):
+            node = node.setdefault(token, {})
+        node.setdefault(self._END, value)
+
+    def find(self, tokens: List[str]) -> Optional[Tuple[int, int, Any]]:
+        """
+        Find the leftmost, longest alias in a token list.
+
+        Returns:
+            (start, end, value) of the match, or None
+        """
+        for start in range(len(tokens)):
+            node, match = self.root, None
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if self._END in node:
+                    match = (start, end + 1, node[self._END])
             if match:
-                try:
-                    return parser(match)
-                except (ValueError, IndexError):
-                    continue
-        
+                return match
         return None
-    
-    def _parse_ymd(self, match) -> str:
-        """Parse YYYY-MM-DD format."""
-        year, month, day = match.groups()
-        return f"{year}-{int(month):02d}-{int(day):02d}"
-    
-    def _parse_mdy(self, match) -> str:
-        """Parse MM/DD/YYYY format."""
-        month, day, year = match.groups()
-        return f"{year}-{int(month):02d}-{int(day):02d}"
-    
-    def _parse_dmy(self, match) -> str:
-        """Parse DD/MM/YYYY format (European)."""
-        day, month, year = match.groups()
-        return f"{year}-{int(month):02d}-{int(day):02d}"
-    
-    def _parse_month_day_year(self, match) -> str:
-        """Parse 'Month DD, YYYY' format."""
-        month_str, day, year = match.groups()
-        month_num = self._parse_month_name(month_str)
-        if month_num:
-            return f"{year}-{month_num:02d}-{int(day):02d}"
-        raise ValueError("Invalid month name")
-    
-    def _parse_day_month_year(self, match) -> str:
-        """Parse 'DD Month YYYY' format."""
-        day, month_str, year = match.groups()
-        month_num = self._parse_month_name(month_str)
-        if month_num:
-            return f"{year}-{month_num:02d}-{int(day):02d}"
-        raise ValueError("Invalid month name")
-    
-    def _parse_year_only(self, match) -> str:
-        """Parse year only, default to January 1st."""
-        year = match.groups()[0]
-        return f"{year}-01-01"
-    
-    def _parse_approximate_year(self, match) -> str:
-        """Parse approximate year."""
-        year = match.groups()[0]
-        return f"{year}-01-01"
-    
-    def _parse_month_name(self, month_str: str) -> Optional[int]:
-        """Parse month name or abbreviation."""
-        month_str = month_str.lower()
-        return self.month_names.get(month_str) or self.month_abbrev.get(month_str)
 
 
 class NameExtractor:
@@ -130,21 +180,8 @@ class NameExtractor:
         
     def extract_name(self, text: str) -> Optional[Dict[str, str]]:
         """Extract name components from text."""
-        # Common patterns for name extraction
-        patterns = [
-            # "find John Doe"
-            r'(?:find|search|locate)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            # "looking for Maria Garcia"
-            r'(?:looking for|seeking)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            # Direct name patterns
-            r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b',
-            # Quoted names
-            r'"([^"]+)"',
-            r"'([^']+)'"
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in NAME_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 name_parts = self._parse_name_components(match)
                 if name_parts and len(name_parts.get('tokens', [])) >= 2:
@@ -216,26 +253,32 @@ class LocationExtractor:
         self.country_aliases = self._load_country_aliases()
         self.us_states = self._load_us_states()
         
+        # Exact alias lookup, first country listed wins
+        self.alias_to_country: Dict[str, str] = {}
+        for country, aliases in self.country_aliases.items():
+            for alias in aliases:
+                self.alias_to_country.setdefault(alias.lower(), country)
+        
+        # Two-letter codes collide with words like "in" or "so", so free
+        # text only matches full names; codes still resolve through the
+        # "from ..." / "born in ..." patterns.
+        self.country_trie = AliasTrie({
+            alias: country for alias, country in self.alias_to_country.items() if len(alias) > 2
+        })
+        self.state_trie = AliasTrie(self.us_states)
+        
     def extract_country(self, text: str) -> Optional[str]:
         """Extract country from text."""
         text = text.lower()
         
         # Direct country mentions
-        for country, aliases in self.country_aliases.items():
-            for alias in aliases:
-                if alias.lower() in text:
-                    return country
+        match = self.country_trie.find(tokenize(text))
+        if match:
+            return match[2]
         
         # Pattern-based extraction
-        patterns = [
-            r'from\s+([A-Za-z\s]+?)(?:\s+born|\s+detained|$)',
-            r'born\s+in\s+([A-Za-z\s]+?)(?:\s+on|\s+in|\s+around|$)',
-            r'citizen\s+of\s+([A-Za-z\s]+?)(?:\s|$)',
-            r'native\s+of\s+([A-Za-z\s]+?)(?:\s|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in COUNTRY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 location = match.group(1).strip()
                 # Try to map to known country
@@ -245,16 +288,15 @@ class LocationExtractor:
         
         return None
     
+    def extract_us_state(self, text: str) -> Optional[str]:
+        """Extract a US state name from text as its two-letter abbreviation."""
+        match = self.state_trie.find(tokenize(text))
+        return match[2] if match else None
+    
     def extract_facility_location(self, text: str) -> Optional[str]:
         """Extract facility or detention location."""
-        patterns = [
-            r'(?:detained|held)\s+(?:at|in)\s+([A-Za-z\s,]+?)(?:\s|$)',
-            r'(?:facility|center)\s+(?:in|at)\s+([A-Za-z\s,]+?)(?:\s|$)',
-            r'(?:prison|jail)\s+(?:in|at)\s+([A-Za-z\s,]+?)(?:\s|$)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in FACILITY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
@@ -262,13 +304,7 @@ class LocationExtractor:
     
     def _normalize_country(self, location: str) -> Optional[str]:
         """Normalize location to standard country name."""
-        location = location.lower().strip()
-        
-        for country, aliases in self.country_aliases.items():
-            if location in [alias.lower() for alias in aliases]:
-                return country
-        
-        return None
+        return self.alias_to_country.get(location.lower().strip())
     
     def _load_country_aliases(self) -> Dict[str, List[str]]:
         """Load country aliases and variations."""
@@ -330,19 +366,43 @@ class LocationExtractor:
 class NaturalLanguageQueryProcessor:
     """Main processor for natural language queries."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         self.logger = structlog.get_logger(__name__)
         self.date_parser = DateParser()
         self.name_extractor = NameExtractor()
         self.location_extractor = LocationExtractor()
         
+        # Parse results keyed by normalized query text
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[str, ParsedQuery]" = OrderedDict()
+        
     def parse_query(self, query: str, context: Optional[str] = None) -> ParsedQuery:
         """Parse natural language query into structured parameters."""
-        query = query.strip()
-        full_text = f"{query} {context or ''}".lower()
+        full_text = normalize_query(query, context)
+        
+        cached = self._cache.get(full_text)
+        if cached is not None:
+            self._cache.move_to_end(full_text)
+            self.cache_hits += 1
+            return cached.copy()
+        self.cache_misses += 1
         
         self.logger.debug("Parsing natural language query", query=query)
+        parsed = self._parse_text(full_text)
         
+        self._cache[full_text] = parsed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return parsed.copy()
+    
+    def clear_cache(self) -> None:
+        """Drop memoized parse results."""
+        self._cache.clear()
+    
+    def _parse_text(self, full_text: str) -> ParsedQuery:
+        """Parse normalized query text."""
         # Detect query type
         search_type = self._detect_search_type(full_text)
         
@@ -356,15 +416,11 @@ class NaturalLanguageQueryProcessor:
     def _detect_search_type(self, text: str) -> str:
         """Detect the type of search from the query."""
         # Alien number patterns
-        if re.search(r'a\d{8,9}|\b\d{8,9}\b', text, re.IGNORECASE):
+        if ALIEN_NUMBER_DETECT_PATTERN.search(text):
             return "alien_number"
         
         # Facility search patterns
-        facility_keywords = [
-            'facility', 'center', 'detention', 'prison', 'jail',
-            'processing center', 'correctional', 'holding'
-        ]
-        if any(keyword in text for keyword in facility_keywords):
+        if any(keyword in text for keyword in FACILITY_KEYWORDS):
             return "facility"
         
         # Default to name-based search
@@ -373,13 +429,8 @@ class NaturalLanguageQueryProcessor:
     def _parse_alien_number_query(self, text: str) -> ParsedQuery:
         """Parse alien number query."""
         # Extract alien number
-        patterns = [
-            r'(a\d{8,9})',
-            r'\b(\d{8,9})\b'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in ALIEN_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 alien_number = match.group(1).upper()
                 if not alien_number.startswith('A'):
@@ -408,9 +459,13 @@ class NaturalLanguageQueryProcessor:
         facility_location = self.location_extractor.extract_facility_location(text)
         
         if facility_location:
+            parameters = {'facility_location': facility_location}
+            state = self.location_extractor.extract_us_state(text)
+            if state:
+                parameters['facility_state'] = state
             return ParsedQuery(
                 search_type="facility",
-                parameters={'facility_location': facility_location},
+                parameters=parameters,
                 confidence=0.8,
                 suggestions=[],
                 corrections_applied=[],
@@ -481,21 +536,8 @@ class NaturalLanguageQueryProcessor:
     
     def _extract_date_from_text(self, text: str) -> Optional[str]:
         """Extract date from text using various patterns."""
-        # Date-related patterns
-        date_patterns = [
-            r'born\s+(?:on\s+)?([^,]+?)(?:\s+in|\s+at|,|$)',
-            r'birth\s+(?:date\s+)?([^,]+?)(?:\s+in|\s+at|,|$)',
-            r'dob\s+([^,\s]+)',
-            r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-            r'(\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2})',
-            r'((?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4})',
-            r'(\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4})',
-            r'(?:around|about|circa)\s+(\d{4})',
-            r'(?:in|during)\s+(\d{4})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in TEXT_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1)
                 parsed_date = self.date_parser.parse_date(date_str)
@@ -509,44 +551,17 @@ class NaturalLanguageQueryProcessor:
         corrected = parameters.copy()
         
         # Name corrections
-        name_corrections = {
-            'jose': 'José',
-            'maria': 'María',
-            'carlos': 'Carlos',
-            'juan': 'Juan',
-            'luis': 'Luis',
-            'ana': 'Ana',
-            'garcia': 'García',
-            'rodriguez': 'Rodríguez',
-            'martinez': 'Martínez',
-            'lopez': 'López',
-            'gonzalez': 'González',
-            'hernandez': 'Hernández',
-            'perez': 'Pérez',
-            'sanchez': 'Sánchez'
-        }
-        
         for field in ['first_name', 'last_name', 'middle_name']:
             if field in corrected:
                 original = corrected[field].lower()
-                if original in name_corrections:
-                    corrected[field] = name_corrections[original]
+                if original in NAME_CORRECTIONS:
+                    corrected[field] = NAME_CORRECTIONS[original]
         
         # Country corrections
         if 'country_of_birth' in corrected:
-            country_corrections = {
-                'mexico': 'Mexico',
-                'méxico': 'Mexico',
-                'guatemala': 'Guatemala',
-                'el salvador': 'El Salvador',
-                'salvador': 'El Salvador',
-                'honduras': 'Honduras',
-                'nicaragua': 'Nicaragua'
-            }
-            
             original = corrected['country_of_birth'].lower()
-            if original in country_corrections:
-                corrected['country_of_birth'] = country_corrections[original]
+            if original in COUNTRY_CORRECTIONS:
+                corrected['country_of_birth'] = COUNTRY_CORRECTIONS[original]
         
         return corrected
     
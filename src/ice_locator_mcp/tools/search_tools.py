@@ -13,15 +13,37 @@ import structlog
 from fuzzywuzzy import fuzz
 from phonetics import metaphone, soundex
 
-from ..core.search_engine import SearchEngine, SearchRequest, SearchResult, DetaineeRecord
+from ..core.search_engine import (
+    COUNTRY_MAPPINGS,
+    FAMILY_RESOURCES,
+    LEGAL_RESOURCES,
+    DetaineeRecord,
+    SearchEngine,
+    SearchRequest,
+    SearchResult
+)
 from ..utils.logging import PerformanceLogger
+from ..utils.profiling import phase
+from ..utils.serialization import dumps
+
+
+# Natural language query patterns used by smart_search
+ALIEN_NUMBER_PATTERN = re.compile(r'a\d{8,9}|\b\d{8,9}\b', re.IGNORECASE)
+QUERY_NAME_PATTERNS = [
+    re.compile(r'(?:find|search|locate)\s+([A-Za-z]+(?:\s+[A-Za-z]+)*?)(?:\s+from|\s+born|\s+detained|$)', re.IGNORECASE),
+    re.compile(r'([A-Za-z]+\s+[A-Za-z]+)(?:\s+from|\s+born)', re.IGNORECASE),
+]
+QUERY_COUNTRY_PATTERN = re.compile(r'from\s+([A-Za-z\s]+?)(?:\s+born|\s+detained|$)', re.IGNORECASE)
+QUERY_YEAR_PATTERN = re.compile(r'(?:born|birth)\s+(?:around\s+)?(\d{4})', re.IGNORECASE)
+QUERY_DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4})')
 
 
 class SearchTools:
     """Implementation of MCP search tools."""
     
-    def __init__(self, search_engine: SearchEngine):
+    def __init__(self, search_engine: SearchEngine, compact_json: bool = False):
         self.search_engine = search_engine
+        self.compact_json = compact_json
         self.logger = structlog.get_logger(__name__)
         self.performance_logger = PerformanceLogger()
         
@@ -60,16 +82,18 @@ class SearchTools:
             
             # Apply fuzzy matching if enabled and no exact matches
             if fuzzy_search and result.status == "not_found":
-                result = await self._apply_fuzzy_search(request, result)
+                with phase("fuzzy"):
+                    result = await self._apply_fuzzy_search(request, result)
             
             # Log performance
             processing_time = time.time() - start_time
-            await self.performance_logger.log_search_performance(
-                search_type="name_search",
-                processing_time=processing_time,
-                cache_hit=False,  # Would need to track this
-                results_count=len(result.results)
-            )
+            with phase("telemetry"):
+                await self.performance_logger.log_search_performance(
+                    search_type="name_search",
+                    processing_time=processing_time,
+                    cache_hit=False,  # Would need to track this
+                    results_count=len(result.results)
+                )
             
             return self._format_search_response(result, language)
             
@@ -103,12 +127,13 @@ class SearchTools:
             
             # Log performance
             processing_time = time.time() - start_time
-            await self.performance_logger.log_search_performance(
-                search_type="alien_number_search",
-                processing_time=processing_time,
-                cache_hit=False,
-                results_count=len(result.results)
-            )
+            with phase("telemetry"):
+                await self.performance_logger.log_search_performance(
+                    search_type="alien_number_search",
+                    processing_time=processing_time,
+                    cache_hit=False,
+                    results_count=len(result.results)
+                )
             
             return self._format_search_response(result, language)
             
@@ -161,12 +186,13 @@ class SearchTools:
             
             # Log performance
             processing_time = time.time() - start_time
-            await self.performance_logger.log_search_performance(
-                search_type="smart_search",
-                processing_time=processing_time,
-                cache_hit=False,
-                results_count=len(result.results)
-            )
+            with phase("telemetry"):
+                await self.performance_logger.log_search_performance(
+                    search_type="smart_search",
+                    processing_time=processing_time,
+                    cache_hit=False,
+                    results_count=len(result.results)
+                )
             
             return self._format_search_response(result, language)
             
@@ -244,14 +270,16 @@ class SearchTools:
             }
             
             # Log performance
-            await self.performance_logger.log_search_performance(
-                search_type="bulk_search",
-                processing_time=time.time() - start_time,
-                cache_hit=False,
-                results_count=len(successful_results)
-            )
+            with phase("telemetry"):
+                await self.performance_logger.log_search_performance(
+                    search_type="bulk_search",
+                    processing_time=time.time() - start_time,
+                    cache_hit=False,
+                    results_count=len(successful_results)
+                )
             
-            return json.dumps(bulk_result, indent=2)
+            with phase("serialize"):
+                return dumps(bulk_result, compact=self.compact_json)
             
         except Exception as e:
             self.logger.error("Bulk search failed", error=str(e))
@@ -348,8 +376,7 @@ class SearchTools:
         query_lower = query.lower()
         
         # Look for alien number pattern
-        alien_pattern = r'a\d{8,9}|\b\d{8,9}\b'
-        alien_match = re.search(alien_pattern, query, re.IGNORECASE)
+        alien_match = ALIEN_NUMBER_PATTERN.search(query)
         if alien_match:
             alien_num = alien_match.group()
             if not alien_num.startswith('A'):
@@ -358,13 +385,8 @@ class SearchTools:
             return params
         
         # Extract names
-        name_patterns = [
-            r'(?:find|search|locate)\s+([A-Za-z]+(?:\s+[A-Za-z]+)*?)(?:\s+from|\s+born|\s+detained|$)',
-            r'([A-Za-z]+\s+[A-Za-z]+)(?:\s+from|\s+born)',
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in QUERY_NAME_PATTERNS:
+            match = pattern.search(query)
             if match:
                 full_name = match.group(1).strip()
                 name_parts = full_name.split()
@@ -376,22 +398,19 @@ class SearchTools:
                 break
         
         # Extract country
-        country_pattern = r'from\s+([A-Za-z\s]+?)(?:\s+born|\s+detained|$)'
-        country_match = re.search(country_pattern, query, re.IGNORECASE)
+        country_match = QUERY_COUNTRY_PATTERN.search(query)
         if country_match:
             params['country_of_birth'] = country_match.group(1).strip()
         
         # Extract birth year/date
-        year_pattern = r'(?:born|birth)\s+(?:around\s+)?(\d{4})'
-        year_match = re.search(year_pattern, query, re.IGNORECASE)
+        year_match = QUERY_YEAR_PATTERN.search(query)
         if year_match:
             year = year_match.group(1)
             # Use January 1st as default
             params['date_of_birth'] = f"{year}-01-01"
         
         # Full date pattern
-        date_pattern = r'(\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4})'
-        date_match = re.search(date_pattern, query)
+        date_match = QUERY_DATE_PATTERN.search(query)
         if date_match:
             date_str = date_match.group(1)
             params['date_of_birth'] = self._normalize_date(date_str)
@@ -531,34 +550,12 @@ class SearchTools:
     
     def _load_country_mappings(self) -> Dict[str, str]:
         """Load country name mappings."""
-        return {
-            'mexico': 'Mexico',
-            'méxico': 'Mexico',
-            'guatemala': 'Guatemala',
-            'el salvador': 'El Salvador',
-            'salvador': 'El Salvador',
-            'honduras': 'Honduras',
-            'nicaragua': 'Nicaragua',
-            'costa rica': 'Costa Rica',
-            'panama': 'Panama',
-            'panamá': 'Panama',
-            'colombia': 'Colombia',
-            'venezuela': 'Venezuela',
-            'ecuador': 'Ecuador',
-            'peru': 'Peru',
-            'perú': 'Peru',
-            'bolivia': 'Bolivia',
-            'brazil': 'Brazil',
-            'brasil': 'Brazil',
-            'argentina': 'Argentina',
-            'chile': 'Chile',
-            'uruguay': 'Uruguay',
-            'paraguay': 'Paraguay'
-        }
+        return dict(COUNTRY_MAPPINGS)
     
     def _format_search_response(self, result: SearchResult, language: str = "en") -> str:
         """Format search response for MCP client."""
-        return json.dumps(result.__dict__, indent=2, default=str)
+        with phase("serialize"):
+            return dumps(result, compact=self.compact_json)
     
     def _format_error_response(self, error_message: str, language: str = "en") -> str:
         """Format error response."""
@@ -568,7 +565,8 @@ class SearchTools:
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
             "language": language
         }
-        return json.dumps(error_response, indent=2)
+        with phase("serialize"):
+            return dumps(error_response, compact=self.compact_json)
     
     async def _generate_markdown_report(self, criteria: Dict, results: List[Dict], report_type: str) -> str:
         """Generate markdown format report."""
@@ -635,11 +633,12 @@ class SearchTools:
             },
             "results": results,
             "recommendations": self._get_recommendations_for_report_type(report_type),
-            "legal_resources": SearchResult._get_legal_resources(),
-            "family_resources": SearchResult._get_family_resources()
+            "legal_resources": LEGAL_RESOURCES,
+            "family_resources": FAMILY_RESOURCES
         }
         
-        return json.dumps(report, indent=2, default=str)
+        with phase("serialize"):
+            return dumps(report, compact=self.compact_json)
     
     def _get_recommendations_for_report_type(self, report_type: str) -> List[str]:
         """Get recommendations based on report type."""
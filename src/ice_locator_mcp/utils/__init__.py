@@ -2,9 +2,7 @@
 Utility modules for ICE Locator MCP Server.
 """
 
-from .cache import CacheManager
-from .rate_limiter import RateLimiter
-from .logging import setup_logging, get_logger, RequestLogger, PerformanceLogger, SecurityLogger
+from .lazy_imports import lazy_exports
 
 __all__ = [
     "CacheManager",
@@ -14,4 +12,15 @@ __all__ = [
     "RequestLogger",
     "PerformanceLogger",
     "SecurityLogger"
-]
\ No newline at end of file
+]
+
+# Submodules (diskcache, prometheus_client) load on first access
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "CacheManager": ".cache",
+    "RateLimiter": ".rate_limiter",
+    "setup_logging": ".logging",
+    "get_logger": ".logging",
+    "RequestLogger": ".logging",
+    "PerformanceLogger": ".logging",
+    "SecurityLogger": ".logging"
+})
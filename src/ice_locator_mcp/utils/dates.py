@@ -0,0 +1,104 @@
+"""
+Date parsing utilities for ICE Locator MCP Server.
+
+Shared by the natural language query processor (tools) and the search
+request canonicalization (core), so neither layer imports the other.
+"""
+
+import calendar
+import re
+from datetime import date, datetime
+from typing import Optional
+
+
+class DateParser:
+    """Parse various date formats and expressions."""
+    
+    def __init__(self):
+        self.current_year = datetime.now().year
+        self.month_names = {
+            month.lower(): i for i, month in enumerate(calendar.month_name[1:], 1)
+        }
+        self.month_abbrev = {
+            month.lower(): i for i, month in enumerate(calendar.month_abbr[1:], 1)
+        }
+        
+        # Exact date patterns
+        self.patterns = [(re.compile(pattern), parser) for pattern, parser in [
+            # YYYY-MM-DD
+            (r'(\d{4})-(\d{1,2})-(\d{1,2})', self._parse_ymd),
+            # MM/DD/YYYY
+            (r'(\d{1,2})/(\d{1,2})/(\d{4})', self._parse_mdy),
+            # DD/MM/YYYY (European)
+            (r'(\d{1,2})/(\d{1,2})/(\d{4})', self._parse_dmy),
+            # Month DD, YYYY
+            (r'([a-z]+)\s+(\d{1,2}),?\s+(\d{4})', self._parse_month_day_year),
+            # DD Month YYYY
+            (r'(\d{1,2})\s+([a-z]+)\s+(\d{4})', self._parse_day_month_year),
+            # Just year
+            (r'^(\d{4})$', self._parse_year_only),
+            # "born around 1990"
+            (r'(?:around|about|circa)\s+(\d{4})', self._parse_approximate_year),
+            # "born in 1990"
+            (r'(?:in|during)\s+(\d{4})', self._parse_year_only),
+        ]]
+        
+    def parse_date(self, date_str: str) -> Optional[str]:
+        """Parse natural language date into YYYY-MM-DD format."""
+        date_str = date_str.lower().strip()
+        
+        for pattern, parser in self.patterns:
+            match = pattern.search(date_str)
+            if match:
+                try:
+                    return parser(match)
+                except (ValueError, IndexError):
+                    continue
+        
+        return None
+    
+    def _parse_ymd(self, match) -> str:
+        """Parse YYYY-MM-DD format."""
+        year, month, day = match.groups()
+        return date(int(year), int(month), int(day)).isoformat()
+    
+    def _parse_mdy(self, match) -> str:
+        """Parse MM/DD/YYYY format."""
+        month, day, year = match.groups()
+        return date(int(year), int(month), int(day)).isoformat()
+    
+    def _parse_dmy(self, match) -> str:
+        """Parse DD/MM/YYYY format (European)."""
+        day, month, year = match.groups()
+        return date(int(year), int(month), int(day)).isoformat()
+    
+    def _parse_month_day_year(self, match) -> str:
+        """Parse 'Month DD, YYYY' format."""
+        month_str, day, year = match.groups()
+        month_num = self._parse_month_name(month_str)
+        if month_num:
+            return date(int(year), month_num, int(day)).isoformat()
+        raise ValueError("Invalid month name")
+    
+    def _parse_day_month_year(self, match) -> str:
+        """Parse 'DD Month YYYY' format."""
+        day, month_str, year = match.groups()
+        month_num = self._parse_month_name(month_str)
+        if month_num:
+            return date(int(year), month_num, int(day)).isoformat()
+        raise ValueError("Invalid month name")
+    
+    def _parse_year_only(self, match) -> str:
+        """Parse year only, default to January 1st."""
+        year = match.groups()[0]
+        return f"{year}-01-01"
+    
+    def _parse_approximate_year(self, match) -> str:
+        """Parse approximate year."""
+        year = match.groups()[0]
+        return f"{year}-01-01"
+    
+    def _parse_month_name(self, month_str: str) -> Optional[int]:
+        """Parse month name or abbreviation."""
+        month_str = month_str.lower()
+        return self.month_names.get(month_str) or self.month_abbrev.get(month_str)
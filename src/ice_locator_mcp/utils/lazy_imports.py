@@ -0,0 +1,36 @@
+"""
+Lazy exports for package ``__init__`` modules.
+
+A package lists its public names and the submodule defining each; the
+submodule is imported the first time one of its names is accessed
+(PEP 562), so importing a package no longer imports everything in it.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(namespace: Dict[str, Any], exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build ``__getattr__`` and ``__dir__`` for a package namespace.
+    
+    Args:
+        namespace: The package's ``globals()``
+        exports: Exported name to the relative module that defines it
+    
+    Returns:
+        Module-level ``__getattr__`` and ``__dir__`` functions
+    """
+    package = namespace["__name__"]
+    
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+    
+    return __getattr__, __dir__
@@ -43,10 +43,10 @@ def setup_logging(
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging
+    # Configure standard library logging (stdout carries the MCP stdio transport)
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout if console_output else None,
+        stream=sys.stderr if console_output else None,
         level=getattr(logging, level.upper())
     )
     
@@ -10,9 +10,20 @@ import json
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import psutil
 import structlog
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+from .prometheus_metrics import METRICS_REGISTRY
+from .sketches import LatencySketch, SlidingWindowSketch
+
+
+# Upper bounds (seconds) used when exporting latency sketches as Prometheus histograms
+PROMETHEUS_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
 
 
 @dataclass
@@ -50,6 +61,7 @@ class RequestMetrics:
     
     # Request details
     search_type: Optional[str] = None
+    tool_name: Optional[str] = None
     result_count: Optional[int] = None
     proxy_used: Optional[str] = None
     
@@ -93,6 +105,10 @@ class MetricsCollector:
         # Current request tracking
         self.active_requests: Dict[str, RequestMetrics] = {}
         
+        # Streaming latency sketches keyed by (tool_name, search_type);
+        # unlike request_metrics these are not capped by max_history
+        self.latency_sketches: Dict[Tuple[str, str], SlidingWindowSketch] = {}
+        
         # Aggregated statistics
         self.stats_cache: Dict[str, Any] = {}
         self.stats_cache_time: float = 0.0
@@ -120,12 +136,14 @@ class MetricsCollector:
                 pass
         self.logger.info("Performance monitoring stopped")
     
-    def start_request(self, request_id: str, search_type: str = None) -> RequestMetrics:
+    def start_request(self, request_id: str, search_type: str = None,
+                      tool_name: str = None) -> RequestMetrics:
         """Start tracking a new request."""
         metrics = RequestMetrics(
             request_id=request_id,
             start_time=time.time(),
-            search_type=search_type
+            search_type=search_type,
+            tool_name=tool_name
         )
         self.active_requests[request_id] = metrics
         return metrics
@@ -145,6 +163,7 @@ class MetricsCollector:
             # Move to history
             self.request_metrics.append(metrics)
             del self.active_requests[request_id]
+            self._record_sketch(metrics)
             
             self.logger.debug(
                 "Request completed",
@@ -165,56 +184,91 @@ class MetricsCollector:
         )
         self.custom_metrics[name].append(metric)
     
+    def _record_sketch(self, metrics: RequestMetrics) -> None:
+        """Fold a completed request into its streaming sketch (O(1))."""
+        key = (metrics.tool_name or "", metrics.search_type or "")
+        sketch = self.latency_sketches.get(key)
+        if sketch is None:
+            sketch = self.latency_sketches[key] = SlidingWindowSketch()
+        
+        outcomes = ["total", metrics.status]
+        if metrics.status == "completed" and metrics.cache_hit:
+            outcomes.append("cache_hit")
+        
+        duration = metrics.total_duration if metrics.status == "completed" else None
+        sketch.record(duration or None, outcomes, now=metrics.end_time)
+    
     def get_request_stats(self, last_n_minutes: int = 60) -> Dict[str, Any]:
         """Get request statistics for the last N minutes."""
-        cutoff_time = time.time() - (last_n_minutes * 60)
-        
-        # Filter recent requests
-        recent_requests = [
-            req for req in self.request_metrics 
-            if req.start_time >= cutoff_time
-        ]
+        window_seconds = last_n_minutes * 60
+        now = time.time()
+        
+        # Merge the per-key sliding windows
+        durations = LatencySketch()
+        counts: Dict[str, int] = defaultdict(int)
+        by_search_type: Dict[str, int] = defaultdict(int)
+        by_tool: Dict[str, int] = defaultdict(int)
+        latency_breakdown: Dict[str, Dict[str, Any]] = {}
+        
+        for (tool_name, search_type), sketch in self.latency_sketches.items():
+            key_durations, key_counts = sketch.window(window_seconds, now)
+            if not key_counts["total"]:
+                continue
+            
+            durations.merge(key_durations)
+            for outcome, count in key_counts.items():
+                counts[outcome] += count
+            if search_type:
+                by_search_type[search_type] += key_counts["total"]
+            if tool_name:
+                by_tool[tool_name] += key_counts["total"]
+            
+            if key_durations.count:
+                p50, p95, p99 = key_durations.quantiles((0.5, 0.95, 0.99))
+                latency_breakdown[f"{tool_name or '-'}/{search_type or '-'}"] = {
+                    'tool_name': tool_name or None,
+                    'search_type': search_type or None,
+                    'count': key_durations.count,
+                    'p50_response_time': p50,
+                    'p95_response_time': p95,
+                    'p99_response_time': p99
+                }
         
-        if not recent_requests:
+        total_requests = counts["total"]
+        if not total_requests:
             return {
                 'total_requests': 0,
                 'time_period_minutes': last_n_minutes
             }
         
-        # Calculate statistics
-        completed_requests = [req for req in recent_requests if req.status == "completed"]
-        failed_requests = [req for req in recent_requests if req.status == "failed"]
-        
-        durations = [req.total_duration for req in completed_requests if req.total_duration]
+        completed_requests = counts["completed"]
         
         stats = {
             'time_period_minutes': last_n_minutes,
-            'total_requests': len(recent_requests),
-            'completed_requests': len(completed_requests),
-            'failed_requests': len(failed_requests),
-            'success_rate': len(completed_requests) / len(recent_requests) if recent_requests else 0,
-            'requests_per_minute': len(recent_requests) / last_n_minutes,
+            'total_requests': total_requests,
+            'completed_requests': completed_requests,
+            'failed_requests': counts["failed"],
+            'success_rate': completed_requests / total_requests,
+            'requests_per_minute': total_requests / last_n_minutes,
         }
         
-        if durations:
+        if durations.count:
+            p50, p95, p99 = durations.quantiles((0.5, 0.95, 0.99))
             stats.update({
-                'avg_response_time': sum(durations) / len(durations),
-                'min_response_time': min(durations),
-                'max_response_time': max(durations),
-                'p95_response_time': self._calculate_percentile(durations, 0.95),
-                'p99_response_time': self._calculate_percentile(durations, 0.99)
+                'avg_response_time': durations.mean,
+                'min_response_time': durations.min,
+                'max_response_time': durations.max,
+                'p50_response_time': p50,
+                'p95_response_time': p95,
+                'p99_response_time': p99
             })
         
-        # Group by search type
-        by_search_type = defaultdict(int)
-        for req in recent_requests:
-            if req.search_type:
-                by_search_type[req.search_type] += 1
         stats['by_search_type'] = dict(by_search_type)
+        stats['by_tool'] = dict(by_tool)
+        stats['latency_breakdown'] = latency_breakdown
         
         # Cache hit rate
-        cache_hits = sum(1 for req in completed_requests if req.cache_hit)
-        stats['cache_hit_rate'] = cache_hits / len(completed_requests) if completed_requests else 0
+        stats['cache_hit_rate'] = counts["cache_hit"] / completed_requests if completed_requests else 0
         
         return stats
     
@@ -333,16 +387,6 @@ class MetricsCollector:
             active_connections=connections
         )
     
-    def _calculate_percentile(self, values: List[float], percentile: float) -> float:
-        """Calculate percentile of values."""
-        if not values:
-            return 0.0
-        
-        sorted_values = sorted(values)
-        index = int(percentile * len(sorted_values))
-        index = min(index, len(sorted_values) - 1)
-        return sorted_values[index]
-    
     def export_metrics(self, format: str = "json") -> str:
         """Export metrics in specified format."""
         data = {
@@ -361,6 +405,49 @@ class MetricsCollector:
             return json.dumps(data, indent=2, default=str)
         else:
             raise ValueError(f"Unsupported export format: {format}")
+    
+    def register_prometheus(self, registry: Optional[CollectorRegistry] = None) -> "RequestSketchCollector":
+        """Expose the latency sketches as Prometheus histograms."""
+        collector = RequestSketchCollector(self)
+        (registry or METRICS_REGISTRY).register(collector)
+        return collector
+
+
+class RequestSketchCollector:
+    """Prometheus collector exporting MetricsCollector sketches."""
+    
+    def __init__(self, metrics_collector: MetricsCollector,
+                 buckets: Tuple[float, ...] = PROMETHEUS_LATENCY_BUCKETS):
+        self.metrics_collector = metrics_collector
+        self.buckets = buckets
+    
+    def collect(self) -> Iterator[Any]:
+        """Yield cumulative histogram and counter families."""
+        histogram = HistogramMetricFamily(
+            "ice_locator_request_duration_seconds",
+            "Duration of completed requests",
+            labels=["tool", "search_type"]
+        )
+        requests = CounterMetricFamily(
+            "ice_locator_requests",
+            "Requests by outcome",
+            labels=["tool", "search_type", "outcome"]
+        )
+        
+        for (tool_name, search_type), sketch in list(self.metrics_collector.latency_sketches.items()):
+            lifetime = sketch.lifetime
+            buckets = [
+                (str(bound), lifetime.count_at_or_below(bound))
+                for bound in self.buckets
+            ]
+            buckets.append(("+Inf", lifetime.count))
+            histogram.add_metric([tool_name, search_type], buckets, lifetime.sum)
+            
+            for outcome, count in sketch.lifetime_counts.items():
+                requests.add_metric([tool_name, search_type, outcome], count)
+        
+        yield histogram
+        yield requests
 
 
 class PerformanceProfiler:
@@ -0,0 +1,231 @@
+"""
+Sampled tool-call profiling for ICE Locator MCP Server.
+
+When profiling is enabled, a configurable fraction of tool calls is
+profiled. A sampled call gets per-phase wall times (cache lookup,
+rate-limit wait, fetch, parse, fuzzy matching, serialization, telemetry)
+and, while no other call is being sampled, a statistical stack profile of
+the event loop thread. The profile is written as a collapsed-stack file
+(``<name>.folded``, readable by flamegraph.pl and speedscope) next to a
+JSON summary, and old files are pruned.
+
+Phases are exclusive: entering a nested phase pauses the enclosing one, so
+a fetch made while fuzzy matching counts as fetch only. Outside a sampled
+call, ``phase`` costs one context variable lookup.
+
+Tool names come from the client, so names outside the registered tools are
+profiled as ``unknown`` before they reach a file name or a metric label.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+import structlog
+
+from .prometheus_metrics import TOOL_PHASE_DURATION
+
+
+PHASES = ("cache", "rate_limit", "fetch", "parse", "fuzzy", "serialize", "telemetry")
+
+_active_profile: ContextVar[Optional["CallProfile"]] = ContextVar("ice_locator_call_profile", default=None)
+_profile_ids = itertools.count(1)
+
+UNKNOWN_TOOL = "unknown"
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+@dataclass
+class CallProfile:
+    """Phase timings of one sampled tool call."""
+
+    tool_name: str
+    started_at: float = field(default_factory=time.time)
+    start: float = field(default_factory=time.perf_counter)
+    phases: Dict[str, float] = field(default_factory=dict)
+    current: Optional[str] = None
+    current_start: float = 0.0
+    duration: float = 0.0
+
+    def _switch(self, name: Optional[str]) -> Optional[str]:
+        """Charge the running phase up to now and make ``name`` the running phase."""
+        now = time.perf_counter()
+        if self.current is not None:
+            self.phases[self.current] = self.phases.get(self.current, 0.0) + now - self.current_start
+        previous, self.current, self.current_start = self.current, name, now
+        return previous
+
+    def summary(self) -> Dict[str, float]:
+        """Phase times in milliseconds, with time outside any phase as ``other``."""
+        phases = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+        phases["other"] = round(max(0.0, self.duration - sum(self.phases.values())) * 1000, 3)
+        return phases
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attribute the enclosed block to ``name`` when the current call is sampled."""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    previous = profile._switch(name)
+    try:
+        yield
+    finally:
+        # Concurrent sub-tasks of one call (bulk search) share the profile;
+        # only hand back if no sibling has switched phase in the meantime
+        if profile.current == name:
+            profile._switch(previous)
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval from a background thread."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None) -> None:
+        """Start sampling ``thread_id`` (the calling thread by default)."""
+        self._target = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ice-locator-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling and return collapsed stacks with their sample counts."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            names: List[str] = []
+            while frame is not None and len(names) < self.max_depth:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+
+class ToolCallProfiler:
+    """Profiles a sampled fraction of tool calls and keeps the newest profiles on disk."""
+
+    def __init__(self, config, tool_names: Optional[Iterable[str]] = None):
+        """
+        Args:
+            config: ProfilingConfig
+            tool_names: Registered tool names; any other name is profiled as
+                ``unknown``. Without it, every name is profiled as ``unknown``.
+        """
+        self.config = config
+        self.tool_names = frozenset(tool_names or ())
+        self.logger = structlog.get_logger(__name__)
+        self.output_dir = Path(config.output_dir)
+        self._sampler_busy = False
+        self._rng = random.Random()
+        self.profiled_calls = 0
+
+    def tool_label(self, tool_name: str) -> str:
+        """Bounded, path-safe name for a client-supplied tool name."""
+        if tool_name not in self.tool_names:
+            return UNKNOWN_TOOL
+        return _UNSAFE_NAME_CHARS.sub("_", tool_name)
+
+    def should_sample(self) -> bool:
+        """Decide whether the next tool call is profiled."""
+        return self.config.enabled and self._rng.random() < self.config.sample_rate
+
+    @asynccontextmanager
+    async def profile(self, tool_name: str) -> AsyncIterator[Optional[CallProfile]]:
+        """Profile the enclosed tool call if it is sampled."""
+        if not self.should_sample():
+            yield None
+            return
+
+        profile = CallProfile(self.tool_label(tool_name))
+        token = _active_profile.set(profile)
+        sampler = None
+        if not self._sampler_busy:
+            # The stack sampler sees the whole loop thread, so only one call uses it at a time
+            self._sampler_busy = True
+            sampler = StackSampler(self.config.interval)
+            sampler.start()
+        try:
+            yield profile
+        finally:
+            stacks = sampler.stop() if sampler else Counter()
+            if sampler:
+                self._sampler_busy = False
+            profile._switch(None)
+            profile.duration = time.perf_counter() - profile.start
+            _active_profile.reset(token)
+            self.profiled_calls += 1
+            self._record_phases(profile)
+            await asyncio.get_running_loop().run_in_executor(None, self._write, profile, stacks)
+
+    def _record_phases(self, profile: CallProfile) -> None:
+        for name, seconds in profile.phases.items():
+            TOOL_PHASE_DURATION.labels(tool=profile.tool_name, phase=name).observe(seconds)
+
+    def _write(self, profile: CallProfile, stacks: Counter) -> None:
+        """Write the profile files and apply retention (runs off the event loop)."""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(profile.started_at))
+            base = self.output_dir / f"{stamp}-{profile.tool_name}-{next(_profile_ids)}"
+            base.with_suffix(".folded").write_text(
+                "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+            )
+            base.with_suffix(".json").write_text(json.dumps({
+                "tool": profile.tool_name,
+                "started_at": profile.started_at,
+                "duration_ms": round(profile.duration * 1000, 3),
+                "phases_ms": profile.summary(),
+                "stack_samples": sum(stacks.values()),
+                "sample_interval_ms": self.config.interval * 1000,
+            }, indent=2))
+            self.prune()
+            self.logger.debug("Tool call profiled", tool_name=profile.tool_name, path=str(base))
+        except OSError as e:
+            self.logger.warning("Failed to write tool call profile", error=str(e))
+
+    def prune(self) -> int:
+        """Delete profiles beyond ``max_files`` or older than ``max_age_hours``.
+
+        Returns:
+            Number of profiles removed
+        """
+        summaries = sorted(self.output_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        cutoff = time.time() - self.config.max_age_hours * 3600
+        expired = [
+            p for i, p in enumerate(summaries)
+            if i >= self.config.max_files or p.stat().st_mtime < cutoff
+        ]
+        for summary in expired:
+            summary.unlink(missing_ok=True)
+            summary.with_suffix(".folded").unlink(missing_ok=True)
+        return len(expired)
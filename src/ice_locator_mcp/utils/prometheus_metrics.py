@@ -0,0 +1,350 @@
+"""
+Prometheus metrics exposition for ICE Locator MCP Server.
+
+Defines the process-wide Prometheus instruments (tool calls and their
+profiled phases, cache tiers, rate-limiter waits, parsing, heatmap DB
+queries, event-loop lag and slow callbacks) and the helpers that expose them: a
+``/metrics`` payload for the heatmap FastAPI app and an optional side-port
+HTTP server for the stdio MCP server.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    GC_COLLECTOR,
+    PLATFORM_COLLECTOR,
+    PROCESS_COLLECTOR,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+# Dedicated registry so the instruments can be defined at import time without
+# colliding with anything else registered on the process-global default
+METRICS_REGISTRY = CollectorRegistry()
+for _collector in (PROCESS_COLLECTOR, PLATFORM_COLLECTOR, GC_COLLECTOR):
+    METRICS_REGISTRY.register(_collector)
+
+TOOL_CALLS = Counter(
+    "ice_locator_tool_calls",
+    "MCP tool calls by tool and outcome",
+    ["tool", "status"],
+    registry=METRICS_REGISTRY
+)
+TOOL_CALL_DURATION = Histogram(
+    "ice_locator_tool_call_duration_seconds",
+    "MCP tool call latency",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+CACHE_REQUESTS = Counter(
+    "ice_locator_cache_requests",
+    "Cache lookups by tier and result",
+    ["tier", "result"],
+    registry=METRICS_REGISTRY
+)
+CACHE_HIT_RATIO = Gauge(
+    "ice_locator_cache_hit_ratio",
+    "Cache hit ratio since start, per tier",
+    ["tier"],
+    registry=METRICS_REGISTRY
+)
+TOOL_PHASE_DURATION = Histogram(
+    "ice_locator_tool_phase_duration_seconds",
+    "Time spent per phase of profiled (sampled) MCP tool calls",
+    ["tool", "phase"],
+    buckets=FAST_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+RATE_LIMITER_WAIT = Histogram(
+    "ice_locator_rate_limiter_wait_seconds",
+    "Time spent waiting for rate limiter permission",
+    buckets=(0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=METRICS_REGISTRY
+)
+PARSE_DURATION = Histogram(
+    "ice_locator_parse_duration_seconds",
+    "Time spent parsing locator result pages",
+    ["search_type"],
+    buckets=FAST_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+DB_QUERY_DURATION = Histogram(
+    "ice_locator_db_query_duration_seconds",
+    "Database query time per heatmap endpoint",
+    ["endpoint"],
+    buckets=FAST_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+EVENT_LOOP_LAG = Histogram(
+    "ice_locator_event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the event loop probe",
+    buckets=FAST_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+EVENT_LOOP_BLOCKED = Histogram(
+    "ice_locator_event_loop_blocked_seconds",
+    "Duration of callbacks that blocked the event loop past the slow-callback threshold",
+    buckets=LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY
+)
+SLOW_CALLBACKS = Counter(
+    "ice_locator_event_loop_slow_callbacks_total",
+    "Callbacks that blocked the event loop past the slow-callback threshold",
+    ["coroutine"],
+    registry=METRICS_REGISTRY
+)
+
+_cache_totals: Dict[str, Tuple[int, int]] = {}
+
+
+def record_tool_call(tool_name: str, duration: float, status: str) -> None:
+    """Record a completed MCP tool call."""
+    TOOL_CALLS.labels(tool=tool_name, status=status).inc()
+    TOOL_CALL_DURATION.labels(tool=tool_name).observe(duration)
+
+
+def record_cache_lookup(tier: str, hit: bool) -> None:
+    """Record a cache lookup and refresh the tier's hit ratio."""
+    CACHE_REQUESTS.labels(tier=tier, result="hit" if hit else "miss").inc()
+
+    hits, total = _cache_totals.get(tier, (0, 0))
+    hits, total = hits + int(hit), total + 1
+    _cache_totals[tier] = (hits, total)
+    CACHE_HIT_RATIO.labels(tier=tier).set(hits / total)
+
+
+@contextmanager
+def observe_duration(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Time a block into ``histogram`` (with optional labels)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        target = histogram.labels(**labels) if labels else histogram
+        target.observe(time.perf_counter() - start)
+
+
+def metrics_payload(registry: CollectorRegistry = METRICS_REGISTRY) -> Tuple[bytes, str]:
+    """Render the exposition payload and its content type."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: CollectorRegistry = METRICS_REGISTRY):
+    """Serve ``/metrics`` on a side port (for the stdio MCP server)."""
+    logger = structlog.get_logger(__name__)
+    server = start_http_server(port, addr=host, registry=registry)
+    logger.info("Prometheus metrics server started", host=host, port=port)
+    return server
+
+
+@dataclass
+class SlowCallback:
+    """One stretch during which a callback kept the event loop busy."""
+
+    started_at: float
+    duration: float
+    task: Optional[str] = None
+    coroutine: Optional[str] = None
+    stack: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SlowCallbackDetector:
+    """Watchdog thread that catches callbacks blocking the event loop.
+
+    Every ``check_interval`` the watchdog schedules a no-op on the loop. If
+    the loop has not run it after ``threshold`` seconds, the watchdog
+    captures the loop thread's stack and the task being stepped, then waits
+    for the loop to recover to measure how long it was blocked. Costs one
+    loop callback per interval while the loop is healthy.
+    """
+
+    def __init__(self, threshold: float = 0.1, check_interval: Optional[float] = None,
+                 max_records: int = 50, max_depth: int = 32):
+        self.threshold = threshold
+        self.check_interval = check_interval if check_interval is not None else threshold
+        self.max_depth = max_depth
+        self.records: Deque[SlowCallback] = deque(maxlen=max_records)
+        self.total = 0
+        self.logger = structlog.get_logger(__name__)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start watching the running loop."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ice-locator-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        # The loop was last known to be free when it answered a probe; a
+        # block can start any time after that, even before the next probe
+        last_answered = time.perf_counter()
+        while not self._stop.is_set():
+            answered = threading.Event()
+            answered_at: List[float] = []
+
+            def answer() -> None:
+                answered_at.append(time.perf_counter())
+                answered.set()
+
+            try:
+                self._loop.call_soon_threadsafe(answer)
+            except RuntimeError:
+                return  # Loop closed
+            if not answered.wait(self.threshold):
+                blocked = self._capture(time.time() - (time.perf_counter() - last_answered))
+                while not answered.wait(0.05):
+                    if self._stop.is_set():
+                        return
+                blocked.duration = answered_at[0] - last_answered
+                self._record(blocked)
+            last_answered = answered_at[0]
+            self._stop.wait(self.check_interval)
+
+    def _capture(self, started_at: float) -> SlowCallback:
+        """Snapshot what the loop thread is running right now."""
+        record = SlowCallback(started_at=started_at, duration=0.0)
+        task = asyncio.current_task(self._loop)
+        if task is not None:
+            record.task = task.get_name()
+            coroutine = task.get_coro()
+            record.coroutine = getattr(coroutine, "__qualname__", repr(coroutine))
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is not None:
+            summary = traceback.StackSummary.extract(
+                traceback.walk_stack(frame), limit=self.max_depth, lookup_lines=False
+            )
+            record.stack = [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in reversed(summary)]
+        return record
+
+    def _record(self, record: SlowCallback) -> None:
+        self.records.append(record)
+        self.total += 1
+        EVENT_LOOP_BLOCKED.observe(record.duration)
+        SLOW_CALLBACKS.labels(coroutine=record.coroutine or "<callback>").inc()
+        self.logger.warning(
+            "Event loop blocked",
+            duration_ms=round(record.duration * 1000, 1),
+            coroutine=record.coroutine,
+            where=record.stack[-1] if record.stack else None
+        )
+
+
+class EventLoopLagProbe:
+    """Periodically measures how late the event loop wakes a sleeping task.
+
+    With ``slow_callback_threshold`` set, a :class:`SlowCallbackDetector`
+    also runs and records what blocked the loop. ``alert_metrics`` feeds
+    both into ``AlertManager`` rules.
+    """
+
+    def __init__(self, interval: float = 0.5, slow_callback_threshold: Optional[float] = None):
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+        self.last_lag: float = 0.0
+        self.max_lag: float = 0.0
+        self.samples = 0
+        self.lag_counts = [0] * (len(FAST_BUCKETS) + 1)
+        self.detector = SlowCallbackDetector(slow_callback_threshold) if slow_callback_threshold else None
+        self._window_max_lag = 0.0
+        self._window_slow_callbacks = 0
+
+    def start(self) -> None:
+        """Start probing on the running loop."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        if self.detector:
+            self.detector.start()
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self.detector:
+            await asyncio.to_thread(self.detector.stop)
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def observe(self, lag: float) -> None:
+        """Record one lag measurement."""
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self._window_max_lag = max(self._window_max_lag, lag)
+        self.samples += 1
+        self.lag_counts[bisect_left(FAST_BUCKETS, lag)] += 1
+        EVENT_LOOP_LAG.observe(lag)
+
+    def histogram(self) -> Dict[str, int]:
+        """Lag sample counts per bucket (upper bounds in seconds, non-cumulative)."""
+        labels = [f"le_{bound:g}" for bound in FAST_BUCKETS] + ["le_inf"]
+        return {label: count for label, count in zip(labels, self.lag_counts) if count}
+
+    def summary(self) -> Dict[str, Any]:
+        """Lag histogram and recent slow callbacks, for dashboards."""
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "lag_histogram": self.histogram(),
+            "slow_callbacks_total": self.detector.total if self.detector else 0,
+            "slow_callbacks": [r.to_dict() for r in self.detector.records] if self.detector else [],
+        }
+
+    def alert_metrics(self) -> Dict[str, float]:
+        """Worst lag and slow-callback count since the previous call."""
+        total = self.detector.total if self.detector else 0
+        metrics = {
+            "event_loop_lag_ms": self._window_max_lag * 1000,
+            "slow_callback_count": float(total - self._window_slow_callbacks),
+        }
+        self._window_max_lag = 0.0
+        self._window_slow_callbacks = total
+        return metrics
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.observe(max(0.0, loop.time() - scheduled))
@@ -4,92 +4,129 @@ Rate limiting utilities for ICE Locator MCP Server.
 
 import asyncio
 import time
-from typing import Dict, Optional
+from typing import Any, Dict
 import structlog
 
 
 class RateLimiter:
-    """Rate limiter with burst allowance and smart backoff."""
-    
-    def __init__(self, 
+    """GCRA (token-bucket) rate limiter with burst allowance and smart backoff.
+
+    State is a single theoretical arrival time, so admission is O(1). Each
+    caller reserves its slot synchronously in arrival order and then sleeps
+    without holding any lock, which makes waiters a fair FIFO queue while
+    cache-only workloads never contend with a sleeping caller.
+    """
+
+    def __init__(self,
                  requests_per_minute: int = 10,
                  burst_allowance: int = 20):
         self.requests_per_minute = requests_per_minute
         self.burst_allowance = burst_allowance
         self.logger = structlog.get_logger(__name__)
-        
-        # Rate limiting state
-        self.request_times: list = []
-        self.burst_count = 0
-        self.last_reset = time.time()
-        self.lock = asyncio.Lock()
-        
+
+        # GCRA state: theoretical arrival time of the next conforming request
+        self.theoretical_arrival = time.monotonic()
+        self.waiting = 0
+        self.total_wait_time = 0.0
+        self.total_acquired = 0
+
         # Adaptive rate limiting
         self.success_count = 0
         self.error_count = 0
         self.current_rate_multiplier = 1.0
-        
-    async def acquire(self) -> None:
-        """Acquire permission to make a request."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Clean old request times (older than 1 minute)
-            self.request_times = [
-                t for t in self.request_times 
-                if current_time - t < 60
-            ]
-            
-            # Reset burst count every minute
-            if current_time - self.last_reset > 60:
-                self.burst_count = 0
-                self.last_reset = current_time
-            
-            # Calculate current rate limit
-            effective_rate = int(self.requests_per_minute * self.current_rate_multiplier)
-            
-            # Check if we need to wait
-            if len(self.request_times) >= effective_rate:
-                # Check if we can use burst allowance
-                if self.burst_count < self.burst_allowance:
-                    self.burst_count += 1
-                    self.logger.debug("Using burst allowance", burst_count=self.burst_count)
-                else:
-                    # Calculate wait time
-                    oldest_request = min(self.request_times)
-                    wait_time = 60 - (current_time - oldest_request)
-                    
-                    if wait_time > 0:
-                        self.logger.info("Rate limit reached, waiting", wait_time=wait_time)
-                        await asyncio.sleep(wait_time)
-            
-            # Record this request
-            self.request_times.append(current_time)
-    
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds between requests at the current (adaptive) rate."""
+        effective_rate = max(1, int(self.requests_per_minute * self.current_rate_multiplier))
+        return 60.0 / effective_rate
+
+    @property
+    def burst_tolerance(self) -> float:
+        """How far ahead of schedule a burst may run.
+
+        A bucket of ``burst_allowance`` tokens admits at most
+        ``burst_allowance + requests_per_minute`` requests in any minute,
+        never more than the previous sliding-window implementation.
+        """
+        return max(0, self.burst_allowance - 1) * self.emission_interval
+
+    def time_until_available(self) -> float:
+        """Seconds until a request made now would be admitted without waiting."""
+        return max(0.0, self.theoretical_arrival - self.burst_tolerance - time.monotonic())
+
+    def _reserve(self, now: float) -> float:
+        """Reserve the next slot and return the monotonic time it opens."""
+        allowed_at = max(now, self.theoretical_arrival - self.burst_tolerance)
+        self.theoretical_arrival = max(self.theoretical_arrival, now) + self.emission_interval
+        return allowed_at
+
+    async def acquire(self) -> float:
+        """Acquire permission to make a request.
+
+        Returns:
+            Seconds spent waiting for the reserved slot
+        """
+        # Reservation is synchronous (no await), so it is atomic on the loop
+        requested_at = time.monotonic()
+        allowed_at = self._reserve(requested_at)
+        reserved_arrival = self.theoretical_arrival
+        wait_time = allowed_at - requested_at
+
+        if wait_time > 0:
+            self.logger.info("Rate limit reached, waiting", wait_time=wait_time, queued=self.waiting)
+            self.waiting += 1
+            try:
+                # Sleep to the absolute slot time so waiters wake in FIFO order
+                await asyncio.sleep(max(0.0, allowed_at - time.monotonic()))
+            except asyncio.CancelledError:
+                # Give the slot back if nobody reserved behind us
+                if self.theoretical_arrival == reserved_arrival:
+                    self.theoretical_arrival -= self.emission_interval
+                raise
+            finally:
+                self.waiting -= 1
+
+        self.total_acquired += 1
+        self.total_wait_time += wait_time
+        return wait_time
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get current limiter state."""
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "burst_allowance": self.burst_allowance,
+            "rate_multiplier": self.current_rate_multiplier,
+            "time_until_available": self.time_until_available(),
+            "waiting": self.waiting,
+            "total_acquired": self.total_acquired,
+            "average_wait_time": self.total_wait_time / self.total_acquired if self.total_acquired else 0.0
+        }
+
     async def mark_success(self) -> None:
         """Mark a successful request for adaptive rate limiting."""
         self.success_count += 1
         await self._adjust_rate_multiplier()
-    
+
     async def mark_error(self, error_type: str = "general") -> None:
         """Mark a failed request for adaptive rate limiting."""
         self.error_count += 1
-        
+
         # Reduce rate more aggressively for certain errors
         if error_type in ["rate_limit", "captcha", "blocked"]:
             self.error_count += 2  # Count these as worse errors
-        
+
         await self._adjust_rate_multiplier()
-    
+
     async def _adjust_rate_multiplier(self) -> None:
         """Adjust rate multiplier based on success/error ratio."""
         total_requests = self.success_count + self.error_count
-        
+
         if total_requests < 10:
             return  # Not enough data yet
-        
+
         success_rate = self.success_count / total_requests
-        
+
         # Adjust multiplier based on success rate
         if success_rate > 0.9:
             # High success rate, can be more aggressive
@@ -103,14 +140,14 @@ class RateLimiter:
         else:
             # Poor success rate, be very conservative
             self.current_rate_multiplier = max(0.3, self.current_rate_multiplier - 0.2)
-        
+
         self.logger.debug(
             "Rate multiplier adjusted",
             success_rate=success_rate,
             multiplier=self.current_rate_multiplier
         )
-        
+
         # Reset counters periodically
         if total_requests > 100:
             self.success_count = int(self.success_count * 0.8)
-            self.error_count = int(self.error_count * 0.8)
\ No newline at end of file
+            self.error_count = int(self.error_count * 0.8)
@@ -0,0 +1,167 @@
+"""
+JSON serialization for MCP tool responses.
+
+Encodes with orjson when it is installed and with the standard library
+otherwise. Both backends encode the same values, but the text can differ in
+how some floats are spelled (orjson writes 1e-7 where the standard library
+writes 1e-07). NaN and infinities, which JSON cannot represent, are encoded
+as null by both. Output is indented by default, and compact mode drops all
+whitespace. Dataclasses are encoded as objects, and anything else that JSON
+cannot represent is encoded with str().
+
+Constant blocks that recur in many responses, such as the legal and family
+resource lists, can be registered with pre_encode(). They stay plain values
+everywhere else; compact output from the standard library encoder splices
+their stored text in place of re-encoding them. orjson encodes the value
+itself, which is faster than the extra splice pass.
+"""
+
+import dataclasses
+import itertools
+import json
+import math
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    # Datetimes go through default (str) so both backends agree
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_fragment_ids = itertools.count()
+
+# Pre-encoded constants by id; the stored fragment keeps the value alive, so
+# an id cannot be reused by another object
+_pre_encoded: Dict[int, "Fragment"] = {}
+
+
+class Fragment:
+    """A constant JSON value encoded once and reused in every response."""
+
+    __slots__ = ("value", "text", "token", "placeholder")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        # Control characters are always escaped, so the placeholder cannot
+        # appear in encoded output except where this fragment was encoded
+        self.token = f"\x00ice-fragment-{next(_fragment_ids)}\x00"
+        self.placeholder = json.dumps(self.token)
+
+    def __copy__(self) -> "Fragment":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Fragment":
+        return self
+
+    def __reduce__(self):
+        return Fragment, (self.value,)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Fragment):
+            return self.value == other.value
+        return self.value == other
+
+    # Equal to its (usually unhashable) value, so not hashable itself
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Fragment({self.value!r})"
+
+
+def pre_encode(value: Any) -> Any:
+    """
+    Register a constant so compact responses reuse its encoded text.
+
+    The value is returned unchanged and must not be mutated afterwards.
+    """
+    _pre_encoded[id(value)] = Fragment(value)
+    return value
+
+
+def _substitute(obj: Any, depth: int) -> Any:
+    """Replace pre-encoded constants in obj and in dicts up to depth levels down."""
+    fragment = _pre_encoded.get(id(obj))
+    if fragment is not None:
+        return fragment
+    if depth and isinstance(obj, dict):
+        return {key: _substitute(value, depth - 1) for key, value in obj.items()}
+    return obj
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of obj with NaN and infinities replaced by None, as orjson does."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if isinstance(obj, Fragment):
+        return _finite(obj.value)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: _finite(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+    return obj
+
+
+def _default(fragments: Optional[Dict[int, Fragment]]):
+    """Encoder fallback; collects fragments when they are spliced afterwards."""
+    def default(obj: Any) -> Any:
+        if isinstance(obj, Fragment):
+            if fragments is None:
+                return obj.value
+            fragments[id(obj)] = obj
+            return obj.token
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            if fragments is None:
+                return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+            # Constants sit directly in fields or in dict fields (user_guidance)
+            return {f.name: _substitute(getattr(obj, f.name), 1) for f in dataclasses.fields(obj)}
+        return str(obj)
+    return default
+
+
+def _stdlib_dumps(obj: Any, compact: bool) -> str:
+    """Encode with the standard library, splicing fragments in compact mode."""
+    if not compact:
+        return json.dumps(obj, default=_default(None), ensure_ascii=False, indent=2, allow_nan=False)
+
+    fragments: Dict[int, Fragment] = {}
+    text = json.dumps(_substitute(obj, 1), default=_default(fragments), ensure_ascii=False,
+                      separators=(",", ":"), allow_nan=False)
+    for fragment in fragments.values():
+        text = text.replace(fragment.placeholder, fragment.text)
+    return text
+
+
+def dumps(obj: Any, compact: bool = False) -> str:
+    """
+    Encode a response as JSON text.
+
+    Args:
+        obj: Value to encode
+        compact: Omit indentation and whitespace
+
+    Returns:
+        JSON text
+    """
+    if ORJSON_AVAILABLE:
+        options = _ORJSON_OPTIONS if compact else _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+        try:
+            # orjson encodes fragment values faster than a splice pass costs
+            return orjson.dumps(obj, default=_default(None), option=options).decode()
+        except TypeError:
+            # Values orjson rejects (e.g. integers over 64 bits) take the stdlib path
+            pass
+
+    try:
+        return _stdlib_dumps(obj, compact)
+    except ValueError:
+        # Only non-finite floats are rejected; encode them as null like orjson
+        return _stdlib_dumps(_finite(obj), compact)
@@ -0,0 +1,255 @@
+"""
+Streaming latency sketches for ICE Locator MCP Server.
+
+Provides a mergeable, log-bucketed latency histogram (HDR-style with a
+bounded relative error), a sliding-window wrapper built from a ring of
+per-interval sketches, and per-key sliding-window event counters. Recording
+is O(1); quantiles and window merges cost O(buckets), independent of how
+many values were recorded.
+"""
+
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class LatencySketch:
+    """Mergeable log-bucketed histogram with bounded relative error.
+
+    Values are mapped to bucket ``ceil(log(v) / log(gamma))`` where
+    ``gamma = (1 + e) / (1 - e)``, so every quantile estimate is within
+    ``relative_error`` of a true recorded value.
+    """
+
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-6):
+        if not 0.0 < relative_error < 1.0:
+            raise ValueError("relative_error must be between 0 and 1")
+        self.relative_error = relative_error
+        self.min_value = min_value
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint (in relative terms) of (gamma^(i-1), gamma^i]
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def _bucket_upper(self, index: int) -> float:
+        return self.gamma ** index
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record a value (O(1))."""
+        if value < 0:
+            raise ValueError("LatencySketch only accepts non-negative values")
+        if value < self.min_value:
+            self.zero_count += count
+        else:
+            index = self._bucket_index(value)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Merge another sketch with the same relative error into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative error")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "LatencySketch":
+        """Return an independent copy."""
+        clone = LatencySketch(self.relative_error, self.min_value)
+        clone.merge(self)
+        return clone
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0 <= q <= 1)."""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Estimate several quantiles."""
+        return [self.quantile(q) for q in qs]
+
+    def count_at_or_below(self, bound: float) -> int:
+        """Number of recorded values ``<= bound`` (used for histogram export)."""
+        total = self.zero_count if bound >= 0 else 0
+        for index, count in self.buckets.items():
+            if self._bucket_upper(index) <= bound:
+                total += count
+        return total
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of recorded values."""
+        return self.sum / self.count if self.count else 0.0
+
+
+class SlidingWindowSketch:
+    """Ring of per-interval sketches and outcome counters.
+
+    Each slot covers ``slot_seconds``; a window query merges the slots that
+    fall within the requested look-back, so old data ages out without ever
+    scanning individual requests.
+    """
+
+    def __init__(self, slot_seconds: int = 60, slots: int = 1440,
+                 relative_error: float = 0.01):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self.relative_error = relative_error
+
+        self._slot_ids: List[Optional[int]] = [None] * slots
+        self._sketches: List[Optional[LatencySketch]] = [None] * slots
+        self._counters: List[Optional[Counter]] = [None] * slots
+
+        # Cumulative since start, for monotonic exports
+        self.lifetime = LatencySketch(relative_error)
+        self.lifetime_counts: Counter = Counter()
+
+    @property
+    def max_window_seconds(self) -> int:
+        """Longest look-back the ring can answer."""
+        return self.slot_seconds * self.slots
+
+    def _slot(self, now: float) -> Tuple[LatencySketch, Counter]:
+        slot_id = int(now // self.slot_seconds)
+        index = slot_id % self.slots
+        if self._slot_ids[index] != slot_id:
+            self._slot_ids[index] = slot_id
+            self._sketches[index] = LatencySketch(self.relative_error)
+            self._counters[index] = Counter()
+        return self._sketches[index], self._counters[index]
+
+    def record(self, value: Optional[float] = None,
+               outcomes: Iterable[str] = (),
+               now: Optional[float] = None) -> None:
+        """Record a latency value and/or outcome counts (O(1))."""
+        now = time.time() if now is None else now
+        sketch, counter = self._slot(now)
+        if value is not None:
+            sketch.record(value)
+            self.lifetime.record(value)
+        for outcome in outcomes:
+            counter[outcome] += 1
+            self.lifetime_counts[outcome] += 1
+
+    def window(self, last_seconds: float,
+               now: Optional[float] = None) -> Tuple[LatencySketch, Counter]:
+        """Merge all slots within the last ``last_seconds``."""
+        now = time.time() if now is None else now
+        current = int(now // self.slot_seconds)
+        span = min(self.slots, max(1, math.ceil(last_seconds / self.slot_seconds)))
+        oldest = current - span + 1
+
+        merged = LatencySketch(self.relative_error)
+        counts: Counter = Counter()
+        for slot_id, sketch, counter in zip(self._slot_ids, self._sketches, self._counters):
+            if slot_id is not None and oldest <= slot_id <= current:
+                merged.merge(sketch)
+                counts.update(counter)
+        return merged, counts
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over a trailing time window.
+
+    Each key keeps only its non-empty slots (``slot_seconds`` wide) and a
+    running total, so recording an event and reading a key's count are O(1)
+    amortized. Counts are exact to slot granularity: an event ages out of
+    the window up to one slot late. Beyond ``max_keys``, the least recently
+    updated keys are dropped.
+    """
+
+    def __init__(self, window_seconds: float, slot_seconds: float = 60.0,
+                 max_keys: int = 10_000):
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self.slots = max(1, math.ceil(window_seconds / slot_seconds))
+        self.max_keys = max_keys
+
+        # key -> [deque of [slot_id, count], total]
+        self._keys: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _expire(self, entry: list, current: int) -> None:
+        slots = entry[0]
+        oldest = current - self.slots + 1
+        while slots and slots[0][0] < oldest:
+            entry[1] -= slots.popleft()[1]
+
+    def add(self, key: str, amount: int = 1, now: Optional[float] = None) -> int:
+        """Record ``amount`` events for ``key`` and return its count in the window."""
+        now = time.time() if now is None else now
+        current = int(now // self.slot_seconds)
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = [deque(), 0]
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+            self._expire(entry, current)
+
+        slots = entry[0]
+        if slots and slots[-1][0] == current:
+            slots[-1][1] += amount
+        else:
+            slots.append([current, amount])
+        entry[1] += amount
+        return entry[1]
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        """Events recorded for ``key`` within the window."""
+        entry = self._keys.get(key)
+        if entry is None:
+            return 0
+        now = time.time() if now is None else now
+        self._expire(entry, int(now // self.slot_seconds))
+        return entry[1]
+
+    def total(self, now: Optional[float] = None) -> int:
+        """Events within the window across all keys (O(keys))."""
+        now = time.time() if now is None else now
+        return sum(self.count(key, now) for key in list(self._keys))
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop keys with no events left in the window; returns how many."""
+        now = time.time() if now is None else now
+        idle = [key for key in list(self._keys) if self.count(key, now) == 0]
+        for key in idle:
+            del self._keys[key]
+        return len(idle)
@@ -0,0 +1,160 @@
+"""
+In-process stand-in for the online detainee locator.
+
+Serves recorded form, result, no-result and error pages as an ASGI app so
+the real SearchEngine can run against it through ``httpx.ASGITransport``
+without network access. Response latency and server errors are injected
+deterministically, so repeated runs see the same sequence of outcomes.
+"""
+
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse
+from starlette.routing import Route
+
+
+PAGES_DIR = Path(__file__).parent / "fixtures" / "locator_site"
+
+CSRF_TOKEN = "stand-in-csrf-token"
+
+FIRST_NAMES = ["Ana", "Luis", "Maria", "Jose", "Carmen", "Pedro", "Rosa", "Juan", "Elena", "Miguel"]
+LAST_NAMES = ["Garcia", "Hernandez", "Lopez", "Martinez", "Gonzalez", "Perez", "Ramirez", "Cruz", "Flores", "Reyes"]
+COUNTRIES = ["Mexico", "Guatemala", "Honduras", "El Salvador", "Venezuela"]
+FACILITIES = [
+    ("Krome Service Processing Center", "Miami, FL"),
+    ("Otay Mesa Detention Center", "San Diego, CA"),
+    ("South Texas ICE Processing Center", "Pearsall, TX"),
+    ("Adelanto ICE Processing Center", "Adelanto, CA"),
+]
+
+# Page text containing these is read as a rate-limit or access-denied page
+_DETECTOR_TRIGGERS = ("429", "403")
+
+
+@dataclass
+class Person:
+    """A detainee known to the stand-in site."""
+
+    alien_number: str
+    first_name: str
+    last_name: str
+    date_of_birth: str
+    country_of_birth: str
+    facility_name: str
+    facility_location: str
+
+
+def make_people(count: int = 200, seed: int = 7) -> List[Person]:
+    """Build a deterministic population of detainees."""
+    rng = random.Random(seed)
+    people, used = [], set()
+    while len(people) < count:
+        alien_number = f"A{rng.randrange(10 ** 8, 10 ** 9):09d}"
+        if alien_number in used or any(t in alien_number for t in _DETECTOR_TRIGGERS):
+            continue
+        used.add(alien_number)
+        facility_name, facility_location = rng.choice(FACILITIES)
+        people.append(Person(
+            alien_number=alien_number,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            date_of_birth=f"{rng.randrange(1960, 2004)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            country_of_birth=rng.choice(COUNTRIES),
+            facility_name=facility_name,
+            facility_location=facility_location,
+        ))
+    return people
+
+
+class LocatorSite:
+    """ASGI app serving the recorded locator pages.
+
+    Args:
+        people: Detainees the site knows about
+        latency: Seconds added to every response
+        jitter: Upper bound of extra seeded random latency, in seconds
+        error_every: Answer every Nth search submission with HTTP 503 (0 disables)
+        seed: Seed for the latency jitter
+    """
+
+    def __init__(self,
+                 people: Optional[List[Person]] = None,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_every: int = 0,
+                 seed: int = 7):
+        self.people = people if people is not None else make_people()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_every = error_every
+        self.rng = random.Random(seed)
+        self.requests: Counter = Counter()
+
+        self.by_alien_number = {p.alien_number: p for p in self.people}
+        self.by_name: Dict[tuple, List[Person]] = {}
+        for person in self.people:
+            self.by_name.setdefault((person.first_name.lower(), person.last_name.lower()), []).append(person)
+
+        self.pages = {
+            name: Template((PAGES_DIR / f"{name}.html").read_text())
+            for name in ("search_form", "results", "result_row", "no_results", "unavailable")
+        }
+        self.app = Starlette(routes=[
+            Route("/search", self.search_form, methods=["GET"]),
+            Route("/search/results", self.search_results, methods=["POST"]),
+        ])
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.app(scope, receive, send)
+
+    async def _delay(self) -> None:
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def search_form(self, request: Request) -> HTMLResponse:
+        self.requests["form"] += 1
+        await self._delay()
+        return HTMLResponse(self.pages["search_form"].substitute(csrf_token=CSRF_TOKEN))
+
+    async def search_results(self, request: Request) -> HTMLResponse:
+        self.requests["search"] += 1
+        form = await request.form()
+        await self._delay()
+
+        if self.error_every and self.requests["search"] % self.error_every == 0:
+            self.requests["error"] += 1
+            return HTMLResponse(self.pages["unavailable"].substitute(), status_code=503)
+        if form.get("csrf_token") != CSRF_TOKEN:
+            self.requests["error"] += 1
+            return HTMLResponse(self.pages["unavailable"].substitute(), status_code=400)
+
+        if form.get("alien_number"):
+            person = self.by_alien_number.get(form["alien_number"].upper())
+            matches = [person] if person else []
+        else:
+            key = (form.get("first_name", "").lower(), form.get("last_name", "").lower())
+            matches = self.by_name.get(key, [])
+
+        if not matches:
+            self.requests["not_found"] += 1
+            return HTMLResponse(self.pages["no_results"].substitute())
+
+        self.requests["found"] += 1
+        rows = "".join(
+            self.pages["result_row"].substitute(
+                alien_number=p.alien_number, name=f"{p.last_name}, {p.first_name}",
+                date_of_birth=p.date_of_birth, country_of_birth=p.country_of_birth,
+                facility_name=p.facility_name, facility_location=p.facility_location
+            )
+            for p in matches
+        )
+        return HTMLResponse(self.pages["results"].substitute(rows=rows))
@@ -0,0 +1,352 @@
+"""
+Offline end-to-end benchmark of the MCP search tools.
+
+Replays a fixed workload of tool calls through
+``ICELocatorServer.handle_call_tool``. Each call goes through SearchTools
+and SearchEngine (cache, rate limiter, form fetch, result parsing,
+serialization), which run against the in-process stand-in locator site
+from ``locator_site.py`` with injected latency and server errors. The
+benchmark reports throughput, p50/p99 latency, the traced memory high-water
+mark and cache behaviour as JSON. It fails when the memory peak or the
+cache hit rate regresses beyond the tolerances stored with the committed
+baseline, or when the outcomes or site traffic change.
+
+Throughput and latency depend on the machine and on the test runner
+(coverage tracing alone halves throughput), so under pytest they are only
+compared with the baseline when ``ICE_LOCATOR_BENCHMARK_BASELINE`` is set.
+Running this file as a script always compares them.
+
+Human-like pacing delays are switched off (``SearchConfig.human_delays``)
+so the numbers measure the server, not its deliberate sleeps.
+
+To refresh the baseline after an intended change, run::
+
+    python tests/performance/test_e2e_benchmark.py --update-baseline
+
+The tests are marked ``performance`` and deselected by default; run them
+with ``pytest -m performance``. Set ``ICE_LOCATOR_BENCHMARK_REPORT`` to keep
+the JSON report from a test run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import mcp.types as types
+import pytest
+
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.core.search_engine import SearchEngine
+from ice_locator_mcp.server import ICELocatorServer
+from ice_locator_mcp.utils.prometheus_metrics import METRICS_REGISTRY
+
+from locator_site import LocatorSite, make_people
+
+pytestmark = pytest.mark.performance
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "e2e_benchmark.json"
+
+SITE_URL = "http://locator.test"
+
+# Workload and site settings the baseline was recorded with
+SETTINGS = {
+    "concurrency": 8,
+    "repeats": 3,
+    "latency_ms": 2.0,
+    "jitter_ms": 1.0,
+    "error_every": 25,
+    "seed": 7,
+}
+
+# Allowed change before a metric counts as a regression
+DEFAULT_TOLERANCES = {
+    "throughput": 0.5,   # fraction throughput may drop
+    "latency": 1.0,      # fraction p50/p99 may grow
+    "memory": 0.5,       # fraction the traced peak may grow
+    "cache_hit_rate": 0.05,  # absolute drop in hit rate
+}
+
+
+def build_workload(people, repeats: int, seed: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Distinct lookups, each repeated, in a seeded shuffled order."""
+    rng = random.Random(seed)
+    lookups = [("search_detainee_by_alien_number", {"alien_number": p.alien_number}) for p in people[:24]]
+    lookups += [
+        ("search_detainee_by_name", {
+            "first_name": p.first_name, "last_name": p.last_name,
+            "date_of_birth": p.date_of_birth, "country_of_birth": p.country_of_birth
+        })
+        for p in people[24:36]
+    ]
+    # Unknown people: not-found name searches also try fuzzy name variations
+    lookups += [
+        ("search_detainee_by_name", {
+            "first_name": first_name, "last_name": "Quispe",
+            "date_of_birth": "1980-01-01", "country_of_birth": "Peru"
+        })
+        for first_name in ("Ana", "Luis", "Maria", "Jose", "Carmen", "Pedro")
+    ]
+    lookups += [("search_detainee_by_alien_number", {"alien_number": f"A00000000{i}"}) for i in range(4)]
+
+    workload = lookups * repeats
+    rng.shuffle(workload)
+    return workload
+
+
+def cache_counts() -> Tuple[float, float]:
+    """Disk cache hits and misses recorded so far."""
+    def sample(result: str) -> float:
+        value = METRICS_REGISTRY.get_sample_value(
+            "ice_locator_cache_requests_total", {"tier": "disk", "result": result}
+        )
+        return value or 0.0
+    return sample("hit"), sample("miss")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def make_server(site: LocatorSite, cache_dir: Path) -> ICELocatorServer:
+    """A server whose search engine talks to the stand-in site."""
+    config = ServerConfig()
+    config.monitoring_config.mcpcat_enabled = False
+    config.proxy_config.enabled = False
+    config.cache_config.cache_dir = cache_dir
+    config.search_config.base_url = SITE_URL
+    config.search_config.human_delays = False
+    config.search_config.requests_per_minute = 600_000
+    config.search_config.burst_allowance = 600_000
+
+    server = ICELocatorServer(config)
+    server.search_engine = SearchEngine(
+        proxy_manager=server.proxy_manager,
+        config=config.search_config,
+        cache_dir=cache_dir,
+        transport=httpx.ASGITransport(app=site)
+    )
+    return server
+
+
+async def run_workload(settings: Dict[str, Any], trace_memory: bool = False) -> Dict[str, Any]:
+    """Replay the workload once against a fresh server, site and cache."""
+    people = make_people(seed=settings["seed"])
+    site = LocatorSite(
+        people,
+        latency=settings["latency_ms"] / 1000,
+        jitter=settings["jitter_ms"] / 1000,
+        error_every=settings["error_every"],
+        seed=settings["seed"]
+    )
+    workload = build_workload(people, settings["repeats"], settings["seed"])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        server = make_server(site, Path(cache_dir))
+        await server.ensure_components()
+        handler = server.server.request_handlers[types.CallToolRequest]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in workload:
+            queue.put_nowait(item)
+        latencies: List[float] = []
+        outcomes: Dict[str, int] = {}
+
+        async def worker() -> None:
+            while not queue.empty():
+                name, arguments = queue.get_nowait()
+                request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(
+                    name=name, arguments=arguments
+                ))
+                start = time.perf_counter()
+                response = await handler(request)
+                latencies.append(time.perf_counter() - start)
+                status = json.loads(response.root.content[0].text).get("status", "unknown")
+                outcomes[status] = outcomes.get(status, 0) + 1
+
+        hits_before, misses_before = cache_counts()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(settings["concurrency"])))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        hits_after, misses_after = cache_counts()
+        entries = len(server.search_engine.cache_manager.cache)
+        await server.stop()
+
+    hits, misses = hits_after - hits_before, misses_after - misses_before
+    return {
+        "calls": len(workload),
+        "elapsed_s": elapsed,
+        "latencies": latencies,
+        "outcomes": dict(sorted(outcomes.items())),
+        "memory_peak_bytes": peak,
+        "cache": {
+            "hits": int(hits),
+            "misses": int(misses),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "entries": entries,
+        },
+        "site_requests": dict(sorted(site.requests.items())),
+    }
+
+
+async def run_benchmark(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run the timed pass and a memory-traced pass and build the report."""
+    settings = dict(SETTINGS, **(settings or {}))
+    timed = await run_workload(settings)
+    traced = await run_workload(settings, trace_memory=True)
+
+    latencies = timed["latencies"]
+    return {
+        "settings": settings,
+        "calls": timed["calls"],
+        "throughput_per_s": round(timed["calls"] / timed["elapsed_s"], 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "mean": round(statistics.fmean(latencies) * 1000, 2),
+            "max": round(max(latencies) * 1000, 2),
+        },
+        "memory_peak_mb": round(traced["memory_peak_bytes"] / 2 ** 20, 2),
+        "cache": timed["cache"],
+        "outcomes": timed["outcomes"],
+        "site_requests": timed["site_requests"],
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        timing: bool = True) -> List[str]:
+    """Describe every metric that regressed beyond its tolerance.
+
+    With ``timing`` off, throughput and latency are not compared.
+    """
+    tolerances = dict(DEFAULT_TOLERANCES, **baseline.get("tolerances", {}))
+    regressions = []
+
+    if timing:
+        floor = baseline["throughput_per_s"] * (1 - tolerances["throughput"])
+        if report["throughput_per_s"] < floor:
+            regressions.append(
+                f"throughput {report['throughput_per_s']}/s is below {floor:.1f}/s "
+                f"(baseline {baseline['throughput_per_s']}/s)"
+            )
+
+        for key in ("p50", "p99"):
+            ceiling = baseline["latency_ms"][key] * (1 + tolerances["latency"])
+            if report["latency_ms"][key] > ceiling:
+                regressions.append(
+                    f"{key} latency {report['latency_ms'][key]} ms is above {ceiling:.2f} ms "
+                    f"(baseline {baseline['latency_ms'][key]} ms)"
+                )
+
+    ceiling = baseline["memory_peak_mb"] * (1 + tolerances["memory"])
+    if report["memory_peak_mb"] > ceiling:
+        regressions.append(
+            f"memory peak {report['memory_peak_mb']} MB is above {ceiling:.2f} MB "
+            f"(baseline {baseline['memory_peak_mb']} MB)"
+        )
+
+    floor = baseline["cache"]["hit_rate"] - tolerances["cache_hit_rate"]
+    if report["cache"]["hit_rate"] < floor:
+        regressions.append(
+            f"cache hit rate {report['cache']['hit_rate']:.2%} is below {floor:.2%} "
+            f"(baseline {baseline['cache']['hit_rate']:.2%})"
+        )
+
+    return regressions
+
+
+class TestEndToEndBenchmark:
+    """Benchmark the tool-call path against the stand-in site."""
+
+    async def test_against_baseline(self):
+        """The benchmark stays within tolerance of the committed baseline."""
+        report = await run_benchmark()
+        text = json.dumps(report, indent=2)
+        print("\n" + text)
+        if os.getenv("ICE_LOCATOR_BENCHMARK_REPORT"):
+            Path(os.environ["ICE_LOCATOR_BENCHMARK_REPORT"]).write_text(text)
+
+        baseline = json.loads(BASELINE_PATH.read_text())
+        assert report["settings"] == baseline["settings"], "workload changed; refresh the baseline"
+        assert report["outcomes"].get("found", 0) > 0 and report["outcomes"].get("error", 0) > 0
+        assert report["outcomes"] == baseline["outcomes"]
+        assert report["site_requests"] == baseline["site_requests"]
+        timing = bool(os.getenv("ICE_LOCATOR_BENCHMARK_BASELINE"))
+        assert compare_to_baseline(report, baseline, timing=timing) == []
+
+    async def test_injected_latency_and_errors(self):
+        """Uncached calls pay the site latency; every Nth submission fails."""
+        settings = dict(SETTINGS, concurrency=1, repeats=1, latency_ms=10.0, jitter_ms=0.0, error_every=4)
+        result = await run_workload(settings)
+
+        assert result["calls"] == 46
+        assert result["site_requests"]["error"] == result["site_requests"]["search"] // 4
+        assert min(result["latencies"]) >= 0.010
+        assert result["outcomes"]["error"] > 0
+
+    def test_regressions_are_reported(self):
+        """Slower, larger or less cache-friendly runs fail the comparison."""
+        baseline = {
+            "throughput_per_s": 100.0,
+            "latency_ms": {"p50": 10.0, "p99": 40.0},
+            "memory_peak_mb": 10.0,
+            "cache": {"hit_rate": 0.6},
+        }
+        assert compare_to_baseline(baseline, baseline) == []
+
+        worse = {
+            "throughput_per_s": 40.0,
+            "latency_ms": {"p50": 25.0, "p99": 40.0},
+            "memory_peak_mb": 16.0,
+            "cache": {"hit_rate": 0.5},
+        }
+        regressions = compare_to_baseline(worse, baseline)
+        assert [r.split()[0] for r in regressions] == ["throughput", "p50", "memory", "cache"]
+        regressions = compare_to_baseline(worse, baseline, timing=False)
+        assert [r.split()[0] for r in regressions] == ["memory", "cache"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--report", type=Path, help="write the JSON report here")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark())
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.report:
+        args.report.write_text(text)
+
+    if args.update_baseline:
+        previous = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline = dict(report, tolerances=previous.get("tolerances", DEFAULT_TOLERANCES))
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        return
+
+    regressions = compare_to_baseline(report, json.loads(BASELINE_PATH.read_text()))
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
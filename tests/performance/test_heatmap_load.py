@@ -0,0 +1,238 @@
+"""
+In-process load tests for the heatmap API.
+
+Drives the FastAPI app through ``httpx.ASGITransport`` (no sockets) with
+concurrency sweeps over every route, against SQLite databases of 200, 5k
+and 50k facilities. Each database also holds two years of
+``monthly_population`` and a year of detainee location history. Every
+(size, route, concurrency) cell records requests per second and a latency
+histogram over the Prometheus ``LATENCY_BUCKETS``. The report is printed
+and, when ``ICE_LOCATOR_LOAD_REPORT`` is set, written there as JSON.
+
+The checks look for scaling problems, not absolute speed. Per-facility
+cost must stay flat as the database grows, and single-facility routes must
+not slow down with the size of the table.
+
+These tests are marked ``performance`` and deselected by default; run them
+with ``pytest -m performance``.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from ice_locator_mcp.api.heatmap_api import HeatmapAPI, app, get_heatmap_api
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+from ice_locator_mcp.utils.prometheus_metrics import LATENCY_BUCKETS
+
+pytestmark = pytest.mark.performance
+
+
+FACILITY_COUNTS = (200, 5_000, 50_000)
+CONCURRENCY_LEVELS = (1, 4, 16)
+MONTHS = 24
+
+# Requests per concurrency level; large databases get fewer so a run stays
+# short, and levels above the request count are skipped
+REQUESTS_PER_LEVEL = {200: 32, 5_000: 8, 50_000: 2}
+
+ROUTES = {
+    "facilities": "/api/facilities",
+    "heatmap_data": "/api/heatmap-data",
+    "heatmap_data_as_of": "/api/heatmap-data?as_of=2024-06-30",
+    "facilities_with_population": "/api/facilities-with-population",
+    "facility_statistics": "/api/facility-statistics",
+    "facility_current_detainees": "/api/facility/{facility_id}/current-detainees",
+}
+
+# Routes whose response holds one facility
+SINGLE_FACILITY_ROUTES = ("facility_current_detainees",)
+
+STATES = ["CA", "TX", "FL", "AZ", "NM", "GA", "LA", "NY", "PA", "NJ"]
+
+
+def build_database(path: Path, facilities: int, seed: int = 11) -> None:
+    """Write a heatmap database with facilities, monthly populations and location history."""
+    rng = random.Random(seed)
+    manager = SQLiteDatabaseManager(str(path))
+    manager.connect()
+    try:
+        manager.create_tables()
+        manager.create_monthly_population_table()
+        connection = manager.connection
+        with connection:
+            connection.executemany(
+                "INSERT INTO facilities (id, name, latitude, longitude, address, population_count) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (i, f"Facility {i:05d}", rng.uniform(25.0, 48.0), rng.uniform(-123.0, -70.0),
+                     f"{rng.randrange(1, 9999)} Main St, City {i}, {rng.choice(STATES)} {rng.randrange(10000, 99999)}",
+                     rng.choice([0, rng.randrange(1, 2000)]))
+                    for i in range(1, facilities + 1)
+                ]
+            )
+
+            months = [f"{2022 + m // 12}-{m % 12 + 1:02d}" for m in range(MONTHS)]
+            connection.executemany(
+                "INSERT INTO monthly_population (facility_id, month_year, population_count, download_date) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (facility_id, month, rng.randrange(0, 2000), f"{month}-15")
+                    for month in months
+                    for facility_id in range(1, facilities + 1)
+                )
+            )
+
+            detainees = facilities * 2
+            connection.executemany(
+                "INSERT INTO detainees (id, first_name, last_name) VALUES (?, ?, ?)",
+                [(i, "First", f"Last{i}") for i in range(1, detainees + 1)]
+            )
+            start = date(2024, 1, 1)
+            history = []
+            for detainee_id in range(1, detainees + 1):
+                begin = start + timedelta(days=rng.randrange(365))
+                end = begin + timedelta(days=rng.randrange(1, 200)) if rng.random() < 0.5 else None
+                history.append((detainee_id, rng.randrange(1, facilities + 1), begin.isoformat(),
+                                end.isoformat() if end else None))
+            connection.executemany(
+                "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date, end_date) "
+                "VALUES (?, ?, ?, ?)",
+                history
+            )
+    finally:
+        manager.disconnect()
+
+
+def histogram(latencies: List[float]) -> Dict[str, int]:
+    """Count latencies into the Prometheus latency buckets (upper bounds in seconds)."""
+    counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    for latency in latencies:
+        counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+    labels = [f"le_{bound:g}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+    return {label: count for label, count in zip(labels, counts) if count}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def sweep_route(client: httpx.AsyncClient, url: str, requests: int,
+                      concurrency: int) -> Dict[str, Any]:
+    """Issue ``requests`` GETs with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "histogram": histogram(latencies),
+        "statuses": statuses,
+    }
+
+
+async def load_test(database: Path, facilities: int) -> Dict[str, Any]:
+    """Sweep every route at every concurrency level against one database."""
+    api = HeatmapAPI()
+    api.database_path = str(database)
+    app.dependency_overrides[get_heatmap_api] = lambda: api
+    results: Dict[str, Any] = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://heatmap.test") as client:
+            for name, route in ROUTES.items():
+                url = route.format(facility_id=facilities // 2)
+                # Warm-up builds the occupancy and snapshot tables on first use
+                (await client.get(url)).raise_for_status()
+                requests = REQUESTS_PER_LEVEL[facilities]
+                results[name] = {
+                    str(concurrency): await sweep_route(client, url, requests, concurrency)
+                    for concurrency in CONCURRENCY_LEVELS
+                    if concurrency <= requests
+                }
+    finally:
+        app.dependency_overrides.pop(get_heatmap_api, None)
+    return results
+
+
+@pytest.fixture(scope="module")
+def load_report(tmp_path_factory):
+    """Build the three databases once and sweep them."""
+    directory = tmp_path_factory.mktemp("heatmap_load")
+    report: Dict[str, Any] = {}
+    for facilities in FACILITY_COUNTS:
+        database = directory / f"heatmap_{facilities}.db"
+        start = time.perf_counter()
+        build_database(database, facilities)
+        build_seconds = time.perf_counter() - start
+        report[str(facilities)] = {
+            "build_s": round(build_seconds, 2),
+            "routes": asyncio.run(load_test(database, facilities)),
+        }
+
+    print()
+    for facilities, result in report.items():
+        for name, levels in result["routes"].items():
+            print(f"{facilities:>6} facilities {name:<28}" + "".join(
+                f" c={c}: {cell['rps']:>8,.1f} rps p50 {cell['p50_ms']:>8,.2f} ms p99 {cell['p99_ms']:>8,.2f} ms |"
+                for c, cell in levels.items()
+            ))
+    if os.getenv("ICE_LOCATOR_LOAD_REPORT"):
+        Path(os.environ["ICE_LOCATOR_LOAD_REPORT"]).write_text(json.dumps(report, indent=2))
+    return report
+
+
+class TestHeatmapLoad:
+    """Concurrency sweeps over the heatmap routes."""
+
+    def test_every_request_succeeds(self, load_report):
+        """All routes answer 200 at every size and concurrency."""
+        for result in load_report.values():
+            for levels in result["routes"].values():
+                for cell in levels.values():
+                    assert cell["statuses"] == {200: cell["requests"]}
+
+    def test_histograms_cover_every_request(self, load_report):
+        """Histogram buckets account for every request."""
+        cell = load_report["200"]["routes"]["heatmap_data"]["16"]
+        assert sum(cell["histogram"].values()) == cell["requests"]
+        assert cell["rps"] > 0
+
+    @pytest.mark.parametrize("route", [r for r in ROUTES if r not in SINGLE_FACILITY_ROUTES])
+    def test_per_facility_cost_does_not_grow(self, load_report, route):
+        """Routes over all facilities scale at most linearly from 5k to 50k facilities."""
+        small = load_report["5000"]["routes"][route]["1"]["p50_ms"] / 5_000
+        large = load_report["50000"]["routes"][route]["1"]["p50_ms"] / 50_000
+        assert large < small * 2
+
+    @pytest.mark.parametrize("route", SINGLE_FACILITY_ROUTES)
+    def test_single_facility_routes_stay_flat(self, load_report, route):
+        """Looking up one facility does not slow down with the number of facilities."""
+        small = load_report["200"]["routes"][route]["1"]["p50_ms"]
+        large = load_report["50000"]["routes"][route]["1"]["p50_ms"]
+        assert large < max(small * 5, small + 5)
@@ -0,0 +1,96 @@
+"""
+Serialization benchmarks for MCP tool responses.
+
+Compares the previous encoding (``json.dumps(..., indent=2)`` of the result
+dictionary with freshly built guidance lists) with the serialization layer
+in pretty and compact mode, with and without orjson, on 1 to 500 records.
+"""
+
+import json
+import time
+from dataclasses import asdict
+
+import pytest
+
+from ice_locator_mcp.core.search_engine import (
+    FAMILY_RESOURCES,
+    LEGAL_RESOURCES,
+    DetaineeRecord,
+    SearchResult
+)
+from ice_locator_mcp.utils import serialization
+from ice_locator_mcp.utils.serialization import dumps
+
+
+RECORD_COUNTS = (1, 10, 100, 500)
+
+
+def make_result(count):
+    records = [
+        DetaineeRecord(
+            alien_number=f"A{i:09d}", name=f"Person Number {i}", date_of_birth="1990-01-01",
+            country_of_birth="Guatemala", facility_name="Krome Service Processing Center",
+            facility_location="Miami, FL", custody_status="In Custody", last_updated="2025-01-01T00:00:00",
+            booking_date="2024-12-01", visiting_hours="Sat-Sun 8am-3pm"
+        )
+        for i in range(count)
+    ]
+    return SearchResult.success(records, 0.2, suggestions=["Check spelling"])
+
+
+def legacy_dumps(result):
+    """The previous encoding: records as dicts, guidance lists rebuilt per result."""
+    payload = asdict(result)
+    payload["user_guidance"] = dict(
+        payload["user_guidance"],
+        legal_resources=[dict(resource) for resource in LEGAL_RESOURCES],
+        family_resources=[dict(resource) for resource in FAMILY_RESOURCES]
+    )
+    return json.dumps(payload, indent=2, default=str)
+
+
+def best_time(function, repeat=5):
+    number = max(1, 2000 // (len(function.__defaults__[0].results) + 1))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number)
+    return min(times)
+
+
+def measure(result, monkeypatch):
+    timings = {"legacy": best_time(lambda r=result: legacy_dumps(r))}
+    backends = ["orjson", "stdlib"] if serialization.ORJSON_AVAILABLE else ["stdlib"]
+    for backend in backends:
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", backend == "orjson")
+        timings[f"{backend} pretty"] = best_time(lambda r=result: dumps(r))
+        timings[f"{backend} compact"] = best_time(lambda r=result: dumps(r, compact=True))
+    monkeypatch.undo()
+    return timings
+
+
+class TestSerializationBenchmark:
+    """Encoding time and size by payload size."""
+
+    def test_encoding_times(self, monkeypatch):
+        """Compact encoding beats the previous encoding at every payload size."""
+        print()
+        for count in RECORD_COUNTS:
+            result = make_result(count)
+            timings = measure(result, monkeypatch)
+            sizes = (len(legacy_dumps(result)), len(dumps(result, compact=True)))
+            print(f"{count:>4} records: " + ", ".join(
+                f"{name} {seconds * 1e6:,.0f} us" for name, seconds in timings.items()
+            ) + f"; {sizes[0]:,} -> {sizes[1]:,} bytes")
+
+            best_compact = min(t for name, t in timings.items() if name.endswith("compact"))
+            assert best_compact < timings["legacy"]
+            assert sizes[1] < sizes[0] * 0.85
+
+    @pytest.mark.skipif(not serialization.ORJSON_AVAILABLE, reason="orjson not installed")
+    def test_orjson_speedup_on_large_payloads(self, monkeypatch):
+        """With orjson, compact 500-record responses encode several times faster."""
+        timings = measure(make_result(500), monkeypatch)
+        assert timings["orjson compact"] * 3 < timings["legacy"]
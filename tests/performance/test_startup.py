@@ -0,0 +1,167 @@
+"""
+Cold-start benchmarks for the stdio MCP server.
+
+Every MCP client session launches a fresh server process, so the time to
+answer ``list_tools`` is paid per session. The MCP SDK's own import cost
+depends on the machine, so budgets are measured on top of a process that
+only imports the SDK.
+"""
+
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import mcp.types as types
+
+import ice_locator_mcp
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.server import ICELocatorServer
+
+
+SRC_DIR = Path(ice_locator_mcp.__file__).resolve().parents[1]
+
+# Time the server may add on top of the MCP SDK before answering list_tools
+STARTUP_BUDGET = 0.2
+
+# Subsystems that must not load before the first tool call
+DEFERRED_MODULES = (
+    "ice_locator_mcp.monitoring.comprehensive_monitor",
+    "ice_locator_mcp.anti_detection.proxy_manager",
+    "ice_locator_mcp.core.search_engine",
+    "ice_locator_mcp.tools.search_tools",
+    "ice_locator_mcp.database.manager",
+    "mcpcat",
+    "opentelemetry",
+    "sentry_sdk",
+    "psutil",
+    "numpy",
+    "bs4",
+    "diskcache",
+    "psycopg2",
+    "prometheus_client",
+)
+
+SDK_IMPORTS = "import mcp.types, mcp.server.lowlevel, mcp.server.stdio"
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| *(\S+)")
+
+
+def child_env():
+    env = dict(os.environ, ICE_LOCATOR_ANALYTICS_ENABLED="false")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def import_times(code):
+    """Cumulative import time in seconds per module, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=child_env(), capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            times[match.group(2)] = max(times.get(match.group(2), 0), int(match.group(1)) / 1e6)
+    return times
+
+
+def time_to_list_tools():
+    """Seconds from process start until the server answers tools/list over stdio."""
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2024-11-05", "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "1.0"}
+        }},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "ice_locator_mcp"], env=child_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        process.stdin.write("".join(json.dumps(m) + "\n" for m in messages))
+        process.stdin.flush()
+        for line in process.stdout:
+            response = json.loads(line)
+            if response.get("id") == 2:
+                elapsed = time.perf_counter() - start
+                return elapsed, [tool["name"] for tool in response["result"]["tools"]]
+    finally:
+        process.kill()
+        process.wait()
+    raise AssertionError("server exited before answering tools/list")
+
+
+def time_to_import_sdk():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", SDK_IMPORTS], env=child_env(), check=True)
+    return time.perf_counter() - start
+
+
+class TestColdStart:
+    """Startup cost of a new stdio server process."""
+
+    def test_optional_subsystems_are_not_imported(self):
+        """Importing the server leaves monitoring, scraping and database stacks unloaded."""
+        loaded = import_times("import ice_locator_mcp.server")
+        eager = sorted(name for name in loaded
+                       if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES))
+        assert eager == []
+
+    def test_server_import_overhead(self):
+        """The server module adds little import time on top of the MCP SDK."""
+        overheads = []
+        for _ in range(3):
+            sdk = import_times(SDK_IMPORTS)
+            server = import_times("import ice_locator_mcp.server")
+            sdk_total = max(sdk.get(name, 0) for name in ("mcp", "mcp.types"))
+            overheads.append(server["ice_locator_mcp.server"] - sdk_total)
+        print(f"\nserver import overhead: {min(overheads) * 1000:.0f} ms")
+        assert min(overheads) < STARTUP_BUDGET
+
+    def test_list_tools_from_process_start(self):
+        """A fresh process answers list_tools within budget of a bare SDK import."""
+        runs = [time_to_list_tools() for _ in range(3)]
+        baseline = min(time_to_import_sdk() for _ in range(3))
+        elapsed = min(run[0] for run in runs)
+        print(f"\nlist_tools from process start: {elapsed * 1000:.0f} ms "
+              f"(SDK import alone: {baseline * 1000:.0f} ms)")
+
+        assert "search_detainee_by_name" in runs[0][1]
+        assert elapsed - baseline < STARTUP_BUDGET
+
+
+class TestDeferredInitialization:
+    """Components start on the first tool call instead of at startup."""
+
+    async def test_first_tool_calls_share_one_initialization(self, monkeypatch):
+        """Concurrent first calls initialize the search stack once; stop cleans it up."""
+        monkeypatch.setenv("ICE_LOCATOR_ANALYTICS_ENABLED", "false")
+        server = ICELocatorServer(ServerConfig())
+        server.proxy_manager = AsyncMock()
+        server.search_engine = AsyncMock()
+        server.search_tools = Mock(search_by_alien_number=AsyncMock(return_value='{"status": "found"}'))
+        await server.start()
+        server.search_engine.initialize.assert_not_called()
+
+        handler = server.server.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(
+            name="search_detainee_by_alien_number", arguments={"alien_number": "A123456789"}
+        ))
+        results = await asyncio.gather(*(handler(request) for _ in range(3)))
+
+        assert all(result.root.content[0].text == '{"status": "found"}' for result in results)
+        server.proxy_manager.initialize.assert_awaited_once()
+        server.search_engine.initialize.assert_awaited_once()
+
+        await server.stop()
+        server.search_engine.cleanup.assert_awaited_once()
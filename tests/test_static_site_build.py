@@ -0,0 +1,141 @@
+"""
+Tests for the incremental static site build (scripts/build_static_site.py).
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import build_static_site  # noqa: E402
+
+
+@pytest.fixture
+def site(temp_dir):
+    """Facilities data file, output directory and a build helper."""
+    facilities = [
+        {"name": f"Facility {i}", "city": f"City {i}", "state": "TX" if i % 2 else "CA",
+         "zip": f"7{i:04d}", "population": 100 * i}
+        for i in range(1, 41)
+    ]
+    data_path = temp_dir / "facilities.json"
+    assets_dir = temp_dir / "assets"
+    assets_dir.mkdir()
+    (assets_dir / "facilities.json").write_text('{"facilities": []}')
+    (assets_dir / "facilities_monthly_optimized.json").write_text('{"meta": {"v": 1}}')
+    output = temp_dir / "site"
+
+    def build(data=None, **kwargs):
+        data_path.write_text(json.dumps(data or facilities))
+        kwargs.setdefault("workers", 1)
+        kwargs.setdefault("assets_dir", assets_dir)
+        return build_static_site.build_site(data_path, output, **kwargs)
+
+    return facilities, output, build
+
+
+class TestStaticSiteBuild:
+    """Test incremental rebuilds and manifest-driven sitemap."""
+
+    def test_full_build_covers_every_facility(self, site):
+        """Every facility gets a page, plus the index and statistics pages."""
+        facilities, output, build = site
+        summary = build(today="2025-01-01")
+
+        assert summary["pages"] == len(facilities) + 2
+        assert (output / "facilities" / "facility-40.html").exists()
+        sitemap = (output / "sitemap.xml").read_text()
+        assert sitemap.count("<url>") == len(facilities) + 2 + len(build_static_site.EXTRA_SITEMAP_PAGES)
+        assert "/facilities/facility-1.html" in sitemap
+
+    def test_unchanged_inputs_are_skipped(self, site):
+        """A second build renders and writes nothing."""
+        _, output, build = site
+        build(today="2025-01-01")
+        page = output / "facilities" / "facility-1.html"
+        mtime = page.stat().st_mtime_ns
+
+        summary = build(today="2025-02-01")
+        assert summary["rendered"] == 0
+        assert page.stat().st_mtime_ns == mtime
+        manifest = json.loads((output / build_static_site.MANIFEST_NAME).read_text())
+        assert {page["lastmod"] for page in manifest["pages"].values()} == {"2025-01-01"}
+
+    def test_only_affected_pages_rebuild(self, site):
+        """A population change rebuilds that facility and the aggregate pages."""
+        facilities, output, build = site
+        build(today="2025-01-01")
+
+        facilities[4]["population"] += 1
+        summary = build(facilities, today="2025-02-01")
+
+        assert summary["rendered"] == 3
+        manifest = json.loads((output / build_static_site.MANIFEST_NAME).read_text())
+        assert manifest["pages"]["facilities/facility-5.html"]["lastmod"] == "2025-02-01"
+        assert manifest["pages"]["facilities/facility-6.html"]["lastmod"] == "2025-01-01"
+
+    def test_removed_facility_pages_are_deleted(self, site):
+        """Pages for facilities no longer in the data are removed."""
+        facilities, output, build = site
+        build()
+        summary = build(facilities[:-1])
+
+        assert summary["removed"] == ["facilities/facility-40.html"]
+        assert not (output / "facilities" / "facility-40.html").exists()
+
+    def test_parallel_build_matches_serial(self, site, temp_dir):
+        """Pages rendered on the process pool are identical to serial output."""
+        _, output, build = site
+        build(workers=1, force=True)
+        serial = (output / "facilities" / "index.html").read_bytes()
+
+        summary = build(workers=2, force=True)
+        assert summary["rendered"] >= build_static_site.PARALLEL_THRESHOLD
+        assert (output / "facilities" / "index.html").read_bytes() == serial
+
+    def test_web_app_format_is_normalized(self):
+        """The web app facilities format maps to the same record shape."""
+        record = build_static_site._normalize_facility({
+            "name": "Dilley Family Residential Center",
+            "address": "Dilley, TX, 78017",
+            "population_count": 2000,
+            "latitude": 28.67,
+            "longitude": -99.17
+        })
+        assert (record["city"], record["state"], record["zip"]) == ("Dilley", "TX", "78017")
+        assert record["population"] == 2000
+
+    def test_outputs_are_precompressed(self, site):
+        """Every page and the sitemap have matching precompressed siblings."""
+        _, output, build = site
+        build()
+
+        page = output / "facilities" / "facility-1.html"
+        for suffix in build_static_site.COMPRESSED_SUFFIXES:
+            assert (output / "sitemap.xml").with_name("sitemap.xml" + suffix).exists()
+        assert gzip.decompress(page.with_name(page.name + ".gz").read_bytes()) == page.read_bytes()
+
+    def test_data_payloads_are_content_hashed(self, site, temp_dir):
+        """Payloads get hashed names that change only with their content."""
+        _, output, build = site
+        summary = build()
+        monthly = summary["assets"]["facilities_monthly_optimized.json"]
+        assert monthly.startswith("data/facilities_monthly_optimized.")
+
+        asset_manifest = json.loads((output / build_static_site.ASSET_MANIFEST_NAME).read_text())
+        assert asset_manifest["data"]["facilities_monthly_optimized.json"] == f"/{monthly}"
+        assert f'href="/{monthly}"' in (output / "statistics" / "index.html").read_text()
+
+        # Unchanged payload: same name, no page rebuilds
+        assert build()["assets"]["facilities_monthly_optimized.json"] == monthly
+
+        # Changed payload: new name, old file removed, linking page rebuilt
+        (temp_dir / "assets" / "facilities_monthly_optimized.json").write_text('{"meta": {"v": 2}}')
+        summary = build()
+        assert summary["assets"]["facilities_monthly_optimized.json"] != monthly
+        assert not (output / monthly).exists()
+        assert summary["rendered"] == 1
@@ -0,0 +1,136 @@
+"""
+Unit tests for the streaming participating agencies reader and ingest.
+"""
+
+import tracemalloc
+from unittest.mock import Mock
+
+import pytest
+
+from ice_locator_mcp.database import ingest_participating_agencies as ingest
+from ice_locator_mcp.database.agency_reader import (
+    AgencyRow,
+    ReadProgress,
+    batched,
+    iter_agency_rows,
+    iter_unique_agencies
+)
+from ice_locator_mcp.database.geocoding import BatchGeocoder, GazetteerBackend, GeocodingCache
+
+
+HEADER = "STATE,LAW ENFORCEMENT AGENCY,TYPE,COUNTY,SUPPORT TYPE\n"
+
+
+def write_agencies(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for row in rows:
+            f.write(",".join(row) + "\n")
+    return path
+
+
+def synthetic_rows(count, distinct):
+    for i in range(count):
+        yield ("TEXAS", f"Agency {i % distinct} Sheriff's Office", "Jail Enforcement Model", f"County {i % 50}", "")
+
+
+class TestAgencyReader:
+    """Test normalization, deduplication and progress reporting."""
+
+    def test_rows_are_normalized_and_deduplicated(self, temp_dir):
+        """Whitespace is collapsed, empty rows skipped, and the first duplicate kept."""
+        path = write_agencies(temp_dir / "agencies.csv", [
+            ("FLORIDA", "  Dade   Sheriff ", "Jail", "Dade", "ICE"),
+            ("Florida", "DADE SHERIFF", "Task Force", "Dade", ""),
+            ("", "Stateless Agency", "Jail", "", ""),
+            ("TEXAS", "Harris County", "Jail", "Harris", ""),
+        ])
+        progress = ReadProgress()
+
+        rows = list(iter_unique_agencies(path, progress))
+
+        assert rows == [
+            AgencyRow("Dade Sheriff", "FLORIDA", "Dade", "Jail", "ICE"),
+            AgencyRow("Harris County", "TEXAS", "Harris", "Jail", "")
+        ]
+        assert rows[0].facility_name == "Dade Sheriff, FLORIDA"
+        assert rows[0].to_dict() == {"agency": "Dade Sheriff", "state": "FLORIDA", "county": "Dade", "type": "Jail"}
+        assert progress.to_dict() == {"rows": 4, "unique": 2, "duplicates": 1, "skipped": 1}
+
+    def test_progress_callback(self, temp_dir):
+        """Progress is reported every N rows and once at the end."""
+        path = write_agencies(temp_dir / "agencies.csv", synthetic_rows(25, 10))
+        reports = []
+
+        list(iter_unique_agencies(path, on_progress=lambda p: reports.append(p.rows), progress_every=10))
+        assert reports == [10, 20, 25]
+
+    def test_missing_file(self, temp_dir):
+        """A missing file raises before any row is read."""
+        with pytest.raises(FileNotFoundError):
+            list(iter_agency_rows(temp_dir / "missing.csv"))
+
+    def test_batched(self):
+        """Batches keep order and the last batch holds the remainder."""
+        assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert list(batched([], 3)) == []
+
+    def test_memory_stays_flat(self, temp_dir):
+        """Peak memory while streaming does not grow with the number of rows."""
+        def peak(path):
+            tracemalloc.start()
+            for batch in batched(iter_unique_agencies(path), 100):
+                pass
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        small = write_agencies(temp_dir / "small.csv", synthetic_rows(2000, 200))
+        large = write_agencies(temp_dir / "large.csv", synthetic_rows(50000, 200))
+
+        assert peak(large) < peak(small) * 2
+
+    def test_xlsx_read_only(self, temp_dir):
+        """The spreadsheet is read in read-only mode below a title row."""
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append([None, None])
+        sheet.append(["STATE", "LAW ENFORCEMENT AGENCY", "TYPE", "COUNTY"])
+        sheet.append(["ALABAMA", "Baldwin County Sheriff's Office", "Jail Enforcement Model", "Baldwin"])
+        sheet.append(["ALABAMA", "Baldwin County Sheriff's Office", "Task Force Model", "Baldwin"])
+        workbook.save(temp_dir / "agencies.xlsx")
+
+        rows = list(iter_unique_agencies(temp_dir / "agencies.xlsx"))
+        assert [row.facility_name for row in rows] == ["Baldwin County Sheriff's Office, ALABAMA"]
+
+
+class TestStreamingIngest:
+    """Test the batched participating agencies ingest."""
+
+    def test_ingest_writes_batches(self, temp_dir, monkeypatch):
+        """New agencies are geocoded and inserted per batch; existing ones are skipped."""
+        path = write_agencies(temp_dir / "agencies.csv", [
+            ("FL", "Dade Sheriff", "Jail", "Dade", ""),
+            ("FL", "Dade Sheriff", "Jail", "Dade", ""),
+            ("TX", "Harris County", "Jail", "Harris", ""),
+            ("TX", "Dilley", "Jail", "", ""),
+            ("ZZ", "Unknown Agency", "Jail", "", ""),
+        ])
+        existing = Mock()
+        existing.name = "Harris County, TX"
+        db_manager = Mock()
+        db_manager.get_all_facilities.return_value = [existing]
+        monkeypatch.setattr(ingest, "DatabaseManager", Mock(return_value=db_manager))
+
+        cache = GeocodingCache(temp_dir / "geocode.sqlite")
+        geocoder = BatchGeocoder(GazetteerBackend({"FL": (27.8, -81.7), "TX": (31.0, -100.0)}), cache)
+        stats = ingest.ingest_participating_agencies("postgresql://unused", str(path), geocoder=geocoder,
+                                                     batch_size=2)
+        cache.close()
+
+        batches = [[f.name for f in call.args[0]] for call in db_manager.insert_facilities.call_args_list]
+        assert batches == [["Dade Sheriff, FL"], ["Dilley, TX", "Unknown Agency, ZZ"]]
+        assert (stats["processed"], stats["skipped"], stats["geocoded"]) == (3, 1, 2)
+        assert (stats["rows"], stats["duplicates"]) == (5, 1)
+        db_manager.disconnect.assert_called_once()
@@ -0,0 +1,137 @@
+"""
+Unit tests for batched, transactional population writes.
+"""
+
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from ice_locator_mcp.database.models import Facility
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+from ice_locator_mcp.database.update_facility_population import FacilityPopulationUpdater
+
+
+@pytest.fixture
+def db_manager(temp_dir):
+    """SQLite manager over a fresh database with three facilities."""
+    manager = SQLiteDatabaseManager(str(temp_dir / "bulk.db"))
+    manager.connect()
+    manager.create_tables()
+    manager.connection.executemany(
+        "INSERT INTO facilities (id, name, latitude, longitude) VALUES (?, ?, 0, 0)",
+        [(1, "Adelanto"), (2, "Otero"), (3, "Krome")]
+    )
+    manager.connection.commit()
+    manager.create_monthly_population_table()
+
+    statements = []
+    manager.connection.set_trace_callback(statements.append)
+    manager.statements = statements
+    yield manager
+    manager.disconnect()
+
+
+def monthly_rows(manager):
+    return manager.connection.execute(
+        "SELECT facility_id, month_year, population_count FROM monthly_population ORDER BY 2, 1"
+    ).fetchall()
+
+
+class TestSQLiteBulkWrites:
+    """Test upserts and population updates on SQLite."""
+
+    def test_month_is_written_in_one_transaction(self, db_manager):
+        """A month of rows costs one COMMIT."""
+        written = db_manager.upsert_monthly_population(
+            "2024-01", [(1, 100, "01/15/2024"), (2, 200, "01/15/2024"), (3, 300, "01/15/2024")]
+        )
+
+        assert written == 3
+        assert sum(1 for s in db_manager.statements if s.strip().upper() == "COMMIT") == 1
+        assert [tuple(r) for r in monthly_rows(db_manager)] == [
+            (1, "2024-01", 100), (2, "2024-01", 200), (3, "2024-01", 300)
+        ]
+
+    def test_conflicts_update_in_place(self, db_manager):
+        """Re-ingesting a month updates rows instead of duplicating them."""
+        db_manager.upsert_monthly_population("2024-01", [(1, 100, "01/15/2024")])
+        row_id = db_manager.connection.execute("SELECT id FROM monthly_population").fetchone()[0]
+
+        db_manager.upsert_monthly_population("2024-01", [(1, 150, "01/30/2024")])
+        rows = db_manager.connection.execute(
+            "SELECT id, population_count, download_date FROM monthly_population"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [(row_id, 150, "01/30/2024")]
+
+    def test_replace_month_drops_stale_rows(self, db_manager):
+        """Replacing a month leaves other months untouched."""
+        db_manager.upsert_monthly_population("2024-01", [(1, 100, "a"), (2, 200, "a")])
+        db_manager.upsert_monthly_population("2024-02", [(1, 110, "b")])
+
+        db_manager.upsert_monthly_population("2024-01", [(2, 250, "c")], replace_month=True)
+        assert [tuple(r) for r in monthly_rows(db_manager)] == [
+            (2, "2024-01", 250), (1, "2024-02", 110)
+        ]
+
+    def test_failed_batch_rolls_back(self, db_manager):
+        """A failing row leaves the month as it was."""
+        db_manager.upsert_monthly_population("2024-01", [(1, 100, "a")])
+        db_manager.connection.execute("""
+            CREATE TRIGGER reject_negative BEFORE INSERT ON monthly_population
+            WHEN NEW.population_count < 0 BEGIN SELECT RAISE(ABORT, 'negative'); END
+        """)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            db_manager.upsert_monthly_population("2024-01", [(2, 5, "b"), (3, -1, "b")], replace_month=True)
+        assert [tuple(r) for r in monthly_rows(db_manager)] == [(1, "2024-01", 100)]
+
+    def test_legacy_duplicates_are_collapsed(self, temp_dir):
+        """Databases created without the unique key get it, keeping the latest row."""
+        path = str(temp_dir / "legacy.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE monthly_population (id INTEGER PRIMARY KEY AUTOINCREMENT, facility_id INTEGER,"
+                     " month_year TEXT, population_count INTEGER, download_date TEXT, created_at TIMESTAMP)")
+        conn.executemany("INSERT INTO monthly_population (facility_id, month_year, population_count) VALUES (?, ?, ?)",
+                         [(1, "2024-01", 10), (1, "2024-01", 20)])
+        conn.commit()
+        conn.close()
+
+        manager = SQLiteDatabaseManager(path)
+        manager.connect()
+        manager.create_monthly_population_table()
+        manager.upsert_monthly_population("2024-01", [(1, 30, "x")])
+        assert [tuple(r) for r in monthly_rows(manager)] == [(1, "2024-01", 30)]
+        manager.disconnect()
+
+    def test_update_facility_populations(self, db_manager):
+        """Population updates for many facilities share one transaction."""
+        assert db_manager.update_facility_populations({1: 10, 3: 30, 99: 1}) == 2
+        assert sum(1 for s in db_manager.statements if s.strip().upper() == "COMMIT") == 1
+        rows = db_manager.connection.execute("SELECT id, population_count FROM facilities ORDER BY id").fetchall()
+        assert [tuple(r) for r in rows] == [(1, 10), (2, None), (3, 30)]
+
+
+class TestPopulationUpdaterBatching:
+    """Test that the TRAC population updater writes once."""
+
+    def test_updates_are_sent_as_one_batch(self):
+        """All matched facilities go to a single batch update."""
+        updater = FacilityPopulationUpdater("postgresql://localhost/ice_locator")
+        updater.db_manager = Mock()
+        updater.db_manager.get_all_facilities.return_value = [
+            Facility(id=1, name="Broward Transitional Center", latitude=0.0, longitude=0.0, address=None),
+            Facility(id=2, name="Krome North Service Processing Center", latitude=0.0, longitude=0.0, address=None),
+        ]
+        updater.db_manager.update_facility_populations.return_value = 2
+        updater.fetch_trac_data = Mock(return_value=[
+            {"name": "BROWARD TRANSITIONAL CENTER", "population_count": 500},
+            {"name": "KROME NORTH SERVICE PROCESSING CENTER", "population_count": 600},
+            {"name": "UNKNOWN HOLD ROOM", "population_count": 7},
+        ])
+
+        stats = updater.update_population_counts()
+
+        updater.db_manager.update_facility_populations.assert_called_once_with({1: 500, 2: 600})
+        updater.db_manager.update_facility_population.assert_not_called()
+        assert (stats["matched_facilities"], stats["updated_facilities"], stats["unmatched_facilities"]) == (2, 2, 1)
@@ -0,0 +1,128 @@
+"""
+Unit tests for canonical search cache keys, with a replayed query log.
+"""
+
+import hashlib
+
+import pytest
+
+from ice_locator_mcp.core.search_engine import (
+    SearchRequest,
+    canonical_alien_number,
+    canonical_country,
+    canonical_date,
+    fold_text
+)
+from ice_locator_mcp.utils.dates import DateParser
+
+
+# Lookups as clients send them: the same people typed several ways
+QUERY_LOG = [
+    {"first_name": "José", "last_name": "Rodríguez", "date_of_birth": "1990-01-05", "country_of_birth": "México"},
+    {"first_name": "Jose", "last_name": "Rodriguez", "date_of_birth": "01/05/1990", "country_of_birth": "mexico"},
+    {"first_name": "JOSÉ", "last_name": "RODRÍGUEZ", "date_of_birth": "January 5, 1990", "country_of_birth": "Mexico"},
+    {"first_name": "José ", "last_name": " Rodríguez", "date_of_birth": "1990-1-5", "country_of_birth": "MÉXICO"},
+    {"first_name": "María  José", "last_name": "López", "date_of_birth": "1985-03-15", "country_of_birth": "Guatemala"},
+    {"first_name": "Maria Jose", "last_name": "Lopez", "date_of_birth": "03/15/1985", "country_of_birth": "guatemala"},
+    {"first_name": "maría josé", "last_name": "lópez", "date_of_birth": "15 March 1985", "country_of_birth": "Guatemala"},
+    {"first_name": "Ana", "last_name": "Hernández", "date_of_birth": "1992-07-04", "country_of_birth": "Salvador"},
+    {"first_name": "Ana", "last_name": "Hernandez", "date_of_birth": "07/04/1992", "country_of_birth": "El Salvador"},
+    {"first_name": "Ana", "last_name": "Hernández", "date_of_birth": "1992-07-04", "country_of_birth": "el  salvador"},
+    {"first_name": "Luis", "last_name": "Pérez", "date_of_birth": "1979-12-24", "country_of_birth": "Perú"},
+    {"first_name": "Luis", "last_name": "Perez", "date_of_birth": "12/24/1979", "country_of_birth": "Peru"},
+    {"first_name": "Luis", "last_name": "Pérez", "date_of_birth": "24/12/1979", "country_of_birth": "peru"},
+    {"first_name": "Carmen", "last_name": "Gonzalez Ramirez", "date_of_birth": "1994-02-11", "country_of_birth": "Honduras"},
+    {"first_name": "Carmen", "last_name": "González  Ramírez", "date_of_birth": "1994-02-11", "country_of_birth": "Honduras"},
+    {"first_name": "Ngozi", "last_name": "Okafor", "date_of_birth": "1975-06-30", "country_of_birth": "Nigeria"},
+    {"first_name": "Ngozi", "last_name": "Okafor", "date_of_birth": "06/30/1975", "country_of_birth": "nigeria"},
+    {"alien_number": "A123456789"},
+    {"alien_number": "a123456789"},
+    {"alien_number": "A-123-456-789"},
+    {"alien_number": "123456789"},
+    {"alien_number": "A12345678"},
+    {"alien_number": "A012345678"},
+    {"alien_number": "A 012 345 678"},
+    {"alien_number": "A987654321"},
+]
+
+
+def legacy_cache_key(request):
+    """The cache key before canonicalization: lowercased and stripped only."""
+    fields = {k: getattr(request, k) for k in (
+        "first_name", "last_name", "middle_name", "date_of_birth", "country_of_birth", "alien_number", "language"
+    )}
+    normalized = {k: str(v).lower().strip() for k, v in fields.items() if v is not None}
+    return hashlib.md5("|".join(f"{k}={v}" for k, v in sorted(normalized.items())).encode()).hexdigest()
+
+
+def replay_hit_rate(key_function):
+    """Fraction of log entries whose key was already cached by an earlier entry."""
+    seen, hits = set(), 0
+    for entry in QUERY_LOG:
+        key = key_function(SearchRequest(**entry))
+        hits += key in seen
+        seen.add(key)
+    return hits / len(QUERY_LOG)
+
+
+class TestCanonicalization:
+    """Test the field canonicalizers."""
+
+    def test_fold_text(self):
+        """Accents and case are folded and whitespace collapsed."""
+        assert fold_text("  María\tJOSÉ  ") == "maria jose"
+        assert fold_text("Ñuñez") == "nunez"
+
+    def test_dates(self):
+        """Dates DateParser understands become YYYY-MM-DD; others are only folded."""
+        assert {canonical_date(d) for d in ("1990-01-05", "01/05/1990", "Jan 5, 1990", "1990-1-5")} == {"1990-01-05"}
+        assert canonical_date("13/05/1990") == "1990-05-13"
+        assert canonical_date("unknown ") == "unknown"
+
+    def test_impossible_dates_are_rejected(self):
+        """DateParser only returns real calendar dates."""
+        assert DateParser().parse_date("1990-02-30") is None
+
+    def test_countries(self):
+        """Country spellings resolve through the mapping table."""
+        assert {canonical_country(c) for c in ("México", "mexico", " MEXICO ")} == {"mexico"}
+        assert canonical_country("Salvador") == "el salvador"
+        assert canonical_country("Nigeria") == "nigeria"
+
+    def test_alien_numbers(self):
+        """Separators and the prefix are dropped and 8-digit numbers padded."""
+        assert {canonical_alien_number(a) for a in ("A-12345678", "a012345678", "012 345 678")} == {"a012345678"}
+        assert canonical_alien_number("A12") == "a12"
+
+
+class TestCacheKeys:
+    """Test cache keys built from canonical fields."""
+
+    def test_equivalent_requests_share_a_key(self):
+        """Different spellings of one lookup hash to the same key."""
+        keys = {SearchRequest(**entry).to_cache_key() for entry in QUERY_LOG[:4]}
+        assert len(keys) == 1
+
+    def test_different_requests_keep_different_keys(self):
+        """Canonicalization does not merge different people or languages."""
+        base = dict(first_name="Jose", last_name="Rodriguez", date_of_birth="1990-01-05")
+        keys = {
+            SearchRequest(**base).to_cache_key(),
+            SearchRequest(**dict(base, first_name="Josue")).to_cache_key(),
+            SearchRequest(**dict(base, date_of_birth="1990-05-01")).to_cache_key(),
+            SearchRequest(**base, language="es").to_cache_key(),
+            SearchRequest(alien_number="A123456789").to_cache_key(),
+            SearchRequest(alien_number="A123456780").to_cache_key(),
+        }
+        assert len(keys) == 6
+
+    def test_replayed_log_hit_rate(self):
+        """Replaying the query log hits the cache far more often with canonical keys."""
+        legacy = replay_hit_rate(legacy_cache_key)
+        canonical = replay_hit_rate(SearchRequest.to_cache_key)
+        distinct = len({SearchRequest(**entry).to_cache_key() for entry in QUERY_LOG})
+        print(f"\nreplayed {len(QUERY_LOG)} lookups: hit rate {legacy:.0%} -> {canonical:.0%}")
+
+        assert distinct == 9
+        assert canonical == pytest.approx(1 - distinct / len(QUERY_LOG))
+        assert canonical > legacy * 3
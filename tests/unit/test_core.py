@@ -5,6 +5,7 @@ Unit tests for ICE Locator MCP Server core functionality.
 import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
+from dataclasses import asdict
 from datetime import datetime
 
 from ice_locator_mcp.core.config import ServerConfig, ProxyConfig, SearchConfig
@@ -159,6 +160,34 @@ class TestSearchResult:
         assert len(result.results) == 0
 
 
+@pytest.mark.asyncio
+class TestSearchEngineCache:
+    """Test search result caching."""
+    
+    async def test_cached_result_round_trip(self, temp_dir, mock_proxy_manager):
+        """A result stored in an empty cache is served back with its records."""
+        engine = SearchEngine(mock_proxy_manager, SearchConfig(), cache_dir=temp_dir / "cache")
+        await engine.cache_manager.initialize()
+        request = SearchRequest(alien_number="A123456789")
+        record = DetaineeRecord(
+            alien_number="A123456789",
+            name="John Doe",
+            date_of_birth="1990-01-01",
+            country_of_birth="Mexico",
+            facility_name="Test Facility",
+            facility_location="Test City, TX",
+            custody_status="In Custody",
+            last_updated="2024-01-15T10:30:00Z"
+        )
+        
+        await engine.cache_manager.set(request.to_cache_key(), asdict(SearchResult.success([record], 0.1)))
+        result = await engine.search(request)
+        
+        assert result.status == "found"
+        assert result.results == [record]
+        await engine.cleanup()
+
+
 @pytest.mark.asyncio
 class TestSearchTools:
     """Test search tools functionality."""
@@ -0,0 +1,130 @@
+"""
+Unit tests for the live monitoring dashboard stream.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ice_locator_mcp.monitoring.dashboard import AlertManager, MonitoringDashboard
+from ice_locator_mcp.monitoring.dashboard_stream import DashboardEventStream, create_dashboard_app
+
+
+@pytest.fixture
+def dashboard(temp_dir):
+    """Create a dashboard over a stubbed comprehensive monitor."""
+    comprehensive_monitor = Mock()
+    comprehensive_monitor.system_monitor = None
+    comprehensive_monitor.session_metrics = {}
+    comprehensive_monitor.generate_analytics_dashboard_data = AsyncMock(return_value={
+        "analytics_summary": {"total_tool_calls": 3}
+    })
+    comprehensive_monitor.get_health_status = AsyncMock(return_value={"overall_status": "healthy"})
+    return MonitoringDashboard(comprehensive_monitor, AlertManager(storage_path=temp_dir), config=None)
+
+
+class TestDashboardEventStream:
+    """Test event fan-out and replay."""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_receive_events_in_order(self):
+        """Every subscriber receives published events."""
+        stream = DashboardEventStream()
+        subscription = stream.subscribe()
+        first = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0)
+
+        stream.publish("metrics", {"cpu_percent": 10.0})
+        stream.publish("metrics", {"cpu_percent": 20.0})
+
+        assert (await first).data == {"cpu_percent": 10.0}
+        assert (await subscription.__anext__()).data == {"cpu_percent": 20.0}
+        await subscription.aclose()
+        assert not stream.subscribers
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_missed_events(self):
+        """A client resuming from Last-Event-ID gets only what it missed."""
+        stream = DashboardEventStream(history_size=4)
+        for i in range(3):
+            stream.publish("metrics", {"i": i})
+
+        subscription = stream.subscribe(last_event_id=1)
+        assert (await subscription.__anext__()).event_id == 2
+        assert (await subscription.__anext__()).event_id == 3
+        await subscription.aclose()
+
+        # Ids older than the replay buffer force a resync
+        for i in range(5):
+            stream.publish("metrics", {"i": i})
+        subscription = stream.subscribe(last_event_id=1)
+        assert (await subscription.__anext__()).event == "resync"
+        await subscription.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_resynced(self):
+        """Publishing never blocks on a full subscriber queue."""
+        stream = DashboardEventStream(queue_size=2)
+        subscription = stream.subscribe()
+        pending = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0)
+
+        queue = next(iter(stream.subscribers))
+        for i in range(5):
+            stream.publish("metrics", {"i": i})
+        assert queue.qsize() == 1
+        assert (await pending).event == "resync"
+        await subscription.aclose()
+
+
+class TestMonitoringDashboardStream:
+    """Test deltas published by the dashboard."""
+
+    @pytest.mark.asyncio
+    async def test_alert_changes_are_published(self, dashboard):
+        """Triggered and resolved alerts become stream events."""
+        await dashboard.alert_manager.evaluate_metrics({"cpu_percent": 95.0})
+        dashboard.alert_manager.rule_cooldowns.clear()
+        await dashboard.alert_manager.evaluate_metrics({"cpu_percent": 10.0})
+
+        events = list(dashboard.event_stream.history)
+        assert [(e.event, e.data["action"]) for e in events] == [
+            ("alert", "triggered"), ("alert", "resolved")
+        ]
+        assert events[0].data["rule_id"] == "high_cpu"
+
+    def test_tool_call_counters_publish_only_changes(self, dashboard):
+        """Only tool counters that changed are sent."""
+        metrics = dashboard.comprehensive_monitor.session_metrics
+        metrics["tool_calls"] = {"search_detainee_by_name": 2, "bulk_search": 1}
+        metrics["success_rate"] = {"successful": 3, "failed": 0}
+
+        first = dashboard.publish_tool_call_deltas()
+        assert first["total"] == 3
+        assert dashboard.publish_tool_call_deltas() is None
+
+        metrics["tool_calls"]["bulk_search"] = 2
+        assert dashboard.publish_tool_call_deltas()["changed"] == {"bulk_search": 2}
+
+    @pytest.mark.asyncio
+    async def test_sse_encoding(self, dashboard):
+        """SSE messages carry id, event name and compact JSON."""
+        sse = dashboard.event_stream.sse()
+        message = asyncio.ensure_future(sse.__anext__())
+        while not dashboard.event_stream.subscribers:
+            await asyncio.sleep(0)
+        dashboard.event_stream.publish("tool_calls", {"total": 4})
+
+        assert await message == 'id: 1\nevent: tool_calls\ndata: {"total":4}\n\n'
+        await sse.aclose()
+
+    def test_page_is_rendered_with_stream_client(self, dashboard):
+        """The page is served once and subscribes to the event stream."""
+        client = TestClient(create_dashboard_app(dashboard))
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert 'new EventSource("events")' in response.text
+        assert '<span id="total_tool_calls">3</span>' in response.text
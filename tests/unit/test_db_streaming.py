@@ -0,0 +1,144 @@
+"""
+Unit tests for streaming row iteration and the slotted database models.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ice_locator_mcp.api.heatmap_api import HeatmapAPI, app, get_heatmap_api
+from ice_locator_mcp.database.manager import DatabaseManager
+from ice_locator_mcp.database.models import Detainee, Facility
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+
+
+def make_database(path, facilities):
+    manager = SQLiteDatabaseManager(path)
+    manager.connect()
+    manager.create_tables()
+    manager.connection.executemany(
+        "INSERT INTO facilities (name, latitude, longitude, population_count, created_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f"Facility {i:05d}", 30.0 + i / 1000, -100.0, i, "2025-01-02 03:04:05") for i in range(facilities)]
+    )
+    manager.connection.commit()
+    return manager
+
+
+@pytest.fixture
+def db_manager(temp_dir):
+    manager = make_database(str(temp_dir / "streaming.db"), 5)
+    manager.connection.executemany(
+        "INSERT INTO detainees (id, first_name, last_name) VALUES (?, ?, ?)",
+        [(1, "Ana", "Cruz"), (2, "Luis", "Perez"), (3, "Eva", "Diaz")]
+    )
+    manager.connection.execute(
+        "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date) VALUES (2, 1, '2025-01-01')"
+    )
+    manager.connection.commit()
+    yield manager
+    manager.disconnect()
+
+
+class TestModels:
+    """Test the slotted models and lazy timestamps."""
+
+    def test_models_use_slots(self):
+        """Model instances have no per-instance dict."""
+        facility = Facility(1, "Krome", 25.7, -80.4, None)
+        assert not hasattr(facility, "__dict__")
+        with pytest.raises(AttributeError):
+            facility.extra = 1
+
+    def test_timestamps_parse_on_first_access(self):
+        """Text timestamps stay text until read, then are parsed once."""
+        detainee = Detainee(1, "Ana", "Cruz", "2025-01-02 03:04:05", None)
+        assert Detainee.created_at.fget is not None
+        assert detainee.created_at == datetime(2025, 1, 2, 3, 4, 5)
+        assert detainee.created_at is detainee.created_at
+        assert detainee.updated_at is None
+        detainee.updated_at = datetime(2025, 2, 1)
+        assert detainee == Detainee(1, "Ana", "Cruz", datetime(2025, 1, 2, 3, 4, 5), datetime(2025, 2, 1))
+
+    def test_empty_timestamp_reads_as_none(self):
+        """An empty timestamp string is treated as missing, as before."""
+        facility = Facility(1, "Krome", 25.7, -80.4, None, created_at="", updated_at="")
+        assert facility.created_at is None
+        assert facility == Facility(1, "Krome", 25.7, -80.4, None)
+        assert "created_at=None" in repr(facility)
+
+
+class TestSQLiteIteration:
+    """Test batched iteration in the SQLite manager."""
+
+    def test_iterators_match_lists(self, db_manager):
+        """Small batches yield the same rows, in order, as the list methods."""
+        assert list(db_manager.iter_facilities(batch_size=2)) == db_manager.get_all_facilities()
+        assert [f.name for f in db_manager.iter_facilities(batch_size=2)][:2] == ["Facility 00000", "Facility 00001"]
+        assert [d.last_name for d in db_manager.iter_detainees(batch_size=1)] == ["Cruz", "Diaz", "Perez"]
+        assert [d.id for d in db_manager.get_detainees_without_facility()] == [1, 3]
+
+    def test_timestamps_are_not_parsed_while_iterating(self, db_manager):
+        """Unparseable timestamps only fail for callers that read them."""
+        db_manager.connection.execute("UPDATE facilities SET updated_at = 'not a date'")
+        facilities = list(db_manager.iter_facilities())
+        assert [f.latitude for f in facilities][0] == 30.0
+        with pytest.raises(ValueError):
+            facilities[0].updated_at
+
+
+class TestPostgresIteration:
+    """Test server-side cursor iteration in the PostgreSQL manager."""
+
+    def test_named_cursor_batches(self):
+        """Rows come from a named cursor in fetchmany batches and the cursor is closed."""
+        manager = DatabaseManager("postgresql://localhost/test")
+        manager.connection = MagicMock()
+        cursor = manager.connection.cursor.return_value
+        row = {"id": 1, "first_name": "Ana", "last_name": "Cruz", "created_at": None, "updated_at": None}
+        cursor.fetchmany.side_effect = [[row, dict(row, id=2)], [dict(row, id=3)], []]
+
+        detainees = list(manager.iter_detainees(batch_size=2))
+
+        assert [d.id for d in detainees] == [1, 2, 3]
+        assert manager.connection.cursor.call_args.kwargs["name"].startswith("ice_locator_rows_")
+        cursor.fetchmany.assert_called_with(2)
+        cursor.close.assert_called_once()
+
+    def test_cursor_names_are_unique(self):
+        """Concurrent iterators on one connection get their own cursors."""
+        manager = DatabaseManager("postgresql://localhost/test")
+        manager.connection = MagicMock()
+        manager.connection.cursor.return_value.fetchmany.return_value = []
+        list(manager.iter_facilities())
+        list(manager.iter_facilities())
+        names = [call.kwargs["name"] for call in manager.connection.cursor.call_args_list]
+        assert len(set(names)) == 2
+
+
+class TestFacilityStreaming:
+    """Test the streamed /api/facilities response."""
+
+    @pytest.mark.parametrize("count", [0, 1, 1201])
+    def test_streamed_json(self, temp_dir, monkeypatch, count):
+        """The streamed body is a JSON array of every facility."""
+        path = str(temp_dir / "api.db")
+        make_database(path, count).disconnect()
+        monkeypatch.setenv("SQLITE_DATABASE_PATH", path)
+        app.dependency_overrides[get_heatmap_api] = HeatmapAPI
+        try:
+            response = TestClient(app).get("/api/facilities")
+        finally:
+            app.dependency_overrides.pop(get_heatmap_api, None)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        facilities = response.json()
+        assert len(facilities) == count
+        if count:
+            assert facilities[-1] == {
+                "id": count, "name": f"Facility {count - 1:05d}", "latitude": 30.0 + (count - 1) / 1000,
+                "longitude": -100.0, "address": None, "population_count": count - 1
+            }
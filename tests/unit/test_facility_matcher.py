@@ -0,0 +1,239 @@
+"""
+Unit tests and ingest benchmark for the indexed TRAC facility matcher.
+"""
+
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+from ice_locator_mcp.database.facility_matcher import (
+    FacilityMatcher,
+    extract_county_and_state,
+    extract_location_from_address,
+    facility_name_stem,
+    normalize_facility_name,
+    normalize_facility_name_advanced
+)
+from ice_locator_mcp.database.models import Facility
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from fetch_historical_trac_data import HistoricalTRACDataFetcher, TRACFacility  # noqa: E402
+
+
+# Linear-scan matchers the index replaced, kept as the reference behaviour
+
+def linear_match_with_location(name, city, state, db_facilities):
+    trac_normalized = normalize_facility_name(name)
+    trac_advanced = normalize_facility_name_advanced(name)
+    for db in db_facilities:
+        if trac_normalized == normalize_facility_name(db['name']):
+            return db
+    for db in db_facilities:
+        if trac_advanced == normalize_facility_name_advanced(db['name']):
+            return db
+    for db in db_facilities:
+        db_advanced = normalize_facility_name_advanced(db['name'])
+        if trac_advanced in db_advanced or db_advanced in trac_advanced:
+            return db
+    for db in db_facilities:
+        if state == db.get('state', '') and city.upper() == (db.get('city') or '').upper():
+            return db
+        db_city, db_state = extract_location_from_address(db.get('address', ''))
+        if db_city and db_state and state == db_state and city.upper() == db_city.upper():
+            return db
+    trac_core = re.sub(r'\b(COUNTY|CITY|TOWN|VILLAGE)\b', '', trac_advanced).strip()
+    for db in db_facilities:
+        db_core = re.sub(r'\b(COUNTY|CITY|TOWN|VILLAGE)\b', '',
+                         normalize_facility_name_advanced(db['name'])).strip()
+        if trac_core and db_core and (
+            trac_core in db_core or db_core in trac_core or
+            len(set(trac_core.split()) & set(db_core.split())) >= 2
+        ):
+            return db
+    return None
+
+
+def linear_name_matches(name, db_facilities, threshold):
+    trac_name = name.upper().strip()
+    for facility in db_facilities:
+        if facility.name.upper().strip() == trac_name:
+            yield facility
+            return
+    normalized = facility_name_stem(trac_name)
+    for facility in db_facilities:
+        if facility_name_stem(facility.name.upper().strip()) == normalized:
+            yield facility
+    trac_county, trac_state = extract_county_and_state(trac_name)
+    if trac_county:
+        for facility in db_facilities:
+            db_county, db_state = extract_county_and_state(facility.name)
+            if db_county and db_county == trac_county:
+                if trac_state and db_state:
+                    if trac_state == db_state:
+                        yield facility
+                elif trac_state or db_state:
+                    if trac_state and trac_state in facility.name.upper():
+                        yield facility
+                    elif db_state and db_state in trac_name:
+                        yield facility
+                else:
+                    yield facility
+    trac_tokens = set(normalized.split())
+    if trac_tokens:
+        for facility in db_facilities:
+            count = sum(1 for token in trac_tokens if token in facility.name.upper())
+            if count >= 2 and count / len(trac_tokens) >= 0.5:
+                yield facility
+    for facility in db_facilities:
+        db_tokens = set(facility_name_stem(facility.name.upper().strip()).split())
+        if trac_tokens and db_tokens:
+            score = len(trac_tokens & db_tokens) / len(trac_tokens | db_tokens)
+            if 'COUNTY' in trac_tokens and 'COUNTY' in db_tokens:
+                score *= 1.5
+            trac_states = {t for t in trac_tokens if len(t) == 2 and t.isalpha()}
+            db_states = {t for t in db_tokens if len(t) == 2 and t.isalpha()}
+            if trac_states and db_states and trac_states & db_states:
+                score *= 1.2
+            if score > threshold:
+                yield facility
+
+
+WORDS = ["ADAMS", "BAKER", "CLAY", "DADE", "ESSEX", "FRANKLIN", "GRANT", "HALL", "IRWIN",
+         "JACKSON", "KERN", "LAKE", "MARION", "NYE", "OTERO", "PIKE", "ROCK", "SALT", "TAFT", "UNION"]
+KINDS = ["COUNTY JAIL", "COUNTY DETENTION CENTER", "CORRECTIONAL FACILITY", "PROCESSING CENTER",
+         "COUNTY SHERIFF'S OFFICE", "DET CTR", "SERVICE PROCESSING CENTER", "REGIONAL JAIL"]
+STATES = ["TX", "CA", "FL", "NY", "GA", "AZ", "LA", "NC"]
+
+
+def synthetic_name(rng):
+    words = " ".join(rng.sample(WORDS, rng.choice([1, 1, 2])))
+    name = f"{words} {rng.choice(KINDS)}"
+    if rng.random() < 0.2:
+        name += f", {rng.choice(STATES)}"
+    return name.title() if rng.random() < 0.5 else name
+
+
+def synthetic_db(rng, size):
+    facilities = []
+    for i in range(size):
+        city, state = rng.choice(WORDS).title(), rng.choice(STATES)
+        facilities.append({
+            "id": i + 1,
+            "name": synthetic_name(rng),
+            "address": f"{city}, {state} {rng.randint(10000, 99999)}",
+            "city": city,
+            "state": state
+        })
+    return facilities
+
+
+class TestFacilityMatcher:
+    """Test index lookups against the linear-scan strategies."""
+
+    def test_location_matches_equal_linear_scan(self):
+        """Every strategy picks the same facility the linear scan did."""
+        rng = random.Random(7)
+        db_facilities = synthetic_db(rng, 150)
+        matcher = FacilityMatcher(db_facilities)
+
+        for _ in range(400):
+            name, city, state = synthetic_name(rng), rng.choice(WORDS).title(), rng.choice(STATES)
+            expected = linear_match_with_location(name, city, state, db_facilities)
+            assert matcher.match_with_location(name, city, state) is expected
+
+    def test_name_candidates_equal_linear_scan(self):
+        """Candidate order and the single best match follow the linear strategies."""
+        rng = random.Random(11)
+        db_facilities = [Facility(id=i, name=synthetic_name(rng), latitude=0.0, longitude=0.0, address=None)
+                         for i in range(150)]
+        matcher = FacilityMatcher(db_facilities)
+
+        for _ in range(300):
+            name = synthetic_name(rng)
+            expected = list(linear_name_matches(name, db_facilities, 0.3))[:5]
+            assert matcher.find_candidates(name, max_candidates=5) == expected
+            assert matcher.find_match(name) is next(linear_name_matches(name, db_facilities, 0.4), None)
+
+    def test_known_pairs(self):
+        """Real-world naming variants resolve to the expected facility."""
+        db_facilities = [
+            Facility(id=1, name="Alamance County Sheriff's Office, NORTH CAROLINA", latitude=0.0, longitude=0.0, address=None),
+            Facility(id=4, name="Broward Transitional Center", latitude=0.0, longitude=0.0, address=None),
+            Facility(id=6, name="Orange County Jail", latitude=0.0, longitude=0.0, address=None),
+        ]
+        matcher = FacilityMatcher(db_facilities)
+
+        assert matcher.find_match("ALAMANCE COUNTY DETENTION FACILITY").id == 1
+        assert matcher.find_match("BROWARD TRANSITIONAL CENTER").id == 4
+        assert matcher.find_match("ORANGE COUNTY JAIL (FL)").id == 6
+        assert matcher.find_match("NOWHERE HOLD ROOM") is None
+
+    def test_incremental_add_invalidates_cache(self):
+        """Facilities added later are visible to previously cached queries."""
+        matcher = FacilityMatcher([{"id": 1, "name": "Otero Processing Center", "address": ""}])
+        assert matcher.match_with_location("Nye County Jail", "Pahrump", "NV") is None
+
+        matcher.add({"id": 2, "name": "Nye County Detention Center", "address": "Pahrump, NV 89048"})
+        assert matcher.match_with_location("Nye County Jail", "Pahrump", "NV")["id"] == 2
+        assert len(matcher) == 2
+
+
+class TestHistoricalIngestBenchmark:
+    """Benchmark a full historical ingest with the linear and indexed matchers."""
+
+    def _ingest(self, temp_dir, db_facilities, monthly_data, match):
+        db_path = temp_dir / f"ingest_{match}.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE facilities (id INTEGER PRIMARY KEY, name TEXT, latitude REAL,
+                                     longitude REAL, address TEXT, population_count INTEGER)
+        """)
+        conn.executemany(
+            "INSERT INTO facilities VALUES (?, ?, 0, 0, ?, NULL)",
+            [(f["id"], f["name"], f["address"]) for f in db_facilities]
+        )
+        conn.commit()
+        conn.close()
+
+        fetcher = HistoricalTRACDataFetcher(str(db_path))
+        if match == "linear":
+            fetcher.match_facility_to_database = lambda trac, facilities: linear_match_with_location(
+                trac.name, trac.city, trac.state, facilities
+            )
+
+        start = time.perf_counter()
+        fetcher.update_database_with_monthly_data(monthly_data)
+        elapsed = time.perf_counter() - start
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT facility_id, month_year, population_count FROM monthly_population ORDER BY 1, 2"
+        ).fetchall()
+        conn.close()
+        return elapsed, rows
+
+    def test_indexed_ingest_matches_and_is_faster(self, temp_dir):
+        """Both ingests write identical rows; the indexed one is much faster."""
+        rng = random.Random(3)
+        db_facilities = synthetic_db(rng, 200)
+        trac_facilities = [(synthetic_name(rng), rng.choice(WORDS).title(), rng.choice(STATES))
+                           for _ in range(60)]
+        monthly_data = {
+            f"2020-{month:02d}": [
+                TRACFacility(name, city, state, "00000", "IGSA", rng.randint(0, 900), f"{month:02d}/15/2020")
+                for name, city, state in trac_facilities
+            ]
+            for month in range(1, 13)
+        }
+
+        linear_time, linear_rows = self._ingest(temp_dir, db_facilities, monthly_data, "linear")
+        indexed_time, indexed_rows = self._ingest(temp_dir, db_facilities, monthly_data, "indexed")
+        print(f"\nhistorical ingest: linear {linear_time:.3f}s, indexed {indexed_time:.3f}s, "
+              f"speedup {linear_time / indexed_time:.1f}x")
+
+        assert indexed_rows == linear_rows
+        assert indexed_time * 5 < linear_time
@@ -0,0 +1,158 @@
+"""
+Unit tests for the shared geocoding cache and batch geocoder.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ice_locator_mcp.database import geocode_facilities
+from ice_locator_mcp.database.geocoding import (
+    NOT_FOUND,
+    BatchGeocoder,
+    GazetteerBackend,
+    GeocoderBackend,
+    GeocoderUnavailable,
+    GeocodingCache,
+    create_backend,
+    normalize_address
+)
+
+
+class CountingBackend(GeocoderBackend):
+    """Local backend that records every address it is asked for."""
+
+    name = "counting"
+
+    def __init__(self, places=None, requests_per_minute=None, failures=0):
+        self.places = places or {}
+        self.requests_per_minute = requests_per_minute
+        self.failures = failures
+        self.calls = []
+        self.call_times = []
+
+    def geocode(self, address):
+        self.calls.append(address)
+        self.call_times.append(time.monotonic())
+        if self.failures:
+            self.failures -= 1
+            raise GeocoderUnavailable("timed out")
+        return self.places.get(address)
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Cache in a temporary SQLite file."""
+    cache = GeocodingCache(temp_dir / "geocode.sqlite")
+    yield cache
+    cache.close()
+
+
+class TestGeocodingCache:
+    """Test address normalization and persistence."""
+
+    def test_normalize_address(self):
+        """Case, accents, punctuation and a trailing country are folded."""
+        assert normalize_address("  Doña Ana County Sheriff's Office,  NM, USA ") == \
+            "dona ana county sheriff s office, nm"
+        assert normalize_address("Krome SPC, Miami, FL") == normalize_address("KROME SPC , MIAMI , FL, United States")
+
+    def test_results_persist_across_instances(self, temp_dir, cache):
+        """Hits and known misses survive reopening the cache."""
+        cache.put_many([("Dilley, TX", (28.67, -99.17), "test"), ("Nowhere, ZZ", None, "test")])
+        cache.close()
+
+        reopened = GeocodingCache(temp_dir / "geocode.sqlite")
+        assert reopened.get("dilley, tx, usa") == (28.67, -99.17)
+        assert reopened.get("Nowhere, ZZ") == NOT_FOUND
+        assert reopened.get("Elsewhere, TX") is None
+        assert len(reopened) == 2
+        reopened.close()
+
+
+class TestBatchGeocoder:
+    """Test cache-first batching through the shared worker."""
+
+    def test_only_misses_reach_the_backend(self, cache):
+        """A re-ingest is served from the cache without backend calls."""
+        backend = CountingBackend({"Dilley, TX": (28.67, -99.17)})
+        geocoder = BatchGeocoder(backend, cache)
+        addresses = ["Dilley, TX", "DILLEY, TX, USA", "Nowhere, ZZ"]
+
+        first = geocoder.geocode_many_sync(addresses)
+        assert first == {"Dilley, TX": (28.67, -99.17), "DILLEY, TX, USA": (28.67, -99.17),
+                         "Nowhere, ZZ": NOT_FOUND}
+        assert backend.calls == ["Dilley, TX", "Nowhere, ZZ"]
+
+        second = BatchGeocoder(backend, cache).geocode_many_sync(addresses)
+        assert second == first
+        assert len(backend.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_one_throttled_worker_serves_concurrent_batches(self, cache):
+        """Concurrent batches share one paced request stream and in-flight lookups."""
+        backend = CountingBackend({f"Place {i}": (float(i), 0.0) for i in range(4)}, requests_per_minute=600)
+        geocoder = BatchGeocoder(backend, cache)
+
+        first, second = await asyncio.gather(
+            geocoder.geocode_many(["Place 0", "Place 1", "Place 2"]),
+            geocoder.geocode_many(["Place 2", "Place 3"])
+        )
+        await geocoder.aclose()
+
+        assert first["Place 2"] == second["Place 2"] == (2.0, 0.0)
+        assert sorted(backend.calls) == ["Place 0", "Place 1", "Place 2", "Place 3"]
+        gaps = [b - a for a, b in zip(backend.call_times, backend.call_times[1:])]
+        assert min(gaps) >= 0.09
+
+    def test_transient_failures_are_retried_not_cached(self, cache):
+        """Unavailable backends are retried; exhausted retries are not remembered."""
+        backend = CountingBackend({"Dilley, TX": (28.67, -99.17)}, failures=1)
+        assert BatchGeocoder(backend, cache).geocode_many_sync(["Dilley, TX"])["Dilley, TX"] == (28.67, -99.17)
+
+        backend = CountingBackend({"Adelanto, CA": (34.56, -117.44)}, failures=5)
+        geocoder = BatchGeocoder(backend, cache, max_retries=2)
+        assert geocoder.geocode_many_sync(["Adelanto, CA"])["Adelanto, CA"] == NOT_FOUND
+        assert geocoder.stats["failed"] == 1
+        assert cache.get("Adelanto, CA") is None
+
+
+class TestOfflineBackend:
+    """Test the gazetteer backend used for tests and air-gapped rebuilds."""
+
+    def test_bundled_gazetteer(self):
+        """Facility names and addresses from the bundled data resolve offline."""
+        backend = create_backend("offline")
+        assert isinstance(backend, GazetteerBackend)
+        assert backend.requests_per_minute is None
+        assert backend.geocode("Dilley Family Residential Center") == (28.6695971, -99.1672017)
+
+    def test_leading_components_are_dropped(self):
+        """Unknown agencies fall back to the enclosing place."""
+        backend = GazetteerBackend({"Dade County, FL": (25.6, -80.5)})
+        assert backend.geocode("Miami-Dade Sheriff, Dade County, FL, USA") == (25.6, -80.5)
+        assert backend.geocode("Some Agency, TX") is None
+
+    def test_sample_ingest_runs_offline(self, temp_dir, cache, monkeypatch):
+        """The geocoding ingest completes with no network access."""
+        csv_path = temp_dir / "agencies.csv"
+        csv_path.write_text(
+            "STATE,LAW ENFORCEMENT AGENCY,COUNTY,TYPE\n"
+            "FL,Dade Sheriff,Dade,Jail\n"
+            "FL,Dade Sheriff,Dade,Jail\n"
+            "ZZ,Unknown Agency,,Task Force\n"
+        )
+        db_manager = Mock()
+        db_manager.get_all_facilities.return_value = []
+        monkeypatch.setattr(geocode_facilities, "DatabaseManager", Mock(return_value=db_manager))
+
+        geocoder = BatchGeocoder(GazetteerBackend({"Dade County, FL": (25.6, -80.5)}), cache)
+        geocode_facilities.geocode_facilities_from_csv("postgresql://unused", str(csv_path), geocoder)
+
+        facilities = db_manager.insert_facilities.call_args.args[0]
+        assert [(f.name, f.latitude, f.longitude) for f in facilities] == [
+            ("Dade Sheriff, FL", 25.6, -80.5), ("Unknown Agency, ZZ", 0.0, 0.0)
+        ]
+        assert geocoder.stats == {"cached": 0, "geocoded": 1, "not_found": 1, "failed": 0}
@@ -11,6 +11,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from ice_locator_mcp.api.heatmap_api import app, HeatmapAPI
+from ice_locator_mcp.utils.prometheus_metrics import METRICS_REGISTRY
 
 
 class TestHeatmapAPI(unittest.TestCase):
@@ -97,6 +98,40 @@ class TestHeatmapAPI(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["detainee_count"], 5)
 
+    
+    @patch('ice_locator_mcp.database.sqlite_manager.SQLiteDatabaseManager.get_heatmap_data')
+    @patch('ice_locator_mcp.database.sqlite_manager.SQLiteDatabaseManager.connect')
+    def test_metrics_endpoint(self, mock_connect, mock_get_heatmap_data):
+        """Test the Prometheus metrics endpoint."""
+        mock_get_heatmap_data.return_value = []
+        self.client.get("/api/heatmap-data")
+        
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn(
+            'ice_locator_db_query_duration_seconds_count{endpoint="heatmap_data"}',
+            response.text
+        )
+        self.assertIn("ice_locator_tool_call_duration_seconds", response.text)
+        self.assertIn("ice_locator_event_loop_lag_seconds", response.text)
+    
+    @patch('ice_locator_mcp.database.sqlite_manager.SQLiteDatabaseManager.get_current_detainee_count')
+    @patch('ice_locator_mcp.database.sqlite_manager.SQLiteDatabaseManager.get_facility_by_id')
+    @patch('ice_locator_mcp.database.sqlite_manager.SQLiteDatabaseManager.connect')
+    def test_facility_request_is_timed_once(self, mock_connect, mock_get_facility, mock_get_count):
+        """One facility request adds one database timing observation."""
+        mock_get_facility.return_value = Mock(id=1, latitude=0.0, longitude=0.0, address="")
+        mock_get_facility.return_value.name = "Test Facility"
+        mock_get_count.return_value = 5
+        sample = ("ice_locator_db_query_duration_seconds_count",
+                  {"endpoint": "facility_current_detainees"})
+        before = METRICS_REGISTRY.get_sample_value(*sample) or 0.0
+        
+        response = self.client.get("/api/facility/1/current-detainees")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(METRICS_REGISTRY.get_sample_value(*sample), before + 1)
 
 class TestHeatmapAPIClass(unittest.TestCase):
     """Test cases for the HeatmapAPI class."""
@@ -0,0 +1,145 @@
+"""
+Tests for the event loop lag probe and slow-callback detector.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.monitoring import comprehensive_monitor, dashboard
+from ice_locator_mcp.monitoring.dashboard import AlertManager, MonitoringDashboard
+from ice_locator_mcp.server import ICELocatorServer
+from ice_locator_mcp.utils.prometheus_metrics import EventLoopLagProbe, SlowCallbackDetector
+
+
+async def blocking_persist():
+    """Stand-in for a coroutine doing synchronous I/O on the loop."""
+    time.sleep(0.25)
+
+
+class TestSlowCallbackDetector:
+    """Watchdog over the event loop."""
+
+    async def test_records_blocking_coroutine_and_stack(self):
+        """A coroutine blocking past the threshold is recorded with its stack."""
+        detector = SlowCallbackDetector(threshold=0.05, check_interval=0.01)
+        detector.start()
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.create_task(blocking_persist(), name="persist")
+            await asyncio.sleep(0.1)
+        finally:
+            await asyncio.to_thread(detector.stop)
+
+        # Other stalls on a loaded machine may be recorded too
+        assert detector.total >= 1
+        record = next(r for r in detector.records if r.coroutine == "blocking_persist")
+        assert record.task == "persist"
+        assert record.coroutine == "blocking_persist"
+        # Measured from the last answered probe, so at most one interval short
+        assert 0.25 - detector.check_interval <= record.duration < 0.5
+        assert any(line.endswith("in blocking_persist") for line in record.stack)
+
+    async def test_healthy_loop_records_nothing(self):
+        """Short callbacks stay under the threshold."""
+        detector = SlowCallbackDetector(threshold=0.1, check_interval=0.01)
+        detector.start()
+        try:
+            for _ in range(20):
+                await asyncio.sleep(0.005)
+        finally:
+            await asyncio.to_thread(detector.stop)
+
+        assert detector.total == 0
+
+
+class TestEventLoopLagProbe:
+    """Lag histogram and alert metrics."""
+
+    def test_histogram_and_alert_window(self):
+        """Lag samples are bucketed; alert metrics cover only the last window."""
+        probe = EventLoopLagProbe()
+        for lag in (0.0002, 0.0002, 0.03, 0.4):
+            probe.observe(lag)
+
+        assert probe.histogram() == {"le_0.0005": 2, "le_0.05": 1, "le_0.5": 1}
+        assert probe.alert_metrics() == {"event_loop_lag_ms": 400.0, "slow_callback_count": 0.0}
+
+        probe.observe(0.001)
+        assert probe.alert_metrics()["event_loop_lag_ms"] == 1.0
+        assert probe.summary()["max_lag_ms"] == 400.0
+
+    async def test_probe_measures_blocked_loop(self):
+        """A blocked loop shows up as lag and as a slow callback."""
+        probe = EventLoopLagProbe(interval=0.02, slow_callback_threshold=0.05)
+        probe.detector.check_interval = 0.01
+        probe.start()
+        try:
+            await asyncio.sleep(0.05)
+            time.sleep(0.15)
+            await asyncio.sleep(0.1)
+        finally:
+            await probe.stop()
+
+        summary = probe.summary()
+        assert summary["max_lag_ms"] >= 100
+        assert summary["slow_callbacks_total"] >= 1
+        blocked = 0.15 - probe.detector.check_interval
+        assert any(record["duration"] >= blocked for record in summary["slow_callbacks"])
+
+
+class TestLoopAlerts:
+    """Loop health feeds the alert rules."""
+
+    async def test_dashboard_raises_loop_alerts(self, temp_dir):
+        """Lag and slow callbacks since the last evaluation trigger alerts."""
+        comprehensive_monitor = Mock(system_monitor=None)
+        comprehensive_monitor.generate_analytics_dashboard_data = AsyncMock(return_value={})
+        comprehensive_monitor.get_health_status = AsyncMock(return_value={})
+        probe = EventLoopLagProbe()
+        probe.detector = Mock(total=5, records=[])
+        dashboard = MonitoringDashboard(comprehensive_monitor, AlertManager(storage_path=temp_dir),
+                                        config=None, loop_lag_probe=probe)
+        probe.observe(0.3)
+
+        metrics = await dashboard.evaluate_alerts()
+
+        assert metrics == {"event_loop_lag_ms": 300.0, "slow_callback_count": 5.0}
+        assert set(dashboard.alert_manager.active_alerts) == {"event_loop_lag", "slow_callbacks"}
+        assert (await dashboard.get_dashboard_data())["event_loop"]["slow_callbacks_total"] == 5
+
+        # The next window is quiet, so both alerts resolve
+        dashboard.alert_manager.rule_cooldowns.clear()
+        await dashboard.evaluate_alerts()
+        assert dashboard.alert_manager.active_alerts == {}
+
+    async def test_server_evaluates_loop_alerts(self, temp_dir, monkeypatch):
+        """With the probe running, starting monitoring also starts alert evaluation."""
+        monitor = Mock(system_monitor=None, mcpcat_monitor=None)
+        monitor.initialize = AsyncMock()
+        monitor.start_monitoring = AsyncMock()
+        monitor.stop_monitoring = AsyncMock()
+        monitor.cleanup = AsyncMock()
+        monkeypatch.setattr(comprehensive_monitor, "ComprehensiveMonitor", Mock(return_value=monitor))
+        monkeypatch.setattr(dashboard, "AlertManager", lambda: AlertManager(storage_path=temp_dir))
+        monkeypatch.setattr(MonitoringDashboard, "_stream_loop", AsyncMock())
+
+        config = ServerConfig()
+        config.monitoring_config.loop_monitor_enabled = True
+        server = ICELocatorServer(config)
+        await server.start()
+        try:
+            server.loop_lag_probe.observe(0.3)
+            await server._start_monitoring()
+            alerts = server.monitoring_dashboard.alert_manager.active_alerts
+            for _ in range(100):
+                if alerts:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert server.monitoring_dashboard.loop_lag_probe is server.loop_lag_probe
+            assert "event_loop_lag" in alerts
+        finally:
+            await server.stop()
+        assert server.monitoring_dashboard is None
@@ -0,0 +1,120 @@
+"""
+Unit tests for the ring-buffer metrics store and SystemMonitor trend analysis.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from ice_locator_mcp.monitoring.metrics_store import ArchiveSpec, MetricsRingStore, METRICS_DTYPE
+from ice_locator_mcp.monitoring.system_monitor import SystemMonitor, SystemMetrics
+
+
+SMALL_ARCHIVES = (
+    ArchiveSpec("10s", 10, 6),
+    ArchiveSpec("1m", 60, 4),
+)
+
+
+class TestMetricsRingStore:
+    """Test the fixed-size ring store."""
+
+    def test_files_have_fixed_size(self, temp_dir):
+        """Ring files are preallocated and never grow."""
+        store = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        for i in range(1000):
+            store.record(1_000_000 + i * 10, {"cpu_percent": float(i)})
+        store.flush()
+
+        sizes = sorted(p.stat().st_size for p in temp_dir.glob("*.ring"))
+        assert sizes == [4 * METRICS_DTYPE.itemsize, 6 * METRICS_DTYPE.itemsize]
+
+    def test_downsampling_consolidates_mean_and_peak(self, temp_dir):
+        """Coarser archives hold the mean and peak of their samples."""
+        store = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        base = 6_000_000  # aligned to a minute
+        for i, cpu in enumerate([10.0, 20.0, 30.0, 40.0, 50.0, 96.0]):
+            store.record(base + i * 10, {"cpu_percent": cpu})
+
+        fine = store.fetch(base, base + 59, resolution="10s")
+        assert list(fine["cpu_percent"]) == [10.0, 20.0, 30.0, 40.0, 50.0, 96.0]
+
+        coarse = store.fetch(base, base + 59, resolution="1m")
+        assert len(coarse) == 1
+        assert coarse["samples"][0] == 6
+        assert coarse["cpu_percent"][0] == pytest.approx(41.0)
+        assert coarse["cpu_percent_max"][0] == 96.0
+
+    def test_ring_wraps_and_drops_old_buckets(self, temp_dir):
+        """Writing past the ring length overwrites the oldest buckets."""
+        store = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        base = 6_000_000
+        for i in range(10):
+            store.record(base + i * 10, {"cpu_percent": float(i)})
+
+        rows = store.fetch(base, base + 1000, resolution="10s")
+        assert list(rows["cpu_percent"]) == [4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+        assert np.all(np.diff(rows["timestamp"]) > 0)
+
+    def test_data_survives_reopen(self, temp_dir):
+        """Data persists across store instances."""
+        store = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        store.record(6_000_000, {"memory_percent": 55.0})
+        store.flush()
+
+        reopened = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        rows = reopened.fetch(6_000_000, 6_000_010, resolution="10s")
+        assert rows["memory_percent"][0] == 55.0
+
+    def test_select_archive_by_range(self, temp_dir):
+        """Range queries use the finest archive that covers them."""
+        store = MetricsRingStore(temp_dir, archives=SMALL_ARCHIVES)
+        now = time.time()
+        assert store.select_archive(now - 30).spec.name == "10s"
+        assert store.select_archive(now - 200).spec.name == "1m"
+
+        with pytest.raises(ValueError):
+            store.select_archive(now, resolution="1d")
+
+
+class TestSystemMonitorTrends:
+    """Test trend analysis backed by the ring store."""
+
+    @pytest.mark.asyncio
+    async def test_analyze_performance_trends(self, temp_dir):
+        """Trends are computed from the stored history."""
+        monitor = SystemMonitor(storage_path=temp_dir)
+        start = datetime.now() - timedelta(minutes=10)
+        for i in range(20):
+            snapshot = SystemMetrics(
+                timestamp=start + timedelta(seconds=30 * i),
+                cpu_percent=5.0 + i * 5,
+                memory_percent=50.0,
+                disk_percent=40.0
+            )
+            monitor.metrics_history.append(snapshot)
+            monitor.history_store.record_snapshot(snapshot)
+
+        analysis = await monitor.analyze_performance_trends(60)
+
+        assert analysis["data_points"] == 20
+        assert analysis["trends"]["cpu_percent"] == "increasing"
+        assert analysis["trends"]["memory_percent"] == "stable"
+        assert analysis["averages"]["memory_percent"] == 50.0
+        assert "High CPU usage detected" in analysis["anomalies"]
+
+    @pytest.mark.asyncio
+    async def test_insufficient_data(self, temp_dir):
+        """An empty store reports insufficient data."""
+        monitor = SystemMonitor(storage_path=temp_dir)
+        analysis = await monitor.analyze_performance_trends(60)
+        assert "error" in analysis
+
+    def test_calculate_trend(self, temp_dir):
+        """Trend direction from array halves."""
+        monitor = SystemMonitor(storage_path=temp_dir)
+        assert monitor._calculate_trend(np.array([1.0])) == "insufficient_data"
+        assert monitor._calculate_trend([10.0, 10.0, 10.5, 10.5]) == "stable"
+        assert monitor._calculate_trend([50.0, 40.0, 20.0, 10.0]) == "decreasing"
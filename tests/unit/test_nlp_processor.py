@@ -0,0 +1,167 @@
+"""
+Unit tests and benchmark corpus for the natural language query parser.
+"""
+
+import time
+
+import pytest
+
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.i18n.processor import LanguageProcessor
+from ice_locator_mcp.tools.nlp_processor import (
+    AliasTrie,
+    NaturalLanguageQueryProcessor,
+    normalize_query,
+    tokenize
+)
+
+
+# Benchmark corpus: English and Spanish queries as users type them
+ENGLISH_QUERIES = [
+    "Find John Doe from Mexico born 1990",
+    "find Maria Garcia born on March 15, 1985 from Guatemala",
+    "Looking for Jose Luis Hernandez, born 03/15/1985, citizen of Honduras",
+    "search Ana de la Cruz born around 1992 in El Salvador",
+    "locate A123456789",
+    "alien number 987654321",
+    "where is A12345678 detained",
+    "detained at Krome processing center in Miami",
+    "held in Adelanto facility",
+    "jail in Houston Texas",
+    "Carlos Perez native of Venezuela dob 1979-07-04",
+    "Find Luis Sanchez from Peru born 12 June 1990",
+    "'Juan Martinez' born during 1988",
+    "Find Ngozi Okafor from Nigeria born 1975",
+    "find Nguyen Van An vietnamese born 1969",
+    "Ana Hernandez born in 1990 from Dominican Republic",
+    "John Smith born 1990",
+    "find someone",
+]
+
+SPANISH_QUERIES = [
+    "buscar a José Rodríguez de México nacido en 1990",
+    "encontrar María López nacida el 15/03/1985 en Guatemala",
+    "dónde está Juan Pérez, detenido en el centro de Otero",
+    "buscar número alien A098765432",
+    "busco a Carmen Gonzalez Ramirez, salvadoreña, nacida en 1994",
+    "encontrar a Luis Hernández de Honduras",
+    "dónde está detenido Pedro Sánchez de Perú",
+    "buscar detenido en la cárcel de Houston",
+]
+
+CORPUS = ENGLISH_QUERIES + SPANISH_QUERIES
+
+
+@pytest.fixture
+def processor():
+    return NaturalLanguageQueryProcessor()
+
+
+class TestQueryParsing:
+    """Test extraction results on the corpus."""
+
+    def test_alien_numbers(self, processor):
+        """A-numbers are found with or without the prefix."""
+        assert processor.parse_query("locate A123456789").parameters == {"alien_number": "A123456789"}
+        assert processor.parse_query("alien number 987654321").parameters == {"alien_number": "A987654321"}
+        assert processor.parse_query("buscar número alien A098765432").search_type == "alien_number"
+
+    def test_dates(self, processor):
+        """Numeric, written and year-only dates become YYYY-MM-DD."""
+        dates = [processor.parse_query(q).parameters.get("date_of_birth") for q in (
+            "find Maria Garcia born on March 15, 1985 from Guatemala",
+            "Carlos Perez native of Venezuela dob 1979-07-04",
+            "Find Luis Sanchez from Peru born 12 June 1990",
+            "'Juan Martinez' born during 1988",
+        )]
+        assert dates == ["1985-03-15", "1979-07-04", "1990-06-12", "1988-01-01"]
+
+    def test_names_are_corrected(self, processor):
+        """Quoted names are extracted and common Spanish names get their accents."""
+        parameters = processor.parse_query("'Juan Martinez' born during 1988").parameters
+        assert (parameters["first_name"], parameters["last_name"]) == ("Juan", "Martínez")
+
+    def test_countries_match_whole_words(self, processor):
+        """Country names match as whole words, so "born" is not Bolivia and "john" not Honduras."""
+        countries = [processor.parse_query(q).parameters.get("country_of_birth") for q in (
+            "'Juan Martinez' born during 1988",
+            "John Smith born 1990",
+            "Find Ngozi Okafor from Nigeria born 1975",
+            "find Nguyen Van An vietnamese born 1969",
+            "Ana Hernandez born in 1990 from Dominican Republic",
+            "buscar a José Rodríguez de México nacido en 1990",
+        )]
+        assert countries == [None, None, "Nigeria", "Vietnam", "Dominican Republic", "Mexico"]
+
+    def test_country_codes_resolve_through_patterns(self, processor):
+        """Two-letter codes are only read as countries after "from" and similar."""
+        extractor = processor.location_extractor
+        assert extractor.extract_country("someone from mx") == "Mexico"
+        assert extractor.extract_country("born in 1990 in texas") is None
+
+    def test_facility_location_and_state(self, processor):
+        """Facility queries carry the location and any US state named."""
+        parsed = processor.parse_query("jail in Houston Texas")
+        assert parsed.parameters == {"facility_location": "houston", "facility_state": "TX"}
+        assert processor.parse_query("detained at Krome processing center in Miami").parameters == {
+            "facility_location": "krome"
+        }
+
+    def test_alias_trie(self):
+        """The trie returns the leftmost, longest alias."""
+        trie = AliasTrie({"salvador": "El Salvador", "el salvador": "El Salvador", "new york": "NY", "new": "X"})
+        assert trie.find(tokenize("born in El Salvador")) == (2, 4, "El Salvador")
+        assert trie.find(tokenize("New York City")) == (0, 2, "NY")
+        assert trie.find(tokenize("nowhere")) is None
+
+
+class TestParseCache:
+    """Test memoization of parse results."""
+
+    def test_equivalent_queries_share_an_entry(self, processor):
+        """Case and whitespace differences hit the same cache entry."""
+        first = processor.parse_query("Find John Doe from Mexico born 1990")
+        second = processor.parse_query("  find   JOHN doe from mexico\tborn 1990 ")
+        assert second == first
+        assert (processor.cache_hits, processor.cache_misses) == (1, 1)
+        assert normalize_query(" a  B ", "C ") == "a b c"
+
+    def test_results_are_copies(self, processor):
+        """Changing a returned result does not change the cached one."""
+        processor.parse_query("locate A123456789").parameters["alien_number"] = "changed"
+        assert processor.parse_query("locate A123456789").parameters["alien_number"] == "A123456789"
+
+    def test_cache_is_bounded(self):
+        """The least recently used entry is evicted first."""
+        processor = NaturalLanguageQueryProcessor(cache_size=2)
+        for query in ("find a", "find b", "find a", "find c"):
+            processor.parse_query(query)
+        assert list(processor._cache) == ["find a", "find c"]
+
+    def test_corpus_benchmark(self, processor):
+        """Repeated queries from the corpus are served from the cache much faster than parsing."""
+        def run():
+            start = time.perf_counter()
+            for query in CORPUS:
+                processor.parse_query(query)
+            return time.perf_counter() - start
+
+        cold = run()
+        warm = min(run() for _ in range(5))
+        print(f"\n{len(CORPUS)} queries: {cold * 1e6 / len(CORPUS):.1f} us/query parsed, "
+              f"{warm * 1e6 / len(CORPUS):.1f} us/query cached")
+        assert processor.cache_misses == len(CORPUS)
+        assert warm < cold
+
+
+class TestLanguageDetection:
+    """Test language detection on the corpus."""
+
+    async def test_detects_corpus_languages(self):
+        """Spanish queries are detected as Spanish and English ones as English."""
+        processor = LanguageProcessor(ServerConfig())
+        spanish = [await processor.detect_language(q) for q in SPANISH_QUERIES]
+        english = [await processor.detect_language(q) for q in ENGLISH_QUERIES]
+        assert spanish.count("es") >= len(SPANISH_QUERIES) - 1
+        assert "es" not in english
+        assert await processor.detect_language("") == "en"
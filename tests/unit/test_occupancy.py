@@ -0,0 +1,163 @@
+"""
+Unit tests for the trigger-maintained facility_current_occupancy table.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+
+
+@pytest.fixture
+def db_manager(temp_dir):
+    """SQLite manager over a fresh database with three facilities and two detainees."""
+    manager = SQLiteDatabaseManager(str(temp_dir / "occupancy.db"))
+    manager.connect()
+    manager.create_tables()
+    manager.connection.executemany(
+        "INSERT INTO facilities (id, name, latitude, longitude, population_count) VALUES (?, ?, 0, 0, ?)",
+        [(1, "Adelanto", 1500), (2, "Otero", 600), (3, "Krome", None)]
+    )
+    manager.connection.executemany(
+        "INSERT INTO detainees (id, first_name, last_name) VALUES (?, ?, ?)",
+        [(1, "Ana", "Cruz"), (2, "Luis", "Perez")]
+    )
+    manager.connection.commit()
+    yield manager
+    manager.disconnect()
+
+
+def add_history(manager, detainee_id, facility_id, end_date=None):
+    cursor = manager.connection.execute(
+        "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date, end_date) "
+        "VALUES (?, ?, '2024-01-01', ?)", (detainee_id, facility_id, end_date)
+    )
+    manager.connection.commit()
+    return cursor.lastrowid
+
+
+def occupancy(manager):
+    return {row["facility_id"]: row["detainee_count"] for row in manager.get_current_detainee_count_by_facility()}
+
+
+def recount(manager):
+    return dict(manager.connection.execute("""
+        SELECT facility_id, COUNT(*) FROM detainee_location_history
+        WHERE end_date IS NULL GROUP BY facility_id
+    """).fetchall())
+
+
+class TestOccupancyTriggers:
+    """Test that the occupancy table follows location history changes."""
+
+    def test_insert_close_transfer_delete(self, db_manager):
+        """Each kind of history change adjusts the counts."""
+        first = add_history(db_manager, 1, 1)
+        add_history(db_manager, 2, 1)
+        add_history(db_manager, 2, 3, end_date="2023-12-31")
+        assert occupancy(db_manager) == {1: 2}
+
+        db_manager.connection.execute("UPDATE detainee_location_history SET facility_id = 2 WHERE id = ?", (first,))
+        assert occupancy(db_manager) == {1: 1, 2: 1}
+
+        db_manager.connection.execute(
+            "UPDATE detainee_location_history SET end_date = '2024-02-01' WHERE id = ?", (first,)
+        )
+        assert occupancy(db_manager) == {1: 1}
+
+        db_manager.connection.execute("UPDATE detainee_location_history SET end_date = NULL WHERE facility_id = 3")
+        db_manager.connection.execute("DELETE FROM detainee_location_history WHERE facility_id = 1")
+        assert occupancy(db_manager) == {3: 1}
+
+    def test_random_changes_match_recount(self, db_manager):
+        """After many random writes the table equals a full recount."""
+        rng = random.Random(7)
+        ids = []
+        for _ in range(500):
+            action = rng.random()
+            if action < 0.5 or not ids:
+                ids.append(add_history(db_manager, rng.randint(1, 2), rng.randint(1, 3),
+                                       rng.choice([None, None, "2024-06-01"])))
+            elif action < 0.8:
+                db_manager.connection.execute(
+                    "UPDATE detainee_location_history SET facility_id = ?, end_date = ? WHERE id = ?",
+                    (rng.randint(1, 3), rng.choice([None, "2024-07-01"]), rng.choice(ids))
+                )
+            else:
+                db_manager.connection.execute("DELETE FROM detainee_location_history WHERE id = ?",
+                                              (ids.pop(rng.randrange(len(ids))),))
+        db_manager.connection.commit()
+
+        assert occupancy(db_manager) == recount(db_manager)
+
+    def test_rebuild(self, db_manager):
+        """A rebuild repairs counts written without the triggers."""
+        add_history(db_manager, 1, 1)
+        db_manager.connection.execute("UPDATE facility_current_occupancy SET detainee_count = 99")
+        assert db_manager.rebuild_occupancy() == 1
+        assert occupancy(db_manager) == {1: 1}
+
+
+class TestOccupancyReads:
+    """Test heatmap reads from the occupancy table."""
+
+    def test_heatmap_counts(self, db_manager):
+        """Every facility is returned, with zero for facilities without open records."""
+        add_history(db_manager, 1, 2)
+        heatmap = db_manager.get_heatmap_data()
+        assert [(f["name"], f["current_detainee_count"]) for f in heatmap] == [
+            ("Adelanto", 0), ("Otero", 1), ("Krome", 0)
+        ]
+
+    def test_heatmap_does_not_read_history(self, db_manager):
+        """The heatmap query plan never touches detainee_location_history."""
+        statements = []
+        db_manager.connection.set_trace_callback(statements.append)
+        db_manager.get_heatmap_data()
+        query = next(s for s in statements if "current_detainee_count" in s)
+
+        plan = " ".join(row[3] for row in db_manager.connection.execute("EXPLAIN QUERY PLAN " + query))
+        assert "detainee_location_history" not in query
+        assert "SEARCH o USING INTEGER PRIMARY KEY" in plan
+
+    def test_single_facility_reads(self, db_manager):
+        """One facility and its count are read by key, with zero for empty or unknown facilities."""
+        add_history(db_manager, 1, 2)
+        add_history(db_manager, 2, 2)
+        assert db_manager.get_facility_by_id(2).name == "Otero"
+        assert db_manager.get_facility_by_id(9) is None
+        assert [db_manager.get_current_detainee_count(i) for i in (1, 2, 9)] == [0, 2, 0]
+
+    def test_open_interval_indexes_are_partial(self, db_manager):
+        """Open-record indexes only cover rows without an end date."""
+        sql = dict(db_manager.connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE name LIKE 'idx_detainee_location_open_%'"
+        ).fetchall())
+        assert len(sql) == 2
+        assert all(s.rstrip().endswith("WHERE end_date IS NULL") for s in sql.values())
+
+    def test_existing_database_is_upgraded(self, temp_dir):
+        """A database created before the occupancy table gets it, counted from history, on first read."""
+        path = str(temp_dir / "legacy.db")
+        connection = sqlite3.connect(path)
+        connection.executescript("""
+            CREATE TABLE facilities (id INTEGER PRIMARY KEY, name TEXT, latitude REAL, longitude REAL,
+                                     address TEXT, population_count INTEGER,
+                                     created_at TIMESTAMP, updated_at TIMESTAMP);
+            CREATE TABLE detainee_location_history (id INTEGER PRIMARY KEY, detainee_id INTEGER,
+                                                    facility_id INTEGER, start_date TIMESTAMP,
+                                                    end_date TIMESTAMP, created_at TIMESTAMP);
+            INSERT INTO facilities (id, name, latitude, longitude) VALUES (1, 'Adelanto', 0, 0);
+            INSERT INTO detainee_location_history (detainee_id, facility_id, start_date) VALUES (1, 1, '2024-01-01');
+            INSERT INTO detainee_location_history (detainee_id, facility_id, start_date) VALUES (2, 1, '2024-01-01');
+        """)
+        connection.close()
+
+        manager = SQLiteDatabaseManager(path)
+        manager.connect()
+        assert manager.get_heatmap_data()[0]["current_detainee_count"] == 2
+        add_history(manager, 3, 1)
+        assert occupancy(manager) == {1: 3}
+        manager.disconnect()
@@ -0,0 +1,212 @@
+"""
+Unit tests for daily occupancy snapshots and as-of heatmap queries.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ice_locator_mcp.api.heatmap_api import HeatmapAPI, app, get_heatmap_api
+from ice_locator_mcp.database.mock_manager import MockDatabaseManager
+from ice_locator_mcp.database.occupancy_snapshots import parse_as_of, sweep_daily_counts
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+
+
+@pytest.fixture
+def db_path(temp_dir):
+    """SQLite database with three facilities and a short location history."""
+    path = str(temp_dir / "snapshots.db")
+    manager = SQLiteDatabaseManager(path)
+    manager.connect()
+    manager.create_tables()
+    manager.connection.executemany(
+        "INSERT INTO facilities (id, name, latitude, longitude, population_count) VALUES (?, ?, 0, 0, ?)",
+        [(1, "Adelanto", 1500), (2, "Otero", 600), (3, "Krome", None)]
+    )
+    manager.connection.executemany(
+        "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date, end_date) VALUES (?, ?, ?, ?)",
+        [
+            (1, 1, "2025-01-10 08:00:00", "2025-03-01 12:00:00"),
+            (1, 2, "2025-03-01 12:00:00", None),
+            (2, 1, "2025-02-01 00:00:00", None),
+            (3, 3, "2025-02-15 00:00:00", "2025-02-15 18:00:00"),
+        ]
+    )
+    manager.connection.commit()
+    manager.disconnect()
+    return path
+
+
+@pytest.fixture
+def db_manager(db_path):
+    manager = SQLiteDatabaseManager(db_path)
+    manager.connect()
+    yield manager
+    manager.disconnect()
+
+
+def counts_as_of(manager, as_of):
+    return {row["facility_id"]: row["detainee_count"]
+            for row in manager.get_detainee_count_by_facility_as_of(as_of)}
+
+
+def recount_as_of(manager, as_of):
+    """Counts from a scan of the full history."""
+    return dict(manager.connection.execute("""
+        SELECT facility_id, COUNT(*) FROM detainee_location_history
+        WHERE date(start_date) <= :day AND (end_date IS NULL OR :day < MAX(date(start_date), date(end_date)))
+        GROUP BY facility_id
+    """, {"day": as_of}).fetchall())
+
+
+class TestSweep:
+    """Test the sweep and date validation helpers."""
+
+    def test_sweep_daily_counts(self):
+        """Deltas become running counts on top of the base; zero deltas write nothing."""
+        deltas = [("2025-01-01", 1, 2), ("2025-01-01", 2, 1), ("2025-01-03", 1, -1), ("2025-01-04", 2, 0)]
+        assert list(sweep_daily_counts({1: 5}, deltas)) == [
+            ("2025-01-01", 1, 7), ("2025-01-01", 2, 1), ("2025-01-03", 1, 6)
+        ]
+
+    def test_parse_as_of(self):
+        """Dates are normalized to YYYY-MM-DD and anything else is rejected."""
+        assert parse_as_of("2025-06-01") == "2025-06-01"
+        assert parse_as_of(date(2025, 6, 1)) == "2025-06-01"
+        with pytest.raises(ValueError) as error:
+            parse_as_of("June 1st")
+        assert isinstance(error.value.__cause__, ValueError)
+
+
+class TestSnapshots:
+    """Test building and incrementally refreshing the snapshots."""
+
+    def test_counts_as_of(self, db_manager):
+        """A record counts from its start day up to, not including, its end day."""
+        assert counts_as_of(db_manager, "2025-01-09") == {}
+        assert counts_as_of(db_manager, "2025-01-10") == {1: 1}
+        assert counts_as_of(db_manager, "2025-02-15") == {1: 2}
+        assert counts_as_of(db_manager, "2025-03-01") == {1: 1, 2: 1}
+        assert counts_as_of(db_manager, "2030-01-01") == {1: 1, 2: 1}
+
+    def test_snapshots_are_sparse(self, db_manager):
+        """Only days on which a facility's count changes are stored."""
+        db_manager.refresh_daily_snapshots()
+        rows = db_manager.connection.execute(
+            "SELECT facility_id, snapshot_date, detainee_count FROM facility_daily_occupancy "
+            "ORDER BY snapshot_date, facility_id"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            (1, "2025-01-10", 1), (1, "2025-02-01", 2), (1, "2025-03-01", 1), (2, "2025-03-01", 1)
+        ]
+        assert db_manager.refresh_daily_snapshots() == 0
+
+    def test_refresh_starts_at_first_changed_day(self, db_manager):
+        """A write only re-sweeps from its start day; earlier snapshots are kept."""
+        db_manager.refresh_daily_snapshots()
+        db_manager.connection.execute(
+            "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date) "
+            "VALUES (4, 3, '2025-02-20')"
+        )
+        db_manager.connection.commit()
+        dirty_from = db_manager.connection.execute(
+            "SELECT dirty_from FROM occupancy_snapshot_state"
+        ).fetchone()[0]
+
+        assert dirty_from == "2025-02-20"
+        assert db_manager.refresh_daily_snapshots() == 3
+        assert db_manager.connection.execute(
+            "SELECT COUNT(*) FROM facility_daily_occupancy WHERE snapshot_date < '2025-02-20'"
+        ).fetchone()[0] == 2
+        assert counts_as_of(db_manager, "2025-02-20") == {1: 2, 3: 1}
+
+    def test_random_history_matches_recount(self, db_manager):
+        """After random writes and refreshes, every day matches a full-history scan."""
+        rng = random.Random(11)
+        first_day = date(2025, 1, 1)
+
+        def day(offset):
+            return (first_day + timedelta(days=offset)).isoformat()
+
+        for round_number in range(20):
+            for _ in range(25):
+                start = rng.randrange(120)
+                end = rng.choice([None, day(start + rng.randrange(0, 30))])
+                db_manager.connection.execute(
+                    "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date, end_date) "
+                    "VALUES (1, ?, ?, ?)", (rng.randint(1, 3), day(start) + " 09:00:00", end)
+                )
+            db_manager.connection.execute(
+                "UPDATE detainee_location_history SET end_date = ? WHERE id = ?",
+                (day(rng.randrange(150)), rng.randint(1, 50))
+            )
+            db_manager.connection.execute(
+                "DELETE FROM detainee_location_history WHERE id = ?", (rng.randint(1, 100),)
+            )
+            db_manager.connection.commit()
+            # Alternate between refreshed snapshots and reads from the history
+            if round_number % 2:
+                db_manager.refresh_daily_snapshots()
+            probe = day(rng.randrange(-5, 160))
+            assert counts_as_of(db_manager, probe) == recount_as_of(db_manager, probe)
+
+        db_manager.refresh_daily_snapshots()
+        for offset in range(-1, 160):
+            assert counts_as_of(db_manager, day(offset)) == recount_as_of(db_manager, day(offset))
+
+    def test_as_of_read_does_not_write(self, db_manager):
+        """Reads of dates past a pending write count from the history and leave the snapshots alone."""
+        db_manager.refresh_daily_snapshots()
+        db_manager.connection.execute(
+            "INSERT INTO detainee_location_history (detainee_id, facility_id, start_date) "
+            "VALUES (4, 3, '2025-02-20')"
+        )
+        db_manager.connection.commit()
+        statements = []
+        db_manager.connection.set_trace_callback(statements.append)
+
+        assert counts_as_of(db_manager, "2025-01-20") == {1: 1}
+        assert counts_as_of(db_manager, "2025-02-20") == {1: 2, 3: 1}
+        assert not any(s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")) for s in statements)
+        assert db_manager.connection.execute(
+            "SELECT dirty_from FROM occupancy_snapshot_state"
+        ).fetchone()[0] == "2025-02-20"
+
+    def test_as_of_read_does_not_scan_history(self, db_manager):
+        """Once built, as-of reads only touch the snapshot table."""
+        db_manager.refresh_daily_snapshots()
+        statements = []
+        db_manager.connection.set_trace_callback(statements.append)
+        db_manager.get_heatmap_data_as_of("2025-02-01")
+        assert statements and not any("detainee_location_history" in s for s in statements)
+
+
+class TestAsOfAPI:
+    """Test as-of heatmap reads through the managers and the HTTP API."""
+
+    def test_mock_manager_as_of(self):
+        """The mock manager counts its history as of a date."""
+        manager = MockDatabaseManager()
+        today = datetime.now().date()
+        assert manager.get_detainee_count_by_facility_as_of(today - timedelta(days=1))[0]["detainee_count"] == 0
+        assert [row["detainee_count"] for row in manager.get_heatmap_data_as_of(today)] == [
+            row["current_detainee_count"] for row in manager.get_heatmap_data()
+        ]
+
+    def test_heatmap_data_endpoint(self, db_path, monkeypatch):
+        """The as_of query parameter selects point-in-time counts; bad dates are rejected."""
+        monkeypatch.setenv("SQLITE_DATABASE_PATH", db_path)
+        app.dependency_overrides[get_heatmap_api] = HeatmapAPI
+        try:
+            client = TestClient(app)
+            response = client.get("/api/heatmap-data", params={"as_of": "2025-02-15"})
+            assert response.status_code == 200
+            assert [(f["name"], f["detainee_count"], f["as_of"]) for f in response.json()] == [
+                ("Adelanto", 2, "2025-02-15"), ("Otero", 0, "2025-02-15"), ("Krome", 0, "2025-02-15")
+            ]
+            assert client.get("/api/heatmap-data").json()[1]["current_detainee_count"] == 1
+            assert client.get("/api/heatmap-data", params={"as_of": "yesterday"}).status_code == 400
+        finally:
+            app.dependency_overrides.pop(get_heatmap_api, None)
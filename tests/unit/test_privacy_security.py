@@ -0,0 +1,108 @@
+"""
+Unit tests for the bounded privacy and compliance monitoring stores.
+"""
+
+import time
+
+import pytest
+
+from ice_locator_mcp.monitoring.privacy_security import (
+    BoundedEventLog,
+    ComplianceMonitor,
+    DataCategory,
+    PrivacySecurityMonitor
+)
+
+
+class TestBoundedEventLog:
+    """Test the ring-buffered event log."""
+
+    def test_capacity_and_eviction_callback(self):
+        """The oldest entries are dropped once full and reported to the callback."""
+        evicted = []
+        log = BoundedEventLog(3, on_evict=evicted.append)
+        for i in range(5):
+            log.append({"n": i}, now=1000.0 + i)
+
+        assert [entry["n"] for entry in log] == [2, 3, 4]
+        assert [entry["n"] for entry in evicted] == [0, 1]
+        assert log.total_appended == 5
+
+    def test_expire_drops_only_old_entries(self):
+        """Expiry stops at the first entry inside the retention period."""
+        log = BoundedEventLog(10)
+        for i in range(5):
+            log.append({"n": i}, now=1000.0 + i * 10)
+
+        assert log.expire(1025.0) == 3
+        assert [entry["timestamp"] for entry in log] == [1030.0, 1040.0]
+
+
+class TestComplianceMonitor:
+    """Test incremental compliance aggregates."""
+
+    def test_report_uses_running_aggregates(self):
+        """Report figures match the logged activity without rescanning it."""
+        monitor = ComplianceMonitor(max_log_entries=5)
+        for _ in range(8):
+            monitor.log_data_processing("detainee_search", [DataCategory.GOVERNMENT_IDS], "legal_assistance")
+        monitor.record_user_consent("alice", "analytics", True, "usage")
+        monitor.record_user_consent("alice", "analytics", False, "usage")
+        monitor.record_user_consent("bob", "analytics", True, "usage")
+        violation = monitor.record_violation("retention", "Log kept past retention")
+        monitor.record_violation("consent", "Processing without consent")
+        assert monitor.resolve_violation(violation["violation_id"])
+        assert not monitor.resolve_violation(violation["violation_id"])
+
+        report = monitor.generate_compliance_report()
+
+        assert len(monitor.data_processing_log) == 5
+        assert report["data_processing_summary"] == {"total_operations": 8, "operations_last_30_days": 8}
+        assert report["consent_summary"] == {"total_users": 2, "consent_types": ["analytics"]}
+        assert (monitor.granted_consents, monitor.total_consents) == (1, 2)
+        assert report["compliance_violations"] == {"total": 2, "unresolved": 1}
+
+    def test_evicted_violations_can_be_resolved(self):
+        """Violations dropped from the audit trail stay open until resolved."""
+        monitor = ComplianceMonitor(max_log_entries=2)
+        violations = [monitor.record_violation("retention", f"Violation {i}") for i in range(3)]
+
+        assert len(monitor.audit_trail) == 2
+        assert all(monitor.resolve_violation(v["violation_id"]) for v in violations)
+        assert all(v["resolved"] for v in violations)
+        assert monitor.generate_compliance_report()["compliance_violations"] == {"total": 3, "unresolved": 0}
+
+
+class TestPrivacySecurityMonitor:
+    """Test bounded access logs and suspicious-activity detection."""
+
+    @pytest.fixture
+    def monitor(self):
+        return PrivacySecurityMonitor(max_access_logs=100, max_security_events=5)
+
+    def test_excessive_requests_detected_per_user(self, monitor):
+        """A user over the hourly limit raises events; other users do not."""
+        for i in range(60):
+            monitor._log_access_attempt({"last_name": "Garcia"}, {"user_id": "alice"})
+            monitor._log_access_attempt({"last_name": "Lopez"}, {"user_id": f"user-{i}"})
+
+        assert monitor.hourly_requests.count("alice") == 60
+        # Requests 51-60 each raise an event; only the newest 5 are retained
+        assert [event["metadata"]["request_count"] for event in monitor.security_events] == [56, 57, 58, 59, 60]
+
+        dashboard = monitor.get_privacy_dashboard_data()
+        assert dashboard["security_events"] == {"total": 10, "recent": 10}
+        assert dashboard["access_logs"] == {"total": 100, "unique_users": 51}
+
+    async def test_cleanup_expires_old_access_logs(self, monitor):
+        """Cleanup removes only logs past retention and updates the user index."""
+        old = time.time() - monitor.ACCESS_LOG_RETENTION_SECONDS - 60
+        for i in range(3):
+            monitor.access_logs.append({"user_id": f"old-{i}"}, now=old)
+            monitor.logged_users[f"old-{i}"] += 1
+        monitor._log_access_attempt({"alien_number": "A123456789"}, {"user_id": "carol"})
+
+        await monitor.cleanup_expired_data()
+
+        assert [log["user_id"] for log in monitor.access_logs] == ["carol"]
+        assert dict(monitor.logged_users) == {"carol": 1}
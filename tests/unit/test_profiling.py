@@ -0,0 +1,218 @@
+"""
+Tests for sampled tool-call profiling.
+"""
+
+import asyncio
+import json
+import os
+import time
+from unittest.mock import AsyncMock
+
+import mcp.types as types
+import pytest
+
+from ice_locator_mcp.core.config import ProfilingConfig, ServerConfig
+from ice_locator_mcp.core.search_engine import SearchResult
+from ice_locator_mcp.server import TOOL_NAMES, ICELocatorServer
+from ice_locator_mcp.tools.search_tools import SearchTools
+from ice_locator_mcp.utils.profiling import CallProfile, StackSampler, ToolCallProfiler, phase, _active_profile
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestPhases:
+    """Per-phase timing of one call."""
+
+    def test_nested_phases_are_exclusive(self):
+        """Time in a nested phase is not also charged to the enclosing one."""
+        profile = CallProfile("search_detainee_by_name")
+        token = _active_profile.set(profile)
+        try:
+            with phase("fuzzy"):
+                busy_wait(0.02)
+                with phase("fetch"):
+                    busy_wait(0.05)
+                busy_wait(0.02)
+        finally:
+            _active_profile.reset(token)
+
+        assert 0.05 <= profile.phases["fetch"] < 0.09
+        assert 0.04 <= profile.phases["fuzzy"] < 0.08
+        assert profile.current is None
+
+    def test_phase_is_noop_without_profile(self):
+        """Unsampled calls record nothing."""
+        with phase("cache"):
+            pass
+        assert _active_profile.get() is None
+
+    def test_summary_reports_other(self):
+        """Time outside any phase is reported as ``other``."""
+        profile = CallProfile("tool", phases={"parse": 0.25}, duration=1.0)
+        assert profile.summary() == {"parse": 250.0, "other": 750.0}
+
+
+class TestStackSampler:
+    """Statistical stack sampling."""
+
+    def test_samples_busy_function(self):
+        """A function burning CPU dominates the collapsed stacks."""
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_wait(0.2)
+        stacks = sampler.stop()
+
+        assert sampler.samples > 10
+        hot = sum(count for stack, count in stacks.items() if stack.endswith(f"{__name__}:busy_wait"))
+        assert hot / sampler.samples > 0.5
+
+
+class TestToolCallProfiler:
+    """Sampling, output files and retention."""
+
+    def _config(self, temp_dir, **overrides):
+        return ProfilingConfig(**dict(dict(
+            enabled=True, sample_rate=1.0, interval=0.001, output_dir=temp_dir / "profiles"
+        ), **overrides))
+
+    async def test_sampled_call_writes_profile(self, temp_dir):
+        """A sampled call writes a collapsed-stack file and a JSON summary."""
+        profiler = ToolCallProfiler(self._config(temp_dir), tool_names=TOOL_NAMES)
+        async with profiler.profile("smart_detainee_search") as profile:
+            with phase("parse"):
+                busy_wait(0.05)
+
+        assert profile is not None
+        summaries = list((temp_dir / "profiles").glob("*.json"))
+        assert len(summaries) == 1
+        summary = json.loads(summaries[0].read_text())
+        assert summary["tool"] == "smart_detainee_search"
+        assert summary["phases_ms"]["parse"] >= 50
+        assert summary["stack_samples"] > 0
+
+        folded = summaries[0].with_suffix(".folded").read_text().splitlines()
+        stack, count = folded[0].rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    async def test_unregistered_tool_names_are_unknown(self, temp_dir):
+        """Client-supplied names outside the registered tools never reach paths or labels."""
+        profiler = ToolCallProfiler(self._config(temp_dir), tool_names=TOOL_NAMES)
+        async with profiler.profile("../../escape") as profile:
+            pass
+
+        assert profile.tool_name == "unknown"
+        assert not list(temp_dir.glob("*.json"))
+        summary = json.loads(next((temp_dir / "profiles").glob("*-unknown-*.json")).read_text())
+        assert summary["tool"] == "unknown"
+
+    async def test_disabled_or_zero_rate_records_nothing(self, temp_dir):
+        """Unsampled calls yield no profile and write no files."""
+        for config in (self._config(temp_dir, enabled=False), self._config(temp_dir, sample_rate=0.0)):
+            profiler = ToolCallProfiler(config)
+            async with profiler.profile("search_detainee_by_name") as profile:
+                pass
+            assert profile is None
+            assert profiler.profiled_calls == 0
+        assert not (temp_dir / "profiles").exists()
+
+    async def test_concurrent_calls_share_one_sampler(self, temp_dir):
+        """Overlapping sampled calls all get phase timings; one gets stacks."""
+        profiler = ToolCallProfiler(self._config(temp_dir))
+
+        async def call():
+            async with profiler.profile("bulk_search_detainees"):
+                with phase("fetch"):
+                    await asyncio.sleep(0.02)
+
+        await asyncio.gather(*(call() for _ in range(3)))
+
+        summaries = [json.loads(p.read_text()) for p in (temp_dir / "profiles").glob("*.json")]
+        assert len(summaries) == 3
+        assert all(s["phases_ms"]["fetch"] >= 15 for s in summaries)
+        assert sum(1 for s in summaries if s["stack_samples"]) == 1
+
+    def test_prune_keeps_newest_and_drops_expired(self, temp_dir):
+        """Retention enforces both the file count and the age limit."""
+        profiler = ToolCallProfiler(self._config(temp_dir, max_files=3, max_age_hours=1))
+        directory = temp_dir / "profiles"
+        directory.mkdir()
+        now = time.time()
+        for i in range(6):
+            for suffix in (".json", ".folded"):
+                path = directory / f"profile-{i}{suffix}"
+                path.write_text("{}")
+                # profile-0 is two hours old, the rest a minute apart
+                age = 7200 if i == 0 else 60 * i
+                os.utime(path, (now - age, now - age))
+
+        assert profiler.prune() == 3
+        assert sorted(p.name for p in directory.glob("*.json")) == [
+            "profile-1.json", "profile-2.json", "profile-3.json"
+        ]
+        assert len(list(directory.glob("*.folded"))) == 3
+
+
+class TestServerProfiling:
+    """Tool calls through the MCP handler."""
+
+    async def test_handler_profiles_tool_call(self, temp_dir, monkeypatch):
+        """A sampled tool call records serialization and telemetry phases."""
+        monkeypatch.setenv("ICE_LOCATOR_ANALYTICS_ENABLED", "false")
+        config = ServerConfig()
+        config.profiling_config = ProfilingConfig(
+            enabled=True, sample_rate=1.0, output_dir=temp_dir / "profiles"
+        )
+        server = ICELocatorServer(config)
+        server.proxy_manager = AsyncMock()
+        server.search_engine = AsyncMock()
+        server.search_engine.search.return_value = SearchResult(
+            status="not_found", results=[], search_metadata={}, user_guidance={}
+        )
+        server.search_tools = SearchTools(server.search_engine)
+
+        handler = server.server.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(
+            name="search_detainee_by_alien_number", arguments={"alien_number": "A123456789"}
+        ))
+        result = await handler(request)
+
+        assert json.loads(result.root.content[0].text)["status"] == "not_found"
+        assert server.tool_profiler.profiled_calls == 1
+        summary = json.loads(next((temp_dir / "profiles").glob("*.json")).read_text())
+        assert summary["tool"] == "search_detainee_by_alien_number"
+        assert {"serialize", "telemetry"} <= set(summary["phases_ms"])
+
+    def test_profiling_from_env(self, monkeypatch, temp_dir):
+        """Profiling is toggled and tuned through environment variables."""
+        monkeypatch.setenv("ICE_LOCATOR_PROFILING_ENABLED", "true")
+        monkeypatch.setenv("ICE_LOCATOR_PROFILING_SAMPLE_RATE", "0.25")
+        monkeypatch.setenv("ICE_LOCATOR_PROFILING_DIR", str(temp_dir))
+        monkeypatch.setenv("ICE_LOCATOR_PROFILING_INTERVAL", "0.002")
+        monkeypatch.setenv("ICE_LOCATOR_PROFILING_MAX_AGE_HOURS", "12")
+        config = ServerConfig.from_env()
+
+        assert config.profiling_config.enabled
+        assert config.profiling_config.sample_rate == 0.25
+        assert config.profiling_config.output_dir == temp_dir
+        assert config.profiling_config.interval == 0.002
+        assert config.profiling_config.max_age_hours == 12
+
+        config.profiling_config.sample_rate = 1.5
+        with pytest.raises(ValueError):
+            config.validate()
+
+    def test_profiling_from_file(self, temp_dir):
+        """Every profiling setting can be set in the config file."""
+        path = temp_dir / "config.json"
+        path.write_text(json.dumps({"profiling": {
+            "enabled": True, "sample_rate": 0.5, "interval": 0.01,
+            "output_dir": str(temp_dir), "max_files": 10, "max_age_hours": 6
+        }}))
+        profiling = ServerConfig.from_file(path).profiling_config
+
+        assert (profiling.enabled, profiling.sample_rate, profiling.interval) == (True, 0.5, 0.01)
+        assert (profiling.output_dir, profiling.max_files, profiling.max_age_hours) == (temp_dir, 10, 6)
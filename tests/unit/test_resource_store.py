@@ -0,0 +1,161 @@
+"""
+Unit tests for the database-backed ice:// MCP resources.
+"""
+
+import json
+import sqlite3
+
+import mcp.types as types
+import pytest
+
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.database.resource_store import ResourceStore
+from ice_locator_mcp.database.sqlite_manager import SQLiteDatabaseManager
+from ice_locator_mcp.server import ICELocatorServer
+
+
+@pytest.fixture
+def database_path(temp_dir):
+    """Facilities database with five facilities and three months of population."""
+    path = str(temp_dir / "facilities.db")
+    manager = SQLiteDatabaseManager(path)
+    manager.connect()
+    manager.create_tables()
+    manager.connection.executemany(
+        "INSERT INTO facilities (id, name, latitude, longitude, population_count) VALUES (?, ?, ?, ?, ?)",
+        [(1, "Adelanto", 34.5, -117.4, 1500), (2, "Otero", 32.6, -106.0, 600), (3, "Krome", 25.7, -80.5, None),
+         (4, "Dilley", 28.7, -99.2, 2000), (5, "Unmapped Jail", 0.0, 0.0, None)]
+    )
+    manager.connection.commit()
+    manager.create_monthly_population_table()
+    manager.upsert_monthly_population("2024-01", [(1, 1400, "a"), (2, 500, "a")])
+    manager.upsert_monthly_population("2024-02", [(1, 1450, "b"), (2, 550, "b"), (4, 1900, "b")])
+    manager.upsert_monthly_population("2024-03", [(1, 1500, "c"), (2, 600, "c"), (4, 2000, "c")])
+    manager.disconnect()
+    return path
+
+
+@pytest.fixture
+def store(database_path):
+    store = ResourceStore(database_path)
+    yield store
+    store.disconnect()
+
+
+class TestResourceStore:
+    """Test the cached read-only query layer."""
+
+    def test_summary(self, store):
+        """Totals come from the database, with the data version attached."""
+        summary = store.summary()
+        assert (summary["total_facilities"], summary["with_coordinates"], summary["with_population"]) == (5, 4, 3)
+        assert summary["current_population"] == 4100
+        assert summary["months"] == {"first": "2024-01", "last": "2024-03", "count": 3}
+        assert summary["data_version"] == store.data_version
+
+    def test_facility_pages(self, store):
+        """Facilities are paged by name."""
+        first = store.list_facilities(page=1, page_size=2)
+        last = store.list_facilities(page=3, page_size=2)
+        assert [f["name"] for f in first["items"]] == ["Adelanto", "Dilley"]
+        assert [f["name"] for f in last["items"]] == ["Unmapped Jail"]
+        assert (first["total"], first["pages"]) == (5, 3)
+
+    def test_facility_history(self, store):
+        """A facility carries its newest months first; unknown IDs return None."""
+        facility = store.get_facility(1, page_size=2)
+        assert facility["name"] == "Adelanto"
+        assert [m["month_year"] for m in facility["population_history"]["items"]] == ["2024-03", "2024-02"]
+        assert facility["population_history"]["total"] == 3
+        assert store.get_facility(99) is None
+
+    def test_trends_range(self, store):
+        """Trends aggregate by month within the requested range."""
+        trends = store.trends("2024-02", "2024-03")
+        assert trends["items"] == [
+            {"month": "2024-02", "total_population": 3900, "facilities_reporting": 3, "average_population": 1300.0},
+            {"month": "2024-03", "total_population": 4100, "facilities_reporting": 3, "average_population": 1366.7},
+        ]
+        with pytest.raises(ValueError):
+            store.trends("2024-13")
+        with pytest.raises(ValueError):
+            store.list_facilities(page=0)
+
+    def test_results_are_cached_until_the_database_changes(self, store, database_path):
+        """Repeated reads skip SQL; a commit elsewhere refreshes the data version."""
+        store.summary()
+        statements = []
+        store.connection.set_trace_callback(statements.append)
+        version = store.summary()["data_version"]
+        assert not [s for s in statements if "facilities" in s]
+
+        writer = sqlite3.connect(database_path)
+        writer.execute("UPDATE facilities SET population_count = 100 WHERE id = 3")
+        writer.commit()
+        writer.close()
+
+        summary = store.summary()
+        assert summary["current_population"] == 4200
+        assert summary["data_version"] != version
+
+    def test_connection_is_read_only(self, store):
+        """The query layer cannot modify the database."""
+        store.summary()
+        with pytest.raises(sqlite3.OperationalError):
+            store.connection.execute("DELETE FROM facilities")
+
+
+class TestDataResources:
+    """Test the ice:// resources served by the MCP server."""
+
+    @pytest.fixture
+    def server(self, database_path, monkeypatch):
+        monkeypatch.setenv("ICE_LOCATOR_ANALYTICS_ENABLED", "false")
+        server = ICELocatorServer(ServerConfig(facilities_database_path=database_path))
+        yield server
+        if server.resource_store:
+            server.resource_store.disconnect()
+
+    async def read(self, server, uri):
+        handler = server.server.request_handlers[types.ReadResourceRequest]
+        result = await handler(types.ReadResourceRequest(
+            method="resources/read", params=types.ReadResourceRequestParams(uri=uri)
+        ))
+        return json.loads(result.root.contents[0].text)
+
+    async def test_facilities_database(self, server):
+        """The database resource reports real counts and links to the next page."""
+        payload = await self.read(server, "ice://facilities/database?page_size=2")
+        assert payload["total_facilities"] == 5
+        assert payload["data_version"] == server.resource_store.data_version
+        assert len(payload["facilities"]["items"]) == 2
+        assert payload["links"]["next"] == "ice://facilities/database?page=2&page_size=2"
+
+    async def test_facility_and_trends(self, server):
+        """Facility and trend sub-resources return just the requested slice."""
+        facility = await self.read(server, "ice://facilities/4")
+        assert facility["name"] == "Dilley"
+        assert facility["links"]["next"] is None
+
+        trends = await self.read(server, "ice://statistics/trends?from=2024-02&to=2024-03&page_size=1")
+        assert trends["range"] == {"from": "2024-02", "to": "2024-03"}
+        assert [m["month"] for m in trends["months"]["items"]] == ["2024-02"]
+        assert trends["links"]["next"] == "ice://statistics/trends?from=2024-02&to=2024-03&page=2&page_size=1"
+
+    async def test_errors_are_reported_in_the_payload(self, server, temp_dir):
+        """Unknown facilities, bad parameters and a missing database return JSON errors."""
+        assert (await self.read(server, "ice://facilities/99"))["error"] == "Facility 99 not found"
+        assert "YYYY-MM" in (await self.read(server, "ice://statistics/trends?from=March"))["error"]
+
+        server.resource_store = ResourceStore(temp_dir / "missing.db")
+        assert (await self.read(server, "ice://facilities/database"))["error"] == "Facilities database unavailable"
+
+    async def test_static_resources_report_their_mime_type(self, server):
+        """Template resources come back as contents with the listed MIME type."""
+        handler = server.server.request_handlers[types.ReadResourceRequest]
+        for uri, mime_type in (("ice://search/history", "application/json"),
+                               ("ice://legal/templates", "text/markdown")):
+            result = await handler(types.ReadResourceRequest(
+                method="resources/read", params=types.ReadResourceRequestParams(uri=uri)
+            ))
+            assert result.root.contents[0].mimeType == mime_type
@@ -0,0 +1,135 @@
+"""
+Unit tests for the tool response serialization layer.
+"""
+
+import json
+from dataclasses import asdict
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ice_locator_mcp.core.search_engine import (
+    FAMILY_RESOURCES,
+    LEGAL_RESOURCES,
+    DetaineeRecord,
+    SearchResult
+)
+from ice_locator_mcp.tools.search_tools import SearchTools
+from ice_locator_mcp.utils import serialization
+from ice_locator_mcp.utils.serialization import Fragment, dumps, pre_encode
+
+
+def make_record(index=0):
+    return DetaineeRecord(
+        alien_number=f"A{index:09d}", name=f"Person {index}", date_of_birth="1990-01-01",
+        country_of_birth="México", facility_name="Krome", facility_location="Miami, FL",
+        custody_status="In Custody", last_updated="2025-01-01"
+    )
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test with each encoder."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+    elif not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestDumps:
+    """Test encoding in both modes and with both backends."""
+
+    def test_modes(self, backend):
+        """Pretty output is indented, compact output has no whitespace, and both decode the same."""
+        value = {"name": "José", "items": [1, 2], 3: None}
+        assert dumps(value) == json.dumps(value, indent=2, ensure_ascii=False)
+        assert dumps(value, compact=True) == '{"name":"José","items":[1,2],"3":null}'
+
+    def test_dataclasses_and_other_types(self, backend):
+        """Dataclasses become objects; datetimes and other values use str()."""
+        when = datetime(2025, 1, 2, 3, 4, 5)
+        encoded = json.loads(dumps({"record": make_record(), "when": when, "ids": {7}}, compact=True))
+        assert encoded["record"] == asdict(make_record())
+        assert encoded["when"] == "2025-01-02 03:04:05"
+        assert encoded["ids"] == "{7}"
+
+    def test_backends_agree(self, monkeypatch):
+        """orjson and the standard library produce identical text for search results."""
+        result = SearchResult.success([make_record(i) for i in range(3)], 0.25)
+        outputs = [dumps(result), dumps(result, compact=True)]
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+        assert [dumps(result), dumps(result, compact=True)] == outputs
+
+    def test_values_orjson_rejects_fall_back(self):
+        """Integers beyond 64 bits are still encoded."""
+        assert dumps({"n": 2 ** 70, "f": LEGAL_RESOURCES}, compact=True).startswith('{"n":1180591620717411303424,"f":[')
+
+    def test_non_finite_floats_are_null(self, backend):
+        """NaN and infinities are encoded as null rather than invalid JSON."""
+        value = {"lag": float("nan"), "items": [float("inf"), 1.5]}
+        assert dumps(value, compact=True) == '{"lag":null,"items":[null,1.5]}'
+        assert json.loads(dumps(value)) == {"lag": None, "items": [None, 1.5]}
+
+
+class TestFragments:
+    """Test pre-encoded constant fragments."""
+
+    def test_fragments_are_spliced(self, backend):
+        """Compact output contains the stored text; pretty output re-encodes the value."""
+        fragment = Fragment([{"name": "AILA", "phone": "1-202-507-7600"}])
+        value = {"a": fragment, "b": [fragment, "x"]}
+        expected = {"a": fragment.value, "b": [fragment.value, "x"]}
+
+        assert dumps(value, compact=True) == json.dumps(expected, separators=(",", ":"))
+        assert dumps(value) == json.dumps(expected, indent=2)
+
+    def test_pre_encoded_constants_are_spliced(self, backend):
+        """Registered constants stay plain lists; the stdlib encoder splices their stored text."""
+        constant = pre_encode([{"name": "AILA"}])
+        assert constant == [{"name": "AILA"}]
+        # Swap the stored text to see where it is used instead of re-encoding
+        serialization._pre_encoded[id(constant)].text = '"spliced"'
+
+        value = {"guidance": constant, "result": SearchResult.success([], 0.0)}
+        decoded = json.loads(dumps(value, compact=True))
+
+        assert decoded["guidance"] == ("spliced" if backend == "stdlib" else [{"name": "AILA"}])
+        assert decoded["result"]["user_guidance"]["legal_resources"] == LEGAL_RESOURCES
+        assert json.loads(dumps(value))["guidance"] == [{"name": "AILA"}]
+
+    def test_result_guidance_is_plain_and_shared(self):
+        """Every result shares the same resource lists, which behave as lists."""
+        first, second = SearchResult.success([], 0.0), SearchResult.error("failed")
+        guidance = first.user_guidance["legal_resources"]
+        assert guidance is second.user_guidance["legal_resources"]
+        assert isinstance(guidance, list) and len(guidance) == 2
+        assert guidance[0]["name"] == "American Immigration Lawyers Association"
+
+    def test_fragment_hash_matches_equality(self):
+        """Fragments compare equal to their value, so they are unhashable like it."""
+        with pytest.raises(TypeError):
+            hash(Fragment([1]))
+
+
+class TestToolResponses:
+    """Test responses produced by the search tools."""
+
+    def test_search_response_encodes_records(self):
+        """Records are encoded as objects, not as their repr."""
+        tools = SearchTools(Mock(), compact_json=True)
+        response = json.loads(tools._format_search_response(SearchResult.success([make_record()], 0.1)))
+        assert response["results"][0]["alien_number"] == "A000000000"
+        assert response["user_guidance"]["family_resources"] == FAMILY_RESOURCES
+
+    async def test_bulk_search_response(self):
+        """Bulk results containing records encode instead of failing."""
+        engine = Mock(search=AsyncMock(return_value=SearchResult.success([make_record(1)], 0.1)))
+        tools = SearchTools(engine)
+        tools.performance_logger = Mock(log_search_performance=AsyncMock())
+
+        response = json.loads(await tools.bulk_search([{"alien_number": "A000000001"}] * 2))
+
+        assert response["status"] == "completed"
+        assert [r["results"][0]["name"] for r in response["results"]] == ["Person 1", "Person 1"]
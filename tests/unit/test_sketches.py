@@ -0,0 +1,149 @@
+"""
+Unit tests for streaming latency sketches and MetricsCollector request stats.
+"""
+
+import random
+
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from ice_locator_mcp.utils.performance import MetricsCollector
+from ice_locator_mcp.utils.sketches import LatencySketch, SlidingWindowCounter, SlidingWindowSketch
+
+
+class TestLatencySketch:
+    """Test the mergeable log-bucketed histogram."""
+
+    def test_quantiles_within_relative_error(self):
+        """Quantile estimates stay within the configured relative error."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(-1.0, 1.0) for _ in range(20000)]
+        sketch = LatencySketch(relative_error=0.01)
+        for value in values:
+            sketch.record(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_equals_combined(self):
+        """Merging two sketches equals recording into one."""
+        a, b, combined = LatencySketch(), LatencySketch(), LatencySketch()
+        for i in range(1, 501):
+            a.record(i / 1000)
+            combined.record(i / 1000)
+        for i in range(501, 1001):
+            b.record(i / 1000)
+            combined.record(i / 1000)
+
+        a.merge(b)
+        assert a.buckets == combined.buckets
+        assert a.quantile(0.99) == combined.quantile(0.99)
+
+        with pytest.raises(ValueError):
+            a.merge(LatencySketch(relative_error=0.05))
+
+    def test_zero_and_negative_values(self):
+        """Zero durations are counted; negative values are rejected."""
+        sketch = LatencySketch()
+        sketch.record(0.0)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.count_at_or_below(0.001) == 1
+
+        with pytest.raises(ValueError):
+            sketch.record(-1.0)
+
+
+class TestSlidingWindowSketch:
+    """Test the ring of per-interval sketches."""
+
+    def test_window_ages_out_old_slots(self):
+        """Only slots inside the look-back are merged."""
+        window = SlidingWindowSketch(slot_seconds=60, slots=10)
+        base = 600_000.0
+        window.record(1.0, ["total"], now=base)
+        window.record(2.0, ["total"], now=base + 120)
+
+        recent, counts = window.window(60, now=base + 120)
+        assert recent.count == 1
+        assert counts["total"] == 1
+
+        both, counts = window.window(180, now=base + 120)
+        assert both.count == 2
+
+        # Past the ring length the oldest slot is gone but lifetime keeps it
+        later, _ = window.window(600, now=base + 700)
+        assert later.count == 1
+        assert window.lifetime.count == 2
+
+
+class TestSlidingWindowCounter:
+    """Test per-key trailing-window counts."""
+
+    def test_counts_age_out_per_key(self):
+        """Each key counts only its own events inside the window."""
+        counter = SlidingWindowCounter(3600, slot_seconds=60)
+        base = 600_000.0
+        for i in range(3):
+            counter.add("alice", now=base + i * 1000)
+        assert counter.add("bob", now=base + 2000) == 1
+
+        assert counter.count("alice", now=base + 2000) == 3
+        assert counter.count("alice", now=base + 3700) == 2
+        assert counter.total(now=base + 3700) == 3
+        assert counter.count("alice", now=base + 9000) == 0
+
+        assert counter.prune(now=base + 9000) == 2
+        assert len(counter) == 0
+
+    def test_least_recently_updated_keys_are_dropped(self):
+        """The number of tracked keys stays bounded."""
+        counter = SlidingWindowCounter(3600, max_keys=100)
+        for i in range(1000):
+            counter.add(f"user-{i}", now=1_000.0)
+        counter.add("user-950", now=1_001.0)
+        counter.add("new", now=1_002.0)
+
+        assert len(counter) == 100
+        assert counter.count("user-950", now=1_002.0) == 2
+        assert counter.count("user-900", now=1_002.0) == 0
+
+
+class TestMetricsCollectorSketches:
+    """Test request statistics served from sketches."""
+
+    def _record(self, collector, request_id, tool, search_type, status="completed", cache_hit=False):
+        collector.start_request(request_id, search_type, tool_name=tool)
+        collector.complete_request(request_id, status=status, cache_hit=cache_hit)
+
+    def test_stats_not_capped_by_history(self):
+        """Counts cover more requests than max_history."""
+        collector = MetricsCollector(max_history=10)
+        for i in range(50):
+            self._record(collector, f"r{i}", "search_detainee_by_name", "name_based",
+                         cache_hit=i % 2 == 0)
+        self._record(collector, "f", "search_detainee_by_alien_number", "alien_number", status="failed")
+
+        stats = collector.get_request_stats(60)
+        assert stats["total_requests"] == 51
+        assert stats["failed_requests"] == 1
+        assert stats["by_search_type"] == {"name_based": 50, "alien_number": 1}
+        assert stats["by_tool"]["search_detainee_by_name"] == 50
+        assert stats["cache_hit_rate"] == pytest.approx(0.5)
+        assert "p50_response_time" in stats
+        assert "search_detainee_by_name/name_based" in stats["latency_breakdown"]
+
+    def test_prometheus_export(self):
+        """Sketches are exported as Prometheus histograms."""
+        collector = MetricsCollector()
+        registry = CollectorRegistry()
+        collector.register_prometheus(registry)
+        self._record(collector, "r1", "smart_detainee_search", "smart")
+
+        output = generate_latest(registry).decode()
+        assert 'ice_locator_request_duration_seconds_bucket{le="+Inf",search_type="smart",tool="smart_detainee_search"} 1.0' in output
+        assert 'ice_locator_requests_total{outcome="completed"' in output
@@ -0,0 +1,103 @@
+"""
+Unit tests for translation catalogs and response localization.
+"""
+
+import copy
+
+import pytest
+
+from ice_locator_mcp.core.config import ServerConfig
+from ice_locator_mcp.i18n.processor import (
+    INTERFACE_CATALOG,
+    LEGAL_CATALOG,
+    LanguageProcessor,
+    MultiLanguageInterface
+)
+
+
+def make_response(index=0):
+    return {
+        "status": "found",
+        "results": [
+            {"name": f"Person {index}", "custody_status": "In Custody"},
+            {"name": f"Other {index}", "custody_status": "detention"},
+        ],
+        "user_guidance": {
+            "next_steps": ["Try again", "Contact the detention facility directly"],
+            "legal_resources": [{"name": "AILA", "website": "https://www.aila.org"}],
+            "help": {"title": "Help"},
+        },
+    }
+
+
+@pytest.fixture
+def processor():
+    return LanguageProcessor(ServerConfig())
+
+
+class TestCatalogs:
+    """Test the precompiled translation catalogs."""
+
+    def test_catalogs_are_read_only(self, processor):
+        """Catalogs are shared and cannot be modified."""
+        assert processor.translations is INTERFACE_CATALOG
+        with pytest.raises(TypeError):
+            INTERFACE_CATALOG["es"]["search"] = "changed"
+        with pytest.raises(TypeError):
+            LEGAL_CATALOG["fr"] = {}
+
+    def test_translate_contexts(self, processor):
+        """Legal terms are only translated in the legal context; unknown text is returned as is."""
+        assert processor.translate("  Not Found ", "es") == "no encontrado"
+        assert processor.translate("asylum", "es", "legal") == "asilo"
+        assert processor.translate("asylum", "es", "status") == "asylum"
+        assert processor.translate("found", "en") == "found"
+        assert processor.translate("found", "fr") == "found"
+
+    async def test_async_wrappers_agree(self, processor):
+        """translate_text and localize_response return the synchronous results."""
+        await processor.initialize()
+        assert await processor.translate_text("in custody", "es") == "bajo custodia"
+        assert await processor.localize_response(make_response(), "es") == processor.localize(make_response(), "es")
+
+
+class TestLocalization:
+    """Test synchronous, batched localization."""
+
+    def test_localize_leaves_input_unchanged(self, processor):
+        """The response is copied, with status, custody status and guidance translated."""
+        response = make_response()
+        original = copy.deepcopy(response)
+
+        localized = processor.localize(response, "es")
+
+        assert response == original
+        assert localized["status"] == "encontrado"
+        assert [r["custody_status"] for r in localized["results"]] == ["bajo custodia", "detención"]
+        assert localized["user_guidance"]["next_steps"][0] == "inténtelo de nuevo"
+        assert localized["user_guidance"]["help"] == {"title": "ayuda"}
+        assert processor.localize(response, "en") is response
+
+    def test_localize_many(self, processor):
+        """Batches keep order and every response gets its own guidance copy."""
+        responses = [make_response(i) for i in range(100)]
+
+        localized = processor.localize_many(responses, "es")
+
+        assert len(localized) == 100
+        assert [r["results"][0]["name"] for r in localized[:2]] == ["Person 0", "Person 1"]
+        localized[0]["user_guidance"]["next_steps"].append("changed")
+        assert localized[1]["user_guidance"]["next_steps"] == ["inténtelo de nuevo",
+                                                              "Contact the detention facility directly"]
+
+    async def test_multilingual_response_resources(self, processor):
+        """Localized resources are added without touching the caller's guidance."""
+        interface = MultiLanguageInterface(processor)
+        response = make_response()
+
+        localized = await interface.format_multilingual_response(response, "es")
+
+        assert localized["user_guidance"]["resources"][0]["name"] == "Línea Nacional de Inmigración"
+        assert "resources" not in response["user_guidance"]
+        localized["user_guidance"]["resources"][0]["name"] = "changed"
+        assert (await processor.get_localized_resources("es"))[0]["name"] == "Línea Nacional de Inmigración"